@@ -0,0 +1,32 @@
+"""
+Transcription queue endpoints.
+"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from ...database import get_db
+from ...config import get_settings
+from ...services.transcription_queue import queue_stats
+from ...services.transcription_worker import get_worker_pool, default_pool_size
+
+router = APIRouter()
+settings = get_settings()
+
+
+@router.get("/transcriptions")
+async def get_transcription_queue(db: Session = Depends(get_db)):
+    """
+    Transcription queue metrics.
+
+    - **depth**: Jobs waiting for a worker
+    - **oldest_queued_seconds**: Age of the oldest waiting job
+    - **last_hour**: Wait (queued -> started) and run latency of completed jobs
+    - **workers**: Worker pool of this process (embedded mode only)
+    """
+    stats = queue_stats(db)
+    if settings.transcription_workers_embedded:
+        stats["workers"] = get_worker_pool().status()
+    else:
+        stats["workers"] = {"size": default_pool_size(), "embedded": False}
+    return stats
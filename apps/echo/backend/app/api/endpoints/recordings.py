@@ -2,17 +2,18 @@
 Recording endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
 import os
 import logging
 
-from ...database import get_db, SessionLocal
+from ...database import get_db
 from ...models.recording import Recording, RecordingStatus
 from ...schemas.recording import (
     RecordingCreate,
@@ -22,7 +23,7 @@ from ...schemas.recording import (
     FolderEnum,
 )
 from ...config import get_settings
-from ...services.transcription_service import TranscriptionService
+from ...services import transcription_queue
 
 router = APIRouter()
 settings = get_settings()
@@ -32,77 +33,6 @@ logger = logging.getLogger(__name__)
 DEMO_USER_ID = UUID("00000000-0000-0000-0000-000000000001")
 
 
-def run_transcription_task(
-    recording_id: UUID,
-    transcription_id: UUID,
-    audio_path: str,
-    language: str,
-):
-    """
-    Background task to run Whisper transcription.
-
-    Uses a new DB session since this runs in a background thread.
-    """
-    db = SessionLocal()
-    try:
-        from ...models.transcription import Transcription, TranscriptionStatus
-
-        transcription = db.query(Transcription).filter(
-            Transcription.id == transcription_id
-        ).first()
-
-        if not transcription:
-            logger.error(f"Transcription {transcription_id} not found")
-            return
-
-        recording = db.query(Recording).filter(
-            Recording.id == recording_id
-        ).first()
-
-        if not recording:
-            logger.error(f"Recording {recording_id} not found")
-            return
-
-        # Update status to processing
-        transcription.status = TranscriptionStatus.PROCESSING.value
-        transcription.started_at = datetime.utcnow()
-        db.commit()
-
-        logger.info(f"Starting transcription for {recording_id} with language={language}")
-
-        # Run Whisper transcription
-        service = TranscriptionService()
-        whisper_lang = None if language in ("auto", "bilingual") else language
-        result = service.transcribe(audio_path, language=whisper_lang)
-
-        # Update transcription with result
-        transcription.full_text = result.text
-        transcription.detected_language = result.language
-        transcription.model_used = result.model
-        transcription.processing_time_seconds = result.duration
-        transcription.word_count = len(result.text.split())
-        transcription.status = TranscriptionStatus.COMPLETED.value
-        transcription.completed_at = datetime.utcnow()
-
-        # Update recording status
-        recording.status = RecordingStatus.TRANSCRIBED.value
-
-        db.commit()
-        logger.info(f"Transcription completed for {recording_id}: {len(result.text)} chars")
-
-    except Exception as e:
-        logger.error(f"Transcription failed for {recording_id}: {e}")
-        try:
-            if transcription:
-                transcription.status = TranscriptionStatus.FAILED.value
-                transcription.error_message = str(e)
-                db.commit()
-        except Exception:
-            pass
-    finally:
-        db.close()
-
-
 # =============================================================================
 # LIST & GET
 # =============================================================================
@@ -364,7 +294,6 @@ async def download_recording(
 async def transcribe_recording(
     recording_id: UUID,
     language: str = "auto",
-    background_tasks: BackgroundTasks = None,
     db: Session = Depends(get_db),
 ):
     """
@@ -372,7 +301,8 @@ async def transcribe_recording(
 
     - **language**: Language code (auto, fr, en)
 
-    Returns the created transcription with status "pending".
+    Queues a job for the transcription worker pool and returns the
+    transcription with status "pending".
     """
     recording = db.query(Recording).filter(
         Recording.id == recording_id,
@@ -392,6 +322,9 @@ async def transcribe_recording(
     # Import here to avoid circular imports
     from ...models.transcription import Transcription, TranscriptionStatus
 
+    # Build audio file path
+    audio_path = os.path.join(settings.audio_storage_path, recording.file_path)
+
     # Check if transcription already exists
     existing = db.query(Transcription).filter(
         Transcription.recording_id == recording_id
@@ -400,10 +333,21 @@ async def transcribe_recording(
     if existing:
         if existing.status == TranscriptionStatus.COMPLETED.value:
             raise HTTPException(status_code=400, detail="Recording already transcribed")
-        # Reset if failed/pending
+        if transcription_queue.active_job(db, existing.id):
+            return {"message": "Transcription already queued", "transcription_id": existing.id}
+        # Re-queue if failed
         existing.status = TranscriptionStatus.PENDING.value
+        existing.language_code = language
         existing.error_message = None
-        db.commit()
+        transcription_queue.enqueue(db, existing.id, recording.id, audio_path, language)
+        recording.status = RecordingStatus.TRANSCRIBING.value
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request queued it first (uq_jobs_active_transcription)
+            db.rollback()
+            return {"message": "Transcription already queued", "transcription_id": existing.id}
+        logger.info(f"Re-queued transcription job for recording {recording_id}")
         return {"message": "Transcription restarted", "transcription_id": existing.id}
 
     # Create new transcription
@@ -414,35 +358,17 @@ async def transcribe_recording(
     )
 
     db.add(transcription)
+    db.flush()
+
+    # Queue the job in the same transaction (picked up by the worker pool)
+    transcription_queue.enqueue(db, transcription.id, recording.id, audio_path, language)
 
     # Update recording status
     recording.status = RecordingStatus.TRANSCRIBING.value
 
     db.commit()
     db.refresh(transcription)
-
-    # Build audio file path
-    audio_path = os.path.join(settings.audio_storage_path, recording.file_path)
-
-    # Trigger async transcription job
-    if background_tasks:
-        background_tasks.add_task(
-            run_transcription_task,
-            recording_id=recording.id,
-            transcription_id=transcription.id,
-            audio_path=audio_path,
-            language=language,
-        )
-        logger.info(f"Queued transcription task for recording {recording_id}")
-    else:
-        # Fallback: run synchronously if no background_tasks
-        logger.warning(f"Running transcription synchronously for {recording_id}")
-        run_transcription_task(
-            recording_id=recording.id,
-            transcription_id=transcription.id,
-            audio_path=audio_path,
-            language=language,
-        )
+    logger.info(f"Queued transcription job for recording {recording_id}")
 
     return {
         "message": "Transcription started",
@@ -52,10 +52,28 @@ class Settings(BaseSettings):
 
     # Whisper Configuration
     whisper_device: str = "auto"  # auto, npu, gpu, cpu
+    transcription_backend: str = "auto"  # auto (ONNX on NPU, else faster-whisper), onnx, faster-whisper
     whisper_model: str = "large-v3"  # Default: best quality for QC-FR
     whisper_model_npu: str = "medium"  # NPU model (faster with BFP16)
     whisper_compute_type: str = "int8"  # float16 for GPU, int8 for CPU, bfp16 for NPU
     whisper_precision: str = "bfp16"  # NPU native precision
+    whisper_cpu_threads: int = 4  # CTranslate2 / ONNX Runtime threads per worker process
+    whisper_onnx_provider: str = "auto"  # ONNX pipeline: auto (NPU if available, else CPU), npu, cpu (selects the ONNX backend)
+    whisper_onnx_model_dir: Optional[str] = None  # Local optimum export for the CPU provider
+    whisper_onnx_batch_size: int = 8  # 30 s chunks per encoder/decoder batch
+
+    # Transcription Worker Pool
+    transcription_workers: int = 0  # 0 = auto (CPU cores / whisper_cpu_threads)
+    transcription_workers_embedded: bool = True  # Run the pool inside the API process
+    transcription_job_max_attempts: int = 3
+    transcription_job_lease_seconds: int = 120  # Renewed by heartbeat while running
+    transcription_poll_interval: float = 2.0  # Seconds between claims when idle
+    transcription_batch_size: int = 4  # Queued recordings claimed together (ONNX backend)
+
+    # Long-audio mode: VAD-split recordings transcribed in parallel chunks
+    long_audio_min_seconds: float = 600  # 0 = disabled
+    long_audio_workers: int = 0  # 0 = auto (share of CPU cores per transcription worker, min 2); 1 = disabled
+    long_audio_idle_seconds: float = 300  # Chunk workers (and their models) stopped after this idle time
 
     # Audio Configuration
     audio_storage_path: str = "/app/data"
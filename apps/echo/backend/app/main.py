@@ -8,11 +8,13 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from .config import get_settings
 from .database import init_db, check_db_connection
-from .api.endpoints import recordings, transcriptions, audio, health, settings as settings_router
+from .api.endpoints import recordings, transcriptions, audio, health, queue, settings as settings_router
+from .services.transcription_worker import get_worker_pool
 
 settings = get_settings()
 
@@ -45,10 +47,15 @@ async def lifespan(app: FastAPI):
     else:
         logger.error("Database connection failed!")
 
+    # Start transcription workers (model loaded once per worker process)
+    if settings.transcription_workers_embedded:
+        get_worker_pool().start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down ECHO")
+    await asyncio.to_thread(get_worker_pool().stop)
 
 
 # =============================================================================
@@ -102,6 +109,7 @@ app.include_router(settings_router.router, prefix="/api/v1", tags=["Settings"])
 app.include_router(recordings.router, prefix="/api/v1/recordings", tags=["Recordings"])
 app.include_router(transcriptions.router, prefix="/api/v1/transcriptions", tags=["Transcriptions"])
 app.include_router(audio.router, prefix="/api/v1/audio", tags=["Audio"])
+app.include_router(queue.router, prefix="/api/v1/queue", tags=["Queue"])
 
 
 # =============================================================================
@@ -0,0 +1,84 @@
+"""
+Transcription job queue model.
+
+Durable queue for the transcription worker pool (services/transcription_worker.py).
+"""
+
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+import enum
+from ..database import Base
+
+
+class JobStatus(str, enum.Enum):
+    """Transcription job status enum."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class TranscriptionJob(Base):
+    """
+    Transcription job claimed by the worker pool.
+
+    Features:
+    - At most one queued/running job per transcription (partial unique index)
+    - Claimed with SELECT ... FOR UPDATE SKIP LOCKED (no double processing)
+    - Lease renewed by a heartbeat; jobs of crashed workers are re-queued
+      once the lease expires
+    - Retries with backoff up to max_attempts
+    - Queue/run timestamps for latency metrics
+    """
+    __tablename__ = "transcription_jobs"
+
+    # Primary key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Foreign keys
+    transcription_id = Column(UUID(as_uuid=True), ForeignKey("transcriptions.id", ondelete="CASCADE"), nullable=False)
+    recording_id = Column(UUID(as_uuid=True), ForeignKey("recordings.id", ondelete="CASCADE"), nullable=False)
+
+    # Work
+    audio_path = Column(Text, nullable=False)
+    language = Column(String(10), nullable=False, default="auto")
+
+    # Status
+    status = Column(String(20), nullable=False, default=JobStatus.QUEUED.value)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    error_message = Column(Text, nullable=True)
+
+    # Lease
+    worker_id = Column(String(100), nullable=True)  # "hostname:pid"
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Timestamps
+    queued_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Reset on retry
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Retry backoff
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Relationships
+    transcription = relationship("Transcription")
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_jobs_claim', status, available_at),
+        Index('idx_jobs_transcription_id', transcription_id),
+        # Concurrent transcribe requests cannot queue the same transcription twice
+        Index(
+            'uq_jobs_active_transcription',
+            transcription_id,
+            unique=True,
+            postgresql_where=status.in_([JobStatus.QUEUED.value, JobStatus.RUNNING.value]),
+        ),
+        Index('idx_jobs_finished_at', finished_at),
+    )
+
+    def __repr__(self):
+        return f"<TranscriptionJob(id={self.id}, status='{self.status}', attempts={self.attempts})>"
@@ -2,16 +2,17 @@
 Audio preprocessing utilities for transcription quality.
 
 Handles:
+- Decoding to mono float32 at 16kHz (Whisper requirement), once, in memory
 - Pre-padding to prevent word cutoff at the beginning
 - Post-padding for clean segment endings
-- Sample rate normalization to 16kHz (Whisper requirement)
+- Peak normalization
+
+The result is a numpy array handed directly to the model (no temporary
+WAV file written and decoded again).
 """
 
 import logging
-import tempfile
-import os
-from pathlib import Path
-from typing import Tuple, Optional
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -22,177 +23,146 @@ TARGET_SAMPLE_RATE = 16000
 PRE_PADDING_MS = 500   # Silence before audio to prevent word cutoff
 POST_PADDING_MS = 300  # Silence after audio for clean endings
 
+# Low-noise padding amplitude (not completely silent to avoid artifacts)
+PADDING_NOISE_STD = 0.0001
 
-def preprocess_audio_for_transcription(
-    audio_path: str,
-    pre_pad_ms: int = PRE_PADDING_MS,
-    post_pad_ms: int = POST_PADDING_MS,
-    target_sr: int = TARGET_SAMPLE_RATE,
-) -> Tuple[str, bool]:
+# Peak level after normalization (headroom against clipping)
+NORMALIZED_PEAK = 0.95
+
+
+def load_audio(audio_path: str, target_sr: int = TARGET_SAMPLE_RATE) -> "np.ndarray":
     """
-    Preprocess audio file for optimal transcription.
+    Decode an audio file to mono float32 samples at `target_sr`.
 
-    Adds silence padding at the beginning and end of the audio to prevent
-    word cutoff issues that can occur with VAD (Voice Activity Detection).
+    Files soundfile can read (WAV, FLAC, OGG) are decoded natively and
+    resampled with soxr only if needed; other formats (MP3, M4A, WebM) are
+    decoded and resampled in one pass by PyAV (see _decode_fallback).
 
     Args:
-        audio_path: Path to the input audio file
-        pre_pad_ms: Milliseconds of silence to add before audio (default: 500ms)
-        post_pad_ms: Milliseconds of silence to add after audio (default: 300ms)
+        audio_path: Path to the audio file
         target_sr: Target sample rate (default: 16000 for Whisper)
 
     Returns:
-        Tuple of (preprocessed_audio_path, is_temporary)
-        - preprocessed_audio_path: Path to the processed audio file
-        - is_temporary: True if the file should be deleted after use
+        Mono float32 samples
     """
-    try:
-        import librosa
-        import soundfile as sf
-        import numpy as np
-    except ImportError as e:
-        logger.warning(f"Audio preprocessing dependencies not available: {e}")
-        logger.info("Falling back to original audio without preprocessing")
-        return audio_path, False
+    import numpy as np
 
     try:
-        # Load audio with target sample rate
-        logger.debug(f"Loading audio: {audio_path}")
-        audio, sr = librosa.load(audio_path, sr=target_sr, mono=True)
-
-        original_duration = len(audio) / sr
-        logger.debug(f"Original audio: {original_duration:.2f}s, {len(audio)} samples @ {sr}Hz")
+        import soundfile as sf
 
-        # Calculate padding samples
-        pre_pad_samples = int(target_sr * pre_pad_ms / 1000)
-        post_pad_samples = int(target_sr * post_pad_ms / 1000)
+        data, sr = sf.read(audio_path, dtype="float32", always_2d=True)
+    except Exception as e:
+        logger.debug(f"soundfile cannot decode {audio_path} ({e}), using fallback decoder")
+        return np.ascontiguousarray(_decode_fallback(audio_path, target_sr), dtype=np.float32)
 
-        # Create low-noise silence (not completely silent to avoid artifacts)
-        # Using very low amplitude noise instead of zeros
-        pre_silence = np.random.normal(0, 0.0001, pre_pad_samples).astype(np.float32)
-        post_silence = np.random.normal(0, 0.0001, post_pad_samples).astype(np.float32)
+    audio = data[:, 0] if data.shape[1] == 1 else data.mean(axis=1, dtype=np.float32)
+    if sr != target_sr:
+        audio = _resample(audio, sr, target_sr)
+    return np.ascontiguousarray(audio, dtype=np.float32)
 
-        # Normalize audio to prevent clipping
-        max_val = np.abs(audio).max()
-        if max_val > 0:
-            audio = audio / max_val * 0.95
 
-        # Concatenate: silence + audio + silence
-        padded_audio = np.concatenate([pre_silence, audio, post_silence])
+def _decode_fallback(audio_path: str, target_sr: int) -> "np.ndarray":
+    """
+    Decode a format soundfile cannot read.
 
-        # Create temporary file for preprocessed audio
-        temp_dir = Path(tempfile.gettempdir()) / "echo_preprocessed"
-        temp_dir.mkdir(exist_ok=True)
+    Uses faster-whisper's PyAV decoder (mono, resampled while decoding);
+    librosa only where faster-whisper is not installed (NPU setups).
+    """
+    try:
+        from faster_whisper import decode_audio
+    except ImportError:
+        import librosa
 
-        # Use original filename with prefix
-        original_name = Path(audio_path).stem
-        temp_path = temp_dir / f"preprocessed_{original_name}.wav"
+        audio, _ = librosa.load(audio_path, sr=target_sr, mono=True)
+        return audio
 
-        # Write preprocessed audio
-        sf.write(str(temp_path), padded_audio, target_sr)
+    return decode_audio(audio_path, sampling_rate=target_sr)
 
-        new_duration = len(padded_audio) / sr
-        logger.info(
-            f"Audio preprocessed: {original_duration:.2f}s -> {new_duration:.2f}s "
-            f"(+{pre_pad_ms}ms pre, +{post_pad_ms}ms post)"
-        )
 
-        return str(temp_path), True
+def _resample(audio: "np.ndarray", orig_sr: int, target_sr: int) -> "np.ndarray":
+    try:
+        import soxr
 
-    except Exception as e:
-        logger.error(f"Audio preprocessing failed: {e}")
-        logger.info("Falling back to original audio")
-        return audio_path, False
+        return soxr.resample(audio, orig_sr, target_sr, quality="HQ")
+    except ImportError:
+        import librosa
 
+        return librosa.resample(audio, orig_sr=orig_sr, target_sr=target_sr)
 
-def cleanup_preprocessed_file(file_path: str) -> None:
-    """
-    Remove a temporary preprocessed audio file.
 
-    Args:
-        file_path: Path to the file to remove
+def preprocess_audio_for_transcription(
+    audio_path: str,
+    pre_pad_ms: int = PRE_PADDING_MS,
+    post_pad_ms: int = POST_PADDING_MS,
+    target_sr: int = TARGET_SAMPLE_RATE,
+) -> "np.ndarray":
     """
-    try:
-        if os.path.exists(file_path) and "preprocessed_" in os.path.basename(file_path):
-            os.remove(file_path)
-            logger.debug(f"Cleaned up preprocessed file: {file_path}")
-    except Exception as e:
-        logger.warning(f"Failed to cleanup preprocessed file: {e}")
-
+    Decode and preprocess an audio file for optimal transcription.
 
-def cleanup_old_preprocessed_files(max_age_hours: int = 24) -> int:
-    """
-    Clean up old preprocessed files from the temp directory.
+    Adds silence padding at the beginning and end of the audio to prevent
+    word cutoff issues that can occur with VAD (Voice Activity Detection).
+    The padded buffer is allocated once: 16kHz mono sources are decoded
+    straight into it, then normalized in place.
 
     Args:
-        max_age_hours: Remove files older than this many hours
+        audio_path: Path to the input audio file
+        pre_pad_ms: Milliseconds of silence to add before audio (default: 500ms)
+        post_pad_ms: Milliseconds of silence to add after audio (default: 300ms)
+        target_sr: Target sample rate (default: 16000 for Whisper)
 
     Returns:
-        Number of files removed
+        Padded, normalized mono float32 samples at `target_sr`
     """
-    import time
+    import numpy as np
 
-    temp_dir = Path(tempfile.gettempdir()) / "echo_preprocessed"
-    if not temp_dir.exists():
-        return 0
+    pre_pad_samples = int(target_sr * pre_pad_ms / 1000)
+    post_pad_samples = int(target_sr * post_pad_ms / 1000)
 
-    removed = 0
-    max_age_seconds = max_age_hours * 3600
-    current_time = time.time()
+    frames = _native_frames(audio_path, target_sr)
+    if frames is not None:
+        # Native passthrough: decode directly into the padded buffer
+        import soundfile as sf
 
-    try:
-        for file_path in temp_dir.glob("preprocessed_*.wav"):
-            try:
-                file_age = current_time - file_path.stat().st_mtime
-                if file_age > max_age_seconds:
-                    file_path.unlink()
-                    removed += 1
-            except Exception as e:
-                logger.debug(f"Could not remove old file {file_path}: {e}")
-
-        if removed > 0:
-            logger.info(f"Cleaned up {removed} old preprocessed files")
+        padded = np.empty(pre_pad_samples + frames + post_pad_samples, dtype=np.float32)
+        data = sf.read(audio_path, dtype="float32", out=padded[pre_pad_samples:pre_pad_samples + frames])
+        if isinstance(data, tuple):
+            data = data[0]
+        num_samples = len(data)
+        padded = padded[:pre_pad_samples + num_samples + post_pad_samples]
+    else:
+        audio = load_audio(audio_path, target_sr)
+        num_samples = len(audio)
+        padded = np.empty(pre_pad_samples + num_samples + post_pad_samples, dtype=np.float32)
+        padded[pre_pad_samples:pre_pad_samples + num_samples] = audio
 
-    except Exception as e:
-        logger.warning(f"Cleanup of old preprocessed files failed: {e}")
+    audio = padded[pre_pad_samples:pre_pad_samples + num_samples]
 
-    return removed
+    # Normalize audio to prevent clipping (in place)
+    max_val = np.abs(audio).max() if num_samples else 0.0
+    if max_val > 0:
+        audio *= NORMALIZED_PEAK / max_val
 
+    # Low-noise silence before and after
+    rng = np.random.default_rng()
+    padded[:pre_pad_samples] = rng.normal(0, PADDING_NOISE_STD, pre_pad_samples)
+    padded[pre_pad_samples + num_samples:] = rng.normal(0, PADDING_NOISE_STD, post_pad_samples)
 
-class AudioPreprocessor:
-    """
-    Audio preprocessor with context manager support for automatic cleanup.
+    logger.info(
+        f"Audio preprocessed: {num_samples / target_sr:.2f}s -> {len(padded) / target_sr:.2f}s "
+        f"(+{pre_pad_ms}ms pre, +{post_pad_ms}ms post, native={frames is not None})"
+    )
 
-    Usage:
-        with AudioPreprocessor(audio_path) as processed_path:
-            # Use processed_path for transcription
-            result = transcribe(processed_path)
-        # Temporary file is automatically cleaned up
-    """
+    return padded
+
+
+def _native_frames(audio_path: str, target_sr: int) -> Optional[int]:
+    """Frame count if the file is already mono at `target_sr` (no resampling needed)."""
+    try:
+        import soundfile as sf
 
-    def __init__(
-        self,
-        audio_path: str,
-        pre_pad_ms: int = PRE_PADDING_MS,
-        post_pad_ms: int = POST_PADDING_MS,
-    ):
-        self.original_path = audio_path
-        self.pre_pad_ms = pre_pad_ms
-        self.post_pad_ms = post_pad_ms
-        self.processed_path: Optional[str] = None
-        self.is_temporary: bool = False
-
-    def __enter__(self) -> str:
-        """Preprocess audio and return path to processed file."""
-        self.processed_path, self.is_temporary = preprocess_audio_for_transcription(
-            self.original_path,
-            self.pre_pad_ms,
-            self.post_pad_ms,
-        )
-        return self.processed_path
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Clean up temporary file if created."""
-        if self.is_temporary and self.processed_path:
-            cleanup_preprocessed_file(self.processed_path)
-        return False  # Don't suppress exceptions
+        info = sf.info(audio_path)
+    except Exception:
+        return None
+    if info.samplerate == target_sr and info.channels == 1 and info.frames > 0:
+        return info.frames
+    return None
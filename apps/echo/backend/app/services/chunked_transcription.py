@@ -0,0 +1,247 @@
+"""
+Parallel transcription of long recordings.
+
+faster-whisper decodes a file sequentially, so a two-hour meeting keeps a
+single CTranslate2 pipeline busy for its whole length. For recordings longer
+than long_audio_min_seconds:
+1. VAD runs once over the whole recording
+2. the audio is cut in the middle of silences into roughly equal chunks
+   (never inside speech)
+3. chunks are transcribed in parallel by a pool of processes, each holding
+   its own warm WhisperModel
+4. segments and word timings are shifted by their chunk offset and stitched
+   back in order
+
+Wall time falls roughly with the number of chunk workers (long_audio_workers).
+Each transcription worker owns its chunk pool, sized by default to its share
+of the cores but at least 2: long recordings are rare, so the pools borrow
+cores that are usually idle (at most 2x oversubscription while every worker
+runs a long recording at once). Hosts with fewer cores than two workers'
+threads use a single pass. Chunk pools are stopped after
+long_audio_idle_seconds without a long recording, releasing their model copies.
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, List, Dict, Any, Tuple
+
+from ..config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Whisper input sample rate
+SAMPLE_RATE = 16000
+
+# Chunks shorter than this are not worth a separate worker
+MIN_CHUNK_SECONDS = 60
+
+
+def default_chunk_workers() -> int:
+    """
+    Chunk processes per transcription worker (each runs whisper_cpu_threads).
+
+    The cores are shared by every transcription worker; each pool gets its
+    share, but at least 2 so long-audio mode is active by default (1 on hosts
+    too small for two workers, where long recordings use a single pass).
+    """
+    if settings.long_audio_workers > 0:
+        return settings.long_audio_workers
+    slots = (os.cpu_count() or 1) // max(1, settings.whisper_cpu_threads)
+    if slots < 2:
+        return 1
+    # Same default as transcription_worker.default_pool_size()
+    pool_size = settings.transcription_workers if settings.transcription_workers > 0 else slots
+    return max(2, slots // pool_size)
+
+
+# =============================================================================
+# SPLITTING
+# =============================================================================
+
+def plan_chunks(
+    speech: List[Dict[str, int]],
+    total_samples: int,
+    n_chunks: int,
+) -> List[Tuple[int, int]]:
+    """
+    Cut the audio into roughly equal chunks at silence boundaries.
+
+    Args:
+        speech: VAD speech timestamps ({"start", "end"} in samples, sorted)
+        total_samples: Length of the audio in samples
+        n_chunks: Desired number of chunks
+
+    Returns:
+        (start, end) sample ranges covering the whole audio, in order
+    """
+    # Candidate cuts: middle of every silence between two speech segments
+    gaps = [
+        (previous["end"] + current["start"]) // 2
+        for previous, current in zip(speech, speech[1:])
+        if current["start"] > previous["end"]
+    ]
+
+    cuts = []
+    for i in range(1, n_chunks):
+        target = total_samples * i // n_chunks
+        candidates = [gap for gap in gaps if not cuts or gap > cuts[-1]]
+        if not candidates:
+            break
+        cut = min(candidates, key=lambda gap: abs(gap - target))
+        cuts.append(cut)
+
+    bounds = [0] + cuts + [total_samples]
+    return list(zip(bounds, bounds[1:]))
+
+
+# =============================================================================
+# CHUNK WORKERS
+# =============================================================================
+
+# WhisperModel of the current chunk worker process
+_chunk_model = None
+
+
+def _init_chunk_worker(model_size: str, device: str, compute_type: str, cpu_threads: int, download_root: str):
+    """Load the model once per chunk worker process."""
+    global _chunk_model
+    from faster_whisper import WhisperModel
+
+    _chunk_model = WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        download_root=download_root,
+        cpu_threads=cpu_threads,
+    )
+
+
+def _transcribe_chunk(audio, offset: float, options: Dict[str, Any]):
+    """Transcribe one chunk; timings are returned relative to the recording."""
+    from .whisper_local import TranscriptionSegment, WordTiming
+
+    segments, _ = _chunk_model.transcribe(audio, **options)
+
+    results = []
+    for segment in segments:
+        words = [
+            WordTiming(word=w.word, start=w.start + offset, end=w.end + offset, probability=w.probability)
+            for w in segment.words or []
+        ]
+        results.append(TranscriptionSegment(
+            start=segment.start + offset,
+            end=segment.end + offset,
+            text=segment.text.strip(),
+            words=words,
+            avg_logprob=segment.avg_logprob,
+            no_speech_prob=segment.no_speech_prob,
+        ))
+    return results
+
+
+# =============================================================================
+# TRANSCRIBER
+# =============================================================================
+
+class ChunkedTranscriber:
+    """
+    Process pool transcribing chunks of long recordings.
+
+    The pool (and each worker's model) is created on first use, kept for the
+    following recordings and stopped after long_audio_idle_seconds idle.
+    """
+
+    def __init__(self, model_size: str, device: str, compute_type: str, download_root: str, workers: Optional[int] = None):
+        self.workers = workers or default_chunk_workers()
+        self._init_args = (model_size, device, compute_type, settings.whisper_cpu_threads, download_root)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._idle_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+    def transcribe(self, audio, options: Dict[str, Any]) -> list:
+        """
+        Transcribe a long recording in parallel chunks.
+
+        Args:
+            audio: Mono float32 samples at 16 kHz
+            options: WhisperModel.transcribe() options (language already resolved);
+                its vad_parameters are also used to find the cut points
+
+        Returns:
+            TranscriptionSegment list in recording order
+        """
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        duration = len(audio) / SAMPLE_RATE
+        n_chunks = max(1, min(self.workers, math.floor(duration / MIN_CHUNK_SECONDS)))
+        speech = get_speech_timestamps(audio, VadOptions(**options.get("vad_parameters", {})))
+        chunks = plan_chunks(speech, len(audio), n_chunks)
+
+        logger.info(
+            f"Long recording ({duration:.0f}s): {len(chunks)} chunks on {self.workers} workers"
+        )
+
+        with self._lock:
+            self._cancel_idle_timer()
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_transcribe_chunk, audio[start:end], start / SAMPLE_RATE, options)
+                for start, end in chunks
+            ]
+
+            segments = []
+            try:
+                for future in futures:
+                    segments.extend(future.result())
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory): start a fresh pool next time
+                self.shutdown()
+                raise
+            finally:
+                self._start_idle_timer()
+        return segments
+
+    def shutdown(self):
+        """Stop the chunk workers (models are unloaded with them)."""
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    def _start_idle_timer(self):
+        if self._executor is None or settings.long_audio_idle_seconds <= 0:
+            return
+        self._idle_timer = threading.Timer(settings.long_audio_idle_seconds, self._on_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _on_idle(self):
+        with self._lock:
+            # Superseded: a recording ran meanwhile and armed a new timer
+            if self._idle_timer is not threading.current_thread():
+                return
+            logger.info(f"Stopping {self.workers} idle chunk workers")
+            self.shutdown()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # Fresh interpreters: callers may hold DB connections and threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=self._init_args,
+            )
+        return self._executor
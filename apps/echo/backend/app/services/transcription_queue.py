@@ -0,0 +1,324 @@
+"""
+Durable transcription job queue (PostgreSQL).
+
+Jobs live in the transcription_jobs table, so queued and running work
+survives API and worker restarts:
+- enqueue() inserts a job in the caller's transaction
+- claim() / claim_batch() take the oldest available jobs with
+  SELECT ... FOR UPDATE SKIP LOCKED, so any number of worker processes can
+  poll without double processing
+- running jobs hold a lease renewed by heartbeat(); jobs whose lease expired
+  (worker crashed or was killed) are re-queued by requeue_expired()
+- failures are retried with a linear backoff up to max_attempts
+- complete() / fail() only apply while the job is still leased to the
+  calling worker, so a worker whose job was re-queued cannot overwrite it
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any
+from uuid import UUID
+
+from sqlalchemy import func, and_
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models.job import TranscriptionJob, JobStatus
+from ..models.recording import Recording, RecordingStatus
+from ..models.transcription import TranscriptionStatus
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Delay before a failed job is retried, per attempt already made
+RETRY_BACKOFF_SECONDS = 30
+
+# Window of finished jobs used for latency metrics
+LATENCY_WINDOW = timedelta(hours=1)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# =============================================================================
+# PRODUCER
+# =============================================================================
+
+def enqueue(
+    db: Session,
+    transcription_id: UUID,
+    recording_id: UUID,
+    audio_path: str,
+    language: str,
+) -> TranscriptionJob:
+    """
+    Add a transcription job (committed with the caller's transaction).
+
+    Args:
+        db: Database session
+        transcription_id: Transcription row the result is written to
+        recording_id: Recording being transcribed
+        audio_path: Absolute path of the audio file
+        language: Language code ('auto', 'fr', 'en', 'bilingual')
+
+    Returns:
+        The queued job
+    """
+    now = _now()
+    job = TranscriptionJob(
+        transcription_id=transcription_id,
+        recording_id=recording_id,
+        audio_path=audio_path,
+        language=language,
+        status=JobStatus.QUEUED.value,
+        max_attempts=settings.transcription_job_max_attempts,
+        queued_at=now,
+        available_at=now,
+    )
+    db.add(job)
+    return job
+
+
+def active_job(db: Session, transcription_id: UUID) -> Optional[TranscriptionJob]:
+    """Queued or running job of a transcription, if any."""
+    return db.query(TranscriptionJob).filter(
+        TranscriptionJob.transcription_id == transcription_id,
+        TranscriptionJob.status.in_([JobStatus.QUEUED.value, JobStatus.RUNNING.value]),
+    ).first()
+
+
+# =============================================================================
+# CONSUMER
+# =============================================================================
+
+def claim(db: Session, worker_id: str) -> Optional[TranscriptionJob]:
+    """
+    Lease the oldest available job to a worker.
+
+    Args:
+        db: Database session
+        worker_id: Claiming worker ("hostname:pid")
+
+    Returns:
+        The claimed job (status running), or None if the queue is empty
+    """
+    jobs = claim_batch(db, worker_id, 1)
+    return jobs[0] if jobs else None
+
+
+def claim_batch(db: Session, worker_id: str, limit: int) -> List[TranscriptionJob]:
+    """
+    Lease up to `limit` of the oldest available jobs to a worker (transcribed
+    together in shared inference batches).
+
+    Args:
+        db: Database session
+        worker_id: Claiming worker ("hostname:pid")
+        limit: Maximum number of jobs
+
+    Returns:
+        The claimed jobs (status running), oldest first; empty if the queue is empty
+    """
+    now = _now()
+    jobs = db.query(TranscriptionJob).filter(
+        TranscriptionJob.status == JobStatus.QUEUED.value,
+        TranscriptionJob.available_at <= now,
+    ).order_by(
+        TranscriptionJob.queued_at
+    ).with_for_update(skip_locked=True).limit(limit).all()
+
+    if not jobs:
+        db.rollback()
+        return []
+
+    lease = now + timedelta(seconds=settings.transcription_job_lease_seconds)
+    for job in jobs:
+        job.status = JobStatus.RUNNING.value
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.started_at = now
+        job.lease_expires_at = lease
+    db.commit()
+    return jobs
+
+
+def heartbeat(db: Session, job_id: UUID, worker_id: str) -> bool:
+    """
+    Extend the lease of a running job.
+
+    Returns:
+        False if the job is no longer leased to this worker
+    """
+    lease = _now() + timedelta(seconds=settings.transcription_job_lease_seconds)
+    updated = db.query(TranscriptionJob).filter(
+        TranscriptionJob.id == job_id,
+        TranscriptionJob.worker_id == worker_id,
+        TranscriptionJob.status == JobStatus.RUNNING.value,
+    ).update({TranscriptionJob.lease_expires_at: lease}, synchronize_session=False)
+    db.commit()
+    return updated == 1
+
+
+def _hold(db: Session, job: TranscriptionJob, worker_id: str) -> bool:
+    """Lock the job row if it is still running under this worker's lease."""
+    updated = db.query(TranscriptionJob).filter(
+        TranscriptionJob.id == job.id,
+        TranscriptionJob.worker_id == worker_id,
+        TranscriptionJob.status == JobStatus.RUNNING.value,
+    ).update({TranscriptionJob.lease_expires_at: None}, synchronize_session=False)
+    return updated == 1
+
+
+def complete(db: Session, job: TranscriptionJob, worker_id: str) -> bool:
+    """
+    Mark a job completed (committed with the caller's result writes).
+
+    Returns:
+        False if the job is no longer leased to this worker; the caller
+        must then roll back and discard its result
+    """
+    if not _hold(db, job, worker_id):
+        return False
+    job.status = JobStatus.COMPLETED.value
+    job.finished_at = _now()
+    job.lease_expires_at = None
+    job.error_message = None
+    return True
+
+
+def fail(db: Session, job: TranscriptionJob, worker_id: str, error: str) -> bool:
+    """
+    Record a failed attempt; the job is re-queued while attempts remain.
+
+    Once attempts are exhausted the transcription is marked as error and the
+    recording returns to completed, so it can be transcribed again. Nothing
+    is recorded if the job is no longer leased to `worker_id`.
+
+    Returns:
+        True if the job will be retried
+    """
+    if not _hold(db, job, worker_id):
+        logger.warning(f"Job {job.id} no longer leased to {worker_id}, failure not recorded")
+        return False
+    now = _now()
+    job.error_message = error
+    job.lease_expires_at = None
+    if job.attempts < job.max_attempts:
+        job.status = JobStatus.QUEUED.value
+        job.worker_id = None
+        job.queued_at = now
+        job.available_at = now + timedelta(seconds=RETRY_BACKOFF_SECONDS * job.attempts)
+        job.transcription.status = TranscriptionStatus.PENDING.value
+        return True
+    job.status = JobStatus.FAILED.value
+    job.finished_at = now
+    job.transcription.status = TranscriptionStatus.ERROR.value
+    job.transcription.error_message = error
+    db.query(Recording).filter(
+        Recording.id == job.recording_id,
+        Recording.status == RecordingStatus.TRANSCRIBING.value,
+    ).update({Recording.status: RecordingStatus.COMPLETED.value}, synchronize_session=False)
+    return False
+
+
+# =============================================================================
+# RECOVERY
+# =============================================================================
+
+def requeue_expired(db: Session) -> int:
+    """
+    Re-queue running jobs whose lease expired (worker crashed or hung).
+
+    Returns:
+        Number of jobs re-queued
+    """
+    return _release(db, TranscriptionJob.lease_expires_at < _now(), "lease expired")
+
+
+def release_workers(db: Session, worker_ids: List[str]) -> int:
+    """
+    Re-queue the running jobs of workers known to be gone (without waiting
+    for their lease to expire).
+
+    Returns:
+        Number of jobs re-queued
+    """
+    if not worker_ids:
+        return 0
+    return _release(db, TranscriptionJob.worker_id.in_(worker_ids), "worker stopped")
+
+
+def _release(db: Session, condition, reason: str) -> int:
+    now = _now()
+    jobs = db.query(TranscriptionJob).filter(
+        TranscriptionJob.status == JobStatus.RUNNING.value,
+        condition,
+    ).with_for_update(skip_locked=True).all()
+
+    for job in jobs:
+        logger.warning(f"Re-queueing transcription job {job.id} ({reason}, worker={job.worker_id})")
+        # The interrupted attempt counts, so a job that keeps killing its
+        # worker ends up failed instead of looping forever
+        fail(db, job, job.worker_id, f"Interrupted: {reason}")
+        job.available_at = now
+
+    db.commit()
+    return len(jobs)
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+def queue_stats(db: Session) -> Dict[str, Any]:
+    """
+    Queue depth and latency.
+
+    Returns:
+        Dict with job counts per status, age of the oldest queued job and
+        wait (queued -> started) / run (started -> finished) latencies of
+        jobs finished in the last hour
+    """
+    now = _now()
+    counts = dict(
+        db.query(TranscriptionJob.status, func.count(TranscriptionJob.id))
+        .group_by(TranscriptionJob.status)
+        .all()
+    )
+    oldest_queued = db.query(func.min(TranscriptionJob.queued_at)).filter(
+        TranscriptionJob.status == JobStatus.QUEUED.value,
+    ).scalar()
+
+    wait = func.extract("epoch", TranscriptionJob.started_at - TranscriptionJob.queued_at)
+    run = func.extract("epoch", TranscriptionJob.finished_at - TranscriptionJob.started_at)
+    row = db.query(
+        func.count(TranscriptionJob.id),
+        func.avg(wait),
+        func.percentile_cont(0.95).within_group(wait),
+        func.avg(run),
+        func.percentile_cont(0.95).within_group(run),
+    ).filter(
+        and_(
+            TranscriptionJob.status == JobStatus.COMPLETED.value,
+            TranscriptionJob.finished_at >= now - LATENCY_WINDOW,
+        )
+    ).one()
+
+    def seconds(value) -> Optional[float]:
+        return round(float(value), 2) if value is not None else None
+
+    return {
+        "depth": counts.get(JobStatus.QUEUED.value, 0),
+        "running": counts.get(JobStatus.RUNNING.value, 0),
+        "completed": counts.get(JobStatus.COMPLETED.value, 0),
+        "failed": counts.get(JobStatus.FAILED.value, 0),
+        "oldest_queued_seconds": seconds((now - oldest_queued).total_seconds()) if oldest_queued else None,
+        "last_hour": {
+            "completed": row[0],
+            "wait_avg_seconds": seconds(row[1]),
+            "wait_p95_seconds": seconds(row[2]),
+            "run_avg_seconds": seconds(row[3]),
+            "run_p95_seconds": seconds(row[4]),
+        },
+    }
@@ -7,6 +7,9 @@ Automatically selects the best available hardware accelerator:
 3. CPU (faster-whisper) - Always available fallback
 
 This service acts as a facade over the specific hardware implementations.
+transcription_backend="onnx" (or whisper_onnx_provider="cpu") runs the ONNX
+pipeline (batched, KV-cached) whatever the device: on the NPU when it is the
+device in use, otherwise on the CPU execution provider.
 """
 
 import logging
@@ -28,6 +31,17 @@ class TranscriptionDevice(Enum):
     AUTO = "auto"    # Auto-detect best available
 
 
+def device_from_setting(value: Optional[str]) -> TranscriptionDevice:
+    """TranscriptionDevice for a whisper_device setting ('cuda' = GPU, unknown = auto)."""
+    value = (value or "auto").lower()
+    if value == "cuda":
+        return TranscriptionDevice.GPU
+    try:
+        return TranscriptionDevice(value)
+    except ValueError:
+        return TranscriptionDevice.AUTO
+
+
 @dataclass
 class WordTiming:
     """Word-level timing information."""
@@ -82,6 +96,7 @@ class TranscriptionService:
         self._active_device: Optional[TranscriptionDevice] = None
         self._npu_service = None
         self._cpu_service = None
+        self._onnx_active = False  # ONNX pipeline (NPU or CPU provider) in use
         self._is_initialized = False
 
     @property
@@ -89,11 +104,17 @@ class TranscriptionService:
         """Get the currently active transcription device."""
         return self._active_device
 
+    @property
+    def supports_batch(self) -> bool:
+        """Whether several recordings can share inference batches (ONNX backend)."""
+        return self._onnx_active
+
     @property
     def device_info(self) -> dict:
         """Get information about available devices."""
         return {
             "active": self._active_device.value if self._active_device else None,
+            "backend": "onnx" if self._onnx_active else ("faster-whisper" if self._is_initialized else None),
             "npu_available": self._check_npu_available(),
             "gpu_available": self._check_gpu_available(),
             "cpu_available": True,  # Always available
@@ -146,13 +167,16 @@ class TranscriptionService:
 
         logger.info(f"Initializing transcription service with device: {device_to_use.value}")
 
-        if device_to_use == TranscriptionDevice.NPU:
-            if self._initialize_npu():
-                self._active_device = TranscriptionDevice.NPU
+        if self._use_onnx(device_to_use):
+            if self._initialize_npu(device_to_use):
+                self._onnx_active = True
+                self._active_device = (
+                    TranscriptionDevice.NPU if self._npu_service.provider == "npu" else TranscriptionDevice.CPU
+                )
                 self._is_initialized = True
                 return self._active_device
             else:
-                logger.warning("NPU initialization failed, falling back to CPU")
+                logger.warning("ONNX initialization failed, falling back to faster-whisper on CPU")
                 device_to_use = TranscriptionDevice.CPU
 
         if device_to_use == TranscriptionDevice.GPU:
@@ -184,12 +208,23 @@ class TranscriptionService:
         logger.info("Using CPU for transcription (NPU/GPU not available)")
         return TranscriptionDevice.CPU
 
-    def _initialize_npu(self) -> bool:
-        """Initialize NPU transcription backend."""
+    def _use_onnx(self, device: TranscriptionDevice) -> bool:
+        """Whether the ONNX pipeline serves this device (per transcription_backend)."""
+        backend = settings.transcription_backend.lower()
+        if backend == "onnx":
+            return True
+        if backend == "faster-whisper":
+            return False
+        return device == TranscriptionDevice.NPU or settings.whisper_onnx_provider.lower() == "cpu"
+
+    def _initialize_npu(self, device: TranscriptionDevice = TranscriptionDevice.NPU) -> bool:
+        """Initialize the ONNX transcription backend (NPU or CPU provider)."""
         try:
             from .whisper_npu import get_npu_whisper_service
             self._npu_service = get_npu_whisper_service()
-            return self._npu_service.load_model()
+            # Anything but the NPU runs on the CPU execution provider
+            provider = None if device == TranscriptionDevice.NPU else "cpu"
+            return self._npu_service.load_model(provider=provider)
         except ImportError as e:
             logger.warning(f"NPU service not available: {e}")
             return False
@@ -225,16 +260,47 @@ class TranscriptionService:
         if not self._is_initialized:
             self.initialize()
 
-        if self._active_device == TranscriptionDevice.NPU:
+        if self._onnx_active:
             return self._transcribe_npu(audio_path, language)
         else:
             return self._transcribe_cpu(audio_path, language)
 
+    def transcribe_batch(
+        self,
+        audio_paths: List[str],
+        languages: List[Optional[str]],
+    ) -> List[TranscriptionResult]:
+        """
+        Transcribe several audio files.
+
+        The ONNX backend batches their chunks through the encoder and
+        decoder; other backends transcribe the files one after another.
+
+        Args:
+            audio_paths: Paths to the audio files
+            languages: Language code per file
+
+        Returns:
+            TranscriptionResult per file, in order
+        """
+        if not self._is_initialized:
+            self.initialize()
+
+        if self.supports_batch:
+            results = self._npu_service.transcribe_batch(audio_paths, languages)
+            return [self._convert_npu_result(result) for result in results]
+
+        return [
+            self.transcribe(audio_path, language)
+            for audio_path, language in zip(audio_paths, languages)
+        ]
+
     def _transcribe_npu(self, audio_path: str, language: Optional[str]) -> TranscriptionResult:
         """Transcribe using NPU."""
-        result = self._npu_service.transcribe(audio_path, language)
+        return self._convert_npu_result(self._npu_service.transcribe(audio_path, language))
 
-        # Convert NPU result to unified format
+    def _convert_npu_result(self, result) -> TranscriptionResult:
+        """Convert NPU result to unified format."""
         segments = []
         for seg in result.segments:
             words = [WordTiming(
@@ -261,7 +327,7 @@ class TranscriptionService:
             language=result.language,
             language_probability=result.language_probability,
             duration=result.duration,
-            device="npu",
+            device=result.device,
             model=self._npu_service.model_name
         )
 
@@ -322,7 +388,7 @@ class TranscriptionService:
             self.initialize()
 
         # NPU doesn't support streaming yet, use CPU
-        if self._active_device != TranscriptionDevice.CPU:
+        if self._onnx_active:
             logger.info("Streaming transcription using CPU (NPU doesn't support streaming)")
 
         if self._cpu_service is None:
@@ -370,6 +436,7 @@ class TranscriptionService:
             self._cpu_service = None
 
         self._active_device = None
+        self._onnx_active = False
         self._is_initialized = False
         logger.info("Transcription service unloaded")
 
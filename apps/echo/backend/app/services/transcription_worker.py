@@ -0,0 +1,386 @@
+"""
+Transcription worker pool.
+
+Long-lived worker processes consuming the durable job queue
+(services/transcription_queue.py):
+- each process loads the Whisper model once at startup and keeps it warm
+  for every job it runs (no per-request model load)
+- concurrency is bounded by the number of processes, sized to the CPU
+  cores (transcription_workers, default: cores / whisper_cpu_threads)
+- with the ONNX backend a worker claims up to transcription_batch_size
+  queued recordings at once and runs them through shared inference batches
+- a supervisor thread restarts dead workers, re-queues their job at once
+  and re-queues jobs whose lease expired (e.g. after a host crash)
+
+Runs inside the API process (transcription_workers_embedded) or standalone:
+    python -m app.services.transcription_worker
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models.job import TranscriptionJob, JobStatus
+from ..models.recording import Recording, RecordingStatus
+from ..models.transcription import TranscriptionStatus
+from . import transcription_queue as queue
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Seconds between supervisor passes (dead workers, expired leases)
+SUPERVISE_INTERVAL = 10.0
+
+# Seconds a worker gets to finish its current job on shutdown
+SHUTDOWN_TIMEOUT = 30.0
+
+# Fresh interpreters: forked children would share the parent's DB connections
+_mp = multiprocessing.get_context("spawn")
+
+
+def worker_id_for(pid: int) -> str:
+    """Lease owner id of a worker process."""
+    return f"{socket.gethostname()}:{pid}"
+
+
+def default_pool_size() -> int:
+    """Worker processes fitting the CPU cores (each runs whisper_cpu_threads)."""
+    if settings.transcription_workers > 0:
+        return settings.transcription_workers
+    return max(1, (os.cpu_count() or 1) // max(1, settings.whisper_cpu_threads))
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+
+class _Heartbeat:
+    """Renews the leases of the running jobs from a background thread."""
+
+    def __init__(self, job_ids: List, worker_id: str):
+        self.job_ids = job_ids
+        self.worker_id = worker_id
+        self.lost = set()  # Jobs whose lease was taken over (re-queued elsewhere)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self):
+        interval = settings.transcription_job_lease_seconds / 3
+        while not self._stop.wait(interval):
+            db = SessionLocal()
+            try:
+                for job_id in self.job_ids:
+                    if job_id not in self.lost and not queue.heartbeat(db, job_id, self.worker_id):
+                        self.lost.add(job_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for jobs {self.job_ids}: {e}")
+            finally:
+                db.close()
+
+
+def run_job(db, job: TranscriptionJob, service, worker_id: str):
+    """
+    Transcribe the audio of a claimed job and store the result.
+
+    Args:
+        db: Database session of the worker
+        job: Job claimed by this worker
+        service: Initialized TranscriptionService (warm model)
+        worker_id: Lease owner id
+    """
+    try:
+        _mark_processing(db, [job])
+
+        with _Heartbeat([job.id], worker_id) as lease:
+            whisper_lang = _whisper_language(job.language)
+            result = service.transcribe(job.audio_path, language=whisper_lang)
+
+        _store_result(db, job, result, lease)
+
+    except Exception as e:
+        logger.error(f"Transcription failed for {job.recording_id}: {e}")
+        db.rollback()
+        retry = queue.fail(db, job, worker_id, str(e))
+        db.commit()
+        if retry:
+            logger.info(f"Job {job.id} re-queued (attempt {job.attempts}/{job.max_attempts})")
+
+
+def run_batch(db, jobs: List[TranscriptionJob], service, worker_id: str):
+    """
+    Transcribe several claimed jobs in shared inference batches.
+
+    If the batch fails, each job is run on its own so one bad recording
+    does not fail the others.
+    """
+    try:
+        _mark_processing(db, jobs)
+
+        with _Heartbeat([job.id for job in jobs], worker_id) as lease:
+            results = service.transcribe_batch(
+                [job.audio_path for job in jobs],
+                [_whisper_language(job.language) for job in jobs],
+            )
+
+        for job, result in zip(jobs, results):
+            _store_result(db, job, result, lease)
+
+    except Exception as e:
+        logger.warning(f"Batch of {len(jobs)} transcriptions failed ({e}), running them one by one")
+        db.rollback()
+        for job in jobs:
+            # Skip jobs whose lease was taken over by another worker meanwhile
+            if job.status == JobStatus.RUNNING.value and job.worker_id == worker_id:
+                run_job(db, job, service, worker_id)
+
+
+def _whisper_language(language: str) -> Optional[str]:
+    return None if language in ("auto", "bilingual") else language
+
+
+def _mark_processing(db, jobs: List[TranscriptionJob]):
+    for job in jobs:
+        # Update status to processing
+        job.transcription.status = TranscriptionStatus.PROCESSING.value
+        job.transcription.started_at = datetime.utcnow()
+        logger.info(
+            f"Starting transcription for {job.recording_id} with language={job.language} "
+            f"(job {job.id}, attempt {job.attempts}/{job.max_attempts})"
+        )
+    db.commit()
+
+
+def _store_result(db, job: TranscriptionJob, result, lease: _Heartbeat):
+    # Checked again under a row lock: the lease may have been taken over
+    # since the last heartbeat
+    if job.id in lease.lost or not queue.complete(db, job, lease.worker_id):
+        db.rollback()
+        logger.warning(f"Lease of job {job.id} lost, discarding result")
+        return
+
+    # Update transcription with result
+    transcription = job.transcription
+    transcription.full_text = result.text
+    transcription.detected_language = result.language
+    transcription.model_used = result.model
+    transcription.processing_time_seconds = result.duration
+    transcription.word_count = len(result.text.split())
+    transcription.status = TranscriptionStatus.COMPLETED.value
+    transcription.error_message = None
+    transcription.completed_at = datetime.utcnow()
+
+    # Update recording status
+    db.query(Recording).filter(Recording.id == job.recording_id).update(
+        {Recording.status: RecordingStatus.TRANSCRIBED.value}, synchronize_session=False
+    )
+
+    db.commit()
+    logger.info(f"Transcription completed for {job.recording_id}: {len(result.text)} chars")
+
+
+def _worker_main(stop_event, log_level: str):
+    """Entry point of a worker process."""
+    logging.basicConfig(
+        level=getattr(logging, log_level),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    # Shutdown is driven by the pool (Ctrl+C reaches the whole process group)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from .transcription_service import TranscriptionService, device_from_setting
+
+    worker_id = worker_id_for(os.getpid())
+    service = TranscriptionService(preferred_device=device_from_setting(settings.whisper_device))
+    device = service.initialize()
+    logger.info(
+        f"Transcription worker {worker_id} ready on {device.value} "
+        f"({'onnx' if service.supports_batch else 'faster-whisper'})"
+    )
+
+    # Recordings claimed together when the backend batches inference
+    batch_size = max(1, settings.transcription_batch_size) if service.supports_batch else 1
+
+    while not stop_event.is_set():
+        db = SessionLocal()
+        try:
+            jobs = queue.claim_batch(db, worker_id, batch_size)
+            if not jobs:
+                stop_event.wait(settings.transcription_poll_interval)
+                continue
+            if len(jobs) == 1:
+                run_job(db, jobs[0], service, worker_id)
+            else:
+                run_batch(db, jobs, service, worker_id)
+        except Exception as e:
+            logger.error(f"Transcription worker {worker_id} error: {e}")
+            stop_event.wait(settings.transcription_poll_interval)
+        finally:
+            db.close()
+
+    service.unload()
+    logger.info(f"Transcription worker {worker_id} stopped")
+
+
+# =============================================================================
+# POOL
+# =============================================================================
+
+class TranscriptionWorkerPool:
+    """
+    Fixed-size pool of transcription worker processes.
+
+    Usage:
+        pool = get_worker_pool()
+        pool.start()
+        ...
+        pool.stop()
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or default_pool_size()
+        self._processes: List[multiprocessing.Process] = []
+        self._stop_event = _mp.Event()
+        self._supervisor: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._supervisor is not None
+
+    def start(self):
+        """Re-queue interrupted jobs and start the worker processes."""
+        if self.is_running:
+            return
+
+        self._recover()
+        self._stop_event.clear()
+        with self._lock:
+            self._processes = [self._spawn() for _ in range(self.size)]
+
+        self._supervisor = threading.Thread(target=self._supervise, name="transcription-supervisor", daemon=True)
+        self._supervisor.start()
+        logger.info(f"Started {self.size} transcription workers")
+
+    def stop(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """
+        Stop the workers; each finishes its current job within `timeout`,
+        jobs still running after that are re-queued.
+        """
+        if not self.is_running:
+            return
+
+        self._stop_event.set()
+        self._supervisor.join()
+        self._supervisor = None
+
+        with self._lock:
+            processes, self._processes = self._processes, []
+
+        for process in processes:
+            process.join(timeout)
+        stopped = []
+        for process in processes:
+            if process.is_alive():
+                logger.warning(f"Transcription worker {process.pid} did not stop, terminating")
+                process.terminate()
+                process.join()
+                stopped.append(worker_id_for(process.pid))
+
+        self._release(stopped)
+        logger.info("Transcription workers stopped")
+
+    def status(self) -> Dict[str, Any]:
+        """Pool size and live worker ids."""
+        with self._lock:
+            alive = [worker_id_for(p.pid) for p in self._processes if p.is_alive()]
+        return {"size": self.size, "alive": len(alive), "workers": alive}
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _spawn(self) -> multiprocessing.Process:
+        process = _mp.Process(
+            target=_worker_main,
+            args=(self._stop_event, settings.log_level),
+            name="transcription-worker",
+            # Not daemonic: workers start their own long-audio chunk pool
+            daemon=False,
+        )
+        process.start()
+        return process
+
+    def _supervise(self):
+        while not self._stop_event.wait(SUPERVISE_INTERVAL):
+            dead = []
+            with self._lock:
+                for i, process in enumerate(self._processes):
+                    if not process.is_alive():
+                        logger.error(f"Transcription worker {process.pid} died (exit code {process.exitcode}), restarting")
+                        dead.append(worker_id_for(process.pid))
+                        self._processes[i] = self._spawn()
+            self._release(dead)
+            self._recover()
+
+    def _recover(self):
+        db = SessionLocal()
+        try:
+            queue.requeue_expired(db)
+        except Exception as e:
+            logger.error(f"Re-queueing expired transcription jobs failed: {e}")
+        finally:
+            db.close()
+
+    def _release(self, worker_ids: List[str]):
+        if not worker_ids:
+            return
+        db = SessionLocal()
+        try:
+            queue.release_workers(db, worker_ids)
+        except Exception as e:
+            logger.error(f"Re-queueing jobs of stopped workers failed: {e}")
+        finally:
+            db.close()
+
+
+# Singleton instance
+_worker_pool: Optional[TranscriptionWorkerPool] = None
+
+
+def get_worker_pool() -> TranscriptionWorkerPool:
+    """Get the singleton transcription worker pool."""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = TranscriptionWorkerPool()
+    return _worker_pool
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    pool = get_worker_pool()
+    pool.start()
+
+    shutdown = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: shutdown.set())
+    signal.signal(signal.SIGINT, lambda *_: shutdown.set())
+    shutdown.wait()
+    pool.stop()
@@ -15,7 +15,8 @@ from pathlib import Path
 import os
 
 from ..config import get_settings
-from .audio_preprocessor import AudioPreprocessor
+from .audio_preprocessor import preprocess_audio_for_transcription
+from .chunked_transcription import ChunkedTranscriber, SAMPLE_RATE, default_chunk_workers
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -57,6 +58,18 @@ the action items.""",
 }
 
 
+# VAD parameters optimized for Quebec French conversational speech
+VAD_PARAMETERS = dict(
+    min_silence_duration_ms=400,   # Reduced: allow shorter pauses in speech
+    speech_pad_ms=500,             # Increased: more context at boundaries
+    threshold=0.35,                # Lower: more sensitive to soft speech
+    min_speech_duration_ms=100,    # Capture short utterances like "tsé", "ben"
+)
+
+# Audio used to detect the language of a long recording before it is split
+LANGUAGE_DETECTION_SECONDS = 30
+
+
 @dataclass
 class WordTiming:
     """Word-level timing information."""
@@ -105,6 +118,8 @@ class LocalWhisperService:
         self.device = settings.whisper_device
         self.compute_type = settings.whisper_compute_type
         self._is_loaded = False
+        self.model_dir: Optional[str] = None
+        self._chunked: Optional[ChunkedTranscriber] = None  # Long-audio workers (lazy)
 
     @property
     def is_available(self) -> bool:
@@ -150,14 +165,21 @@ class LocalWhisperService:
             # Model download directory
             model_dir = Path(settings.audio_storage_path) / "models"
             model_dir.mkdir(parents=True, exist_ok=True)
+            self.model_dir = str(model_dir)
 
             self.model = WhisperModel(
                 self.model_size,
                 device=self.device,
                 compute_type=self.compute_type,
                 download_root=str(model_dir),
+                cpu_threads=settings.whisper_cpu_threads,
             )
 
+            # Chunk workers hold the previous model
+            if self._chunked is not None:
+                self._chunked.shutdown()
+                self._chunked = None
+
             self._is_loaded = True
             logger.info(f"Whisper model loaded successfully on {self.device}")
             return True
@@ -199,51 +221,50 @@ class LocalWhisperService:
         if initial_prompt:
             logger.debug(f"Using initial prompt for language: {language}")
 
-        # Preprocess audio with padding to prevent word cutoff
-        with AudioPreprocessor(audio_path) as processed_path:
-            # Transcribe with faster-whisper
-            # VAD parameters optimized for Quebec French conversational speech
-            segments, info = self.model.transcribe(
-                processed_path,
-                language=language if language not in ("auto", "bilingual", None) else None,
-                task=task,
-                beam_size=5,
-                initial_prompt=initial_prompt,
-                vad_filter=True,
-                vad_parameters=dict(
-                    min_silence_duration_ms=400,   # Reduced: allow shorter pauses in speech
-                    speech_pad_ms=500,             # Increased: more context at boundaries
-                    threshold=0.35,                # Lower: more sensitive to soft speech
-                    min_speech_duration_ms=100,    # Capture short utterances like "tsé", "ben"
-                ),
-                word_timestamps=True,
-            )
+        # Decode once with padding to prevent word cutoff (in memory, shared
+        # by the single-pass and chunked paths)
+        audio = preprocess_audio_for_transcription(audio_path, target_sr=SAMPLE_RATE)
+
+        options = dict(
+            language=language if language not in ("auto", "bilingual", None) else None,
+            task=task,
+            beam_size=5,
+            initial_prompt=initial_prompt,
+            vad_filter=True,
+            vad_parameters=VAD_PARAMETERS,
+            word_timestamps=True,
+        )
+
+        if self._use_chunks(audio):
+            return self._transcribe_chunked(audio, options)
+
+        # Transcribe with faster-whisper
+        segments, info = self.model.transcribe(audio, **options)
+
+        all_segments = []
+        full_text_parts = []
+
+        for segment in segments:
+            words = []
+            if segment.words:
+                for w in segment.words:
+                    words.append(WordTiming(
+                        word=w.word,
+                        start=w.start,
+                        end=w.end,
+                        probability=w.probability,
+                    ))
 
-            # Collect results (must be done inside context manager as segments is a generator)
-            all_segments = []
-            full_text_parts = []
-
-            for segment in segments:
-                words = []
-                if segment.words:
-                    for w in segment.words:
-                        words.append(WordTiming(
-                            word=w.word,
-                            start=w.start,
-                            end=w.end,
-                            probability=w.probability,
-                        ))
-
-                ts = TranscriptionSegment(
-                    start=segment.start,
-                    end=segment.end,
-                    text=segment.text.strip(),
-                    words=words,
-                    avg_logprob=segment.avg_logprob,
-                    no_speech_prob=segment.no_speech_prob,
-                )
-                all_segments.append(ts)
-                full_text_parts.append(segment.text.strip())
+            ts = TranscriptionSegment(
+                start=segment.start,
+                end=segment.end,
+                text=segment.text.strip(),
+                words=words,
+                avg_logprob=segment.avg_logprob,
+                no_speech_prob=segment.no_speech_prob,
+            )
+            all_segments.append(ts)
+            full_text_parts.append(segment.text.strip())
 
         result = TranscriptionResult(
             text=" ".join(full_text_parts),
@@ -260,6 +281,55 @@ class LocalWhisperService:
 
         return result
 
+    def _use_chunks(self, audio) -> bool:
+        """Long recordings are split across chunk workers (long-audio mode)."""
+        min_seconds = settings.long_audio_min_seconds
+        if min_seconds <= 0 or len(audio) / SAMPLE_RATE < min_seconds:
+            return False
+        # A single chunk worker would only add a model copy
+        if default_chunk_workers() < 2:
+            logger.info(
+                f"Long recording ({len(audio) / SAMPLE_RATE:.0f}s) transcribed in one pass: "
+                "fewer than 2 chunk workers (set LONG_AUDIO_WORKERS)"
+            )
+            return False
+        return True
+
+    def _transcribe_chunked(self, audio, options: dict) -> TranscriptionResult:
+        """
+        Transcribe a long recording in parallel chunks (chunked_transcription.py).
+
+        The language is detected once on the start of the recording, so every
+        chunk is decoded with the same language.
+        """
+        language_probability = 1.0
+        if options["language"] is None:
+            # Detection runs eagerly in transcribe(); the segments are not consumed
+            _, info = self.model.transcribe(
+                audio[:LANGUAGE_DETECTION_SECONDS * SAMPLE_RATE], beam_size=1
+            )
+            options = dict(options, language=info.language)
+            language_probability = info.language_probability
+
+        if self._chunked is None:
+            self._chunked = ChunkedTranscriber(
+                self.model_size, self.device, self.compute_type, self.model_dir
+            )
+        segments = self._chunked.transcribe(audio, options)
+
+        logger.info(
+            f"Transcription complete: {len(segments)} segments, "
+            f"language={options['language']} ({language_probability:.2%})"
+        )
+
+        return TranscriptionResult(
+            text=" ".join(seg.text for seg in segments if seg.text),
+            segments=segments,
+            language=options["language"],
+            language_probability=language_probability,
+            duration=len(audio) / SAMPLE_RATE,
+        )
+
     def transcribe_streaming(
         self,
         audio_path: str,
@@ -336,6 +406,10 @@ class LocalWhisperService:
 
     def unload_model(self):
         """Unload the model to free memory."""
+        if self._chunked is not None:
+            self._chunked.shutdown()
+            self._chunked = None
+
         if self.model is not None:
             del self.model
             self.model = None
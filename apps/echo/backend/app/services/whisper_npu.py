@@ -7,6 +7,15 @@ separate encoder/decoder ONNX models optimized for the XDNA NPU.
 Architecture:
     Audio → Feature Extraction → Encoder (NPU) → Decoder (NPU) → Text
 
+The same ONNX pipeline runs on the CPU execution provider
+(whisper_onnx_provider="cpu", or transcription_backend="onnx" on a host
+without NPU / with whisper_device="cpu") with optimum-exported models
+(encoder / decoder / decoder_with_past graphs), decoded incrementally with
+a key/value cache. The 30 s chunks of one or several recordings are
+batched through log-mel extraction, the encoder and greedy decoding.
+Benchmark on any machine:
+    python -m app.services.whisper_npu recording.wav [other.wav ...]
+
 Requirements:
 - AMD Ryzen AI SDK 1.6.1+
 - NPU Driver MCDM v32.0.203.280+
@@ -36,6 +45,16 @@ logger = logging.getLogger(__name__)
 SAMPLE_RATE = 16000
 MAX_DECODE_LENGTH = 448  # Fixed decoder sequence length
 
+# Whisper log-mel parameters (30 s windows)
+N_FFT = 400
+HOP_LENGTH = 160
+CHUNK_SAMPLES = SAMPLE_RATE * 30
+
+# ONNX files of an optimum export (openai/whisper-* → onnx)
+ONNX_ENCODER_FILE = "encoder_model.onnx"
+ONNX_DECODER_FILE = "decoder_model.onnx"
+ONNX_DECODER_WITH_PAST_FILE = "decoder_with_past_model.onnx"
+
 
 @dataclass
 class NPUWordTiming:
@@ -70,11 +89,171 @@ class NPUTranscriptionResult:
     rtf: float = 0.0  # Real-time factor
 
 
+def log_mel_spectrogram(chunks: List["np.ndarray"], mel_filters: "np.ndarray") -> "np.ndarray":
+    """
+    Whisper log-mel features of many chunks at once.
+
+    Same computation as WhisperFeatureExtractor (zero-padded 30 s windows,
+    centered periodic-Hann STFT, log10 mel, 8 dB dynamic range), vectorised
+    over the batch instead of one chunk per call.
+
+    Args:
+        chunks: Mono float32 chunks at 16 kHz (at most 30 s each)
+        mel_filters: Mel filter bank, (n_fft // 2 + 1, n_mels)
+
+    Returns:
+        Features of shape (batch, n_mels, 3000)
+    """
+    import numpy as np
+
+    batch = np.zeros((len(chunks), CHUNK_SAMPLES), dtype=np.float32)
+    for row, chunk in enumerate(chunks):
+        batch[row, :len(chunk)] = chunk[:CHUNK_SAMPLES]
+
+    padded = np.pad(batch, ((0, 0), (N_FFT // 2, N_FFT // 2)), mode="reflect")
+    frames = np.lib.stride_tricks.sliding_window_view(padded, N_FFT, axis=1)[:, ::HOP_LENGTH]
+    window = np.hanning(N_FFT + 1)[:-1].astype(np.float32)
+    power = np.abs(np.fft.rfft(frames * window, axis=-1)) ** 2
+
+    log_spec = np.log10(np.maximum(power @ mel_filters, 1e-10)).transpose(0, 2, 1)[:, :, :-1]
+    log_spec = np.maximum(log_spec, log_spec.max(axis=(1, 2), keepdims=True) - 8.0)
+    return ((log_spec + 4.0) / 4.0).astype(np.float32)
+
+
+class KVCacheDecoder:
+    """
+    Batched greedy Whisper decoding with past key/values.
+
+    Uses the two decoder graphs of an optimum export:
+    - decoder: the prompt against the encoder output, returns the self- and
+      cross-attention key/values
+    - decoder_with_past: one new token per step against the cached
+      key/values, so each step costs O(1) tokens instead of re-running the
+      whole sequence
+
+    Key/values stay in ONNX Runtime memory between steps (IO binding, no
+    numpy round trip); the token input and the logits output reuse numpy
+    buffers allocated once.
+    """
+
+    def __init__(self, decoder, decoder_with_past, eos_token: int, max_length: int):
+        import numpy as np
+
+        self.decoder = decoder
+        self.decoder_with_past = decoder_with_past
+        self.eos_token = eos_token
+        self.max_length = max_length
+
+        self._past_inputs = [
+            i.name for i in decoder_with_past.get_inputs() if i.name.startswith("past_key_values")
+        ]
+        self._step_outputs = [o.name for o in decoder_with_past.get_outputs()]
+        self._step_needs_encoder = any(
+            i.name == "encoder_hidden_states" for i in decoder_with_past.get_inputs()
+        )
+
+        # Buffers reused by every step (reallocated when the batch size changes)
+        vocab_size = decoder_with_past.get_outputs()[0].shape[-1]
+        self._vocab_size = vocab_size if isinstance(vocab_size, int) else None
+        self._input_ids = np.zeros((1, 1), dtype=np.int64)
+        self._logits = self._new_logits(1)
+
+    def decode(self, encoder_out: "np.ndarray", prompt: List[int]) -> Tuple[List[List[int]], Optional[float]]:
+        """
+        Batched greedy decode from a prompt (start-of-transcript sequence).
+
+        Args:
+            encoder_out: Encoder output of a batch of chunks
+            prompt: Prompt tokens shared by every row
+
+        Returns:
+            Tuple of (token_ids per row, time_to_first_token)
+        """
+        import numpy as np
+
+        decode_start = time.time()
+        batch_size = encoder_out.shape[0]
+        tokens = [list(prompt) for _ in range(batch_size)]
+
+        # Prompt pass: fills the cache (cross-attention key/values are final)
+        binding = self.decoder.io_binding()
+        binding.bind_cpu_input("input_ids", np.tile(np.array(prompt, dtype=np.int64), (batch_size, 1)))
+        binding.bind_cpu_input("encoder_hidden_states", encoder_out)
+        output_names = [o.name for o in self.decoder.get_outputs()]
+        for name in output_names:
+            binding.bind_output(name, "cpu")
+        self.decoder.run_with_iobinding(binding)
+        outputs = dict(zip(output_names, binding.get_outputs()))
+
+        logits = outputs["logits"].numpy()
+        next_tokens = np.argmax(logits[:, -1], axis=-1)
+        first_token_time = time.time() - decode_start
+        past = {_past_name(name): value for name, value in outputs.items() if name != "logits"}
+
+        if self._input_ids.shape[0] != batch_size:
+            self._input_ids = np.zeros((batch_size, 1), dtype=np.int64)
+            self._logits = self._new_logits(batch_size)
+
+        step = self.decoder_with_past.io_binding()
+        if self._step_needs_encoder:
+            step.bind_cpu_input("encoder_hidden_states", encoder_out)
+        if self._logits is not None:
+            step.bind_output(
+                "logits", "cpu", 0, np.float32, self._logits.shape, self._logits.ctypes.data
+            )
+
+        finished = np.zeros(batch_size, dtype=bool)
+        length = len(prompt)
+        while length < self.max_length:
+            finished |= next_tokens == self.eos_token
+            if finished.all():
+                break
+            for row in np.flatnonzero(~finished):
+                tokens[row].append(int(next_tokens[row]))
+            length += 1
+
+            # Finished rows keep decoding EOS (their output is ignored)
+            self._input_ids[:, 0] = np.where(finished, self.eos_token, next_tokens)
+            step.bind_cpu_input("input_ids", self._input_ids)
+            for name in self._past_inputs:
+                step.bind_ortvalue_input(name, past[name])
+            for name in self._step_outputs:
+                if name != "logits" or self._logits is None:
+                    step.bind_output(name, "cpu")
+
+            self.decoder_with_past.run_with_iobinding(step)
+
+            # Only the self-attention cache grows; cross-attention is reused
+            for name, value in zip(self._step_outputs, step.get_outputs()):
+                if name == "logits":
+                    logits = self._logits if self._logits is not None else value.numpy()
+                else:
+                    past[_past_name(name)] = value
+            next_tokens = np.argmax(logits[:, -1], axis=-1)
+
+        return tokens, first_token_time
+
+    def _new_logits(self, batch_size: int) -> Optional["np.ndarray"]:
+        import numpy as np
+
+        if self._vocab_size is None:
+            return None  # Dynamic vocab axis: let ONNX Runtime allocate
+        return np.empty((batch_size, 1, self._vocab_size), dtype=np.float32)
+
+
+def _past_name(present_name: str) -> str:
+    """Cache input fed by a present output ("present.0.decoder.key" → "past_key_values.0.decoder.key")."""
+    return present_name.replace("present", "past_key_values", 1)
+
+
 class WhisperONNXModel:
     """
     Whisper ONNX model with separate encoder and decoder.
 
-    Based on AMD's reference implementation for Ryzen AI NPU.
+    Based on AMD's reference implementation for Ryzen AI NPU. With a
+    decoder_with_past graph (optimum export) decoding uses the key/value
+    cache (KVCacheDecoder); fixed-shape NPU decoders are re-run over the
+    padded sequence for every token.
     """
 
     def __init__(
@@ -83,16 +262,22 @@ class WhisperONNXModel:
         decoder_path: str,
         model_type: str,
         encoder_providers: Optional[list] = None,
-        decoder_providers: Optional[list] = None
+        decoder_providers: Optional[list] = None,
+        decoder_with_past_path: Optional[str] = None,
+        session_options=None,
     ):
+        import numpy as np
         import onnxruntime as ort
         from transformers import WhisperFeatureExtractor, WhisperTokenizer
 
         logger.info(f"Loading Whisper ONNX encoder: {encoder_path}")
-        self.encoder = ort.InferenceSession(encoder_path, providers=encoder_providers)
+        self.encoder = ort.InferenceSession(encoder_path, sess_options=session_options, providers=encoder_providers)
+        self.encoder_input = self.encoder.get_inputs()[0].name  # "x" (AMD) or "input_features" (optimum)
+        encoder_batch = self.encoder.get_inputs()[0].shape[0]
+        self.encoder_batch = encoder_batch if isinstance(encoder_batch, int) else None  # None = any
 
         logger.info(f"Loading Whisper ONNX decoder: {decoder_path}")
-        self.decoder = ort.InferenceSession(decoder_path, providers=decoder_providers)
+        self.decoder = ort.InferenceSession(decoder_path, sess_options=session_options, providers=decoder_providers)
 
         # Load tokenizer and feature extractor
         self.feature_extractor = WhisperFeatureExtractor.from_pretrained(f"openai/{model_type}")
@@ -106,36 +291,65 @@ class WhisperONNXModel:
         decoder_input_shape = self.decoder.get_inputs()[0].shape[1]
         self.max_length = min(MAX_DECODE_LENGTH, decoder_input_shape) if isinstance(decoder_input_shape, int) else MAX_DECODE_LENGTH
 
-        logger.info(f"Whisper ONNX model loaded: max_length={self.max_length}")
+        self.cached_decoder: Optional[KVCacheDecoder] = None
+        if decoder_with_past_path:
+            logger.info(f"Loading Whisper ONNX decoder with past: {decoder_with_past_path}")
+            decoder_with_past = ort.InferenceSession(
+                decoder_with_past_path, sess_options=session_options, providers=decoder_providers
+            )
+            self.cached_decoder = KVCacheDecoder(self.decoder, decoder_with_past, self.eos_token, self.max_length)
+        else:
+            # Fixed-shape decoder input, allocated once and refilled per decode
+            self._decoder_input = np.full((1, self.max_length), self.eos_token, dtype=np.int64)
+
+        logger.info(
+            f"Whisper ONNX model loaded: max_length={self.max_length}, "
+            f"kv_cache={self.cached_decoder is not None}"
+        )
 
-    def preprocess(self, audio) -> "np.ndarray":
-        """Convert raw audio to Whisper log-mel spectrogram."""
-        import numpy as np
-        inputs = self.feature_extractor(audio, sampling_rate=SAMPLE_RATE, return_tensors="np")
-        return inputs["input_features"].astype(np.float32)
+    def preprocess(self, chunks: List["np.ndarray"]) -> "np.ndarray":
+        """Convert a batch of raw audio chunks to Whisper log-mel spectrograms."""
+        return log_mel_spectrogram(chunks, self.feature_extractor.mel_filters)
 
     def encode(self, input_features: "np.ndarray") -> "np.ndarray":
-        """Run encoder ONNX model."""
-        return self.encoder.run(None, {"x": input_features})[0]
+        """Run encoder ONNX model (row by row if the graph has a fixed batch size)."""
+        import numpy as np
 
-    def decode(self, encoder_out: "np.ndarray") -> Tuple[List[int], Optional[float]]:
+        if self.encoder_batch is None or self.encoder_batch == len(input_features):
+            return self.encoder.run(None, {self.encoder_input: input_features})[0]
+        return np.concatenate([
+            self.encoder.run(None, {self.encoder_input: input_features[row:row + 1]})[0]
+            for row in range(len(input_features))
+        ])
+
+    def decode(self, encoder_out: "np.ndarray") -> Tuple[List[List[int]], Optional[float]]:
         """
-        Greedy decode with fixed-length input_ids.
+        Greedy decode of a batch (incremental with the key/value cache when
+        available, otherwise row by row with fixed-length input_ids).
 
         Returns:
-            Tuple of (token_ids, time_to_first_token)
+            Tuple of (token_ids per row, time_to_first_token)
         """
+        if self.cached_decoder is not None:
+            return self.cached_decoder.decode(encoder_out, [self.sot_token])
+
+        rows = [self._decode_fixed(encoder_out[row:row + 1]) for row in range(len(encoder_out))]
+        return [tokens for tokens, _ in rows], rows[0][1] if rows else None
+
+    def _decode_fixed(self, encoder_out: "np.ndarray") -> Tuple[List[int], Optional[float]]:
+        """Greedy decode of one row with the fixed-shape (NPU) decoder."""
         import numpy as np
 
         tokens = [self.sot_token]
         first_token_time = None
         decode_start = time.time()
 
-        for _ in range(self.max_length):
-            # Pad to fixed length
-            decoder_input = np.full((1, self.max_length), self.eos_token, dtype=np.int64)
-            decoder_input[0, :len(tokens)] = tokens
+        # Padded with EOS; each step writes one more token
+        decoder_input = self._decoder_input
+        decoder_input.fill(self.eos_token)
+        decoder_input[0, 0] = self.sot_token
 
+        for _ in range(self.max_length):
             # Run decoder
             outputs = self.decoder.run(None, {
                 "x": decoder_input,
@@ -149,9 +363,10 @@ class WhisperONNXModel:
             if first_token_time is None:
                 first_token_time = time.time() - decode_start
 
-            if next_token == self.eos_token:
+            if next_token == self.eos_token or len(tokens) == self.max_length:
                 break
 
+            decoder_input[0, len(tokens)] = next_token
             tokens.append(next_token)
 
         return tokens, first_token_time
@@ -167,33 +382,60 @@ class WhisperONNXModel:
         Returns:
             Tuple of (transcription_text, real_time_factor)
         """
-        import numpy as np
+        return self.transcribe_batch([audio], chunk_length_s)[0]
+
+    def transcribe_batch(
+        self,
+        audios: List["np.ndarray"],
+        chunk_length_s: int = 30,
+        batch_size: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Transcribe several recordings, batching their chunks together.
+
+        The 30 s chunks of all recordings are pooled; each batch gets one
+        log-mel computation, one encoder run and one batched decode.
+
+        Args:
+            audios: Audio samples per recording (16kHz mono float32)
+            chunk_length_s: Chunk length in seconds for long audio
+            batch_size: Chunks per batch (default: settings.whisper_onnx_batch_size)
 
+        Returns:
+            (transcription_text, real_time_factor) per recording; the RTF is
+            the one of the whole batch
+        """
+        batch_size = batch_size or settings.whisper_onnx_batch_size
         chunk_size = SAMPLE_RATE * chunk_length_s
-        total_samples = len(audio)
-        transcription_parts = []
+        overlap = SAMPLE_RATE * 1  # 1 second overlap between chunks
 
+        # (recording index, samples) of every chunk, in order
+        chunks = []
+        for index, audio in enumerate(audios):
+            for start in range(0, len(audio), chunk_size - overlap):
+                chunks.append((index, audio[start:start + chunk_size]))
+
+        transcription_parts: List[List[str]] = [[] for _ in audios]
         total_start = time.time()
-        overlap = SAMPLE_RATE * 1  # 1 second overlap between chunks
 
-        for start in range(0, total_samples, chunk_size - overlap):
-            end = min(start + chunk_size, total_samples)
-            audio_chunk = audio[start:end]
+        for first in range(0, len(chunks), batch_size):
+            batch = chunks[first:first + batch_size]
 
             # Encode
-            input_features = self.preprocess(audio_chunk)
+            input_features = self.preprocess([samples for _, samples in batch])
             encoder_out = self.encode(input_features)
 
             # Decode
-            tokens, _ = self.decode(encoder_out)
-            text = self.tokenizer.decode(tokens, skip_special_tokens=True).strip()
-            transcription_parts.append(text)
+            token_rows, _ = self.decode(encoder_out)
+            for (index, _), tokens in zip(batch, token_rows):
+                text = self.tokenizer.decode(tokens, skip_special_tokens=True).strip()
+                transcription_parts[index].append(text)
 
         total_time = time.time() - total_start
-        audio_duration = total_samples / SAMPLE_RATE
+        audio_duration = sum(len(audio) for audio in audios) / SAMPLE_RATE
         rtf = total_time / audio_duration if audio_duration > 0 else 0
 
-        return " ".join(transcription_parts), rtf
+        return [(" ".join(parts), rtf) for parts in transcription_parts]
 
 
 class NPUWhisperService:
@@ -218,6 +460,13 @@ class NPUWhisperService:
         "large-v3-turbo": "amd/whisper-large-turbo-onnx-npu",
     }
 
+    # optimum exports with decoder_with_past graphs (CPU execution provider)
+    HF_CPU_MODEL_MAP = {
+        "small": "onnx-community/whisper-small",
+        "medium": "onnx-community/whisper-medium",
+        "large-v3-turbo": "onnx-community/whisper-large-v3-turbo",
+    }
+
     # OpenAI model names for tokenizer
     OPENAI_MODEL_MAP = {
         "small": "whisper-small",
@@ -231,6 +480,7 @@ class NPUWhisperService:
         self._is_loaded = False
         self._npu_available = None
         self._model_dir: Optional[Path] = None
+        self.provider: Optional[str] = None  # "npu" or "cpu" once loaded
 
     @staticmethod
     def is_npu_available() -> bool:
@@ -376,6 +626,64 @@ class NPUWhisperService:
         logger.info(f"Model downloaded: encoder={encoder_path}, decoder={decoder_path}")
         return encoder_path, decoder_path
 
+    def _download_cpu_model(self) -> Tuple[Path, Path, Path]:
+        """
+        Locate or download an optimum Whisper export for the CPU provider.
+
+        Uses whisper_onnx_model_dir if set (e.g. the output of
+        `optimum-cli export onnx --model openai/whisper-small <dir>`),
+        otherwise downloads from HuggingFace.
+
+        Returns:
+            Tuple of (encoder_path, decoder_path, decoder_with_past_path)
+        """
+        files = [ONNX_ENCODER_FILE, ONNX_DECODER_FILE, ONNX_DECODER_WITH_PAST_FILE]
+
+        if settings.whisper_onnx_model_dir:
+            local_path = Path(settings.whisper_onnx_model_dir)
+        else:
+            from huggingface_hub import snapshot_download
+
+            model_key = self.model_name.lower()
+            if model_key not in self.HF_CPU_MODEL_MAP:
+                logger.warning(f"Unknown model '{model_key}', defaulting to 'medium'")
+                model_key = "medium"
+
+            repo_id = self.HF_CPU_MODEL_MAP[model_key]
+            logger.info(f"Downloading Whisper ONNX model from {repo_id}...")
+            local_path = Path(snapshot_download(
+                repo_id=repo_id,
+                cache_dir=str(self._get_model_dir() / ".cache"),
+                allow_patterns=[f"onnx/{name}*" for name in files] + ["*.json"],
+            ))
+
+        # Exports keep the graphs at the root or under onnx/
+        if (local_path / "onnx" / ONNX_ENCODER_FILE).exists():
+            local_path = local_path / "onnx"
+
+        paths = tuple(local_path / name for name in files)
+        for path in paths:
+            if not path.exists():
+                raise FileNotFoundError(f"ONNX model file not found at {path}")
+
+        logger.info(f"Model ready: {local_path}")
+        return paths
+
+    def _resolve_provider(self, requested: Optional[str] = None) -> Optional[str]:
+        """
+        Execution provider to load.
+
+        Args:
+            requested: "npu", "cpu" or "auto"; None = whisper_onnx_provider
+                ("auto" = NPU if available, else CPU)
+        """
+        provider = (requested or settings.whisper_onnx_provider).lower()
+        if provider == "cpu":
+            return "cpu"
+        if self.is_npu_available():
+            return "npu"
+        return "cpu" if provider == "auto" else None
+
     def _build_provider_options(self, config_path: Path, cache_key: str) -> list:
         """
         Build ONNX Runtime provider options for VitisAI EP.
@@ -402,12 +710,13 @@ class NPUWhisperService:
             "CPUExecutionProvider"  # Fallback
         ]
 
-    def load_model(self, force_reload: bool = False) -> bool:
+    def load_model(self, force_reload: bool = False, provider: Optional[str] = None) -> bool:
         """
-        Load the Whisper model for NPU inference.
+        Load the Whisper ONNX model (NPU, or CPU per whisper_onnx_provider).
 
         Args:
             force_reload: Force reload even if already loaded
+            provider: Execution provider overriding whisper_onnx_provider
 
         Returns:
             True if model loaded successfully
@@ -416,44 +725,24 @@ class NPUWhisperService:
             return True
 
         try:
-            # Check NPU availability
-            if not self.is_npu_available():
+            provider = self._resolve_provider(provider)
+            if provider is None:
                 logger.warning("NPU not available, cannot load NPU model")
                 return False
 
-            # Download model if needed
-            encoder_path, decoder_path = self._download_model()
-
-            # Ensure VitisAI configs exist
-            encoder_config, decoder_config = self._ensure_vitisai_configs()
-
-            # Build provider options
             model_key = self.model_name.lower()
-            encoder_providers = self._build_provider_options(
-                encoder_config,
-                f"whisper_{model_key}_encoder"
-            )
-            decoder_providers = self._build_provider_options(
-                decoder_config,
-                f"whisper_{model_key}_decoder"
-            )
 
             # Get OpenAI model name for tokenizer
             openai_model = self.OPENAI_MODEL_MAP.get(model_key, "whisper-medium")
 
-            logger.info(f"Loading Whisper ONNX model with VitisAI EP...")
-            logger.info("Note: First load may take several minutes for NPU compilation")
-
-            self.model = WhisperONNXModel(
-                encoder_path=str(encoder_path),
-                decoder_path=str(decoder_path),
-                model_type=openai_model,
-                encoder_providers=encoder_providers,
-                decoder_providers=decoder_providers
-            )
+            if provider == "cpu":
+                self.model = self._load_cpu_model(openai_model)
+            else:
+                self.model = self._load_npu_model(model_key, openai_model)
 
+            self.provider = provider
             self._is_loaded = True
-            logger.info(f"Whisper NPU model '{self.model_name}' loaded successfully")
+            logger.info(f"Whisper ONNX model '{self.model_name}' loaded successfully on {provider}")
             return True
 
         except ImportError as e:
@@ -466,6 +755,55 @@ class NPUWhisperService:
             self._is_loaded = False
             return False
 
+    def _load_npu_model(self, model_key: str, openai_model: str) -> WhisperONNXModel:
+        """Fixed-shape AMD models on the VitisAI EP."""
+        # Download model if needed
+        encoder_path, decoder_path = self._download_model()
+
+        # Ensure VitisAI configs exist
+        encoder_config, decoder_config = self._ensure_vitisai_configs()
+
+        # Build provider options
+        encoder_providers = self._build_provider_options(
+            encoder_config,
+            f"whisper_{model_key}_encoder"
+        )
+        decoder_providers = self._build_provider_options(
+            decoder_config,
+            f"whisper_{model_key}_decoder"
+        )
+
+        logger.info(f"Loading Whisper ONNX model with VitisAI EP...")
+        logger.info("Note: First load may take several minutes for NPU compilation")
+
+        return WhisperONNXModel(
+            encoder_path=str(encoder_path),
+            decoder_path=str(decoder_path),
+            model_type=openai_model,
+            encoder_providers=encoder_providers,
+            decoder_providers=decoder_providers
+        )
+
+    def _load_cpu_model(self, openai_model: str) -> WhisperONNXModel:
+        """optimum exports on the CPU EP, decoded with the key/value cache."""
+        import onnxruntime as ort
+
+        encoder_path, decoder_path, decoder_with_past_path = self._download_cpu_model()
+
+        session_options = ort.SessionOptions()
+        session_options.intra_op_num_threads = settings.whisper_cpu_threads
+
+        logger.info("Loading Whisper ONNX model with CPU EP...")
+        return WhisperONNXModel(
+            encoder_path=str(encoder_path),
+            decoder_path=str(decoder_path),
+            model_type=openai_model,
+            encoder_providers=["CPUExecutionProvider"],
+            decoder_providers=["CPUExecutionProvider"],
+            decoder_with_past_path=str(decoder_with_past_path),
+            session_options=session_options,
+        )
+
     def transcribe(
         self,
         audio_path: str,
@@ -481,74 +819,106 @@ class NPUWhisperService:
         Returns:
             NPUTranscriptionResult with full text and segments
         """
+        return self.transcribe_batch([audio_path], [language])[0]
+
+    def transcribe_batch(
+        self,
+        audio_paths: List[str],
+        languages: List[Optional[str]],
+    ) -> List[NPUTranscriptionResult]:
+        """
+        Transcribe several audio files in shared encoder/decoder batches.
+
+        Args:
+            audio_paths: Paths to the audio files
+            languages: Language code per file (None for auto-detect)
+
+        Returns:
+            NPUTranscriptionResult per file, in order
+        """
         if not self._is_loaded:
             if not self.load_model():
                 raise RuntimeError("Failed to load Whisper NPU model")
 
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        for audio_path in audio_paths:
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        logger.info(f"Transcribing with NPU: {audio_path}")
+        logger.info(f"Transcribing with NPU: {', '.join(audio_paths)}")
 
         try:
-            import librosa
-            import numpy as np
+            from .audio_preprocessor import load_audio
 
             # Load and preprocess audio
             start_time = time.time()
-            audio, sr = librosa.load(audio_path, sr=SAMPLE_RATE)
-            duration = len(audio) / sr
-
-            logger.debug(f"Audio loaded: {duration:.2f}s, {len(audio)} samples")
+            audios = []
+            for audio_path in audio_paths:
+                audio = load_audio(audio_path, SAMPLE_RATE)
+                audios.append(audio)
+                logger.debug(f"Audio loaded: {len(audio) / SAMPLE_RATE:.2f}s, {len(audio)} samples")
 
             # Run transcription
-            transcription, rtf = self.model.transcribe(audio)
+            transcriptions = self.model.transcribe_batch(audios)
 
             elapsed = time.time() - start_time
 
-            # Detect language with code-switching support
-            if language and language not in ("auto", "bilingual", None):
-                detected_language = language
-                language_confidence = 1.0
-                is_code_switched = False
-            else:
-                detected_language, language_confidence, is_code_switched = \
-                    self._detect_language_from_text(transcription)
-
-            # Create segment (single segment for now, chunked audio combined)
-            segment = NPUTranscriptionSegment(
-                start=0.0,
-                end=duration,
-                text=transcription.strip(),
-                words=[],  # Word timestamps not available in basic ONNX mode
-                language_detected=detected_language,
-                language_confidence=language_confidence,
-                is_code_switched=is_code_switched
-            )
-
-            result = NPUTranscriptionResult(
-                text=transcription.strip(),
-                segments=[segment],
-                language=detected_language,
-                language_probability=language_confidence,
-                duration=duration,
-                device="npu",
-                rtf=rtf
-            )
-
-            logger.info(
-                f"NPU transcription complete: {len(transcription)} chars, "
-                f"duration={duration:.2f}s, elapsed={elapsed:.2f}s, rtf={rtf:.3f}, "
-                f"language={detected_language} (conf={language_confidence:.2f}, "
-                f"code_switched={is_code_switched})"
-            )
-
-            return result
+            return [
+                self._build_result(transcription, rtf, len(audio) / SAMPLE_RATE, language, elapsed)
+                for audio, (transcription, rtf), language in zip(audios, transcriptions, languages)
+            ]
 
         except Exception as e:
             logger.error(f"NPU transcription failed: {e}")
             raise
 
+    def _build_result(
+        self,
+        transcription: str,
+        rtf: float,
+        duration: float,
+        language: Optional[str],
+        elapsed: float,
+    ) -> NPUTranscriptionResult:
+        """Result of one recording, with language and code-switching detection."""
+        # Detect language with code-switching support
+        if language and language not in ("auto", "bilingual", None):
+            detected_language = language
+            language_confidence = 1.0
+            is_code_switched = False
+        else:
+            detected_language, language_confidence, is_code_switched = \
+                self._detect_language_from_text(transcription)
+
+        # Create segment (single segment for now, chunked audio combined)
+        segment = NPUTranscriptionSegment(
+            start=0.0,
+            end=duration,
+            text=transcription.strip(),
+            words=[],  # Word timestamps not available in basic ONNX mode
+            language_detected=detected_language,
+            language_confidence=language_confidence,
+            is_code_switched=is_code_switched
+        )
+
+        result = NPUTranscriptionResult(
+            text=transcription.strip(),
+            segments=[segment],
+            language=detected_language,
+            language_probability=language_confidence,
+            duration=duration,
+            device=self.provider,
+            rtf=rtf
+        )
+
+        logger.info(
+            f"ONNX transcription complete ({self.provider}): {len(transcription)} chars, "
+            f"duration={duration:.2f}s, elapsed={elapsed:.2f}s, rtf={rtf:.3f}, "
+            f"language={detected_language} (conf={language_confidence:.2f}, "
+            f"code_switched={is_code_switched})"
+        )
+
+        return result
+
     def _detect_language_from_text(self, text: str) -> Tuple[str, float, bool]:
         """
         Detect language from transcribed text with code-switching support.
@@ -620,6 +990,7 @@ class NPUWhisperService:
             self.model = None
 
         self._is_loaded = False
+        self.provider = None
 
         import gc
         gc.collect()
@@ -637,3 +1008,27 @@ def get_npu_whisper_service() -> NPUWhisperService:
     if _npu_service is None:
         _npu_service = NPUWhisperService()
     return _npu_service
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m app.services.whisper_npu <audio> [<audio> ...]
+    # (several files are transcribed as one batch)
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    service = get_npu_whisper_service()
+    if not service.load_model():
+        sys.exit("Failed to load Whisper ONNX model")
+
+    paths = sys.argv[1:]
+    start = time.time()
+    results = service.transcribe_batch(paths, [None] * len(paths))
+    elapsed = time.time() - start
+    audio_hours = sum(result.duration for result in results) / 3600
+
+    for path, result in zip(paths, results):
+        print(f"{path}: {result.text}")
+    print(
+        f"provider={service.provider} files={len(paths)} audio={audio_hours * 3600:.1f}s "
+        f"elapsed={elapsed:.1f}s throughput={audio_hours / (elapsed / 3600):.1f} audio-h/h"
+    )
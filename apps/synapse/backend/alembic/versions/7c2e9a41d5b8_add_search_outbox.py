@@ -0,0 +1,69 @@
+"""add_search_outbox
+
+Revision ID: 7c2e9a41d5b8
+Revises: e6461479a363
+Create Date: 2026-10-16 09:12:04.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9a41d5b8'
+down_revision: Union[str, None] = 'e6461479a363'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Entity type -> table feeding the MeiliSearch sync worker
+OUTBOX_TABLES = {
+    'asset': 'assets',
+    'cable': 'cables',
+    'rule': 'rule_definitions',
+    'location': 'lbs_nodes',
+}
+OPERATIONS = (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD'))
+
+
+def upgrade() -> None:
+    op.create_table(
+        'search_outbox',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_search_outbox_created', 'search_outbox', ['created_at'], unique=False)
+
+    # Statement-level capture: one INSERT ... SELECT per write statement
+    op.execute("""
+        CREATE OR REPLACE FUNCTION search_outbox_capture() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO search_outbox (entity_type, entity_id)
+            SELECT DISTINCT TG_ARGV[0], changed_rows.id::text FROM changed_rows;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for entity_type, table in OUTBOX_TABLES.items():
+        for operation, transition in OPERATIONS:
+            op.execute(
+                f"CREATE TRIGGER trg_{table}_search_outbox_{operation.lower()} "
+                f"AFTER {operation} ON {table} "
+                f"REFERENCING {transition} TABLE AS changed_rows "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION search_outbox_capture('{entity_type}')"
+            )
+
+    # Existing rows are picked up by POST /search/reindex, not backfilled here
+
+
+def downgrade() -> None:
+    for table in OUTBOX_TABLES.values():
+        for operation, _ in OPERATIONS:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_outbox_{operation.lower()} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS search_outbox_capture()")
+    op.drop_index('ix_search_outbox_created', table_name='search_outbox')
+    op.drop_table('search_outbox')
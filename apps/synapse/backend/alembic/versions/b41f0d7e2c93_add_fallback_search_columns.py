@@ -0,0 +1,58 @@
+"""add_fallback_search_columns
+
+Revision ID: b41f0d7e2c93
+Revises: 7c2e9a41d5b8
+Create Date: 2026-10-16 11:40:27.503318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41f0d7e2c93'
+down_revision: Union[str, None] = '7c2e9a41d5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Table -> columns concatenated into search_text / search_vector
+SEARCH_FIELDS = {
+    'assets': ('tag', 'description', 'system', 'area'),
+    'rule_definitions': ('name', 'description'),
+    'cables': ('tag', 'description', 'cable_type'),
+    'lbs_nodes': ('name',),
+}
+
+
+def _expression(fields):
+    return " || ' ' || ".join(f"coalesce({field}, '')" for field in fields)
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for table, fields in SEARCH_FIELDS.items():
+        expression = _expression(fields)
+        op.add_column(table, sa.Column('search_text', sa.Text(), sa.Computed(expression, persisted=True)))
+        op.add_column(table, sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(f"to_tsvector('simple'::regconfig, {expression})", persisted=True),
+        ))
+        op.create_index(
+            f'ix_{table}_search_trgm', table, ['search_text'],
+            postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'},
+        )
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    for table in SEARCH_FIELDS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_index(f'ix_{table}_search_trgm', table_name=table)
+        op.drop_column(table, 'search_vector')
+        op.drop_column(table, 'search_text')
+    # pg_trgm is left installed; other database objects may depend on it
@@ -5,6 +5,7 @@ from app.api.deps import get_current_active_user
 from app.core.audit import log_audit
 from app.core.database import get_db
 from app.core.exceptions import NotFoundError
+from app.core.query_budget import query_budget
 from app.models.auth import User
 from app.models.models import Asset
 from app.schemas.asset import AssetBulkUpdateItem, AssetCreate, AssetResponse, AssetUpdate
@@ -22,6 +23,7 @@ router = APIRouter()
         404: {"description": "One or more assets not found"},
     },
 )
+@query_budget(10)
 def bulk_update_assets(
     assets: list[AssetBulkUpdateItem],
     project_id: str = Header(..., alias="X-Project-ID", description="Target project ID"),
@@ -29,13 +31,16 @@ def bulk_update_assets(
     current_user: User = Depends(get_current_active_user),
 ):
     """Bulk update multiple assets with partial data."""
+    # One lookup for the whole request instead of one per item
+    db_assets = {
+        asset.id: asset
+        for asset in db.query(Asset).filter(
+            Asset.id.in_([item.id for item in assets]), Asset.project_id == project_id
+        )
+    }
     updated_assets = []
     for asset_update in assets:
-        db_asset = (
-            db.query(Asset)
-            .filter(Asset.id == asset_update.id, Asset.project_id == project_id)
-            .first()
-        )
+        db_asset = db_assets.get(asset_update.id)
         if db_asset:
             # Capture old state for diff? For now just log the update
             update_data = asset_update.model_dump(exclude_unset=True, exclude={"id"})
@@ -45,9 +50,11 @@ def bulk_update_assets(
 
             log_audit(db, current_user.id, "UPDATE", "ASSET", db_asset.id, {"changes": update_data})
 
+    updated_ids = [asset.id for asset in updated_assets]
     db.commit()
-    for asset in updated_assets:
-        db.refresh(asset)
+    # Reload the expired rows in one query (refresh() would issue one per asset)
+    if updated_ids:
+        db.query(Asset).filter(Asset.id.in_(updated_ids)).all()
 
     return updated_assets
 
@@ -5,9 +5,11 @@ import uuid
 
 from fastapi import APIRouter, Depends, File, Form, Header, UploadFile
 from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.exceptions import DatabaseError, FileValidationError, RuleExecutionError
 from app.core.exceptions import ValidationError as SynapseValidationError
@@ -16,8 +18,8 @@ from app.models.models import Asset
 from app.models.workflow import BatchOperationType, LogSource, WorkflowActionType
 from app.schemas.import_export import CSVRowError, ImportSummaryResponse
 from app.services.action_logger import ActionLogger
+from app.services.csv_import_service import CSVImportService
 from app.services.metamodel import MetamodelService
-from app.services.versioning_service import VersioningService
 from app.services.workflow_logger import BatchOperationManager, WorkflowLogger
 
 router = APIRouter()
@@ -37,82 +39,125 @@ def get_user_id(current_user) -> str | None:
     return getattr(current_user, "id", None)
 
 
-@router.get("/export", response_class=StreamingResponse)
-def export_assets_csv(
-    project_id: str = Header(..., alias="X-Project-ID"),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_active_user),
-):
-    assets = db.query(Asset).filter(Asset.project_id == project_id).all()
-
-    def iter_csv():
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Define Headers
-        headers = [
-            "id",
-            "tag",
-            "description",
-            "type",
-            "area",
-            "system",
-            "io_type",
-            "manufacturer_part_id",
-            "location_id",
-            "electrical.voltage",
-            "electrical.powerKW",
-            "electrical.loadType",
-            "process.fluid",
-            "process.minRange",
-            "process.maxRange",
-            "process.units",
-            "purchasing.workPackageId",
-            "purchasing.status",
-        ]
-        writer.writerow(headers)
-        yield output.getvalue()
-        output.seek(0)
-        output.truncate(0)
+# Columns read for export (no ORM hydration)
+EXPORT_COLUMNS = (
+    Asset.id,
+    Asset.tag,
+    Asset.description,
+    Asset.type,
+    Asset.area,
+    Asset.system,
+    Asset.io_type,
+    Asset.manufacturer_part_id,
+    Asset.location_id,
+    Asset.electrical,
+    Asset.process,
+    Asset.purchasing,
+)
+
+# Response chunks are flushed once the buffer reaches this many characters
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+
+def iter_assets_csv(db: Session, project_id: str, buffer_size: int = EXPORT_BUFFER_SIZE):
+    """
+    Yield a project's assets as CSV text.
+
+    Rows stream from a server-side cursor (settings.EXPORT_BATCH_SIZE rows per
+    fetch) and are coalesced into chunks of about buffer_size characters.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+
+    # Define Headers
+    headers = [
+        "id",
+        "tag",
+        "description",
+        "type",
+        "area",
+        "system",
+        "io_type",
+        "manufacturer_part_id",
+        "location_id",
+        "electrical.voltage",
+        "electrical.powerKW",
+        "electrical.loadType",
+        "process.fluid",
+        "process.minRange",
+        "process.maxRange",
+        "process.units",
+        "purchasing.workPackageId",
+        "purchasing.status",
+    ]
+    writer.writerow(headers)
+
+    # Send headers right away, before the query runs
+    yield output.getvalue()
+    output.seek(0)
+    output.truncate(0)
+
+    rows = db.execute(
+        select(*EXPORT_COLUMNS)
+        .where(Asset.project_id == project_id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
 
-        for asset in assets:
+    try:
+        for asset in rows:
             # Flatten Data
             elec = asset.electrical or {}
             proc = asset.process or {}
             purch = asset.purchasing or {}
 
-            row = [
-                asset.id,
-                asset.tag,
-                asset.description,
-                asset.type if asset.type else "",  # Now String, not Enum
-                asset.area,
-                asset.system,
-                asset.io_type.value if asset.io_type else "",
-                asset.manufacturer_part_id,
-                asset.location_id,
-                elec.get("voltage", ""),
-                elec.get("powerKW", ""),
-                elec.get("loadType", ""),
-                proc.get("fluid", ""),
-                proc.get("minRange", ""),
-                proc.get("maxRange", ""),
-                proc.get("units", ""),
-                purch.get("workPackageId", ""),
-                purch.get("status", ""),
-            ]
-            writer.writerow(row)
-            yield output.getvalue()
-            output.seek(0)
-            output.truncate(0)
-
-    response = StreamingResponse(iter_csv(), media_type="text/csv")
+            writer.writerow(
+                [
+                    asset.id,
+                    asset.tag,
+                    asset.description,
+                    asset.type if asset.type else "",  # Now String, not Enum
+                    asset.area,
+                    asset.system,
+                    asset.io_type.value if asset.io_type else "",
+                    asset.manufacturer_part_id,
+                    asset.location_id,
+                    elec.get("voltage", ""),
+                    elec.get("powerKW", ""),
+                    elec.get("loadType", ""),
+                    proc.get("fluid", ""),
+                    proc.get("minRange", ""),
+                    proc.get("maxRange", ""),
+                    proc.get("units", ""),
+                    purch.get("workPackageId", ""),
+                    purch.get("status", ""),
+                ]
+            )
+
+            if output.tell() >= buffer_size:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+    finally:
+        # Release the server-side cursor if the client disconnects
+        rows.close()
+
+    if output.tell():
+        yield output.getvalue()
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_assets_csv(
+    project_id: str = Header(..., alias="X-Project-ID"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_active_user),
+):
+    response = StreamingResponse(iter_assets_csv(db, project_id), media_type="text/csv")
     response.headers["Content-Disposition"] = "attachment; filename=assets_export.csv"
     return response
 
 
 @router.post("/import", response_model=ImportSummaryResponse, status_code=200)
-async def import_assets_csv(
+def import_assets_csv(
     file: UploadFile = File(...),
     mapping: str = Form(None),  # JSON string of mapping: {"system_field": "csv_header"}
     project_id: str = Header(..., alias="X-Project-ID"),
@@ -136,7 +181,11 @@ async def import_assets_csv(
     **Behavior:**
     - Creates new assets if tag doesn't exist
     - Updates existing assets if tag already exists in project
-    - Auto-executes rules if assets are created
+    - Auto-executes rules on the created/updated assets (and their dependents)
+    - The upload is streamed and written in chunks (settings.IMPORT_CHUNK_SIZE rows),
+      each committed on its own; a progress event is logged after every chunk
+    - Runs in the threadpool (plain def): parsing and writes never block the
+      event loop serving other requests and DevConsole websockets
 
     **Returns:**
     - Summary with counts (created, updated, failed)
@@ -155,10 +204,6 @@ async def import_assets_csv(
         except Exception as e:
             print(f"Warning: Failed to parse mapping JSON: {e}")
 
-    content = await file.read()
-    decoded = content.decode("utf-8-sig")  # Handle BOM
-    csv_reader = csv.DictReader(io.StringIO(decoded))
-
     # Initialize summary with proper types
     summary = {
         "created": 0,
@@ -179,18 +224,19 @@ async def import_assets_csv(
     )
 
     # NEW: Initialize WorkflowLogger and BatchOperationManager for MVP traceability
+    # Buffered: per-asset events are written in batches
     user_id = get_user_id(current_user)
     workflow_logger = WorkflowLogger(
         db=db,
         project_id=project_id,
         user_id=user_id,
+        buffered=True,
     )
     batch_manager = BatchOperationManager(
         db=db,
         project_id=project_id,
         user_id=user_id,
     )
-    versioning_service = VersioningService(db, project_id)
 
     # Start workflow and batch operation
     correlation_id = workflow_logger.start_workflow(
@@ -206,282 +252,53 @@ async def import_assets_csv(
     )
     batch_id = batch_operation.id
 
-    # Helper to parse nested keys like "electrical.voltage"
-    def set_nested(d, keys, value):
-        for key in keys[:-1]:
-            d = d.setdefault(key, {})
-        d[keys[-1]] = value
-
-    # Helper to get value from row using mapping (case-insensitive)
-    def get_mapped_value(row, system_field):
-        # Build case-insensitive lookup for row keys
-        row_lower = {k.lower(): k for k in row.keys() if k}
-
-        # 1. Try mapped column
-        if system_field in column_map:
-            csv_header = column_map[system_field]
-            if csv_header in row:
-                return row[csv_header]
-            # Try case-insensitive match for mapped column
-            if csv_header.lower() in row_lower:
-                return row[row_lower[csv_header.lower()]]
-
-        # 2. Try direct match (exact)
-        if system_field in row:
-            return row[system_field]
-
-        # 3. Try case-insensitive direct match
-        if system_field.lower() in row_lower:
-            return row[row_lower[system_field.lower()]]
-
-        return None
-
-    for row_idx, row in enumerate(csv_reader):
-        summary["total_rows"] += 1
-        try:
-            # 1. Identify Asset
-            asset_id = get_mapped_value(row, "id")
-            tag = get_mapped_value(row, "tag")
-
-            if not tag:
-                summary["errors"].append(
-                    CSVRowError(row=row_idx, tag=None, error="Missing required field: tag").dict()
-                )
-                summary["failed"] += 1
-                continue
-
-            # 2. Prepare Data Structure
-            asset_data = {
-                "tag": tag,
-                "description": get_mapped_value(row, "description"),
-                "area": get_mapped_value(row, "area"),
-                "system": get_mapped_value(row, "system"),
-                "manufacturer_part_id": get_mapped_value(row, "manufacturer_part_id"),
-                "location_id": get_mapped_value(row, "location_id") or None,
-                "electrical": {},
-                "process": {},
-                "purchasing": {},
-            }
-
-            # Enums
-            type_val = get_mapped_value(row, "type")
-            if type_val:
-                asset_data["type"] = type_val
-
-            io_type_val = get_mapped_value(row, "io_type")
-            if io_type_val:
-                asset_data["io_type"] = io_type_val
-
-            # Nested Fields & Unmapped fields
-            # We iterate through the row to find nested fields that might be mapped OR unmapped
-            # But for mapped nested fields (e.g. "electrical.voltage"), the mapping key is "electrical.voltage"
-
-            # Strategy:
-            # 1. Check for specific known nested fields via mapping
-            known_nested = [
-                "electrical.voltage",
-                "electrical.powerKW",
-                "electrical.loadType",
-                "process.fluid",
-                "process.minRange",
-                "process.maxRange",
-                "process.units",
-                "purchasing.workPackageId",
-                "purchasing.status",
-            ]
-
-            for field in known_nested:
-                val = get_mapped_value(row, field)
-                if val:
-                    parts = field.split(".")
-                    set_nested(asset_data, parts, val)
-
-            # 2. Also check for direct nested columns in CSV (legacy support)
-            for key, value in row.items():
-                if key and "." in key and value:
-                    # Only if NOT already set by mapping
-                    parts = key.split(".")
-                    if parts[0] in ["electrical", "process", "purchasing"]:
-                        # Check if this specific nested path was already set via mapping
-                        # This is a bit complex to check efficiently, so we just overwrite if it wasn't mapped
-                        # Or better: only process if key is NOT a value in column_map
-                        is_mapped_column = False
-                        for _map_key, map_val in column_map.items():
-                            if map_val == key:
-                                is_mapped_column = True
-                                break
-
-                        if not is_mapped_column:
-                            set_nested(asset_data, parts, value)
-
-            # 3. Find Existing
-            existing_asset = None
-            if asset_id:
-                existing_asset = (
-                    db.query(Asset)
-                    .filter(Asset.id == asset_id, Asset.project_id == project_id)
-                    .first()
-                )
-
-            if not existing_asset:
-                existing_asset = (
-                    db.query(Asset).filter(Asset.tag == tag, Asset.project_id == project_id).first()
-                )
-
-            # 4. Update or Create
-            if existing_asset:
-                # Capture old state for versioning
-                old_snapshot = {
-                    "tag": existing_asset.tag,
-                    "description": existing_asset.description,
-                    "type": existing_asset.type,
-                    "area": existing_asset.area,
-                    "system": existing_asset.system,
-                    "electrical": existing_asset.electrical,
-                    "process": existing_asset.process,
-                    "purchasing": existing_asset.purchasing,
-                }
-
-                # Update
-                for key, value in asset_data.items():
-                    if value is not None:
-                        setattr(existing_asset, key, value)
-                summary["updated"] += 1
-                # Log update (legacy)
-                ActionLogger.log(
-                    db=db,
-                    action_type=ActionType.UPDATE,
-                    description=f"Updated asset: {tag}",
-                    project_id=project_id,
-                    parent_id=import_log.id,
-                    entity_type="ASSET",
-                    entity_id=uuid.UUID(existing_asset.id),
-                    details={"tag": tag, "type": asset_data.get("type")},
-                )
-
-                # NEW: Log to WorkflowLogger for real-time traceability
-                workflow_logger.log_update(
-                    source=LogSource.IMPORT,
-                    message=f"Updated asset: {tag}",
-                    entity_type="ASSET",
-                    entity_id=existing_asset.id,
-                    entity_tag=tag,
-                    correlation_id=correlation_id,
-                    details={"row": row_idx, "changes": asset_data},
-                )
-
-                # NEW: Create version for rollback support
-                try:
-                    versioning_service.create_version(
-                        asset=existing_asset,
-                        user_id=user_id,
-                        change_reason=f"CSV Import: {file.filename}",
-                        batch_id=batch_id,
-                    )
-                except Exception as ve:
-                    print(f"Warning: Failed to create version for {tag}: {ve}")
-
-                # Sync to Metamodel
-                try:
-                    MetamodelService.create_node_from_asset(db, existing_asset)
-                except Exception as e:
-                    import traceback
-
-                    traceback.print_exc()
-                    print(f"Warning: Failed to create MetamodelNode for {tag}: {str(e)}")
-
-            else:
-                # Create
-                if "type" not in asset_data:
-                    summary["errors"].append(
-                        CSVRowError(
-                            row=row_idx, tag=tag, error="Missing required field: type"
-                        ).dict()
-                    )
-                    summary["failed"] += 1
-                    continue
-
-                new_asset = Asset(**asset_data, project_id=project_id)
-                db.add(new_asset)
-                db.flush()  # Get the ID
-                summary["created"] += 1
-                # Log creation (legacy)
-                ActionLogger.log(
-                    db=db,
-                    action_type=ActionType.CREATE,
-                    description=f"Created asset: {tag}",
-                    project_id=project_id,
-                    parent_id=import_log.id,
-                    entity_type="ASSET",
-                    entity_id=uuid.UUID(new_asset.id),
-                    details={"tag": tag, "type": asset_data.get("type")},
-                )
-
-                # NEW: Log to WorkflowLogger for real-time traceability
-                workflow_logger.log_create(
-                    source=LogSource.IMPORT,
-                    message=f"Created asset: {tag}",
-                    entity_type="ASSET",
-                    entity_id=new_asset.id,
-                    entity_tag=tag,
-                    correlation_id=correlation_id,
-                    details={"type": asset_data.get("type"), "row": row_idx},
-                )
-
-                # NEW: Create initial version for rollback support
-                try:
-                    versioning_service.create_initial_version(
-                        asset=new_asset,
-                        batch_id=batch_id,
-                    )
-                except Exception as ve:
-                    print(f"Warning: Failed to create initial version for {tag}: {ve}")
-
-                # Sync to Metamodel
-                try:
-                    MetamodelService.create_node_from_asset(db, new_asset)
-                except Exception as e:
-                    import traceback
-
-                    traceback.print_exc()
-                    print(f"Warning: Failed to create MetamodelNode for {tag}: {str(e)}")
-
-        except (SynapseValidationError, DatabaseError) as e:
-            error_msg = e.message if hasattr(e, "message") else str(e)
-            summary["errors"].append(CSVRowError(row=row_idx, tag=tag, error=error_msg).dict())
-            summary["failed"] += 1
-            ActionLogger.log(
-                db=db,
-                action_type=ActionType.ERROR,
-                description=f"Import error for {tag}: {error_msg}",
-                project_id=project_id,
-                parent_id=import_log.id,
-                entity_type="ASSET",
-                details={"row": row_idx, "error": error_msg},
-            )
-        except Exception as e:
-            # Unexpected error - log and continue
-            import traceback
+    # Progress event after each chunk, in the import workflow
+    def report_progress(rows: int, fraction: float | None):
+        workflow_logger.log_info(
+            message=f"Imported {rows} rows",
+            correlation_id=correlation_id,
+            source=LogSource.IMPORT,
+            details={"rows_processed": rows, "progress": fraction},
+        )
 
-            traceback.print_exc()
-            error_msg = f"System error: {str(e)}"
-            summary["errors"].append(
-                CSVRowError(
-                    row=row_idx, tag=tag if "tag" in locals() else None, error=error_msg
-                ).dict()
-            )
-            summary["failed"] += 1
-            ActionLogger.log(
-                db=db,
-                action_type=ActionType.ERROR,
-                description=f"Unexpected import error for row {row_idx}: {str(e)}",
-                project_id=project_id,
-                parent_id=import_log.id,
-                entity_type="ASSET",
-                details={"row": row_idx, "error": str(e)},
-            )
+    # Stream the upload: rows are parsed and written chunk by chunk
+    importer = CSVImportService(
+        db,
+        project_id,
+        user_id,
+        column_map=column_map,
+        workflow_logger=workflow_logger,
+    )
+    try:
+        result = importer.import_csv(
+            file.file,
+            file.filename,
+            batch_id=batch_id,
+            correlation_id=correlation_id,
+            progress=report_progress,
+        )
+    except UnicodeDecodeError:
+        workflow_logger.fail_workflow(correlation_id=correlation_id, error="File is not UTF-8")
+        raise FileValidationError(file.filename, "CSV file must be UTF-8 encoded")
+
+    summary.update(
+        created=result.created,
+        updated=result.updated,
+        failed=result.failed,
+        errors=result.errors,
+        total_rows=result.total_rows,
+    )
 
-    db.commit()
+    if result.errors:
+        ActionLogger.log(
+            db=db,
+            action_type=ActionType.ERROR,
+            description=f"Import errors: {result.failed} rows failed",
+            project_id=project_id,
+            parent_id=import_log.id,
+            entity_type="IMPORT",
+            details={"errors": result.errors[:100]},
+        )
 
     # Update parent log with summary
     import_log.details = {
@@ -513,8 +330,8 @@ async def import_assets_csv(
 
     db.commit()
 
-    # ✨ Auto-execute rules after import if assets were created
-    if summary["created"] > 0:
+    # ✨ Auto-execute rules after import, only on the assets the import touched
+    if affected_count > 0:
         try:
             import time
 
@@ -522,17 +339,23 @@ async def import_assets_csv(
 
             rule_start_time = time.time()
 
+            changed_asset_ids = batch_manager.get_batch_asset_ids(batch_id)
+
             rule_log = ActionLogger.log(
                 db=db,
                 action_type=ActionType.RULE_EXECUTION,
                 description=f"Auto-executing rules after CSV import ({file.filename})",
                 project_id=project_id,
                 parent_id=import_log.id,
-                details={"trigger": "csv_import", "new_assets": summary["created"]},
+                details={
+                    "trigger": "csv_import",
+                    "new_assets": summary["created"],
+                    "changed_assets": len(changed_asset_ids),
+                },
             )
 
-            # Execute all rules
-            rule_result = RuleEngine.apply_rules(db, project_id)
+            # Execute rules incrementally: changed assets and their dependents only
+            rule_result = RuleEngine.apply_rules(db, project_id, asset_ids=changed_asset_ids)
 
             # Update summary with rule execution results
             summary["rules_executed"] = rule_result.get("total_rules", 0)
@@ -2,50 +2,100 @@
 WebSocket endpoint for real-time log streaming.
 """
 
+import json
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from app.middleware.logging_middleware import get_request_log_worker
 from app.services.websocket_manager import WebSocketLogger, log_manager
 
 router = APIRouter()
 
+# Most entries replayed to a resuming client (the store's capacity)
+RESUME_LIMIT = 1000
+
 
 @router.websocket("/ws/logs")
-async def websocket_logs(websocket: WebSocket):
+async def websocket_logs(
+    websocket: WebSocket,
+    levels: str | None = None,
+    topics: str | None = None,
+    since: str | None = None,
+):
     """
     WebSocket endpoint for real-time log streaming.
     Connect from frontend DevConsole to receive logs in real-time.
+
+    Optional comma-separated `levels` / `topics` query parameters filter the
+    stream server-side; send {"type": "subscribe", "levels": [...], "topics": [...]}
+    to change them later. Reconnecting clients pass the id of the last entry
+    they received as `since` to resume without duplicates.
     """
-    await log_manager.connect(websocket)
 
-    # Send recent logs on connect
-    recent_logs = WebSocketLogger.get_logs(limit=50)
-    for log in recent_logs:
-        try:
-            await websocket.send_json(log)
-        except Exception:
-            break
+    def history() -> list[dict]:
+        if since:
+            return WebSocketLogger.get_logs(limit=RESUME_LIMIT, since=since)
+        return WebSocketLogger.get_logs(limit=50)
+
+    # Recent logs are replayed before live entries
+    await log_manager.connect(
+        websocket, levels=_split(levels), topics=_split(topics), history=history
+    )
 
     try:
         while True:
             # Keep connection alive, handle incoming messages
             data = await websocket.receive_text()
-            # Can handle commands from frontend if needed
             if data == "ping":
                 await websocket.send_text("pong")
             elif data == "clear":
                 WebSocketLogger.clear()
+            elif data.startswith("{"):
+                _handle_command(websocket, data)
     except WebSocketDisconnect:
         log_manager.disconnect(websocket)
     except Exception:
         log_manager.disconnect(websocket)
 
 
+def _split(value: str | None) -> list[str] | None:
+    return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+
+def _handle_command(websocket: WebSocket, data: str):
+    try:
+        command = json.loads(data)
+    except ValueError:
+        return
+    if isinstance(command, dict) and command.get("type") == "subscribe":
+        log_manager.subscribe(websocket, command.get("levels"), command.get("topics"))
+
+
 @router.get("/api/v1/logs/")
-async def get_logs(limit: int = 100):
+async def get_logs(
+    limit: int = 100,
+    since: str | None = None,
+    level: str | None = None,
+    source: str | None = None,
+    action_type: str | None = None,
+    entity_id: str | None = None,
+):
     """
     HTTP endpoint for fetching logs (fallback for non-WebSocket clients).
+
+    Filters use the log store's indexes; `since` (a log id) returns only
+    newer entries, for polling or paging forward.
     """
-    return WebSocketLogger.get_logs(limit=limit)
+    filters = {
+        "since": since,
+        "level": level,
+        "source": source,
+        "action_type": action_type,
+        "entity_id": entity_id,
+    }
+    return WebSocketLogger.get_logs(
+        limit=limit, **{key: value for key, value in filters.items() if value is not None}
+    )
 
 
 @router.delete("/api/v1/logs/")
@@ -58,4 +108,10 @@ async def clear_logs():
 @router.get("/api/v1/logs/connections")
 async def get_connection_count():
     """Get number of active WebSocket connections."""
-    return {"connections": log_manager.connection_count}
+    return {"connections": log_manager.connection_count, "dropped": log_manager.dropped_total}
+
+
+@router.get("/api/v1/logs/latency")
+async def get_request_latency():
+    """Per-route request latency histograms (bucket upper bounds in ms)."""
+    return get_request_log_worker().latency_stats()
@@ -0,0 +1,18 @@
+"""
+Prometheus metrics endpoint.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.core.metrics import CONTENT_TYPE, REGISTRY
+from app.middleware.logging_middleware import get_request_log_worker
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Request latency, DB query, rule engine and connection pool metrics."""
+    get_request_log_worker()  # Registers the request metrics
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
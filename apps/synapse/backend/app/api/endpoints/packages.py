@@ -5,24 +5,28 @@ Provides endpoints for:
 - Package CRUD operations
 - Package asset management
 - Template-based export (IN-P040, CA-P040)
-- Export history tracking
+- Background export jobs with cached artifacts
 """
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user
 from app.core.database import get_db
 from app.models.auth import User
 from app.models.models import Asset
-from app.models.packages import Package, PackageStatus
+from app.models.packages import ExportJob, ExportJobStatus, Package, PackageStatus
 from app.schemas.packages import (
+    ExportJobCreate,
+    ExportJobResponse,
     PackageCreate,
     PackageListResponse,
     PackageResponse,
     PackageUpdate,
 )
-from app.services.template_service import TemplateService
+from app.services.export_jobs import ExportError, get_export_queue
+from app.services.template_service import XLSX_MIME_TYPE, TemplateService
 
 router = APIRouter()
 
@@ -308,6 +312,12 @@ def export_package(
     """
     Export package to Excel/PDF using template.
 
+    Unchanged packages are served from the cached artifact; otherwise the file
+    is generated in the request. A miss reads the package rows twice: once to
+    hash them (the hash decides hit or miss, so it cannot wait for generation)
+    and once to write the workbook. Hashing builds no workbook, so the extra
+    pass is small next to generation. Use POST /export/jobs for large packages.
+
     Templates:
     - IN-P040: Instrument Index
     - CA-P040: Cable Schedule
@@ -319,26 +329,116 @@ def export_package(
     if not package:
         raise HTTPException(status_code=404, detail="Package not found")
 
-    # Initialize template service
-    template_service = TemplateService(db)
+    try:
+        artifact = get_export_queue().export(db, package_id, template_type, format)
+    except ExportError as e:
+        raise HTTPException(status_code=500, detail=e.message)
 
-    # Export
-    result = template_service.export_package(
-        package_id=package_id, template_type=template_type, format=format
+    return FileResponse(
+        artifact.path,
+        media_type=XLSX_MIME_TYPE,
+        filename=TemplateService.export_file_name(package.name, template_type),
+        headers={"X-Export-Cache": "hit" if artifact.cached else "miss"},
     )
 
-    if not result.success:
-        raise HTTPException(status_code=500, detail=result.error)
 
-    # Return file
-    return Response(
-        content=result.file_data,
-        media_type=result.mime_type,
-        headers={
-            "Content-Disposition": f'attachment; filename="{result.file_name}"',
-            "Content-Type": result.mime_type,
-        },
+def _get_export_job(db: Session, package_id: str, job_id: str, project_id: str) -> ExportJob:
+    job = (
+        db.query(ExportJob)
+        .join(Package, ExportJob.package_id == Package.id)
+        .filter(
+            ExportJob.id == job_id,
+            ExportJob.package_id == package_id,
+            Package.project_id == project_id,
+        )
+        .first()
     )
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+
+def _export_job_response(job: ExportJob) -> ExportJobResponse:
+    response = ExportJobResponse.model_validate(job)
+    if job.status == ExportJobStatus.COMPLETED:
+        response.download_url = f"/api/v1/packages/{job.package_id}/export/jobs/{job.id}/download"
+    return response
+
+
+@router.post(
+    "/{package_id}/export/jobs",
+    response_model=ExportJobResponse,
+    status_code=202,
+    summary="Queue package export",
+    description="Generate an export in the background; poll the job for progress",
+)
+def create_export_job(
+    package_id: str,
+    job_in: ExportJobCreate,
+    project_id: str = Header(..., alias="X-Project-ID"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Queue an export job (completed immediately when the package is unchanged)."""
+    package = (
+        db.query(Package).filter(Package.id == package_id, Package.project_id == project_id).first()
+    )
+    if not package:
+        raise HTTPException(status_code=404, detail="Package not found")
+
+    try:
+        job = get_export_queue().submit(
+            db,
+            package_id,
+            job_in.template_type,
+            job_in.format,
+            created_by=getattr(current_user, "id", None),
+        )
+    except ExportError as e:
+        raise HTTPException(status_code=500, detail=e.message)
+
+    return _export_job_response(job)
+
+
+@router.get(
+    "/{package_id}/export/jobs/{job_id}",
+    response_model=ExportJobResponse,
+    summary="Get export job",
+    description="Get status and progress of an export job",
+)
+def get_export_job(
+    package_id: str,
+    job_id: str,
+    project_id: str = Header(..., alias="X-Project-ID"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Get export job status."""
+    return _export_job_response(_get_export_job(db, package_id, job_id, project_id))
+
+
+@router.get(
+    "/{package_id}/export/jobs/{job_id}/download",
+    summary="Download export job artifact",
+    description="Download the file generated by a completed export job",
+)
+def download_export_job(
+    package_id: str,
+    job_id: str,
+    project_id: str = Header(..., alias="X-Project-ID"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Download a completed export."""
+    job = _get_export_job(db, package_id, job_id, project_id)
+    if job.status != ExportJobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status.value}")
+
+    path = get_export_queue().store.get(job.content_hash)
+    if path is None:
+        raise HTTPException(status_code=410, detail="Export artifact expired, queue a new export")
+
+    return FileResponse(path, media_type=XLSX_MIME_TYPE, filename=job.file_name)
 
 
 @router.get(
@@ -487,6 +487,12 @@ def detect_rule_conflicts(
 def execute_all_rules(
     project_id: str,
     use_enhanced_engine: bool = Query(True, description="Use enhanced engine with traceability"),
+    bulk: bool = Query(
+        False, description="Enhanced engine: batched writes, one transaction per rule"
+    ),
+    parallel: bool = Query(
+        False, description="Enhanced engine: run independent rules concurrently in waves"
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -505,6 +511,10 @@ def execute_all_rules(
         - use_enhanced_engine: If True (default), uses the new RuleExecutionService
           with full traceability, versioning, and batch rollback support.
           If False, uses the legacy RuleEngine.
+        - bulk: With the enhanced engine, plan each rule across all assets and
+          write it with batched INSERT/UPDATE statements in one transaction.
+        - parallel: With the enhanced engine, run rules that touch disjoint asset
+          types/properties concurrently (priority order kept for conflicting rules).
 
     Returns:
         - total_rules: Number of rules processed
@@ -538,7 +548,7 @@ def execute_all_rules(
             project_id=project_id,
             user_id=current_user.id if current_user else None,
         )
-        summary = executor.execute_rules()
+        summary = executor.execute_rules(bulk=bulk, parallel=parallel)
 
         result = {
             "total_rules": summary.total_rules,
@@ -548,6 +558,7 @@ def execute_all_rules(
             "skipped": summary.skipped,
             "errors": summary.errors,
             "time_elapsed_ms": summary.duration_ms,
+            "phase_ms": summary.phase_ms,
         }
     else:
         # Legacy: Use original RuleEngine
@@ -559,6 +570,8 @@ def execute_all_rules(
     root_log.details = {
         "execution_mode": "execute_all",
         "enhanced_engine": use_enhanced_engine,
+        "bulk": bulk,
+        "parallel": parallel,
         "total_rules": result.get("total_rules", 0),
         "actions_taken": result.get("actions_taken", 0),
         "time_ms": int((time.time() - start_time) * 1000),
@@ -1,10 +1,10 @@
 """
 Global Search API Endpoint
-Provides unified search with MeiliSearch (primary) + thefuzz fallback
+Provides unified search with MeiliSearch (primary) + PostgreSQL fallback
 
 Features:
 - MeiliSearch for fast, typo-tolerant full-text search (~10ms for 10K+ docs)
-- Automatic fallback to thefuzz when MeiliSearch unavailable
+- Automatic fallback to PostgreSQL pg_trgm/tsvector search when MeiliSearch unavailable
 - Search across assets, rules, cables, locations
 - Categorized results with relevance scoring
 - Quick actions and navigation shortcuts
@@ -18,7 +18,6 @@ from typing import Literal
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from thefuzz import fuzz
 
@@ -33,6 +32,9 @@ from app.services.meilisearch_service import (
     INDEX_RULES,
     get_meilisearch_service,
 )
+from app.services.pg_search_service import PostgresSearchService
+from app.services.search_cache import get_search_cache
+from app.services.search_sync import get_search_sync_worker
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -58,8 +60,9 @@ class SearchResponse(BaseModel):
     total: int
     results: list[SearchResult]
     categories: dict[str, int]
-    search_engine: str = "meilisearch"  # or "thefuzz" when fallback
+    search_engine: str = "meilisearch"  # or "postgres" when fallback
     processing_time_ms: int | None = None
+    cached: bool = False  # Served from the search result cache
 
 
 class IndexStatus(BaseModel):
@@ -68,6 +71,8 @@ class IndexStatus(BaseModel):
     available: bool
     engine: str
     indexes: dict[str, dict] | None = None
+    sync: dict | None = None  # Outbox backlog and lag of the sync worker
+    cache: dict | None = None  # Search result cache size and hit rate
     message: str | None = None
 
 
@@ -181,7 +186,7 @@ QUICK_ACTIONS = [
 
 
 def calculate_fuzzy_score(query: str, text: str) -> int:
-    """Calculate fuzzy match score (0-100) - used for fallback"""
+    """Calculate fuzzy match score (0-100) - used for navigation and actions"""
     if not query or not text:
         return 0
     ratio = fuzz.ratio(query.lower(), text.lower())
@@ -269,139 +274,9 @@ async def search_with_meilisearch(
 async def search_with_fallback(
     query: str, type_filter: list[str] | None, project_id: str | None, limit: int, db: Session
 ) -> tuple[list[SearchResult], dict[str, int]]:
-    """Fallback search using thefuzz + database queries"""
-    results = []
-    categories = {}
-
-    # Search Assets
-    if not type_filter or "asset" in type_filter:
-        asset_query = db.query(Asset).filter(
-            or_(
-                Asset.tag.ilike(f"%{query}%"),
-                Asset.description.ilike(f"%{query}%"),
-                Asset.system.ilike(f"%{query}%"),
-                Asset.area.ilike(f"%{query}%"),
-            )
-        )
-        if project_id:
-            asset_query = asset_query.filter(Asset.project_id == project_id)
-
-        assets = asset_query.limit(limit).all()
-        for asset in assets:
-            score = max(
-                calculate_fuzzy_score(query, asset.tag or ""),
-                calculate_fuzzy_score(query, asset.description or ""),
-                calculate_fuzzy_score(query, asset.system or ""),
-            )
-            results.append(
-                SearchResult(
-                    id=asset.id,
-                    type="asset",
-                    title=asset.tag or "Unknown",
-                    subtitle=f"{asset.description or ''} • {asset.system or 'Unclassified'}",
-                    icon="Cpu",
-                    path=f"/assets/{asset.id}",
-                    score=score,
-                    metadata={"area": asset.area, "system": asset.system},
-                )
-            )
-        categories["asset"] = len(assets)
-
-    # Search Rules
-    if not type_filter or "rule" in type_filter:
-        rule_query = db.query(RuleDefinition).filter(
-            or_(
-                RuleDefinition.name.ilike(f"%{query}%"),
-                RuleDefinition.description.ilike(f"%{query}%"),
-            )
-        )
-        if project_id:
-            rule_query = rule_query.filter(RuleDefinition.project_id == project_id)
-
-        rules = rule_query.limit(limit).all()
-        for rule in rules:
-            score = max(
-                calculate_fuzzy_score(query, rule.name or ""),
-                calculate_fuzzy_score(query, rule.description or ""),
-            )
-            results.append(
-                SearchResult(
-                    id=rule.id,
-                    type="rule",
-                    title=rule.name or "Unnamed Rule",
-                    subtitle=rule.description or "No description",
-                    icon="GitBranch",
-                    path=f"/rules/{rule.id}",
-                    score=score,
-                    metadata={"enabled": rule.enabled, "priority": rule.priority},
-                )
-            )
-        categories["rule"] = len(rules)
-
-    # Search Cables
-    if not type_filter or "cable" in type_filter:
-        cable_query = db.query(Cable).filter(
-            or_(
-                Cable.tag.ilike(f"%{query}%"),
-                Cable.description.ilike(f"%{query}%"),
-                Cable.from_location.ilike(f"%{query}%"),
-                Cable.to_location.ilike(f"%{query}%"),
-            )
-        )
-        if project_id:
-            cable_query = cable_query.filter(Cable.project_id == project_id)
-
-        cables = cable_query.limit(limit).all()
-        for cable in cables:
-            score = max(
-                calculate_fuzzy_score(query, cable.tag or ""),
-                calculate_fuzzy_score(query, cable.description or ""),
-            )
-            results.append(
-                SearchResult(
-                    id=cable.id,
-                    type="cable",
-                    title=cable.tag or "Unknown Cable",
-                    subtitle=f"{cable.from_location} → {cable.to_location}"
-                    if cable.from_location
-                    else cable.description,
-                    icon="Cable",
-                    path=f"/cables/{cable.id}",
-                    score=score,
-                    metadata={"cableType": cable.cable_type, "length": cable.length},
-                )
-            )
-        categories["cable"] = len(cables)
-
-    # Search Locations
-    if not type_filter or "location" in type_filter:
-        location_query = db.query(LBSNode).filter(
-            or_(LBSNode.name.ilike(f"%{query}%"), LBSNode.code.ilike(f"%{query}%"))
-        )
-        if project_id:
-            location_query = location_query.filter(LBSNode.project_id == project_id)
-
-        locations = location_query.limit(limit).all()
-        for loc in locations:
-            score = max(
-                calculate_fuzzy_score(query, loc.name or ""),
-                calculate_fuzzy_score(query, loc.code or ""),
-            )
-            results.append(
-                SearchResult(
-                    id=loc.id,
-                    type="location",
-                    title=loc.name or loc.code or "Unknown Location",
-                    subtitle=f"Code: {loc.code}" if loc.code else None,
-                    icon="MapPin",
-                    path=f"/locations/{loc.id}",
-                    score=score,
-                    metadata={"type": str(loc.type) if loc.type else None, "code": loc.code},
-                )
-            )
-        categories["location"] = len(locations)
-
-    return results, categories
+    """Fallback search ranked in PostgreSQL (pg_trgm + tsvector)"""
+    hits, categories = PostgresSearchService(db).search(query, type_filter, project_id, limit)
+    return [SearchResult(**hit) for hit in hits], categories
 
 
 @router.get("/", response_model=SearchResponse)
@@ -418,7 +293,9 @@ async def global_search(
     Global search across all entities.
 
     Uses MeiliSearch for fast, typo-tolerant search (~10ms).
-    Falls back to database + thefuzz when MeiliSearch unavailable.
+    Repeated and extended queries are served from the search result cache.
+    Falls back to ranked PostgreSQL trigram/full-text search when MeiliSearch
+    is unavailable.
     """
     type_filter = types.split(",") if types else None
 
@@ -438,30 +315,48 @@ async def global_search(
             search_engine="static",
         )
 
-    # Search navigation and actions first
+    # Navigation and actions are fuzzy-matched and cheap: computed per query,
+    # never cached (substring narrowing of a prefix entry would drop matches)
     nav_results = search_navigation_and_actions(q, type_filter)
 
-    # Try MeiliSearch first
-    meili = get_meilisearch_service()
-    search_engine = "meilisearch"
+    # Keystroke searches repeat and extend earlier queries
+    cache = get_search_cache()
+    cached = cache.get(project_id, q, type_filter, limit)
     processing_time = None
 
-    if meili.is_available():
-        try:
-            entity_results, categories, processing_time = await search_with_meilisearch(
-                q, type_filter, project_id, limit
-            )
-        except Exception as e:
-            logger.warning(f"MeiliSearch failed, using fallback: {e}")
+    if cached is not None:
+        entity_results = cached.results
+        categories = dict(cached.categories)
+        search_engine = cached.search_engine
+    else:
+        # Try MeiliSearch first
+        meili = get_meilisearch_service()
+        search_engine = "meilisearch"
+
+        if meili.is_available():
+            try:
+                entity_results, categories, processing_time = await search_with_meilisearch(
+                    q, type_filter, project_id, limit
+                )
+            except Exception as e:
+                logger.warning(f"MeiliSearch failed, using fallback: {e}")
+                entity_results, categories = await search_with_fallback(
+                    q, type_filter, project_id, limit, db
+                )
+                search_engine = "postgres_fallback"
+        else:
             entity_results, categories = await search_with_fallback(
                 q, type_filter, project_id, limit, db
             )
-            search_engine = "thefuzz_fallback"
-    else:
-        entity_results, categories = await search_with_fallback(
-            q, type_filter, project_id, limit, db
+            search_engine = "postgres"
+
+        # Nothing was cut off by the limit, so longer queries can filter these results
+        complete = len(entity_results) < limit and all(
+            count < limit for count in categories.values()
+        )
+        cache.put(
+            project_id, q, type_filter, limit, entity_results, categories, search_engine, complete
         )
-        search_engine = "thefuzz"
 
     # Combine results
     all_results = nav_results + entity_results
@@ -478,6 +373,7 @@ async def global_search(
         categories=categories,
         search_engine=search_engine,
         processing_time_ms=processing_time,
+        cached=cached is not None,
     )
 
 
@@ -545,9 +441,11 @@ async def get_recent_searches():
 
 
 @router.get("/status", response_model=IndexStatus)
-async def get_search_status():
-    """Get search engine status and index statistics."""
+async def get_search_status(db: Session = Depends(get_db)):
+    """Get search engine status, index statistics, sync lag and cache hit rate."""
     meili = get_meilisearch_service()
+    sync = get_search_sync_worker().status(db)
+    cache = get_search_cache().stats()
 
     if meili.is_available():
         try:
@@ -556,16 +454,24 @@ async def get_search_status():
                 available=True,
                 engine="meilisearch",
                 indexes=stats,
+                sync=sync,
+                cache=cache,
                 message="MeiliSearch is healthy",
             )
         except Exception as e:
             return IndexStatus(
-                available=False, engine="meilisearch", message=f"Error getting stats: {e}"
+                available=False,
+                engine="meilisearch",
+                sync=sync,
+                cache=cache,
+                message=f"Error getting stats: {e}",
             )
     else:
         return IndexStatus(
             available=False,
-            engine="thefuzz_fallback",
+            engine="postgres_fallback",
+            sync=sync,
+            cache=cache,
             message="MeiliSearch unavailable, using database fallback",
         )
 
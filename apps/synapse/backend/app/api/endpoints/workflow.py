@@ -10,6 +10,7 @@ Provides endpoints for:
 Central to MVP demo: "Je peux voir exactement ce qui se passe"
 """
 
+from collections.abc import Callable
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query
@@ -17,13 +18,15 @@ from sqlalchemy import desc, func
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.core.database import get_db, get_session_factory
 from app.models.auth import User
 from app.models.workflow import (
     AssetChange,
     AssetVersion,
     BatchOperation,
+    LogSource,
     PropertyChange,
+    WorkflowActionType,
     WorkflowEvent,
 )
 from app.schemas.workflow import (
@@ -46,6 +49,7 @@ from app.schemas.workflow import (
     WorkflowEventResponse,
 )
 from app.services.versioning_service import VersioningService
+from app.services.workflow_logger import WorkflowLogger
 
 router = APIRouter()
 
@@ -508,42 +512,99 @@ def rollback_batch(
     batch_id: str,
     reason: str = Query(None, description="Reason for rollback"),
     db: Session = Depends(get_db),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Rollback an entire batch operation."""
-    versioning_service = VersioningService(db)
+    """
+    Rollback an entire batch operation.
+
+    The rollback runs in a single transaction; a progress event is logged
+    (and broadcast to the DevConsole) after every chunk of assets.
+    """
+    batch = db.query(BatchOperation).filter(BatchOperation.id == batch_id).first()
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch operation not found")
+    if batch.is_rolled_back:
+        raise HTTPException(status_code=400, detail="Batch operation already rolled back")
 
+    versioning_service = VersioningService(db, batch.project_id, current_user.id)
+
+    # Progress events use their own session: the rollback transaction must
+    # not be committed chunk by chunk
+    progress_db = session_factory()
     try:
+        workflow_logger = WorkflowLogger(progress_db, batch.project_id, current_user.id)
+        correlation_id = workflow_logger.start_workflow(
+            source=LogSource.ROLLBACK,
+            action_type=WorkflowActionType.ROLLBACK,
+            message=f"Batch rollback: {batch.description or batch_id}",
+            details={"batch_id": batch_id, "reason": reason},
+        )
+
+        def report_progress(processed: int, total: int):
+            workflow_logger.log_info(
+                message=f"Rolled back {processed}/{total} assets",
+                correlation_id=correlation_id,
+                source=LogSource.ROLLBACK,
+                details={
+                    "assets_processed": processed,
+                    "total_assets": total,
+                    "progress": processed / total if total else None,
+                },
+            )
+
         result = versioning_service.rollback_batch(
             batch_id=batch_id,
-            user_id=current_user.id,
             reason=reason,
+            progress=report_progress,
         )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
 
+        if result.success:
+            workflow_logger.complete_workflow(
+                correlation_id, stats={"assets_restored": result.assets_restored}
+            )
+        else:
+            workflow_logger.fail_workflow(correlation_id, error=result.error)
+    finally:
+        progress_db.close()
+
+    results = result.results or []
+    failed = sum(1 for r in results if not r.success)
     return BatchRollbackResultResponse(
         success=result.success,
         batch_id=result.batch_id,
-        total_assets=result.total_assets,
-        rolled_back=result.rolled_back,
-        failed=result.failed,
+        total_assets=len(results),
+        rolled_back=result.assets_restored,
+        failed=failed,
         results=[
             RollbackResultResponse(
                 success=r.success,
                 asset_id=r.asset_id,
-                from_version=r.from_version,
-                to_version=r.to_version,
+                from_version=r.new_version - 1 if r.new_version else None,
+                to_version=r.restored_version,
                 new_version=r.new_version,
-                message=r.message,
+                message=_rollback_message(r),
                 error=r.error,
             )
-            for r in result.results
+            for r in results
         ],
-        message=result.message,
+        message=(
+            f"Rolled back {result.assets_restored} assets ({failed} failed)"
+            if result.success
+            else f"Rollback failed: {result.error}"
+        ),
     )
 
 
+def _rollback_message(result) -> str:
+    """Per-asset message of a batch rollback result."""
+    if not result.success:
+        return result.error or "Rollback failed"
+    if result.restored_version is None:
+        return "Asset created by the batch, deleted"
+    return f"Restored version {result.restored_version}"
+
+
 # =============================================================================
 # STATS ENDPOINT
 # =============================================================================
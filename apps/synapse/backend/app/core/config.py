@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from pydantic_settings import BaseSettings
 
@@ -34,6 +35,57 @@ class Settings(BaseSettings):
     DATABASE_URL: str | None = None
     ANALYTICS_DATABASE_URL: str | None = None
 
+    # Rule Engine
+    # Threads for parallel rule waves (keep below the DB connection pool size)
+    RULE_EXECUTION_WORKERS: int = 4
+
+    # CSV Import / Export
+    # Rows parsed and written per chunk (one upsert/version/node write each)
+    IMPORT_CHUNK_SIZE: int = 1000
+    # Rows fetched per server-side cursor round trip when exporting
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Package Export Jobs
+    # Threads generating IN-P040 / CA-P040 workbooks in the background
+    EXPORT_WORKERS: int = 2
+    # Generated workbooks, one file per content hash
+    EXPORT_ARTIFACT_DIR: str = os.path.join(tempfile.gettempdir(), "synapse-exports")
+    # Artifacts not served for this long are deleted
+    EXPORT_ARTIFACT_RETENTION_DAYS: int = 7
+
+    # DevConsole WebSocket
+    # Log entries queued per viewer before the oldest are dropped
+    WS_CLIENT_QUEUE_SIZE: int = 1000
+    # Most entries sent in one batch frame
+    WS_MAX_BATCH: int = 200
+
+    # Request logging middleware
+    # Fraction of requests that also emit a DEBUG "request start" log entry
+    REQUEST_LOG_SAMPLE_RATE: float = 0.1
+    # Request records buffered for the log drain task before the oldest are dropped
+    REQUEST_LOG_QUEUE_SIZE: int = 10000
+
+    # Query Inspection (development / CI)
+    # Statement shape repeated this often in one request is reported as N+1 (0 = off)
+    N_PLUS_ONE_THRESHOLD: int = 0 if os.getenv("ENVIRONMENT") == "production" else 10
+    # Exceeding a query_budget() raises instead of logging a warning (set in tests/CI)
+    QUERY_BUDGET_ENFORCE: bool = False
+
+    # Search Sync (outbox -> MeiliSearch)
+    SEARCH_SYNC_ENABLED: bool = True
+    # Changes younger than this are left to settle so bursts coalesce per entity
+    SEARCH_SYNC_DEBOUNCE_MS: int = 500
+    # Outbox rows claimed per MeiliSearch push
+    SEARCH_SYNC_BATCH_SIZE: int = 1000
+    # Outbox rows older than this are pruned (sync disabled or MeiliSearch
+    # unreachable); POST /search/reindex catches the index up afterwards (0 = never)
+    SEARCH_OUTBOX_RETENTION_HOURS: float = 24.0
+
+    # Search Result Cache (per process; writes here invalidate it immediately)
+    SEARCH_CACHE_SIZE: int = 512
+    # Upper bound on staleness for writes made by other processes
+    SEARCH_CACHE_TTL_SECONDS: float = 30.0
+
     # AI Provider Configuration
     # Options: "ollama" (free/local), "openai", "gemini", "none"
     AI_PROVIDER: str = "ollama"
@@ -6,29 +6,32 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import record_query, register_pool_metrics
 
 # Configure logging for slow queries
 _query_logger = logging.getLogger("synapse.queries")
 
 engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+register_pool_metrics(engine)
 
 Base = declarative_base()
 
 
-# Query timing for performance monitoring
+# Query timing for performance monitoring (slow query log + /metrics)
 @event.listens_for(Engine, "before_cursor_execute")
 def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
     """Record query start time."""
-    conn.info.setdefault("query_start_time", []).append(time.time())
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
 
 
 @event.listens_for(Engine, "after_cursor_execute")
 def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    """Log slow queries (>500ms)."""
+    """Record query metrics and log slow queries (>500ms)."""
     start_times = conn.info.get("query_start_time", [])
     if start_times:
-        total_time = time.time() - start_times.pop(-1)
+        total_time = time.perf_counter() - start_times.pop(-1)
+        record_query(statement, total_time)
         # Log queries taking more than 500ms
         if total_time > 0.5:
             _query_logger.warning(
@@ -44,3 +47,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_session_factory():
+    """Factory for sessions that commit independently of the request session."""
+    return SessionLocal
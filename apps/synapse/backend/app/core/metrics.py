@@ -0,0 +1,385 @@
+"""
+Prometheus Metrics
+
+Minimal, dependency-free metric types rendered in the Prometheus text
+exposition format (served on /metrics):
+- Counter, Gauge (set directly or read from a callback at scrape time) and
+  Histogram, each with optional labels
+- per-request DB query count / DB time, collected by the cursor events in
+  core/database.py into the QueryStats of the current request (contextvar,
+  so it follows the request into threadpool endpoints)
+- PhaseTimer for exclusive per-phase timings (rule engine load / evaluate /
+  act / log)
+
+Example:
+    RUNS = REGISTRY.register(Histogram("synapse_runs_seconds", "Run time", labels=("kind",)))
+    RUNS.observe(0.42, kind="import")
+
+    with track_queries() as queries:
+        ...
+    queries.count, queries.seconds
+"""
+
+import bisect
+import functools
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+# Default latency buckets (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = tuple[str, ...]
+
+
+# =============================================================================
+# METRIC TYPES
+# =============================================================================
+
+
+class Metric:
+    """Named metric with a fixed set of label names"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def samples(self) -> Iterator[tuple[str, LabelValues, float]]:
+        """(suffix, label values, value) of every sample"""
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, values, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(self.labels, values)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing value"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] += amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, value in items:
+            yield "_total", values, value
+
+
+class Gauge(Metric):
+    """Current value, set directly or read from `collect` at scrape time"""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        collect: Callable[[], dict[LabelValues, float]] | None = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def samples(self):
+        if self._collect is not None:
+            items = sorted(self._collect().items())
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        for values, value in items:
+            yield "", values, value
+
+
+@dataclass
+class HistogramSeries:
+    """Observations of one label combination"""
+
+    buckets: list[int]  # Per bucket (not cumulative); the last one is +Inf
+    count: int = 0
+    sum: float = 0.0
+
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = HistogramSeries([0] * (len(self.buckets) + 1))
+            series.buckets[index] += 1
+            series.count += 1
+            series.sum += value
+
+    def series(self) -> dict[LabelValues, HistogramSeries]:
+        """Snapshot of every label combination"""
+        with self._lock:
+            return {
+                key: HistogramSeries(list(s.buckets), s.count, s.sum)
+                for key, s in sorted(self._series.items())
+            }
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        names = self.labels + ("le",)
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        for values, series in self.series().items():
+            cumulative = 0
+            for bound, count in zip(bounds, series.buckets, strict=True):
+                cumulative += count
+                labels = _format_labels(names, values + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{labels} {series.count}")
+        return lines
+
+
+def _format_value(value: float) -> str:
+    """Full precision (rate() needs every digit of large counters); integers without '.0'"""
+    value = float(value)
+    if value.is_integer() and abs(value) < 2**53:
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues) -> str:
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+
+class Registry:
+    """Metrics exposed on /metrics"""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric (a metric already registered under the name is replaced)"""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# =============================================================================
+# DATABASE QUERIES
+# =============================================================================
+
+
+DB_QUERY_SECONDS = REGISTRY.register(
+    Histogram(
+        "synapse_db_query_duration_seconds",
+        "Duration of individual SQL statements",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+    )
+)
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed within one request (or tracked block)"""
+
+    count: int = 0
+    seconds: float = 0.0
+
+    def add(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+
+
+# Tracked blocks of the current context, outermost first (a budgeted block
+# inside a request counts toward both)
+_query_stats: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+@contextmanager
+def track_queries(stats: QueryStats | None = None) -> Iterator[QueryStats]:
+    """Collect the SQL statements executed in this context into a QueryStats"""
+    stats = stats or QueryStats()
+    token = _query_stats.set(_query_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def record_query(statement: str, seconds: float):
+    """Called by the after_cursor_execute listener for every statement"""
+    DB_QUERY_SECONDS.observe(seconds)
+    for stats in _query_stats.get():
+        stats.add(statement, seconds)
+
+
+def register_pool_metrics(engine) -> None:
+    """Expose connection pool saturation of an engine (QueuePool only)"""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+
+    def gauge(name: str, documentation: str, read: Callable[[], float]):
+        REGISTRY.register(Gauge(name, documentation, collect=lambda: {(): read()}))
+
+    gauge("synapse_db_pool_size", "Connections kept open by the pool", pool.size)
+    gauge("synapse_db_pool_checked_out", "Connections currently in use", pool.checkedout)
+    gauge("synapse_db_pool_overflow", "Connections open beyond the pool size", pool.overflow)
+    gauge(
+        "synapse_db_pool_max_overflow",
+        "Overflow connections allowed beyond the pool size",
+        lambda: pool._max_overflow,
+    )
+
+
+# =============================================================================
+# RULE ENGINE
+# =============================================================================
+
+
+RULE_PHASE_SECONDS = REGISTRY.register(
+    Histogram(
+        "synapse_rule_phase_seconds",
+        "Time spent per rule engine run in each phase (load, evaluate, act, log)",
+        labels=("phase",),
+        buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+    )
+)
+
+
+class PhaseTimer:
+    """
+    Accumulates exclusive time per phase.
+
+    Phases may nest; time spent in an inner phase is not counted in the
+    outer one. Each thread keeps its own phase stack, so worker threads can
+    share a timer (totals are then summed thread time).
+    """
+
+    def __init__(self):
+        self.totals: dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def phase(self, name: str | None) -> Iterator[None]:
+        """Attribute time to `name` (None = not counted, e.g. waiting on workers)"""
+        local = self._local
+        stack = local.__dict__.setdefault("stack", [])
+        now = time.perf_counter()
+        if stack:
+            self._add(stack[-1], now - local.mark)
+        stack.append(name)
+        local.mark = now
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._add(stack.pop(), now - local.mark)
+            local.mark = now
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        """`fn` timed under `name` on every call"""
+
+        def timed(*args, **kwargs):
+            with self.phase(name):
+                return fn(*args, **kwargs)
+
+        return timed
+
+    def milliseconds(self) -> dict[str, int]:
+        return {name: int(seconds * 1000) for name, seconds in self.totals.items()}
+
+    def observe(self, histogram: Histogram = RULE_PHASE_SECONDS):
+        """Record the totals of one run"""
+        for name, seconds in self.totals.items():
+            histogram.observe(seconds, phase=name)
+
+    def _add(self, name: str | None, seconds: float):
+        if name is not None:
+            with self._lock:
+                self.totals[name] += seconds
+
+
+def timed_phase(name: str):
+    """Method decorator timing calls under `name` in the instance's `phases` timer"""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            with self.phases.phase(name):
+                return fn(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,196 @@
+"""
+Query Budgets and N+1 Detection (development / CI)
+
+Builds on the per-request QueryStats collected by the cursor events in
+core/database.py:
+- statements are fingerprinted (literals, bound parameters and IN lists
+  collapsed), so a query issued in a loop has a single shape; a shape run
+  N_PLUS_ONE_THRESHOLD times within one request is reported with the app
+  code that issued it (DevConsole WARN entry, synapse_http_request_n_plus_one)
+- query_budget(n) caps the statements run by a block or an endpoint; going
+  over raises QueryBudgetExceeded when QUERY_BUDGET_ENFORCE is set (tests/CI)
+  and logs a warning otherwise
+
+Example:
+    @router.get("/{asset_id}/details")
+    @query_budget(10)
+    def get_details(...): ...
+
+    with query_budget(3):
+        ValidationService.get_validation_details(db, project_id)
+"""
+
+import asyncio
+import functools
+import logging
+import re
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.exceptions import SynapseException
+from app.core.metrics import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# Frames of the query plumbing itself are not attributed
+_PLUMBING = {
+    str(APP_DIR / "core" / "database.py"),
+    str(APP_DIR / "core" / "metrics.py"),
+    str(Path(__file__).resolve()),
+}
+
+# App frames kept per repeated statement, innermost first
+LOCATION_DEPTH = 3
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\?")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(SynapseException):
+    """More SQL statements than the budget of a block or endpoint"""
+
+    pass
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape: literals and parameters replaced, IN lists collapsed"""
+    shape = _STRING.sub("?", statement)
+    shape = _PARAM.sub("?", shape)
+    shape = _PARAM_LIST.sub("(...)", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+# =============================================================================
+# N+1 DETECTION
+# =============================================================================
+
+
+@dataclass
+class RepeatedStatement:
+    """Statement shape executed at least the threshold number of times"""
+
+    fingerprint: str
+    count: int
+    location: list[str]  # "services/x.py:69 in func", innermost first
+
+
+@dataclass
+class InspectedQueryStats(QueryStats):
+    """QueryStats that also counts executions per statement shape"""
+
+    threshold: int = 0
+    shapes: dict[str, int] = field(default_factory=dict)
+    repeated: dict[str, RepeatedStatement] = field(default_factory=dict)
+
+    def add(self, statement: str, seconds: float):
+        super().add(statement, seconds)
+        shape = fingerprint(statement)
+        count = self.shapes.get(shape, 0) + 1
+        self.shapes[shape] = count
+        if count == self.threshold:
+            self.repeated[shape] = RepeatedStatement(shape, count, _app_location())
+        elif count > self.threshold:
+            self.repeated[shape].count = count
+
+
+def request_query_stats() -> QueryStats:
+    """Stats for one request (inspected when N+1 detection is on)"""
+    if settings.N_PLUS_ONE_THRESHOLD > 0:
+        return InspectedQueryStats(threshold=settings.N_PLUS_ONE_THRESHOLD)
+    return QueryStats()
+
+
+def _app_location() -> list[str]:
+    """Innermost app frames of the current stack"""
+    frames = []
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename in _PLUMBING or not frame.filename.startswith(str(APP_DIR)):
+            continue
+        path = Path(frame.filename).relative_to(APP_DIR)
+        frames.append(f"{path}:{frame.lineno} in {frame.name}")
+        if len(frames) == LOCATION_DEPTH:
+            break
+    return frames
+
+
+# =============================================================================
+# QUERY BUDGETS
+# =============================================================================
+
+
+class query_budget:
+    """
+    Cap on the SQL statements run by a block (context manager) or an endpoint
+    (decorator, below the route decorator).
+
+    Args:
+        max_queries: Statements allowed
+        enforce: Raise QueryBudgetExceeded when over budget instead of logging
+            a warning (default: settings.QUERY_BUDGET_ENFORCE)
+        name: Label used in the report (default: decorated function name)
+    """
+
+    def __init__(self, max_queries: int, enforce: bool | None = None, name: str | None = None):
+        self.max_queries = max_queries
+        self.enforce = settings.QUERY_BUDGET_ENFORCE if enforce is None else enforce
+        self.name = name or "query_budget"
+        self._tracking = None
+        self.stats: InspectedQueryStats | None = None
+
+    def __enter__(self) -> InspectedQueryStats:
+        # Any repeated shape is worth naming when the budget is exceeded
+        self._tracking = track_queries(InspectedQueryStats(threshold=2))
+        self.stats = self._tracking.__enter__()
+        return self.stats
+
+    def __exit__(self, exc_type, exc, tb):
+        self._tracking.__exit__(exc_type, exc, tb)
+        if exc_type is None and self.stats.count > self.max_queries:
+            self._report()
+        return False
+
+    def __call__(self, fn):
+        name = self.name if self.name != "query_budget" else fn.__qualname__
+
+        # A fresh budget per call: decorated endpoints run concurrently
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with query_budget(self.max_queries, self.enforce, name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with query_budget(self.max_queries, self.enforce, name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    def _report(self):
+        repeated = sorted(self.stats.repeated.values(), key=lambda r: r.count, reverse=True)
+        message = f"{self.name} ran {self.stats.count} queries (budget {self.max_queries})"
+        if repeated:
+            top = repeated[0]
+            where = top.location[0] if top.location else "unknown"
+            message += f"; {top.count}x at {where}: {top.fingerprint[:200]}"
+        if self.enforce:
+            raise QueryBudgetExceeded(
+                message,
+                {
+                    "queries": self.stats.count,
+                    "budget": self.max_queries,
+                    "repeated": [r.__dict__ for r in repeated],
+                },
+            )
+        logger.warning(message)
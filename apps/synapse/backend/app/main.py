@@ -13,6 +13,7 @@ from app.api.endpoints import (
     ingestion,
     locations,
     logs,
+    metrics,
     owner_portal,
     packages,
     projects,
@@ -21,6 +22,7 @@ from app.api.endpoints import (
     validation,
     workflow,
 )
+from app.core.config import settings
 from app.core.exceptions import (
     BusinessLogicError,
     DatabaseError,
@@ -32,9 +34,11 @@ from app.core.exceptions import (
     RuleExecutionError,
 )
 from app.core.exceptions import ValidationError as SynapseValidationError
-from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.logging_middleware import LoggingMiddleware, get_request_log_worker
 from app.routers import ai, cables, mock
 from app.routers import metamodel as metamodel_router
+from app.services.export_jobs import get_export_queue
+from app.services.search_sync import get_search_sync_worker
 
 app = FastAPI(
     title="AXOIQ SYNAPSE API",
@@ -46,7 +50,16 @@ app = FastAPI(
 @app.on_event("startup")
 def on_startup():
     # Base.metadata.create_all(bind=engine)
-    pass
+    # With sync disabled the worker only prunes the outbox
+    if settings.SEARCH_SYNC_ENABLED or settings.SEARCH_OUTBOX_RETENTION_HOURS > 0:
+        get_search_sync_worker().start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    get_search_sync_worker().stop()
+    get_export_queue().shutdown()
+    get_request_log_worker().stop()
 
 
 # CORS Configuration - Secure by default
@@ -200,6 +213,7 @@ app.include_router(rules.router, tags=["rules"])
 app.include_router(actions.router, tags=["actions"])
 app.include_router(validation.router, prefix="/api/v1", tags=["validation"])
 app.include_router(logs.router, tags=["logs"])
+app.include_router(metrics.router, tags=["metrics"])
 
 app.include_router(owner_portal.router, prefix="/api/v1/owner", tags=["owner"])
 
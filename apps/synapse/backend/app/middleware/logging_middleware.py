@@ -1,167 +1,355 @@
 """
 Logging middleware that captures all HTTP requests and broadcasts them via WebSocket.
+
+Pure ASGI (no BaseHTTPMiddleware task/stream wrapping). The request path only
+appends a small record to an in-memory queue (deque appends are atomic, no
+lock); RequestLogWorker drains it in a background task:
+- RESPONSE / ERROR log entries for every request
+- DEBUG "request start" entries for a sample of requests (REQUEST_LOG_SAMPLE_RATE)
+- per-route latency, DB query count and DB time histograms (route templates,
+  so ids don't explode the keys), exposed on /metrics
 """
 
+import asyncio
+import random
 import time
 import uuid
-from collections.abc import Callable
+from collections import deque
+from dataclasses import dataclass
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import settings
+from app.core.metrics import REGISTRY, Counter, Histogram, Metric, track_queries
+from app.core.query_budget import RepeatedStatement, request_query_stats
 from app.services.websocket_manager import WebSocketLogger
 
+# Skip WebSocket upgrades and health checks for noise reduction
+SKIP_PATHS = frozenset({"/health", "/metrics", "/ws/logs", "/docs", "/openapi.json", "/redoc"})
+
+# Latency histogram bucket upper bounds (ms); the last bucket is +Inf
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Histogram key of requests that matched no route
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Longest a record waits in the queue before it is logged
+FLUSH_INTERVAL_SECONDS = 0.2
+
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+@dataclass(slots=True)
+class RequestRecord:
+    """One request event queued by the middleware."""
+
+    kind: str  # "start" or "end"
+    request_id: str
+    method: str
+    path: str
+    client_ip: str
+    route: str | None = None
+    status_code: int | None = None
+    duration_ms: float | None = None
+    error: str | None = None
+    user_id: str | None = None
+    user_name: str | None = None
+    db_queries: int = 0
+    db_ms: float = 0.0
+    repeated: list[RepeatedStatement] | None = None  # N+1 candidates
+
+
+class LoggingMiddleware:
     """Middleware to log all HTTP requests and broadcast to WebSocket clients."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip WebSocket upgrades and health checks for noise reduction
-        if request.url.path in ["/health", "/ws/logs", "/docs", "/openapi.json", "/redoc"]:
-            return await call_next(request)
+    def __init__(self, app: ASGIApp, worker: "RequestLogWorker | None" = None):
+        self.app = app
+        self.worker = worker or get_request_log_worker()
 
-        # Skip OPTIONS requests
-        if request.method == "OPTIONS":
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in SKIP_PATHS or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
 
-        request_id = str(uuid.uuid4())[:8]
-        start_time = time.time()
+        worker = self.worker
+        client = scope.get("client")
+        record = RequestRecord(
+            kind="end",
+            request_id=str(uuid.uuid4())[:8],
+            method=scope["method"],
+            path=scope["path"],
+            client_ip=client[0] if client else "unknown",
+        )
+        if worker.sample_rate and random.random() < worker.sample_rate:
+            worker.record(
+                RequestRecord(
+                    "start", record.request_id, record.method, record.path, record.client_ip
+                )
+            )
+
+        status_code = 500
+        start_time = time.perf_counter()
 
-        # Extract request info
-        method = request.method
-        path = request.url.path
-        client_ip = request.client.host if request.client else "unknown"
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        # Extract user context from request (if JWT is present)
-        user_id = None
-        user_name = None
         try:
-            # Try to get user from request state (set by auth dependencies)
-            user = getattr(request.state, "user", None)
-            if user:
-                user_id = str(user.id) if hasattr(user, "id") else None
-                user_name = user.email if hasattr(user, "email") else None
-        except Exception:
-            pass  # No user context available
-
-        # Auto-detect topic from path
-        topic = self._detect_topic(path)
-
-        # Log request start (DEBUG level for User mode filtering)
-        await self._broadcast_log(
-            level="DEBUG",
-            message=f"{method} {path}",
-            source="BACKEND",
-            action_type="REQUEST",
-            user_id=user_id,
-            user_name=user_name,
-            topic=topic,
-            context={
-                "request_id": request_id,
-                "client_ip": client_ip,
-                "method": method,
-                "path": path,
-            },
+            with track_queries(request_query_stats()) as queries:
+                await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            record.error = str(e)
+            raise
+        finally:
+            record.duration_ms = (time.perf_counter() - start_time) * 1000
+            record.status_code = status_code
+            record.db_queries = queries.count
+            record.db_ms = queries.seconds * 1000
+            record.repeated = list(getattr(queries, "repeated", {}).values()) or None
+            route = scope.get("route")
+            record.route = getattr(route, "path", None)
+            # User context (set on request.state by auth dependencies, if any)
+            user = scope.get("state", {}).get("user")
+            if user is not None:
+                record.user_id = str(user.id) if hasattr(user, "id") else None
+                record.user_name = user.email if hasattr(user, "email") else None
+            worker.record(record)
+
+
+class RequestLogWorker:
+    """Drains queued request records into logs and latency histograms."""
+
+    def __init__(self, sample_rate: float | None = None, max_pending: int | None = None):
+        self.sample_rate = settings.REQUEST_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        self._pending: deque[RequestRecord] = deque(
+            maxlen=max_pending or settings.REQUEST_LOG_QUEUE_SIZE
+        )
+        labels = ("method", "route")
+        self.request_seconds = Histogram(
+            "synapse_http_request_duration_seconds",
+            "HTTP request latency",
+            labels=labels,
+            buckets=tuple(bound / 1000 for bound in LATENCY_BUCKETS_MS),
+        )
+        self.request_errors = Counter(
+            "synapse_http_request_errors", "HTTP requests failed with 5xx or an exception", labels
+        )
+        self.db_queries = Histogram(
+            "synapse_http_request_db_queries",
+            "SQL statements executed per HTTP request",
+            labels=labels,
+            buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 1000),
         )
+        self.db_seconds = Histogram(
+            "synapse_http_request_db_seconds", "Database time per HTTP request", labels=labels
+        )
+        self.n_plus_one = Counter(
+            "synapse_http_request_n_plus_one",
+            "Statement shapes repeated N_PLUS_ONE_THRESHOLD+ times in one HTTP request",
+            labels,
+        )
+        self._task: asyncio.Task | None = None
 
-        # Process request
+    def record(self, record: RequestRecord):
+        """Queue a record (called on the request path; never waits)."""
+        self._pending.append(record)
+        if self._task is None or self._task.done():
+            self._start()
+
+    def _start(self):
         try:
-            response = await call_next(request)
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Determine log level based on status code
-            status_code = response.status_code
-            if status_code >= 500:
-                level = "ERROR"
-            elif status_code >= 400:
-                level = "WARN"
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Drained on the next call from inside the event loop
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            try:
+                await self.drain()
+            except Exception as e:
+                print(f"[RequestLog] Drain failed: {e}", flush=True)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def drain(self) -> int:
+        """Log and aggregate every queued record; returns how many were processed."""
+        processed = 0
+        while self._pending:
+            record = self._pending.popleft()
+            processed += 1
+            if record.kind == "start":
+                await self._log_start(record)
             else:
-                level = "INFO"
+                self._observe(record)
+                await self._log_end(record)
+                for repeated in record.repeated or ():
+                    await self._log_repeated(record, repeated)
+        return processed
 
-            # Log response with performance metrics
-            await self._broadcast_log(
-                level=level,
-                message=f"{method} {path} → {status_code} ({duration_ms:.0f}ms)",
-                source="BACKEND",
-                action_type="RESPONSE",
-                user_id=user_id,
-                user_name=user_name,
-                topic=topic,
-                response_time=round(duration_ms, 2),
-                context={
-                    "request_id": request_id,
-                    "status_code": status_code,
-                    "duration_ms": round(duration_ms, 2),
-                    "method": method,
-                    "path": path,
-                },
-            )
+    def metrics(self) -> list[Metric]:
+        return [
+            self.request_seconds,
+            self.request_errors,
+            self.db_queries,
+            self.db_seconds,
+            self.n_plus_one,
+        ]
 
-            return response
+    def latency_stats(self) -> dict[str, dict]:
+        """Per-route latency histograms (ms buckets), keyed "METHOD /route/{param}"."""
+        bounds = [str(bound) for bound in LATENCY_BUCKETS_MS] + ["+Inf"]
+        db_queries = self.db_queries.series()
+        db_seconds = self.db_seconds.series()
+        stats = {}
+        for key, series in self.request_seconds.series().items():
+            method, route = key
+            stats[f"{method} {route}"] = {
+                "count": series.count,
+                "avg_ms": round(series.sum * 1000 / series.count, 2),
+                "errors": int(self.request_errors.get(method=method, route=route)),
+                "avg_db_queries": round(db_queries[key].sum / series.count, 2),
+                "avg_db_ms": round(db_seconds[key].sum * 1000 / series.count, 2),
+                "buckets": dict(zip(bounds, series.buckets, strict=True)),
+            }
+        return stats
 
-        except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
 
-            # Log error
-            await self._broadcast_log(
+    def _observe(self, record: RequestRecord):
+        # Unrouted paths (404s, scanners) share one key to keep the series bounded
+        labels = {"method": record.method, "route": record.route or UNMATCHED_ROUTE}
+        self.request_seconds.observe(record.duration_ms / 1000, **labels)
+        self.db_queries.observe(record.db_queries, **labels)
+        self.db_seconds.observe(record.db_ms / 1000, **labels)
+        if record.error is not None or record.status_code >= 500:
+            self.request_errors.inc(**labels)
+        if record.repeated:
+            self.n_plus_one.inc(len(record.repeated), **labels)
+
+    async def _log_start(self, record: RequestRecord):
+        # DEBUG level for User mode filtering
+        await WebSocketLogger.log(
+            level="DEBUG",
+            message=f"{record.method} {record.path}",
+            source="BACKEND",
+            action_type="REQUEST",
+            topic=detect_topic(record.path),
+            context={
+                "request_id": record.request_id,
+                "client_ip": record.client_ip,
+                "method": record.method,
+                "path": record.path,
+            },
+        )
+
+    async def _log_end(self, record: RequestRecord):
+        method, path = record.method, record.path
+        duration_ms = round(record.duration_ms, 2)
+
+        if record.error is not None:
+            await WebSocketLogger.log(
                 level="ERROR",
-                message=f"{method} {path} → ERROR: {str(e)}",
+                message=f"{method} {path} → ERROR: {record.error}",
                 source="BACKEND",
                 action_type="ERROR",
-                user_id=user_id,
-                user_name=user_name,
-                topic=topic,
+                user_id=record.user_id,
+                user_name=record.user_name,
+                topic=detect_topic(path),
                 context={
-                    "request_id": request_id,
-                    "error": str(e),
-                    "duration_ms": round(duration_ms, 2),
+                    "request_id": record.request_id,
+                    "error": record.error,
+                    "duration_ms": duration_ms,
                 },
             )
-            raise
+            return
+
+        # Determine log level based on status code
+        status_code = record.status_code
+        if status_code >= 500:
+            level = "ERROR"
+        elif status_code >= 400:
+            level = "WARN"
+        else:
+            level = "INFO"
 
-    def _detect_topic(self, path: str) -> str:
-        """Auto-detect log topic from API path."""
-        path_lower = path.lower()
-
-        if "/assets" in path_lower:
-            return "ASSETS"
-        elif "/rules" in path_lower:
-            return "RULES"
-        elif "/cables" in path_lower:
-            return "CABLES"
-        elif "/import" in path_lower or "/upload" in path_lower:
-            return "IMPORT"
-        elif "/auth" in path_lower or "/login" in path_lower or "/token" in path_lower:
-            return "AUTH"
-        elif "/projects" in path_lower or "/project" in path_lower:
-            return "PROJECT"
-        elif "/io" in path_lower or "/io-list" in path_lower:
-            return "IO_LISTS"
-
-        return "SYSTEM"
-
-    async def _broadcast_log(
-        self,
-        level: str,
-        message: str,
-        source: str = "BACKEND",
-        action_type: str | None = None,
-        user_id: str | None = None,
-        user_name: str | None = None,
-        topic: str | None = None,
-        response_time: float | None = None,
-        context: dict | None = None,
-    ):
-        """Broadcast log entry to all WebSocket clients via WebSocketLogger."""
+        # Log response with performance metrics
         await WebSocketLogger.log(
             level=level,
-            message=message,
-            source=source,
-            action_type=action_type,
-            user_id=user_id,
-            user_name=user_name,
-            topic=topic,
-            response_time=response_time,
-            context=context,
+            message=f"{method} {path} → {status_code} ({record.duration_ms:.0f}ms)",
+            source="BACKEND",
+            action_type="RESPONSE",
+            user_id=record.user_id,
+            user_name=record.user_name,
+            topic=detect_topic(path),
+            response_time=duration_ms,
+            context={
+                "request_id": record.request_id,
+                "status_code": status_code,
+                "duration_ms": duration_ms,
+                "method": method,
+                "path": path,
+                "db_queries": record.db_queries,
+                "db_time_ms": round(record.db_ms, 2),
+            },
+        )
+
+    async def _log_repeated(self, record: RequestRecord, repeated: RepeatedStatement):
+        where = repeated.location[0] if repeated.location else "unknown"
+        await WebSocketLogger.log(
+            level="WARN",
+            message=f"N+1 query: {repeated.count}x at {where} ({record.method} {record.path})",
+            source="BACKEND",
+            action_type="N_PLUS_ONE",
+            user_id=record.user_id,
+            user_name=record.user_name,
+            topic=detect_topic(record.path),
+            context={
+                "request_id": record.request_id,
+                "statement": repeated.fingerprint,
+                "count": repeated.count,
+                "location": repeated.location,
+            },
         )
+
+
+def detect_topic(path: str) -> str:
+    """Auto-detect log topic from API path."""
+    path_lower = path.lower()
+
+    if "/assets" in path_lower:
+        return "ASSETS"
+    elif "/rules" in path_lower:
+        return "RULES"
+    elif "/cables" in path_lower:
+        return "CABLES"
+    elif "/import" in path_lower or "/upload" in path_lower:
+        return "IMPORT"
+    elif "/auth" in path_lower or "/login" in path_lower or "/token" in path_lower:
+        return "AUTH"
+    elif "/projects" in path_lower or "/project" in path_lower:
+        return "PROJECT"
+    elif "/io" in path_lower or "/io-list" in path_lower:
+        return "IO_LISTS"
+
+    return "SYSTEM"
+
+
+# Singleton instance
+_request_log_worker: RequestLogWorker | None = None
+
+
+def get_request_log_worker() -> RequestLogWorker:
+    """Get singleton request log worker"""
+    global _request_log_worker
+    if _request_log_worker is None:
+        _request_log_worker = RequestLogWorker()
+        for metric in _request_log_worker.metrics():
+            REGISTRY.register(metric)
+    return _request_log_worker
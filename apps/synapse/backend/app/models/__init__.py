@@ -6,8 +6,9 @@ from .cables import Cable, CableSizingRule, CableType
 from .ingestion import DataSource, DetectedType, ImportStatus, IngestStatus, StagedRow
 from .metamodel import MetamodelEdge, MetamodelNode
 from .models import Asset, AssetType, Connection, IOType, LBSNode, LocationType
-from .packages import Package, PackageStatus
+from .packages import ExportJob, ExportJobStatus, Package, PackageStatus
 from .rules import RuleActionType, RuleDefinition, RuleExecution, RuleSource
+from .search import SearchOutbox
 from .workflow import (
     AssetChange,
     AssetVersion,
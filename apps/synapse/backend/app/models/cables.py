@@ -16,6 +16,8 @@ from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 
+from .search import search_indexes, search_text_column, search_vector_column
+
 
 class Cable(Base):
     """
@@ -89,6 +91,12 @@ class Cable(Base):
     created_by = Column(String(100))
     notes = Column(Text)
 
+    # Fallback search (generated)
+    search_text = search_text_column("tag", "description", "cable_type")
+    search_vector = search_vector_column("tag", "description", "cable_type")
+
+    __table_args__ = search_indexes("cables")
+
     # Relationships
     from_asset = relationship("Asset", foreign_keys=[from_asset_id], backref="cables_from")
     to_asset = relationship("Asset", foreign_keys=[to_asset_id], backref="cables_to")
@@ -17,6 +17,8 @@ from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 
+from .search import search_indexes, search_text_column, search_vector_column
+
 
 def generate_uuid():
     return str(uuid.uuid4())
@@ -84,6 +86,7 @@ class Asset(Base):
         UniqueConstraint("tag", "project_id", name="uix_project_tag"),
         Index("ix_asset_project_id", "project_id"),
         Index("ix_asset_type_project", "type", "project_id"),
+        *search_indexes("assets"),
     )
 
     @property
@@ -126,6 +129,10 @@ class Asset(Base):
     package_id = Column(String, ForeignKey("packages.id"), nullable=True, index=True)
     package = relationship("Package", back_populates="assets")
 
+    # Fallback search (generated)
+    search_text = search_text_column("tag", "description", "system", "area")
+    search_vector = search_vector_column("tag", "description", "system", "area")
+
 
 class LBSNode(Base):
     __tablename__ = "lbs_nodes"
@@ -143,7 +150,11 @@ class LBSNode(Base):
     # Soft delete support
     deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
-    __table_args__ = (Index("ix_lbs_project_id", "project_id"),)
+    # Fallback search (generated)
+    search_text = search_text_column("name")
+    search_vector = search_vector_column("name")
+
+    __table_args__ = (Index("ix_lbs_project_id", "project_id"), *search_indexes("lbs_nodes"))
 
     @property
     def is_deleted(self) -> bool:
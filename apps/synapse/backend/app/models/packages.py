@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -18,6 +18,13 @@ class PackageStatus(str, enum.Enum):
     CLOSED = "CLOSED"
 
 
+class ExportJobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
 class Package(Base):
     __tablename__ = "packages"
 
@@ -40,3 +47,31 @@ class Package(Base):
     # Relationships
     project = relationship("Project")
     assets = relationship("Asset", back_populates="package")
+
+
+class ExportJob(Base):
+    """Background package export; the artifact is stored under content_hash."""
+
+    __tablename__ = "export_jobs"
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    package_id = Column(
+        String, ForeignKey("packages.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    template_type = Column(String, nullable=False)
+    format = Column(String, nullable=False, default="xlsx")
+
+    status = Column(Enum(ExportJobStatus), nullable=False, default=ExportJobStatus.QUEUED)
+    progress = Column(Integer, nullable=False, default=0)  # Percent of rows written
+
+    # Content hash of the export (see TemplateService.content_hash)
+    content_hash = Column(String(64), nullable=True)
+    cached = Column(Boolean, nullable=False, default=False)  # Served from an existing artifact
+    file_name = Column(String, nullable=True)
+    file_size = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_by = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
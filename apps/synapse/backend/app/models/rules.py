@@ -15,6 +15,8 @@ from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 
+from .search import search_indexes, search_text_column, search_vector_column
+
 
 class RuleSource(str, enum.Enum):
     """
@@ -169,6 +171,12 @@ class RuleDefinition(Base):
     success_count = Column(Integer, default=0)
     failure_count = Column(Integer, default=0)
 
+    # Fallback search (generated)
+    search_text = search_text_column("name", "description")
+    search_vector = search_vector_column("name", "description")
+
+    __table_args__ = search_indexes("rule_definitions")
+
     # Relationships
     executions = relationship("RuleExecution", back_populates="rule", cascade="all, delete-orphan")
     creator = relationship("User", foreign_keys=[created_by])
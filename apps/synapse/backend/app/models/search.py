@@ -0,0 +1,142 @@
+"""
+Search Models
+
+- SearchOutbox: change-data-capture table feeding the MeiliSearch sync worker
+  (app/services/search_sync.py)
+- search_text / search_vector: generated columns backing the PostgreSQL
+  fallback search (app/services/pg_search_service.py)
+
+Outbox rows are written by PostgreSQL statement-level triggers on the indexed tables,
+so ORM flushes, bulk Core statements (CSV upserts, batch rollbacks) and raw SQL
+are all captured in the same transaction as the change itself. A row only says
+"this entity changed"; the worker reloads the current state when it syncs.
+"""
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import ColumnProperty, deferred
+
+from app.core.database import Base
+
+# Entity type -> source table captured by the outbox triggers
+OUTBOX_TABLES = {
+    "asset": "assets",
+    "cable": "cables",
+    "rule": "rule_definitions",
+    "location": "lbs_nodes",
+}
+
+
+class SearchOutbox(Base):
+    """Pending search index change for one entity"""
+
+    __tablename__ = "search_outbox"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity_type = Column(String(20), nullable=False)  # asset, cable, rule, location
+    entity_id = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (Index("ix_search_outbox_created", "created_at"),)
+
+
+# =============================================================================
+# FALLBACK SEARCH COLUMNS (PostgreSQL)
+# =============================================================================
+
+
+def _search_expression(fields: tuple[str, ...]) -> str:
+    # Plain || keeps the expression IMMUTABLE, as generated columns require
+    return " || ' ' || ".join(f"coalesce({field}, '')" for field in fields)
+
+
+def search_text_column(*fields: str) -> ColumnProperty:
+    """Generated text searched with pg_trgm (ILIKE, similarity); GIN-index it"""
+    return deferred(Column(Text, Computed(_search_expression(fields), persisted=True)))
+
+
+def search_vector_column(*fields: str) -> ColumnProperty:
+    """Generated tsvector matched with @@ and ranked with ts_rank; GIN-index it"""
+    expression = f"to_tsvector('simple'::regconfig, {_search_expression(fields)})"
+    return deferred(Column(TSVECTOR, Computed(expression, persisted=True)))
+
+
+def search_indexes(table: str) -> tuple[Index, Index]:
+    """GIN indexes for a table's search_text (trigram) and search_vector columns"""
+    return (
+        Index(
+            f"ix_{table}_search_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index(f"ix_{table}_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+
+def _create_trigram_extension(target, connection, **kw):
+    """gin_trgm_ops must exist before metadata.create_all() builds the indexes"""
+    if connection.dialect.name == "postgresql":
+        connection.execute(DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+event.listen(Base.metadata, "before_create", _create_trigram_extension)
+
+
+# =============================================================================
+# CAPTURE TRIGGERS (PostgreSQL)
+# =============================================================================
+
+CAPTURE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION search_outbox_capture() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO search_outbox (entity_type, entity_id)
+    SELECT DISTINCT TG_ARGV[0], changed_rows.id::text FROM changed_rows;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def capture_trigger_sql(entity_type: str, table: str) -> list[str]:
+    """
+    Statement-level triggers for one table.
+
+    Transition tables let a 10k-row upsert add its outbox rows in one
+    INSERT ... SELECT instead of firing 10k row triggers.
+    """
+    statements = []
+    for operation, transition in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        name = f"trg_{table}_search_outbox_{operation.lower()}"
+        statements.append(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+        statements.append(
+            f"CREATE TRIGGER {name} AFTER {operation} ON {table} "
+            f"REFERENCING {transition} TABLE AS changed_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION search_outbox_capture('{entity_type}')"
+        )
+    return statements
+
+
+def _install_capture_triggers(target, connection, **kw):
+    """Install outbox triggers when tables are created via metadata.create_all()"""
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(DDL(CAPTURE_FUNCTION_SQL))
+    for entity_type, table in OUTBOX_TABLES.items():
+        for statement in capture_trigger_sql(entity_type, table):
+            connection.execute(DDL(statement))
+
+
+event.listen(Base.metadata, "after_create", _install_capture_triggers)
@@ -8,7 +8,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
-from app.models.packages import PackageStatus
+from app.models.packages import ExportJobStatus, PackageStatus
 
 
 class PackageBase(BaseModel):
@@ -73,3 +73,32 @@ class PackageListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+
+
+class ExportJobCreate(BaseModel):
+    """Schema for queueing a package export."""
+
+    template_type: str = Field(..., pattern="^(IN-P040|CA-P040)$")
+    format: str = Field("xlsx", pattern="^(xlsx|pdf)$")
+
+
+class ExportJobResponse(BaseModel):
+    """Schema for export job status."""
+
+    id: str
+    package_id: str
+    template_type: str
+    format: str
+    status: ExportJobStatus
+    progress: int
+    cached: bool
+    file_name: str | None = None
+    file_size: int | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    download_url: str | None = None
+
+    class Config:
+        from_attributes = True
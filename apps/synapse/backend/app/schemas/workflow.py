@@ -341,9 +341,10 @@ class RollbackResultResponse(BaseModel):
 
     success: bool
     asset_id: str = Field(..., alias="assetId")
-    from_version: int = Field(..., alias="fromVersion")
-    to_version: int = Field(..., alias="toVersion")
-    new_version: int = Field(..., alias="newVersion")
+    # None for assets soft-deleted by a batch rollback (created by the batch)
+    from_version: int | None = Field(None, alias="fromVersion")
+    to_version: int | None = Field(None, alias="toVersion")
+    new_version: int | None = Field(None, alias="newVersion")
     message: str
     error: str | None = None
 
@@ -0,0 +1,259 @@
+"""
+Rule Condition Compiler
+
+Translates rule condition JSON into SQLAlchemy predicates over Asset columns
+and the JSON ``properties`` column, so rule matching happens in PostgreSQL
+(through ix_asset_type_project) instead of loading every asset into Python.
+
+Condition example:
+    {
+        "asset_type": "PUMP",
+        "property_filters": [
+            {"key": "power_kw", "op": ">", "value": 50},
+            {"key": "area", "op": "in", "value": ["310", "320"]}
+        ]
+    }
+
+The compiled predicate matches exactly what the Python evaluators in
+RuleExecutionService / RuleExecutor accept. Whenever a filter cannot be
+expressed with the same semantics (nested values, string ordering, relationship
+attributes...), compile() returns None and callers fall back to Python.
+"""
+
+from typing import Any
+
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import (
+    Float,
+    Integer,
+    Numeric,
+    String,
+    and_,
+    case,
+    cast,
+    false,
+    func,
+    not_,
+    or_,
+    true,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.models import Asset
+
+
+class ConditionCompiler:
+    """
+    Compiles rule conditions into SQL predicates on the Asset table.
+
+    Args:
+        include_columns: Resolve filter keys against Asset columns first
+            (RuleExecutionService semantics). When False, keys are only looked
+            up in the ``properties`` JSON (RuleExecutor semantics).
+    """
+
+    def __init__(self, include_columns: bool = True):
+        self.include_columns = include_columns
+
+    @staticmethod
+    def is_supported(db: Session) -> bool:
+        """Compiled predicates rely on PostgreSQL JSON functions."""
+        return db.get_bind().dialect.name == "postgresql"
+
+    def compile(self, condition: dict) -> ColumnElement | None:
+        """
+        Compile a condition into a predicate, or None if it must run in Python.
+
+        Only the keys evaluated by the rule engines are considered:
+        asset_type, node_type and property_filters.
+        """
+        if not isinstance(condition, dict):
+            return None
+
+        clauses = []
+
+        if "asset_type" in condition:
+            clauses.append(Asset.type == condition["asset_type"])
+
+        if "node_type" in condition:
+            clauses.append(Asset.type == condition["node_type"])
+
+        for filter_item in condition.get("property_filters") or []:
+            try:
+                key = filter_item["key"]
+                op = filter_item["op"]
+                value = filter_item["value"]
+            except (KeyError, TypeError):
+                return None
+
+            clause = self._compile_filter(key, op, value)
+            if clause is None:
+                return None
+            clauses.append(clause)
+
+        return and_(true(), *clauses)
+
+    # ==========================================================================
+    # FILTERS
+    # ==========================================================================
+
+    def _compile_filter(self, key: str, op: str, value: Any) -> ColumnElement | None:
+        """Compile one property filter, dispatching on where the key lives."""
+        if self.include_columns and hasattr(Asset, key):
+            column = Asset.__table__.c.get(key)
+            if column is None:
+                # Relationship or Python property: only evaluable on the object
+                return None
+            return _ColumnOperand(column).compile(op, value)
+
+        return _JSONOperand(Asset.properties[key]).compile(op, value)
+
+
+class _Operand:
+    """Common operator handling; subclasses provide typed comparisons."""
+
+    def compile(self, op: str, expected: Any) -> ColumnElement | None:
+        if op == "==":
+            return self.eq(expected)
+        elif op == "!=":
+            eq = self.eq(expected)
+            return not_(eq) if eq is not None else None
+        elif op in (">", "<", ">=", "<="):
+            return self.compare(op, expected)
+        elif op in ("in", "IN"):
+            if not isinstance(expected, list):
+                return false()
+            options = [self.eq(item) for item in expected]
+            if any(option is None for option in options):
+                return None
+            return or_(false(), *options)
+        elif op == "contains":
+            return self.contains(expected)
+        elif op in ("exists", "EXISTS"):
+            return not_(self.is_null())
+        elif op in ("not_exists", "NOT_EXISTS"):
+            return self.is_null()
+        return false()
+
+    # All predicates below must be NULL-free so that not_() stays correct.
+
+    def eq(self, expected: Any) -> ColumnElement | None:
+        raise NotImplementedError
+
+    def compare(self, op: str, expected: Any) -> ColumnElement | None:
+        raise NotImplementedError
+
+    def contains(self, expected: Any) -> ColumnElement | None:
+        raise NotImplementedError
+
+    def is_null(self) -> ColumnElement:
+        raise NotImplementedError
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _apply(op: str, left: ColumnElement, right: Any) -> ColumnElement:
+    if op == ">":
+        return left > right
+    elif op == "<":
+        return left < right
+    elif op == ">=":
+        return left >= right
+    return left <= right
+
+
+class _JSONOperand(_Operand):
+    """A key inside the ``properties`` JSON column."""
+
+    def __init__(self, element: ColumnElement):
+        self.element = element
+        # Missing keys and JSON null both read as None in Python
+        self.json_type = func.coalesce(func.json_typeof(element), "null")
+
+    def _number(self) -> ColumnElement:
+        # CASE guards the cast so non-numeric strings never reach it
+        return case(
+            (self.json_type == "number", cast(self.element.as_string(), Numeric)),
+        )
+
+    def eq(self, expected: Any) -> ColumnElement | None:
+        if expected is None:
+            return self.is_null()
+        if isinstance(expected, bool):
+            return and_(
+                self.json_type == "boolean",
+                self.element.as_string() == ("true" if expected else "false"),
+            )
+        if _is_number(expected):
+            return and_(self.json_type == "number", self._number() == expected)
+        if isinstance(expected, str):
+            return and_(self.json_type == "string", self.element.as_string() == expected)
+        return None
+
+    def compare(self, op: str, expected: Any) -> ColumnElement | None:
+        if not _is_number(expected):
+            return None
+        return and_(self.json_type == "number", _apply(op, self._number(), expected))
+
+    def contains(self, expected: Any) -> ColumnElement | None:
+        if isinstance(expected, str):
+            return or_(
+                and_(
+                    self.json_type == "string",
+                    self.element.as_string().contains(expected, autoescape=True),
+                ),
+                and_(self.json_type == "array", cast(self.element, JSONB).contains([expected])),
+            )
+        if _is_number(expected):
+            return and_(self.json_type == "array", cast(self.element, JSONB).contains([expected]))
+        return None
+
+    def is_null(self) -> ColumnElement:
+        return self.json_type == "null"
+
+
+class _ColumnOperand(_Operand):
+    """A scalar Asset column (area, system, discipline, lod, ...)."""
+
+    def __init__(self, column: ColumnElement):
+        self.column = column
+
+    def _accepts(self, expected: Any) -> bool:
+        column_type = self.column.type
+        if isinstance(column_type, SQLEnum):
+            return isinstance(expected, str)
+        if isinstance(column_type, String):
+            return isinstance(expected, str)
+        if isinstance(column_type, Integer | Float):
+            return _is_number(expected)
+        return False
+
+    def eq(self, expected: Any) -> ColumnElement | None:
+        if expected is None:
+            return self.is_null()
+        if not self._accepts(expected):
+            return None
+        if isinstance(self.column.type, SQLEnum) and expected not in self.column.type.enums:
+            return false()
+        return and_(self.column.isnot(None), self.column == expected)
+
+    def compare(self, op: str, expected: Any) -> ColumnElement | None:
+        # String ordering depends on collation, so only numbers are compiled
+        if not isinstance(self.column.type, Integer | Float) or not _is_number(expected):
+            return None
+        return and_(self.column.isnot(None), _apply(op, self.column, expected))
+
+    def contains(self, expected: Any) -> ColumnElement | None:
+        column_type = self.column.type
+        if isinstance(column_type, SQLEnum) or not isinstance(column_type, String):
+            return None
+        if not isinstance(expected, str):
+            return None
+        return and_(self.column.isnot(None), self.column.contains(expected, autoescape=True))
+
+    def is_null(self) -> ColumnElement:
+        return self.column.is_(None)
@@ -0,0 +1,496 @@
+"""
+CSV Import Service
+
+Streaming asset import. The upload is decoded and parsed incrementally and
+rows are processed in chunks, so memory stays flat and each chunk costs a
+fixed number of statements whatever its size:
+- one IN query resolving existing assets by id/tag
+- one INSERT ... ON CONFLICT ON CONSTRAINT uix_project_tag DO UPDATE
+- one bulk UPDATE for rows matched by id that rename their tag
+- batched versions, MetamodelNode sync and (buffered) workflow events
+
+A chunk that fails as a whole (e.g. an unknown location_id) is retried row by
+row in savepoints so only the offending rows are reported as failed.
+
+Example:
+    importer = CSVImportService(db, project_id, user_id, column_map=mapping)
+    result = importer.import_csv(file.file, file.filename, batch_id=batch_id)
+"""
+
+import csv
+import io
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import BinaryIO
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Asset, IOType
+from app.models.workflow import ChangeSource, LogSource
+from app.schemas.import_export import CSVRowError
+from app.services.metamodel import MetamodelService
+from app.services.versioning_service import VersioningService
+from app.services.workflow_logger import WorkflowLogger
+
+# Simple columns read from the CSV
+SCALAR_FIELDS = ("description", "area", "system", "manufacturer_part_id", "location_id")
+
+# Nested JSON columns and the known sub-fields for each
+NESTED_GROUPS = ("electrical", "process", "purchasing")
+KNOWN_NESTED = (
+    "electrical.voltage",
+    "electrical.powerKW",
+    "electrical.loadType",
+    "process.fluid",
+    "process.minRange",
+    "process.maxRange",
+    "process.units",
+    "purchasing.workPackageId",
+    "purchasing.status",
+)
+
+# Columns written by the upsert (None keeps the stored value on update)
+UPSERT_COLUMNS = ("type", "io_type", *SCALAR_FIELDS, *NESTED_GROUPS)
+
+_IO_TYPES = {io_type.value for io_type in IOType}
+
+
+@dataclass
+class CSVImportResult:
+    """Counts and row errors of a CSV import."""
+
+    total_rows: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class _PendingRow:
+    """A parsed row waiting to be written, merged with later rows for the same asset."""
+
+    row: int
+    tag: str
+    data: dict
+    existing_id: str | None = None
+    rename: bool = False
+    merged_rows: int = 0
+
+
+class _ColumnResolver:
+    """
+    Resolves system fields to CSV headers once per file.
+
+    Lookup order per field: mapped header, mapped header (case-insensitive),
+    field name, field name (case-insensitive).
+    """
+
+    def __init__(self, fieldnames: list[str], column_map: dict):
+        self.column_map = column_map
+        self.headers = [name for name in fieldnames if name]
+        self.lower = {name.lower(): name for name in self.headers}
+        self._resolved: dict[str, str | None] = {}
+
+        # Dotted columns that are not the target of a mapping are read as-is
+        mapped_headers = set(column_map.values())
+        self.legacy_nested = [
+            name
+            for name in self.headers
+            if "." in name and name.split(".")[0] in NESTED_GROUPS and name not in mapped_headers
+        ]
+
+    def header(self, system_field: str) -> str | None:
+        if system_field not in self._resolved:
+            self._resolved[system_field] = self._resolve(system_field)
+        return self._resolved[system_field]
+
+    def _resolve(self, system_field: str) -> str | None:
+        if system_field in self.column_map:
+            csv_header = self.column_map[system_field]
+            if csv_header in self.headers:
+                return csv_header
+            if csv_header.lower() in self.lower:
+                return self.lower[csv_header.lower()]
+
+        if system_field in self.headers:
+            return system_field
+        return self.lower.get(system_field.lower())
+
+    def value(self, row: dict, system_field: str):
+        header = self.header(system_field)
+        return row.get(header) if header else None
+
+
+def _set_nested(d: dict, keys: list[str], value):
+    for key in keys[:-1]:
+        d = d.setdefault(key, {})
+    d[keys[-1]] = value
+
+
+class CSVImportService:
+    """
+    Imports assets from a CSV stream into a project.
+
+    Rows whose tag (or id) already exists in the project update that asset;
+    other rows create assets and must provide a type.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        project_id: str,
+        user_id: str | None = None,
+        column_map: dict | None = None,
+        workflow_logger: WorkflowLogger | None = None,
+        chunk_size: int | None = None,
+    ):
+        """
+        Args:
+            db: Database session
+            project_id: Project to import into
+            user_id: User performing the import
+            column_map: {"system_field": "CSV header"} overrides
+            workflow_logger: Logger for per-asset events (buffered recommended)
+            chunk_size: Rows per chunk (default: settings.IMPORT_CHUNK_SIZE)
+        """
+        self.db = db
+        self.project_id = project_id
+        self.user_id = user_id
+        self.column_map = column_map or {}
+        self.workflow_logger = workflow_logger
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self._versioning = VersioningService(db, project_id, user_id)
+
+    # ==========================================================================
+    # IMPORT
+    # ==========================================================================
+
+    def import_csv(
+        self,
+        stream: BinaryIO,
+        filename: str,
+        batch_id: str | None = None,
+        correlation_id: str | None = None,
+        progress: Callable[[int, float | None], None] | None = None,
+    ) -> CSVImportResult:
+        """
+        Import a CSV file chunk by chunk, committing after each chunk.
+
+        Args:
+            stream: Binary file object (UTF-8, optional BOM)
+            filename: Original filename (for change reasons and logs)
+            batch_id: Batch operation the created versions belong to
+            correlation_id: Workflow the per-asset events belong to
+            progress: Called after each chunk with (rows processed, fraction
+                of the file read or None when the size is unknown)
+
+        Returns:
+            CSVImportResult
+        """
+        result = CSVImportResult()
+        total_size = _stream_size(stream)
+
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            reader = csv.DictReader(text)
+            resolver = _ColumnResolver(reader.fieldnames or [], self.column_map)
+
+            for chunk in self._chunks(reader):
+                result.total_rows += len(chunk)
+                self._import_chunk(chunk, resolver, result, filename, batch_id, correlation_id)
+
+                if progress:
+                    fraction = None
+                    if total_size:
+                        fraction = min(stream.tell() / total_size, 1.0)
+                    progress(result.total_rows, fraction)
+        finally:
+            # Leave the caller's stream open
+            text.detach()
+
+        return result
+
+    def _chunks(self, reader: csv.DictReader) -> Iterator[list[tuple[int, dict]]]:
+        chunk = []
+        for row_idx, row in enumerate(reader):
+            chunk.append((row_idx, row))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _import_chunk(
+        self,
+        chunk: list[tuple[int, dict]],
+        resolver: _ColumnResolver,
+        result: CSVImportResult,
+        filename: str,
+        batch_id: str | None,
+        correlation_id: str | None,
+    ):
+        parsed = []
+        for row_idx, row in chunk:
+            tag, asset_id, data, error = self._parse_row(row, resolver)
+            if error:
+                self._fail(result, row_idx, tag, error)
+            else:
+                parsed.append((row_idx, tag, asset_id, data))
+
+        pending = self._plan_chunk(parsed, result)
+        if not pending:
+            return
+
+        try:
+            with self.db.begin_nested():
+                written = self._write(pending, filename, batch_id)
+        except Exception:
+            # Isolate the failing rows
+            written = []
+            for item in pending:
+                try:
+                    with self.db.begin_nested():
+                        written.extend(self._write([item], filename, batch_id))
+                except Exception as e:
+                    self._fail(result, item.row, item.tag, f"System error: {e}")
+
+        # Read ids before the commit expires the returned objects
+        written_ids = [(item, asset.id) for item, asset in written]
+        self.db.commit()
+
+        for item, asset_id in written_ids:
+            if item.existing_id:
+                result.updated += 1
+            else:
+                result.created += 1
+            result.updated += item.merged_rows
+            self._log_row(item, asset_id, correlation_id)
+
+    # ==========================================================================
+    # PARSING
+    # ==========================================================================
+
+    def _parse_row(
+        self, row: dict, resolver: _ColumnResolver
+    ) -> tuple[str | None, str | None, dict, str | None]:
+        """Returns (tag, id, asset data, error)."""
+        tag = resolver.value(row, "tag")
+        if not tag:
+            return None, None, {}, "Missing required field: tag"
+
+        data = {"tag": tag}
+        for name in SCALAR_FIELDS:
+            data[name] = resolver.value(row, name)
+        data["location_id"] = data["location_id"] or None
+        for group in NESTED_GROUPS:
+            data[group] = {}
+
+        type_val = resolver.value(row, "type")
+        if type_val:
+            data["type"] = type_val
+
+        io_type_val = resolver.value(row, "io_type")
+        if io_type_val:
+            if io_type_val not in _IO_TYPES:
+                return tag, None, {}, f"Invalid io_type: {io_type_val}"
+            data["io_type"] = io_type_val
+
+        for name in KNOWN_NESTED:
+            value = resolver.value(row, name)
+            if value:
+                _set_nested(data, name.split("."), value)
+
+        for header in resolver.legacy_nested:
+            value = row.get(header)
+            if value:
+                _set_nested(data, header.split("."), value)
+
+        return tag, resolver.value(row, "id"), data, None
+
+    def _plan_chunk(
+        self, parsed: list[tuple[int, str, str | None, dict]], result: CSVImportResult
+    ) -> list[_PendingRow]:
+        """Resolve rows against existing assets (one query) and merge repeated rows."""
+        if not parsed:
+            return []
+
+        by_id, by_tag = self._existing_assets(
+            {asset_id for _, _, asset_id, _ in parsed if asset_id},
+            {tag for _, tag, _, _ in parsed},
+        )
+
+        pending: dict[tuple[str, str], _PendingRow] = {}
+        for row_idx, tag, asset_id, data in parsed:
+            existing = by_id.get(asset_id) if asset_id else None
+            existing = existing or by_tag.get(tag)
+            rename = existing is not None and existing.tag != tag
+
+            if rename:
+                # Matched by id with a new tag
+                if tag in by_tag or ("tag", tag) in pending:
+                    self._fail(result, row_idx, tag, f"Tag already exists: {tag}")
+                    continue
+                key = ("id", existing.id)
+                by_tag.pop(existing.tag, None)
+            else:
+                key = ("tag", tag)
+
+            item = pending.get(key)
+            if item:
+                # A later row for the same asset updates it, as it would row by row
+                item.data.update({k: v for k, v in data.items() if v is not None})
+                item.merged_rows += 1
+                continue
+
+            if existing:
+                data.setdefault("type", existing.type)
+            elif "type" not in data:
+                self._fail(result, row_idx, tag, "Missing required field: type")
+                continue
+
+            pending[key] = _PendingRow(
+                row=row_idx,
+                tag=tag,
+                data=data,
+                existing_id=existing.id if existing else None,
+                rename=rename,
+            )
+
+        return list(pending.values())
+
+    def _existing_assets(self, asset_ids: set[str], tags: set[str]):
+        rows = (
+            self.db.query(Asset.id, Asset.tag, Asset.type)
+            .filter(
+                Asset.project_id == self.project_id,
+                or_(Asset.id.in_(asset_ids), Asset.tag.in_(tags)),
+            )
+            .all()
+        )
+        by_id = {row.id: row for row in rows if row.id in asset_ids}
+        by_tag = {row.tag: row for row in rows if row.tag in tags}
+        return by_id, by_tag
+
+    # ==========================================================================
+    # WRITES
+    # ==========================================================================
+
+    def _write(
+        self, items: list[_PendingRow], filename: str, batch_id: str | None
+    ) -> list[tuple[_PendingRow, Asset]]:
+        """Upsert a chunk, then version it and sync metamodel nodes."""
+        upserts = [item for item in items if not item.rename]
+        renames = [item for item in items if item.rename]
+
+        written = []
+        if renames:
+            self.db.execute(
+                update(Asset),
+                [
+                    {
+                        "id": item.existing_id,
+                        **{k: v for k, v in item.data.items() if v is not None},
+                    }
+                    for item in renames
+                ],
+            )
+            assets = {
+                asset.id: asset
+                for asset in self.db.query(Asset)
+                .filter(Asset.id.in_([item.existing_id for item in renames]))
+                .populate_existing()
+            }
+            written.extend((item, assets[item.existing_id]) for item in renames)
+
+        if upserts:
+            stmt = pg_insert(Asset)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uix_project_tag",
+                set_={
+                    name: func.coalesce(stmt.excluded[name], Asset.__table__.c[name])
+                    for name in UPSERT_COLUMNS
+                },
+            )
+            rows = [
+                {
+                    "project_id": self.project_id,
+                    "tag": item.tag,
+                    **{name: item.data.get(name) for name in UPSERT_COLUMNS},
+                }
+                for item in upserts
+            ]
+            assets = self.db.scalars(
+                stmt.returning(Asset, sort_by_parameter_order=True),
+                rows,
+                execution_options={"populate_existing": True},
+            )
+            written.extend(zip(upserts, assets, strict=True))
+
+        created = [asset for item, asset in written if not item.existing_id]
+        updated = [asset for item, asset in written if item.existing_id]
+        self._versioning.create_versions_bulk(
+            created,
+            change_source=ChangeSource.IMPORT,
+            change_reason="Initial creation",
+            batch_id=batch_id,
+            commit=False,
+        )
+        self._versioning.create_versions_bulk(
+            updated,
+            change_source=ChangeSource.IMPORT,
+            change_reason=f"CSV Import: {filename}",
+            batch_id=batch_id,
+            commit=False,
+        )
+        MetamodelService.create_nodes_from_assets(
+            self.db, [asset for _, asset in written], commit=False
+        )
+
+        return written
+
+    # ==========================================================================
+    # LOGGING
+    # ==========================================================================
+
+    def _log_row(self, item: _PendingRow, asset_id: str, correlation_id: str | None):
+        if not self.workflow_logger or not correlation_id:
+            return
+
+        if item.existing_id:
+            self.workflow_logger.log_update(
+                source=LogSource.IMPORT,
+                message=f"Updated asset: {item.tag}",
+                entity_type="ASSET",
+                entity_id=asset_id,
+                entity_tag=item.tag,
+                correlation_id=correlation_id,
+                details={"row": item.row, "changes": item.data},
+            )
+        else:
+            self.workflow_logger.log_create(
+                source=LogSource.IMPORT,
+                message=f"Created asset: {item.tag}",
+                entity_type="ASSET",
+                entity_id=asset_id,
+                entity_tag=item.tag,
+                correlation_id=correlation_id,
+                details={"type": item.data.get("type"), "row": item.row},
+            )
+
+    def _fail(self, result: CSVImportResult, row: int, tag: str | None, error: str):
+        result.failed += 1
+        result.errors.append(CSVRowError(row=row, tag=tag, error=error).model_dump())
+
+
+def _stream_size(stream: BinaryIO) -> int | None:
+    try:
+        position = stream.tell()
+        size = stream.seek(0, io.SEEK_END)
+        stream.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
@@ -0,0 +1,338 @@
+"""
+Export Jobs
+
+Background generation of package deliverables (IN-P040, CA-P040) with a
+content-addressed artifact cache.
+
+- Artifacts are stored under TemplateService.content_hash(): a hash of the
+  exported rows, the package/project names and the template version. An
+  unchanged package is served from the stored file without regenerating it,
+  both by the synchronous export endpoint and by submitted jobs.
+- Submitted jobs run on a thread pool (EXPORT_WORKERS), each with its own
+  session, and record their progress on the ExportJob row for polling, so long
+  exports never hold an HTTP request open.
+- A job submitted while an identical one (package, template, format) is queued
+  or running in this process returns the in-flight job.
+- Artifacts not served for EXPORT_ARTIFACT_RETENTION_DAYS are pruned.
+
+Example:
+    queue = get_export_queue()
+    job = queue.submit(db, package_id, "IN-P040")   # COMPLETED at once if cached
+    ...
+    path = queue.store.get(job.content_hash)
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exceptions import SynapseException
+from app.models.packages import ExportJob, ExportJobStatus, Package
+from app.services.template_service import ProgressCallback, TemplateService
+
+logger = logging.getLogger(__name__)
+
+
+class ExportError(SynapseException):
+    """Package export could not be generated"""
+
+    pass
+
+
+@dataclass
+class ExportArtifact:
+    """Generated (or cached) export file"""
+
+    path: Path
+    content_hash: str
+    file_size: int
+    cached: bool  # Served from an existing artifact
+
+
+# =============================================================================
+# ARTIFACT STORE
+# =============================================================================
+
+
+class ArtifactStore:
+    """Directory of generated exports, one file per content hash"""
+
+    def __init__(self, root: str | None = None, retention_days: int | None = None):
+        self.root = Path(root or settings.EXPORT_ARTIFACT_DIR)
+        self.retention_days = (
+            settings.EXPORT_ARTIFACT_RETENTION_DAYS if retention_days is None else retention_days
+        )
+
+    def path(self, content_hash: str) -> Path:
+        return self.root / f"{content_hash}.xlsx"
+
+    def get(self, content_hash: str) -> Path | None:
+        """Stored artifact for a hash (marked as recently served), or None"""
+        path = self.path(content_hash)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, content_hash: str, file: IO[bytes]) -> Path:
+        """
+        Store a generated file under its hash.
+
+        Written to a temporary file first and renamed into place, so readers
+        never see a partial artifact and concurrent writers don't collide.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.root, suffix=".tmp", delete=False) as tmp:
+            shutil.copyfileobj(file, tmp)
+        path = self.path(content_hash)
+        os.replace(tmp.name, path)
+        self.prune()
+        return path
+
+    def prune(self) -> int:
+        """Delete artifacts not served within the retention period"""
+        if not self.root.is_dir():
+            return 0
+        cutoff = time.time() - self.retention_days * 86400
+        removed = 0
+        for path in self.root.glob("*.xlsx"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+# =============================================================================
+# JOB QUEUE
+# =============================================================================
+
+
+class ExportJobQueue:
+    """Runs package exports in a worker pool and caches their artifacts"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        store: ArtifactStore | None = None,
+        executor: Executor | None = None,
+    ):
+        self._session_factory = session_factory
+        self.store = store or ArtifactStore()
+        self._pool = executor
+        self._lock = threading.Lock()
+        # Content hash -> queued/running job id (an edited package hashes
+        # differently, so it never reuses a job exporting stale content)
+        self._in_flight: dict[str, str] = {}
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=settings.EXPORT_WORKERS, thread_name_prefix="export-job"
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        """Stop the worker pool; queued jobs that haven't started are dropped"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # -------------------------------------------------------------------------
+    # Exports
+    # -------------------------------------------------------------------------
+
+    def export(
+        self,
+        db: Session,
+        package_id: str,
+        template_type: str,
+        format: str = "xlsx",
+        content_hash: str | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> ExportArtifact:
+        """
+        Artifact for the package's current content, generated only on a cache miss.
+
+        Args:
+            db: Database session
+            package_id: Package to export
+            template_type: Template type (IN-P040, CA-P040)
+            format: Output format
+            content_hash: Precomputed TemplateService.content_hash()
+            progress: Called with (rows_written, total_rows) while generating
+
+        Returns:
+            ExportArtifact
+
+        Raises:
+            ExportError: Package not found, empty, or generation failed
+        """
+        service = TemplateService(db)
+        content_hash = content_hash or service.content_hash(package_id, template_type, format)
+        if content_hash is None:
+            raise ExportError(f"Cannot export package {package_id} with template {template_type}")
+
+        path = self.store.get(content_hash)
+        if path is not None:
+            return ExportArtifact(path, content_hash, path.stat().st_size, cached=True)
+
+        result = service.export_package(
+            package_id, template_type, format, stream=True, progress=progress
+        )
+        if not result.success:
+            raise ExportError(result.error)
+        with result.file:
+            path = self.store.put(content_hash, result.file)
+        return ExportArtifact(path, content_hash, result.file_size, cached=False)
+
+    def submit(
+        self,
+        db: Session,
+        package_id: str,
+        template_type: str,
+        format: str = "xlsx",
+        created_by: str | None = None,
+    ) -> ExportJob:
+        """
+        Queue an export job.
+
+        A cached artifact completes the job immediately; a job already in
+        flight for the same content hash is returned instead of queueing another.
+
+        Args:
+            db: Database session
+            package_id: Package to export
+            template_type: Template type (IN-P040, CA-P040)
+            format: Output format
+            created_by: Requesting user id
+
+        Returns:
+            ExportJob (QUEUED, or COMPLETED when cached)
+        """
+        service = TemplateService(db)
+        content_hash = service.content_hash(package_id, template_type, format)
+        if content_hash is None:
+            raise ExportError(f"Cannot export package {package_id} with template {template_type}")
+
+        job = ExportJob(
+            package_id=package_id,
+            template_type=template_type,
+            format=format,
+            content_hash=content_hash,
+            created_by=created_by,
+        )
+
+        path = self.store.get(content_hash)
+        if path is not None:
+            self._complete(db, job, path.stat().st_size, cached=True)
+            db.add(job)
+            db.commit()
+            return job
+
+        with self._lock:
+            in_flight = self._in_flight.get(content_hash)
+            if in_flight is None:
+                db.add(job)
+                db.commit()
+                self._in_flight[content_hash] = job.id
+
+        if in_flight is not None:
+            return db.get(ExportJob, in_flight)
+
+        self._executor().submit(self.run_job, job.id)
+        return job
+
+    def run_job(self, job_id: str) -> None:
+        """Generate the artifact of a queued job and record the outcome"""
+        db = self._session_factory()
+        key = None
+        try:
+            job = db.get(ExportJob, job_id)
+            key = job.content_hash
+            job.status = ExportJobStatus.RUNNING
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+            try:
+                artifact = self.export(
+                    db,
+                    job.package_id,
+                    job.template_type,
+                    job.format,
+                    content_hash=job.content_hash,
+                    progress=lambda written, total: self._report_progress(job_id, written, total),
+                )
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Export job {job_id} failed: {e}")
+                job.status = ExportJobStatus.FAILED
+                job.error = str(e)
+                job.finished_at = datetime.utcnow()
+            else:
+                self._complete(db, job, artifact.file_size, cached=artifact.cached)
+            db.commit()
+        except Exception:
+            logger.exception(f"Export job {job_id} could not be recorded")
+            db.rollback()
+        finally:
+            if key is not None:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+            db.close()
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _complete(self, db: Session, job: ExportJob, file_size: int, cached: bool) -> None:
+        package = db.get(Package, job.package_id)
+        job.status = ExportJobStatus.COMPLETED
+        job.progress = 100
+        job.cached = cached
+        job.file_name = TemplateService.export_file_name(package.name, job.template_type)
+        job.file_size = file_size
+        job.finished_at = datetime.utcnow()
+
+    def _report_progress(self, job_id: str, written: int, total: int) -> None:
+        """Store progress from a separate session (the export's cursor stays open)"""
+        # 100 is reserved for the stored artifact
+        percent = min(written * 100 // total, 99) if total else 0
+        db = self._session_factory()
+        try:
+            db.execute(update(ExportJob).where(ExportJob.id == job_id).values(progress=percent))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not record progress of export job {job_id}: {e}")
+        finally:
+            db.close()
+
+
+# Singleton instance
+_export_queue: ExportJobQueue | None = None
+
+
+def get_export_queue() -> ExportJobQueue:
+    """Get singleton export job queue"""
+    global _export_queue
+    if _export_queue is None:
+        _export_queue = ExportJobQueue()
+    return _export_queue
@@ -0,0 +1,140 @@
+"""
+In-memory log store for DevConsole history.
+
+Fixed-capacity ring buffer shared by SystemLog and WebSocketLogger:
+- appends and evictions are O(1) (entries keyed by an increasing sequence
+  number; the oldest is dropped once capacity is reached)
+- secondary indexes by level, source, actionType and entityId hold the
+  sequence numbers of matching entries, so filtered reads only walk matches
+- "since" reads take the id of the last entry a client saw and return what
+  came after it, so reconnecting clients resume without duplicates
+
+Example:
+    store = LogStore(capacity=1000)
+    store.append(entry)
+    store.query(limit=100, level="ERROR")
+    store.query(since=last_seen_id)
+"""
+
+import threading
+from collections import deque
+from typing import Any
+
+# Query parameter -> entry key of each secondary index
+INDEXED_FIELDS = {
+    "level": "level",
+    "source": "source",
+    "action_type": "actionType",
+    "entity_id": "entityId",
+}
+
+
+class LogStore:
+    """Thread-safe ring buffer of log entries with secondary indexes."""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._entries: dict[int, dict[str, Any]] = {}  # seq -> entry, oldest first
+        self._seq_by_id: dict[str, int] = {}
+        self._indexes: dict[str, dict[Any, deque[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self._first_seq = getattr(self, "_next_seq", 1)
+        self._next_seq = self._first_seq
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def append(self, entry: dict[str, Any]):
+        """Add an entry, evicting the oldest one when full."""
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._entries[seq] = entry
+            if entry.get("id") is not None:
+                self._seq_by_id[entry["id"]] = seq
+            for field, key in INDEXED_FIELDS.items():
+                self._indexes[field].setdefault(entry.get(key), deque()).append(seq)
+
+            while len(self._entries) > self.capacity:
+                self._evict_oldest()
+
+    def clear(self):
+        """Drop all entries (sequence numbers keep increasing)."""
+        with self._lock:
+            self._reset()
+
+    def query(
+        self,
+        limit: int = 100,
+        since: str | None = None,
+        level: str | None = None,
+        source: str | None = None,
+        action_type: str | None = None,
+        entity_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Matching entries, oldest first.
+
+        Args:
+            limit: Max entries; the most recent ones without `since`, the first
+                ones after it with `since` (page forward by passing the last id)
+            since: Id of the last entry already seen (unknown or evicted ids
+                return everything still stored)
+            level, source, action_type, entity_id: Exact-match filters
+
+        Returns:
+            List of entries
+        """
+        if limit <= 0:
+            return []
+        filters = {
+            field: value
+            for field, value in {
+                "level": level.upper() if level else None,
+                "source": source,
+                "action_type": action_type,
+                "entity_id": entity_id,
+            }.items()
+            if value is not None
+        }
+
+        with self._lock:
+            after = self._seq_by_id.get(since, 0) if since else 0
+
+            # Walk the smallest index among the filters, newest first
+            candidates = self._entries.keys()
+            for field, value in filters.items():
+                index = self._indexes[field].get(value, ())
+                if len(index) < len(candidates):
+                    candidates = index
+
+            matches = []
+            for seq in reversed(candidates):
+                if seq <= after:
+                    break
+                entry = self._entries[seq]
+                if all(entry.get(INDEXED_FIELDS[f]) == v for f, v in filters.items()):
+                    matches.append(entry)
+                    if not since and len(matches) == limit:
+                        break
+
+        matches.reverse()
+        return matches[:limit] if since else matches
+
+    def _evict_oldest(self):
+        seq = self._first_seq
+        self._first_seq += 1
+        entry = self._entries.pop(seq, None)
+        if entry is None:
+            return
+        if self._seq_by_id.get(entry.get("id")) == seq:
+            del self._seq_by_id[entry["id"]]
+        for field, key in INDEXED_FIELDS.items():
+            index = self._indexes[field]
+            value = entry.get(key)
+            index[value].popleft()
+            if not index[value]:
+                del index[value]
@@ -9,6 +9,8 @@ import uuid
 from datetime import datetime
 from typing import Any
 
+from app.services.log_store import LogStore
+
 # Configure standard Python logging for fallback
 logging.basicConfig(level=logging.INFO)
 _logger = logging.getLogger("synapse")
@@ -20,8 +22,7 @@ class SystemLog:
     Use WebSocketLogger for new code with full feature support.
     """
 
-    _logs: list[dict] = []
-    _max_logs = 1000
+    _store = LogStore(capacity=1000)
 
     @classmethod
     def log(
@@ -47,9 +48,7 @@ class SystemLog:
             "context": context,
             "status": "COMPLETED",
         }
-        cls._logs.append(entry)
-        if len(cls._logs) > cls._max_logs:
-            cls._logs.pop(0)
+        cls._store.append(entry)
 
         # JSON output for Loki/Promtail - use proper logging
         log_data = {
@@ -73,18 +72,11 @@ class SystemLog:
         else:
             _logger.info(log_json)
 
-        # Try to broadcast via WebSocket
+        # Try to broadcast via WebSocket (queued; safe outside the event loop)
         try:
-            import asyncio
-
             from app.services.websocket_manager import log_manager
 
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(log_manager.broadcast(entry))
-        except RuntimeError:
-            # No event loop running - this is normal in synchronous contexts
-            pass
+            log_manager.publish(entry)
         except ImportError:
             # WebSocket manager not available during startup
             pass
@@ -93,14 +85,24 @@ class SystemLog:
             _logger.warning(f"WebSocket broadcast failed: {e}")
 
     @classmethod
-    def get_logs(cls, limit: int = 100):
-        """Get recent logs."""
-        return cls._logs[-limit:]
+    def get_logs(cls, limit: int = 100, since: str | None = None, **filters) -> list[dict]:
+        """
+        Get recent logs, oldest first.
+
+        Args:
+            limit: Max entries
+            since: Only entries after this log id (resume / page forward)
+            **filters: level, source, action_type, entity_id
+
+        Returns:
+            List of log entries
+        """
+        return cls._store.query(limit=limit, since=since, **filters)
 
     @classmethod
     def clear(cls):
         """Clear all logs."""
-        cls._logs = []
+        cls._store.clear()
 
     # Convenience methods
     @classmethod
@@ -469,6 +469,14 @@ class MeiliSearchService:
         """Delete a document from an index"""
         return self.client.index(index_name).delete_document(doc_id)
 
+    def add_documents(self, index_name: str, docs: list[dict]) -> dict:
+        """Add or replace prepared documents in one request"""
+        return self.client.index(index_name).add_documents(docs)
+
+    def delete_documents(self, index_name: str, doc_ids: list[str]) -> dict:
+        """Delete several documents from an index in one request"""
+        return self.client.index(index_name).delete_documents(doc_ids)
+
     def delete_all_documents(self, index_name: str) -> dict:
         """Delete all documents from an index"""
         return self.client.index(index_name).delete_all_documents()
@@ -1,3 +1,4 @@
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
 from app.models.metamodel import (
@@ -120,6 +121,62 @@ class MetamodelService:
         """
         Creates or updates a MetamodelNode based on an Asset.
         """
+        return MetamodelService.create_node(db, MetamodelService._node_from_asset(asset))
+
+    @staticmethod
+    def create_nodes_from_assets(db: Session, assets: list[Asset], commit: bool = True) -> int:
+        """
+        Bulk create_node_from_asset: one lookup query, one multi-row INSERT
+        and one bulk UPDATE for any number of assets of a project.
+
+        Returns:
+            Number of nodes created
+        """
+        nodes = {}
+        for asset in assets:
+            nodes[(asset.project_id, asset.tag)] = MetamodelService._node_from_asset(asset)
+        if not nodes:
+            return 0
+
+        existing = {}
+        for project_id in {project_id for project_id, _ in nodes}:
+            names = [name for pid, name in nodes if pid == project_id]
+            rows = db.query(MetamodelNode.id, MetamodelNode.name).filter(
+                MetamodelNode.project_id == project_id, MetamodelNode.name.in_(names)
+            )
+            for node_id, name in rows:
+                existing.setdefault((project_id, name), node_id)
+
+        updates = []
+        inserts = []
+        for key, node in nodes.items():
+            if key in existing:
+                values = {
+                    "id": existing[key],
+                    "discipline": node.discipline,
+                    "semantic_type": node.semantic_type,
+                    "lod": node.lod,
+                    "isa95_level": node.isa95_level,
+                }
+                if node.properties:
+                    values["properties"] = node.properties
+                if node.description:
+                    values["description"] = node.description
+                updates.append(values)
+            else:
+                inserts.append({**node.model_dump(), "data_status": AssetDataStatus.FRESH_IMPORT})
+
+        if updates:
+            db.execute(update(MetamodelNode), updates)
+        if inserts:
+            db.execute(insert(MetamodelNode), inserts)
+        if commit:
+            db.commit()
+
+        return len(inserts)
+
+    @staticmethod
+    def _node_from_asset(asset: Asset) -> NodeCreate:
         discipline = MetamodelService.map_asset_type_to_discipline(asset.type)
 
         # Determine Semantic Type (Most assets are ASSET, but some might be CONTAINER like Cabinets)
@@ -127,7 +184,7 @@ class MetamodelService:
         if asset.type and asset.type.upper() in ["CABINET", "MCC", "PANEL", "JUNCTION_BOX"]:
             semantic_type = SemanticType.CONTAINER
 
-        node_create = NodeCreate(
+        return NodeCreate(
             name=asset.tag,
             type=asset.type or "UNKNOWN",
             discipline=discipline,
@@ -142,5 +199,3 @@ class MetamodelService:
             },
             project_id=asset.project_id,
         )
-
-        return MetamodelService.create_node(db, node_create)
@@ -0,0 +1,227 @@
+"""
+PostgreSQL Search Service
+
+Fallback search engine used when MeiliSearch is unavailable. Matching,
+ranking and limiting all happen in SQL against the generated search_text /
+search_vector columns (see app/models/search.py), so each entity type costs
+one indexed query instead of a sequential ILIKE scan plus Python rescoring:
+- search_text ILIKE '%q%'    substring match (pg_trgm GIN index)
+- search_text %> q           typo-tolerant word similarity (same index)
+- search_vector @@ tsquery   word-prefix match (tsvector GIN index)
+
+Hits are ranked by GREATEST(similarity(title), word_similarity, ts_rank)
+scaled to 0-100, the same range as MeiliSearch and navigation scores.
+
+Example:
+    hits, categories = PostgresSearchService(db).search("pmp 101", project_id=pid)
+"""
+
+import re
+
+from sqlalchemy import ColumnElement, Select, func, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models.cables import Cable
+from app.models.models import Asset, LBSNode
+from app.models.rules import RuleDefinition, RuleSource
+
+# Result icon per entity type
+ENTITY_ICONS = {"asset": "Cpu", "rule": "GitBranch", "cable": "Cable", "location": "MapPin"}
+
+_TOKEN = re.compile(r"\w+")
+
+
+class PostgresSearchService:
+    """Ranked full-text / trigram search over assets, rules, cables and locations"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(
+        self,
+        query: str,
+        types: list[str] | None = None,
+        project_id: str | None = None,
+        limit: int = 20,
+    ) -> tuple[list[dict], dict[str, int]]:
+        """
+        Search every requested entity type.
+
+        Args:
+            query: Raw user query
+            types: Entity types to search (default: all)
+            project_id: Restrict to one project
+            limit: Max hits per entity type
+
+        Returns:
+            (hits shaped like SearchResult, hit count per entity type)
+        """
+        searches = {
+            "asset": self._search_assets,
+            "rule": self._search_rules,
+            "cable": self._search_cables,
+            "location": self._search_locations,
+        }
+
+        hits: list[dict] = []
+        categories: dict[str, int] = {}
+        for entity_type, search in searches.items():
+            if types and entity_type not in types:
+                continue
+            entity_hits = search(query, project_id, limit)
+            hits.extend(entity_hits)
+            categories[entity_type] = len(entity_hits)
+        return hits, categories
+
+    # -------------------------------------------------------------------------
+    # Matching
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _match(model, title, query: str) -> tuple[ColumnElement, ColumnElement]:
+        """WHERE clause and 0-1 score expression for one searchable model"""
+        conditions = [
+            model.search_text.icontains(query, autoescape=True),
+            model.search_text.op("%>")(query),
+        ]
+        ranks = [func.similarity(title, query), func.word_similarity(query, model.search_text)]
+
+        # Prefix tsquery built from word tokens only, so user input can't break its syntax
+        tokens = _TOKEN.findall(query.lower())
+        if tokens:
+            tsquery = func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+            conditions.append(model.search_vector.op("@@")(tsquery))
+            ranks.append(func.ts_rank(model.search_vector, tsquery))
+
+        return or_(*conditions), func.greatest(*ranks)
+
+    def _ranked(self, stmt: Select, where: ColumnElement, score, order_by, limit: int):
+        return self.db.execute(
+            stmt.add_columns(score.label("score"))
+            .where(where)
+            .order_by(score.desc(), order_by)
+            .limit(limit)
+        ).all()
+
+    # -------------------------------------------------------------------------
+    # Entity searches
+    # -------------------------------------------------------------------------
+
+    def _search_assets(self, query: str, project_id: str | None, limit: int) -> list[dict]:
+        where, score = self._match(Asset, Asset.tag, query)
+        stmt = select(Asset.id, Asset.tag, Asset.description, Asset.system, Asset.area).where(
+            Asset.deleted_at.is_(None)
+        )
+        if project_id:
+            stmt = stmt.where(Asset.project_id == project_id)
+
+        return [
+            {
+                "id": row.id,
+                "type": "asset",
+                "title": row.tag or "Unknown",
+                "subtitle": f"{row.description or ''} • {row.system or 'Unclassified'}",
+                "icon": ENTITY_ICONS["asset"],
+                "path": f"/assets/{row.id}",
+                "score": _percent(row.score),
+                "metadata": {"area": row.area, "system": row.system},
+            }
+            for row in self._ranked(stmt, where, score, Asset.tag, limit)
+        ]
+
+    def _search_rules(self, query: str, project_id: str | None, limit: int) -> list[dict]:
+        where, score = self._match(RuleDefinition, RuleDefinition.name, query)
+        stmt = select(
+            RuleDefinition.id,
+            RuleDefinition.name,
+            RuleDefinition.description,
+            RuleDefinition.is_active,
+            RuleDefinition.priority,
+        )
+        if project_id:
+            # Firm/country/client rules apply everywhere; project rules only to their project
+            stmt = stmt.where(
+                or_(
+                    RuleDefinition.source != RuleSource.PROJECT,
+                    RuleDefinition.source_id == project_id,
+                )
+            )
+
+        return [
+            {
+                "id": row.id,
+                "type": "rule",
+                "title": row.name or "Unnamed Rule",
+                "subtitle": row.description or "No description",
+                "icon": ENTITY_ICONS["rule"],
+                "path": f"/rules/{row.id}",
+                "score": _percent(row.score),
+                "metadata": {"enabled": row.is_active, "priority": row.priority},
+            }
+            for row in self._ranked(stmt, where, score, RuleDefinition.name, limit)
+        ]
+
+    def _search_cables(self, query: str, project_id: str | None, limit: int) -> list[dict]:
+        where, score = self._match(Cable, Cable.tag, query)
+        from_asset = aliased(Asset)
+        to_asset = aliased(Asset)
+        stmt = (
+            select(
+                Cable.id,
+                Cable.tag,
+                Cable.description,
+                Cable.cable_type,
+                Cable.length_meters,
+                from_asset.tag.label("from_tag"),
+                to_asset.tag.label("to_tag"),
+            )
+            .outerjoin(from_asset, Cable.from_asset_id == from_asset.id)
+            .outerjoin(to_asset, Cable.to_asset_id == to_asset.id)
+        )
+        if project_id:
+            stmt = stmt.where(Cable.project_id == project_id)
+
+        return [
+            {
+                "id": str(row.id),
+                "type": "cable",
+                "title": row.tag or "Unknown Cable",
+                "subtitle": (
+                    f"{row.from_tag} → {row.to_tag}"
+                    if row.from_tag and row.to_tag
+                    else row.description
+                ),
+                "icon": ENTITY_ICONS["cable"],
+                "path": f"/cables/{row.id}",
+                "score": _percent(row.score),
+                "metadata": {"cableType": row.cable_type, "length": row.length_meters},
+            }
+            for row in self._ranked(stmt, where, score, Cable.tag, limit)
+        ]
+
+    def _search_locations(self, query: str, project_id: str | None, limit: int) -> list[dict]:
+        where, score = self._match(LBSNode, LBSNode.name, query)
+        stmt = select(LBSNode.id, LBSNode.name, LBSNode.type).where(LBSNode.deleted_at.is_(None))
+        if project_id:
+            stmt = stmt.where(LBSNode.project_id == project_id)
+
+        results = []
+        for row in self._ranked(stmt, where, score, LBSNode.name, limit):
+            location_type = row.type.value if row.type else None
+            results.append(
+                {
+                    "id": row.id,
+                    "type": "location",
+                    "title": row.name or "Unknown Location",
+                    "subtitle": location_type,
+                    "icon": ENTITY_ICONS["location"],
+                    "path": f"/locations/{row.id}",
+                    "score": _percent(row.score),
+                    "metadata": {"type": location_type},
+                }
+            )
+        return results
+
+
+def _percent(score: float | None) -> int:
+    return int(round((score or 0) * 100))
@@ -7,10 +7,14 @@ Maintains backward compatibility with existing mock import workflow.
 
 import time
 
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
+from app.core.metrics import PhaseTimer
 from app.models.action_log import ActionStatus, ActionType
+from app.models.metamodel import MetamodelEdge
 from app.models.models import Asset  # Use unified Asset model
+from app.models.rules import RuleActionType
 from app.services.action_logger import ActionLogger
 from app.services.logger import SystemLog
 from app.services.rule_executor import RuleExecutor
@@ -25,20 +29,27 @@ class RuleEngine:
     """
 
     @staticmethod
-    def apply_rules(db: Session, project_id: str) -> dict:
+    def apply_rules(db: Session, project_id: str, asset_ids: list[str] | None = None) -> dict:
         """
         Apply all active rules for a project to its assets.
 
         Args:
             db: Database session
             project_id: Project ID to apply rules for
+            asset_ids: Incremental mode - only process these changed assets,
+                their dependents (see _dependent_asset_ids) and the children
+                created from them during this run. None = all project assets.
 
         Returns:
             Execution summary with statistics
         """
         start_time = time.time()
+        # Exclusive time per phase (load / evaluate / act / log), see /metrics
+        phases = PhaseTimer()
+        log_action = phases.wrap("log", ActionLogger.log)
+
         # 0. Start Root Log
-        root_log = ActionLogger.log(
+        root_log = log_action(
             db,
             ActionType.RULE_EXECUTION,
             f"Starting Database-Driven Rule Engine for project {project_id}",
@@ -46,18 +57,22 @@ class RuleEngine:
         )
         # Capture root_log_id early to avoid issues after potential rollbacks
         root_log_id = root_log.id
-        SystemLog.log("INFO", f"Starting Database-Driven Rule Engine for project {project_id}...")
+        with phases.phase("log"):
+            SystemLog.log(
+                "INFO", f"Starting Database-Driven Rule Engine for project {project_id}..."
+            )
 
         # 1. Load all applicable rules (FIRM + COUNTRY + PROJECT + CLIENT)
         # Use EnhancedRuleEngine to resolve conflicts
         from app.services.enhanced_rule_engine import EnhancedRuleEngine
 
-        resolution_result = EnhancedRuleEngine.load_and_resolve_rules(db, project_id)
+        with phases.phase("load"):
+            resolution_result = EnhancedRuleEngine.load_and_resolve_rules(db, project_id)
         rules = resolution_result["rules"]
         violations = resolution_result["enforcement_violations"]
 
         if violations:
-            ActionLogger.log(
+            log_action(
                 db,
                 ActionType.RULE_EXECUTION,
                 f"Skipped {len(violations)} rules due to enforcement violations.",
@@ -67,7 +82,7 @@ class RuleEngine:
                 details={"violations": violations},
             )
 
-        ActionLogger.log(
+        log_action(
             db,
             ActionType.RULE_EXECUTION,
             f"Loaded {len(rules)} active rules after conflict resolution.",
@@ -75,18 +90,31 @@ class RuleEngine:
             parent_id=root_log_id,
         )
 
-        # 2. Get all assets to apply rules to (from unified Asset table)
-        assets = db.query(Asset).filter(Asset.project_id == project_id).all()
-        ActionLogger.log(
+        # 2. Count assets to apply rules to (from unified Asset table).
+        # Rows are fetched per rule, pre-filtered in SQL when the condition compiles.
+        scope = None
+        with phases.phase("load"):
+            if asset_ids is not None:
+                scope = RuleEngine._dependent_asset_ids(db, project_id, set(asset_ids))
+                asset_count = len(scope)
+                message = (
+                    f"Incremental run: {len(set(asset_ids))} changed assets, "
+                    f"{asset_count} to process including dependents."
+                )
+            else:
+                asset_count = db.query(Asset).filter(Asset.project_id == project_id).count()
+                message = f"Found {asset_count} assets to process."
+        all_assets = None
+        log_action(
             db,
             ActionType.RULE_EXECUTION,
-            f"Found {len(assets)} assets to process.",
+            message,
             project_id=project_id,
             parent_id=root_log_id,
         )
 
         # 3. Initialize executor
-        executor = RuleExecutor(db, project_id)
+        executor = RuleExecutor(db, project_id, phases=phases)
 
         # 4. Apply each rule to each asset
         total_executions = 0
@@ -95,7 +123,7 @@ class RuleEngine:
         errors = 0
 
         for rule in rules:
-            rule_log = ActionLogger.log(
+            rule_log = log_action(
                 db,
                 ActionType.RULE_EXECUTION,
                 f"Applying rule: {rule.name}",
@@ -107,17 +135,37 @@ class RuleEngine:
             rule_log_id = rule_log.id
             rule_id = rule.id
 
+            assets = executor.find_matching_assets(rule, scope)
+            if assets is None:
+                if all_assets is None:
+                    query = db.query(Asset).filter(Asset.project_id == project_id)
+                    if scope is not None:
+                        query = query.filter(Asset.id.in_(scope))
+                    with phases.phase("load"):
+                        all_assets = query.all()
+                assets = all_assets
+            else:
+                # Non-matching assets are skipped without a per-asset SKIP audit row
+                total_executions += asset_count - len(assets)
+                skipped += asset_count - len(assets)
+
             for asset in assets:
                 # Capture asset info BEFORE execute_rule (which may rollback)
                 asset_id = asset.id
                 asset_discipline = getattr(asset, "discipline", None)
 
-                execution = executor.execute_rule(rule, asset)
+                with phases.phase("act"):
+                    execution = executor.execute_rule(rule, asset)
                 total_executions += 1
 
                 if execution.action_type == "CREATE":
                     actions_taken += 1
-                    ActionLogger.log(
+                    if scope is not None and rule.action_type == RuleActionType.CREATE_CHILD:
+                        # New children are changed assets for the rules that follow
+                        scope.add(execution.created_entity_id)
+                        asset_count = len(scope)
+                        all_assets = None
+                    log_action(
                         db,
                         ActionType.CREATE,
                         execution.action_taken,
@@ -130,7 +178,7 @@ class RuleEngine:
                     )
                 elif execution.action_type == "UPDATE":
                     actions_taken += 1
-                    ActionLogger.log(
+                    log_action(
                         db,
                         ActionType.UPDATE,
                         execution.action_taken,
@@ -144,7 +192,7 @@ class RuleEngine:
 
                 elif execution.action_type == "LINK":
                     actions_taken += 1
-                    ActionLogger.log(
+                    log_action(
                         db,
                         ActionType.LINK,
                         execution.action_taken,
@@ -165,7 +213,7 @@ class RuleEngine:
 
         # Try to log completion - may fail if rollback removed parent log
         try:
-            ActionLogger.log(
+            log_action(
                 db,
                 ActionType.RULE_EXECUTION,
                 (
@@ -182,16 +230,47 @@ class RuleEngine:
             # If logging fails due to rollback, just skip
             pass
 
+        phases.observe()
         return {
             "total_rules": len(rules),
-            "total_assets": len(assets),
+            "total_assets": asset_count,
             "total_executions": total_executions,
             "actions_taken": actions_taken,
             "skipped": skipped,
             "errors": errors,
             "time_elapsed_ms": elapsed_ms,
+            "phase_ms": phases.milliseconds(),
         }
 
+    @staticmethod
+    def _dependent_asset_ids(db: Session, project_id: str, asset_ids: set[str]) -> set[str]:
+        """
+        Expand changed assets with the assets that depend on them.
+
+        Rule-created children point at their parent (child -> parent edge), so
+        dependents are the sources of edges into the changed assets, followed
+        transitively in one recursive query.
+        """
+        if not asset_ids:
+            return set()
+
+        dependents = (
+            select(MetamodelEdge.source_node_id.label("asset_id"))
+            .where(MetamodelEdge.target_node_id.in_(asset_ids))
+            .cte("dependents", recursive=True)
+        )
+        dependents = dependents.union(
+            select(MetamodelEdge.source_node_id).join(
+                dependents, MetamodelEdge.target_node_id == dependents.c.asset_id
+            )
+        )
+
+        rows = db.query(Asset.id).filter(
+            Asset.project_id == project_id,
+            or_(Asset.id.in_(asset_ids), Asset.id.in_(select(dependents.c.asset_id))),
+        )
+        return {asset_id for (asset_id,) in rows}
+
     @staticmethod
     def apply_rules_legacy(db: Session):
         """
@@ -16,21 +16,37 @@ Actions supported:
 - ALLOCATE_IO: Allocate IO points to assets
 - VALIDATE: Run validation checks
 
+Rule conditions are compiled to SQL (ConditionCompiler), so each rule only
+loads its matching assets instead of evaluating every asset in Python.
+
+Bulk mode (execute_rules(bulk=True)) plans every create/update of a rule
+across all matching assets first, then writes them with a handful of
+multi-row INSERT/UPDATE statements inside one transaction per rule.
+
+Parallel mode (execute_rules(parallel=True)) groups rules whose read/write
+footprints are disjoint into waves and runs each wave on a thread pool.
+
 Design based on: .dev/design/2025-11-28-whiteboard-session.md
 """
 
 import time
-from dataclasses import dataclass
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, insert, select, update
 from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.attributes import flag_modified, set_committed_value
 
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import PhaseTimer, timed_phase
 from app.models.cables import Cable
 from app.models.metamodel import MetamodelEdge
-from app.models.models import Asset
+from app.models.models import Asset, generate_uuid
 from app.models.packages import Package, PackageStatus
 from app.models.rules import RuleActionType, RuleDefinition, RuleExecution
 from app.models.workflow import (
@@ -39,6 +55,8 @@ from app.models.workflow import (
     LogSource,
     WorkflowActionType,
 )
+from app.services.condition_compiler import ConditionCompiler
+from app.services.rule_scheduler import build_rule_waves
 from app.services.versioning_service import VersioningService
 from app.services.workflow_logger import (
     BatchOperationManager,
@@ -46,6 +64,20 @@ from app.services.workflow_logger import (
 )
 
 
+@dataclass
+class ExistenceIndex:
+    """Entities that already exist in the project, used for idempotency checks."""
+
+    # Live asset tag -> asset id
+    assets: dict[str, str]
+    # Cable tag -> cable id
+    cables: dict[str, str]
+    # (source_node_id, target_node_id, relation_type)
+    edges: set[tuple[str, str, str]]
+    # Soft-deleted asset tag -> asset id (still held by uix_project_tag)
+    deleted_assets: dict[str, str] = field(default_factory=dict)
+
+
 @dataclass
 class ExecutionContext:
     """Context for rule execution."""
@@ -55,6 +87,8 @@ class ExecutionContext:
     correlation_id: str
     batch_id: str | None
     session_id: str | None = None
+    # Loaded on first use and kept up to date as entities are created
+    index: ExistenceIndex | None = None
 
 
 @dataclass
@@ -98,6 +132,34 @@ class ExecutionSummary:
     errors: int
     duration_ms: int
     rule_results: list[RuleExecutionResult]
+    # Exclusive time per phase: load, evaluate, act, log (see /metrics)
+    phase_ms: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class BulkWritePlan:
+    """Rows planned for one rule in bulk mode, written in a single transaction."""
+
+    new_assets: list[dict] = field(default_factory=list)
+    new_cables: list[dict] = field(default_factory=list)
+    new_edges: list[dict] = field(default_factory=list)
+    # New assets to version (v1) once inserted
+    created_assets: list[Asset] = field(default_factory=list)
+    # (asset, snapshot before the change, new properties)
+    updated_assets: list[tuple[Asset, dict, dict]] = field(default_factory=list)
+    change_reason: str | None = None
+    # (trigger asset, result) for every matched asset
+    results: list[tuple[Asset, ActionResult]] = field(default_factory=list)
+
+
+# Actions with a set-based implementation; others fall back to per-asset execution
+BULK_ACTION_TYPES = {
+    RuleActionType.CREATE_CHILD,
+    RuleActionType.CREATE_CABLE,
+    RuleActionType.SET_PROPERTY,
+    RuleActionType.CREATE_RELATIONSHIP,
+    RuleActionType.ALLOCATE_IO,
+}
 
 
 class RuleExecutionService:
@@ -109,7 +171,9 @@ class RuleExecutionService:
     - Asset versioning for all changes
     - Batch operation tracking for rollback
     - Priority queue for rule ordering
-    - Idempotent actions (won't duplicate assets)
+    - Idempotent actions (won't duplicate assets), checked against an
+      in-memory existence index loaded once per run
+    - Parallel waves of independent rules (rule_scheduler)
     """
 
     def __init__(
@@ -117,15 +181,25 @@ class RuleExecutionService:
         db: Session,
         project_id: str,
         user_id: str | None = None,
+        session_factory: Callable[[], Session] | None = None,
     ):
         self.db = db
         self.project_id = project_id
         self.user_id = user_id
+        # Creates the per-thread sessions used in parallel mode
+        self._session_factory = session_factory or SessionLocal
+        self._asset_cache: list[Asset] | None = None
+        # Size of the asset selection; None once rules created children in it
+        self._selection_count: int | None = None
+        # Time not spent loading, evaluating or acting is logging/bookkeeping
+        self.phases = PhaseTimer()
 
         # Initialize services
-        self._workflow_logger = WorkflowLogger(db, project_id, user_id)
+        # Several events per asset: batch their inserts, broadcast stays live
+        self._workflow_logger = WorkflowLogger(db, project_id, user_id, buffered=True)
         self._versioning = VersioningService(db, project_id, user_id)
         self._batch_manager = BatchOperationManager(db, project_id, user_id)
+        self._condition_compiler = ConditionCompiler(include_columns=True)
 
     # ==========================================================================
     # MAIN EXECUTION
@@ -135,6 +209,9 @@ class RuleExecutionService:
         self,
         rule_ids: list[str] | None = None,
         asset_ids: list[str] | None = None,
+        bulk: bool = False,
+        parallel: bool = False,
+        max_workers: int | None = None,
     ) -> ExecutionSummary:
         """
         Execute rules on assets with full traceability.
@@ -142,10 +219,34 @@ class RuleExecutionService:
         Args:
             rule_ids: Specific rules to execute (None = all active rules)
             asset_ids: Specific assets to process (None = all project assets)
+            bulk: Plan each rule across all assets and write it in one
+                transaction with batched statements (see _execute_rule_bulk)
+            parallel: Run independent rules concurrently in waves, each rule
+                in its own thread and session (see _execute_waves)
+            max_workers: Thread pool size for parallel mode
+                (default: settings.RULE_EXECUTION_WORKERS)
 
         Returns:
             ExecutionSummary with detailed results
         """
+        self.phases = PhaseTimer()
+        try:
+            with self.phases.phase("log"):
+                summary = self._execute_rules(rule_ids, asset_ids, bulk, parallel, max_workers)
+        finally:
+            self.phases.observe()
+        summary.phase_ms = self.phases.milliseconds()
+        return summary
+
+    def _execute_rules(
+        self,
+        rule_ids: list[str] | None,
+        asset_ids: list[str] | None,
+        bulk: bool,
+        parallel: bool,
+        max_workers: int | None,
+    ) -> ExecutionSummary:
+        """Body of execute_rules, timed under the "log" phase by default."""
         start_time = time.time()
 
         # Start workflow
@@ -153,7 +254,11 @@ class RuleExecutionService:
             source=LogSource.RULE,
             action_type=WorkflowActionType.EXECUTE,
             message="Starting Rule Engine execution",
-            details={"rule_count": len(rule_ids) if rule_ids else "all"},
+            details={
+                "rule_count": len(rule_ids) if rule_ids else "all",
+                "bulk": bulk,
+                "parallel": parallel,
+            },
         )
 
         # Create batch operation for rollback tracking
@@ -181,27 +286,40 @@ class RuleExecutionService:
                 source=LogSource.RULE,
             )
 
-            # Load assets
-            assets = self._load_assets(asset_ids)
+            # Count assets; rows are loaded per rule, filtered in SQL when possible
+            self._selection_count = None
+            asset_count = self._selection_size(asset_ids)
 
             self._workflow_logger.log_info(
-                f"Processing {len(assets)} assets",
+                f"Processing {asset_count} assets",
                 correlation_id=correlation_id,
                 source=LogSource.RULE,
             )
 
+            # Bulk mode keeps loaded assets in sync itself, so skip the
+            # per-commit expiry that would reload every asset one by one
+            expire_on_commit = self.db.expire_on_commit
+            if bulk:
+                self.db.expire_on_commit = False
+
+            # Full asset list, loaded lazily for conditions that cannot be compiled
+            self._asset_cache = None
+
             # Execute each rule
-            rule_results = []
-            total_actions = 0
-            total_skipped = 0
-            total_errors = 0
-
-            for rule in rules:
-                result = self._execute_rule(rule, assets, context)
-                rule_results.append(result)
-                total_actions += result.actions_taken
-                total_skipped += result.skipped
-                total_errors += result.errors
+            try:
+                if parallel:
+                    rule_results = self._execute_waves(rules, asset_ids, context, bulk, max_workers)
+                else:
+                    rule_results = [
+                        self._run_rule(rule, asset_ids, context, bulk) for rule in rules
+                    ]
+            finally:
+                self.db.expire_on_commit = expire_on_commit
+                self._asset_cache = None
+
+            total_actions = sum(result.actions_taken for result in rule_results)
+            total_skipped = sum(result.skipped for result in rule_results)
+            total_errors = sum(result.errors for result in rule_results)
 
             # Complete batch
             self._batch_manager.complete_batch(batch.id, affected_assets=total_actions)
@@ -213,7 +331,7 @@ class RuleExecutionService:
                 duration_ms=duration_ms,
                 stats={
                     "rules_executed": len(rules),
-                    "assets_processed": len(assets),
+                    "assets_processed": asset_count,
                     "actions_taken": total_actions,
                     "skipped": total_skipped,
                     "errors": total_errors,
@@ -222,8 +340,8 @@ class RuleExecutionService:
 
             return ExecutionSummary(
                 total_rules=len(rules),
-                total_assets=len(assets),
-                total_executions=len(rules) * len(assets),
+                total_assets=asset_count,
+                total_executions=len(rules) * asset_count,
                 actions_taken=total_actions,
                 skipped=total_skipped,
                 errors=total_errors,
@@ -239,14 +357,73 @@ class RuleExecutionService:
             )
             raise
 
+    def _run_rule(
+        self,
+        rule: RuleDefinition,
+        asset_ids: list[str] | None,
+        context: ExecutionContext,
+        bulk: bool,
+    ) -> RuleExecutionResult:
+        """
+        Load the assets matching a rule and execute it.
+
+        Both condition paths see the selection as it is when the rule starts,
+        children created by earlier rules included; skipped counts are taken
+        against that same selection.
+        """
+        assets = self._match_assets(rule, asset_ids)
+        if assets is None:
+            if self._asset_cache is None:
+                self._asset_cache = self._load_assets(asset_ids)
+            assets = self._asset_cache
+            # Every row was evaluated in Python
+            total_assets = len(assets)
+        else:
+            total_assets = self._selection_size(asset_ids)
+
+        if bulk and rule.action_type in BULK_ACTION_TYPES:
+            result = self._execute_rule_bulk(rule, assets, context, total_assets)
+        else:
+            result = self._execute_rule(rule, assets, context, total_assets)
+
+        if self._grew_selection(rule, result, asset_ids):
+            self._asset_cache = None
+            self._selection_count = None
+        return result
+
+    @staticmethod
+    def _grew_selection(
+        rule: RuleDefinition, result: RuleExecutionResult, asset_ids: list[str] | None
+    ) -> bool:
+        """Whether a rule added children to the selection (explicit ids never grow)."""
+        return (
+            not asset_ids
+            and rule.action_type == RuleActionType.CREATE_CHILD
+            and result.actions_taken > 0
+        )
+
+    def _selection_size(self, asset_ids: list[str] | None) -> int:
+        """Number of assets selected for processing, recounted after creations."""
+        if self._selection_count is None:
+            with self.phases.phase("load"):
+                self._selection_count = self._asset_query(asset_ids).count()
+        return self._selection_count
+
     def _execute_rule(
         self,
         rule: RuleDefinition,
         assets: list[Asset],
         context: ExecutionContext,
+        total_assets: int | None = None,
     ) -> RuleExecutionResult:
-        """Execute a single rule on all assets."""
+        """
+        Execute a single rule on all assets.
+
+        When assets were pre-filtered in SQL, total_assets is the size of the
+        full selection and the difference counts as skipped.
+        """
         start_time = time.time()
+        total_assets = len(assets) if total_assets is None else total_assets
 
         # Log rule start
         self._workflow_logger.log_event(
@@ -263,7 +440,7 @@ class RuleExecutionService:
 
         action_results = []
         actions_taken = 0
-        skipped = 0
+        skipped = total_assets - len(assets)
         errors = 0
 
         for asset in assets:
@@ -299,7 +476,7 @@ class RuleExecutionService:
         return RuleExecutionResult(
             rule_id=rule.id,
             rule_name=rule.name,
-            total_assets=len(assets),
+            total_assets=total_assets,
             actions_taken=actions_taken,
             skipped=skipped,
             errors=errors,
@@ -307,10 +484,727 @@ class RuleExecutionService:
             action_results=action_results,
         )
 
+    # ==========================================================================
+    # PARALLEL EXECUTION
+    # ==========================================================================
+
+    def _execute_waves(
+        self,
+        rules: list[RuleDefinition],
+        asset_ids: list[str] | None,
+        context: ExecutionContext,
+        bulk: bool,
+        max_workers: int | None = None,
+    ) -> list[RuleExecutionResult]:
+        """
+        Execute rules wave by wave (see rule_scheduler.build_rule_waves).
+
+        Rules inside a wave read and write disjoint data, so they run in a
+        thread pool, each with its own session. Waves run one after another,
+        which keeps priority order between conflicting rules.
+        """
+        waves = build_rule_waves(rules)
+        max_workers = max_workers or settings.RULE_EXECUTION_WORKERS
+
+        self._workflow_logger.log_info(
+            f"Scheduled {len(rules)} rules in {len(waves)} waves",
+            correlation_id=context.correlation_id,
+            source=LogSource.RULE,
+            details={"waves": [[rule.name for rule in wave] for wave in waves]},
+        )
+
+        # Shared by the workers; rules in a wave never touch the same entries
+        self._existence_index(context)
+
+        results = {}
+        for wave in waves:
+            if len(wave) == 1 or max_workers == 1:
+                for rule in wave:
+                    results[rule.id] = self._run_rule(rule, asset_ids, context, bulk)
+                continue
+
+            # Workers only see committed data
+            self.db.commit()
+
+            worker_contexts = [replace(context) for _ in wave]
+            asset_count = self._selection_size(asset_ids)
+            # Workers time their own phases; waiting on them is not counted
+            with self.phases.phase(None), ThreadPoolExecutor(
+                max_workers=min(len(wave), max_workers)
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        self._run_rule_isolated,
+                        rule.id,
+                        asset_ids,
+                        worker_context,
+                        asset_count,
+                        bulk,
+                    )
+                    for rule, worker_context in zip(wave, worker_contexts, strict=True)
+                ]
+                for rule, future in zip(wave, futures, strict=True):
+                    results[rule.id] = future.result()
+
+            # Workers committed through their own sessions
+            self.db.expire_all()
+            self._asset_cache = None
+            if any(self._grew_selection(rule, results[rule.id], asset_ids) for rule in wave):
+                self._selection_count = None
+            if any(worker.index is not context.index for worker in worker_contexts):
+                # A worker dropped the index after a failed write
+                context.index = None
+
+        return [results[rule.id] for rule in rules]
+
+    def _run_rule_isolated(
+        self,
+        rule_id: str,
+        asset_ids: list[str] | None,
+        context: ExecutionContext,
+        asset_count: int,
+        bulk: bool,
+    ) -> RuleExecutionResult:
+        """Execute one rule in a worker thread with its own session."""
+        db = self._session_factory()
+        try:
+            if bulk:
+                db.expire_on_commit = False
+            worker = RuleExecutionService(db, self.project_id, self.user_id, self._session_factory)
+            worker.phases = self.phases
+            worker._selection_count = asset_count
+            with self.phases.phase("log"):
+                rule = db.get(RuleDefinition, rule_id)
+                result = worker._run_rule(rule, asset_ids, context, bulk)
+                worker._workflow_logger.flush()
+            return result
+        finally:
+            db.close()
+
+    # ==========================================================================
+    # BULK EXECUTION
+    # ==========================================================================
+
+    def _execute_rule_bulk(
+        self,
+        rule: RuleDefinition,
+        assets: list[Asset],
+        context: ExecutionContext,
+        total_assets: int | None = None,
+    ) -> RuleExecutionResult:
+        """
+        Execute a single rule on all assets with set-based writes.
+
+        Every matching asset is planned in memory first (idempotency checks use
+        the run's existence index), then all rows are written with multi-row
+        INSERT/UPDATE statements and committed once. If the write fails, the
+        whole rule is rolled back and every planned action counts as an error.
+        """
+        start_time = time.time()
+        total_assets = len(assets) if total_assets is None else total_assets
+
+        self._workflow_logger.log_event(
+            source=LogSource.RULE,
+            action_type=WorkflowActionType.EXECUTE,
+            message=f"Executing rule: {rule.name}",
+            correlation_id=context.correlation_id,
+            details={
+                "rule_id": rule.id,
+                "priority": rule.priority,
+                "action_type": rule.action_type.value,
+                "bulk": True,
+            },
+        )
+
+        matched = [asset for asset in assets if self._evaluate_condition(rule.condition, asset)]
+        skipped = total_assets - len(matched)
+
+        plan = BulkWritePlan()
+        if matched:
+            planners = {
+                RuleActionType.CREATE_CHILD: self._plan_create_child,
+                RuleActionType.CREATE_CABLE: self._plan_create_cable,
+                RuleActionType.SET_PROPERTY: self._plan_set_property,
+                RuleActionType.CREATE_RELATIONSHIP: self._plan_create_relationship,
+                RuleActionType.ALLOCATE_IO: self._plan_allocate_io,
+            }
+            with self.phases.phase("act"):
+                planners[rule.action_type](rule, matched, context, plan)
+
+        plan_ms = int((time.time() - start_time) * 1000)
+        per_action_ms = plan_ms // len(matched) if matched else 0
+        for _, result in plan.results:
+            result.duration_ms = per_action_ms
+
+        actions = [(a, r) for a, r in plan.results if r.success and r.action_type != "SKIP"]
+
+        try:
+            self._write_bulk_plan(rule, plan, actions, context)
+
+            rule.execution_count += 1
+            rule.last_executed_at = datetime.utcnow()
+            rule.success_count += len(actions)
+            rule.failure_count += sum(1 for _, r in plan.results if not r.success)
+            self.db.commit()
+
+            # Reflect the bulk UPDATE on the loaded instances without re-dirtying them
+            for asset, _, properties in plan.updated_assets:
+                set_committed_value(asset, "properties", properties)
+
+        except Exception as e:
+            self.db.rollback()
+            self._workflow_logger.log_error(
+                message=f"Bulk write failed for rule {rule.name}, rule rolled back",
+                correlation_id=context.correlation_id,
+                error=str(e),
+                source=LogSource.RULE,
+                details={"rule_id": rule.id, "planned_actions": len(actions)},
+            )
+            for _, result in actions:
+                result.success = False
+                result.action_type = "ERROR"
+                result.message = f"Error executing action: {str(e)}"
+                result.error = str(e)
+            actions = []
+
+            # Planning already recorded the rolled-back entities as existing
+            context.index = None
+
+        self._log_bulk_results(rule, plan, actions, context)
+
+        action_results = [result for _, result in plan.results]
+        errors = sum(1 for result in action_results if not result.success)
+        skipped += sum(1 for result in action_results if result.action_type == "SKIP")
+
+        return RuleExecutionResult(
+            rule_id=rule.id,
+            rule_name=rule.name,
+            total_assets=total_assets,
+            actions_taken=len(actions),
+            skipped=skipped,
+            errors=errors,
+            duration_ms=int((time.time() - start_time) * 1000),
+            action_results=action_results,
+        )
+
+    def _plan_create_child(
+        self,
+        rule: RuleDefinition,
+        assets: list[Asset],
+        context: ExecutionContext,
+        plan: BulkWritePlan,
+    ):
+        """Plan CREATE_CHILD for all matched assets (see _action_create_child)."""
+        action = rule.action.get("create_child", {})
+
+        child_type = action.get("type")
+        if not child_type:
+            for asset in assets:
+                plan.results.append(
+                    (
+                        asset,
+                        ActionResult(
+                            success=False,
+                            action_type="ERROR",
+                            message="Missing child type in rule action",
+                            error="Missing 'type' in create_child action",
+                        ),
+                    )
+                )
+            return
+
+        relation = action.get("relation", "related_to")
+        naming = action.get("naming", "{parent_tag}-{type}")
+        semantic_type = action.get("semantic_type", "ASSET")
+        discipline = action.get("discipline") or rule.discipline
+
+        child_tags = {
+            asset.id: naming.replace("{parent_tag}", asset.tag or "UNKNOWN")
+            .replace("{type}", child_type[:1])
+            .replace("{area}", asset.area or "")
+            for asset in assets
+        }
+        index = self._existence_index(context)
+
+        for asset in assets:
+            child_tag = child_tags[asset.id]
+
+            if child_tag in index.assets or child_tag in index.deleted_assets:
+                plan.results.append((asset, self._existing_child_result(index, child_tag)))
+                continue
+
+            child_properties = action.get("properties", {}).copy()
+            if "inherit_properties" in action and asset.properties:
+                for key in action["inherit_properties"]:
+                    if key in asset.properties:
+                        child_properties[key] = asset.properties[key]
+
+            child = Asset(
+                id=generate_uuid(),
+                tag=child_tag,
+                type=child_type,
+                project_id=context.project_id,
+                semantic_type=semantic_type,
+                discipline=discipline,
+                area=asset.area,
+                system=asset.system,
+                location_id=asset.location_id,
+                properties=child_properties,
+            )
+            index.assets[child_tag] = child.id
+            index.edges.add((child.id, asset.id, relation))
+
+            plan.new_assets.append(
+                {
+                    "id": child.id,
+                    "tag": child.tag,
+                    "type": child.type,
+                    "project_id": child.project_id,
+                    "semantic_type": child.semantic_type,
+                    "discipline": child.discipline,
+                    "area": child.area,
+                    "system": child.system,
+                    "location_id": child.location_id,
+                    "properties": child.properties,
+                }
+            )
+            plan.created_assets.append(child)
+            plan.new_edges.append(
+                {
+                    "id": generate_uuid(),
+                    "source_node_id": child.id,
+                    "target_node_id": asset.id,
+                    "relation_type": relation,
+                    "discipline": discipline,
+                }
+            )
+            plan.results.append(
+                (
+                    asset,
+                    ActionResult(
+                        success=True,
+                        action_type="CREATE",
+                        message=f"Created {child_type} {child_tag} for {asset.tag}",
+                        entity_id=child.id,
+                        entity_tag=child.tag,
+                        entity_type=child_type,
+                        details={"parent_id": asset.id, "relation": relation},
+                    ),
+                )
+            )
+
+    def _plan_create_cable(
+        self,
+        rule: RuleDefinition,
+        assets: list[Asset],
+        context: ExecutionContext,
+        plan: BulkWritePlan,
+    ):
+        """Plan CREATE_CABLE for all matched assets (see _action_create_cable)."""
+        from app.services.cable_sizing import CableSizingService
+
+        action = rule.action.get("create_cable", {})
+
+        cable_tag_pattern = action.get("cable_tag", "{tag}-CBL")
+        cable_type = action.get("cable_type", "POWER")
+        sizing_method = action.get("sizing_method", "Manual")
+        length_meters = action.get("length_meters", 50.0)
+        voltage_str = action.get("voltage", "600V")
+
+        cable_tags = {
+            asset.id: cable_tag_pattern.replace("{tag}", asset.tag or "UNKNOWN") for asset in assets
+        }
+        index = self._existence_index(context)
+
+        for asset in assets:
+            cable_tag = cable_tags[asset.id]
+
+            if cable_tag in index.cables:
+                plan.results.append(
+                    (
+                        asset,
+                        ActionResult(
+                            success=True,
+                            action_type="SKIP",
+                            message=f"Cable {cable_tag} already exists",
+                            entity_id=index.cables[cable_tag],
+                            entity_tag=cable_tag,
+                        ),
+                    )
+                )
+                continue
+
+            sizing_result = {}
+            if sizing_method == "Auto" and asset.type == "MOTOR":
+                hp = None
+                if asset.properties:
+                    hp = asset.properties.get("hp") or asset.properties.get("power")
+                if hp:
+                    try:
+                        sizing_result = CableSizingService.size_cable(
+                            hp=float(hp),
+                            length_meters=length_meters,
+                            voltage_str=voltage_str,
+                        )
+                    except Exception:
+                        pass
+
+            cable_id = uuid.uuid4()
+            index.cables[cable_tag] = str(cable_id)
+
+            plan.new_cables.append(
+                {
+                    "id": cable_id,
+                    "tag": cable_tag,
+                    "project_id": context.project_id,
+                    "cable_type": cable_type,
+                    "description": f"{cable_type} cable for {asset.tag}",
+                    "to_asset_id": asset.id,
+                    "length_meters": length_meters,
+                    "conductor_size": sizing_result.get("cable_size"),
+                    "voltage_drop_percent": sizing_result.get("voltage_drop_percent"),
+                    "voltage_drop_volts": sizing_result.get("voltage_drop_volts"),
+                    "code_standard": "CEC-2021",
+                    "created_by_rule_id": rule.id,
+                    "properties": {
+                        "sizing_method": sizing_method,
+                        "insulation": action.get("insulation", "RW90 XLPE"),
+                        **sizing_result,
+                    },
+                }
+            )
+            plan.results.append(
+                (
+                    asset,
+                    ActionResult(
+                        success=True,
+                        action_type="CREATE",
+                        message=f"Created cable {cable_tag} for {asset.tag}",
+                        entity_id=str(cable_id),
+                        entity_tag=cable_tag,
+                        entity_type="CABLE",
+                        details={"size": sizing_result.get("cable_size")},
+                    ),
+                )
+            )
+
+    def _plan_set_property(
+        self,
+        rule: RuleDefinition,
+        assets: list[Asset],
+        context: ExecutionContext,
+        plan: BulkWritePlan,
+    ):
+        """Plan SET_PROPERTY for all matched assets (see _action_set_property)."""
+        action = rule.action.get("set_property", {})
+        plan.change_reason = f"Properties updated by rule: {rule.name}"
+
+        for asset in assets:
+            if not action:
+                plan.results.append(
+                    (
+                        asset,
+                        ActionResult(
+                            success=False,
+                            action_type="ERROR",
+                            message="No properties to set",
+                            error="Empty set_property action",
+                        ),
+                    )
+                )
+                continue
+
+            properties = dict(asset.properties or {})
+            old_values = {key: properties.get(key) for key in action}
+            properties.update(action)
+            plan.updated_assets.append(
+                (asset, self._versioning._create_snapshot(asset), properties)
+            )
+
+            plan.results.append(
+                (
+                    asset,
+                    ActionResult(
+                        success=True,
+                        action_type="UPDATE",
+                        message=f"Updated properties on {asset.tag}: {list(action.keys())}",
+                        entity_id=asset.id,
+                        entity_tag=asset.tag,
+                        entity_type="ASSET",
+                        details={
+                            "properties_updated": list(action.keys()),
+                            "old_values": old_values,
+                        },
+                    ),
+                )
+            )
+
+    def _plan_allocate_io(
+        self,
+        rule: RuleDefinition,
+        assets: list[Asset],
+        context: ExecutionContext,
+        plan: BulkWritePlan,
+    ):
+        """Plan ALLOCATE_IO for all matched assets (see _action_allocate_io)."""
+        action = rule.action.get("allocate_io", {})
+
+        io_type = action.get("io_type")
+        channel_count = action.get("channel_count", 1)
+        plan.change_reason = f"IO allocated by rule: {rule.name}"
+
+        for asset in assets:
+            if not io_type:
+                plan.results.append(
+                    (
+                        asset,
+                        ActionResult(
+                            success=False,
+                            action_type="ERROR",
+                            message="Missing io_type in action",
+                            error="No io_type specified",
+                        ),
+                    )
+                )
+                continue
+
+            properties = dict(asset.properties or {})
+            io_allocation = dict(properties.get("io_allocation", {}))
+            io_allocation[io_type] = io_allocation.get(io_type, 0) + channel_count
+            properties["io_allocation"] = io_allocation
+            plan.updated_assets.append(
+                (asset, self._versioning._create_snapshot(asset), properties)
+            )
+
+            plan.results.append(
+                (
+                    asset,
+                    ActionResult(
+                        success=True,
+                        action_type="UPDATE",
+                        message=f"Allocated {channel_count} {io_type} channel(s) to {asset.tag}",
+                        entity_id=asset.id,
+                        entity_tag=asset.tag,
+                        entity_type="ASSET",
+                        details={"io_type": io_type, "channels": channel_count},
+                    ),
+                )
+            )
+
+    def _plan_create_relationship(
+        self,
+        rule: RuleDefinition,
+        assets: list[Asset],
+        context: ExecutionContext,
+        plan: BulkWritePlan,
+    ):
+        """Plan CREATE_RELATIONSHIP for all matched assets (see _action_create_relationship)."""
+        action = rule.action.get("create_relationship", {})
+
+        relation_type = action.get("relation", "related_to")
+        target_tag_pattern = action.get("target_tag")
+        direction = action.get("direction", "outgoing")
+
+        if not target_tag_pattern:
+            for asset in assets:
+                plan.results.append(
+                    (
+                        asset,
+                        ActionResult(
+                            success=False,
+                            action_type="ERROR",
+                            message="Missing target_tag in action",
+                            error="No target_tag specified",
+                        ),
+                    )
+                )
+            return
+
+        target_tags = {
+            asset.id: target_tag_pattern.replace("{tag}", asset.tag or "") for asset in assets
+        }
+        index = self._existence_index(context)
+
+        # Resolve (source, target, relation) edges from the index
+        pairs = {}
+        for asset in assets:
+            target_id = index.assets.get(target_tags[asset.id])
+            if target_id is None:
+                continue
+            if direction == "outgoing":
+                pairs[asset.id] = (asset.id, target_id, relation_type)
+            else:
+                pairs[asset.id] = (target_id, asset.id, relation_type)
+
+        for asset in assets:
+            target_tag = target_tags[asset.id]
+
+            if asset.id not in pairs:
+                plan.results.append(
+                    (
+                        asset,
+                        ActionResult(
+                            success=True,
+                            action_type="SKIP",
+                            message=f"Target asset {target_tag} not found",
+                        ),
+                    )
+                )
+                continue
+
+            if pairs[asset.id] in index.edges:
+                plan.results.append(
+                    (
+                        asset,
+                        ActionResult(
+                            success=True,
+                            action_type="SKIP",
+                            message=f"Relationship {relation_type} already exists",
+                        ),
+                    )
+                )
+                continue
+
+            source_id, target_id, _ = pairs[asset.id]
+            index.edges.add(pairs[asset.id])
+            edge_id = generate_uuid()
+
+            plan.new_edges.append(
+                {
+                    "id": edge_id,
+                    "source_node_id": source_id,
+                    "target_node_id": target_id,
+                    "relation_type": relation_type,
+                    "discipline": rule.discipline,
+                }
+            )
+            plan.results.append(
+                (
+                    asset,
+                    ActionResult(
+                        success=True,
+                        action_type="LINK",
+                        message=f"Created {relation_type} to {target_tag}",
+                        entity_id=edge_id,
+                        entity_type="EDGE",
+                        details={"relation": relation_type, "target": target_tag},
+                    ),
+                )
+            )
+
+    @timed_phase("act")
+    def _write_bulk_plan(
+        self,
+        rule: RuleDefinition,
+        plan: BulkWritePlan,
+        actions: list[tuple[Asset, ActionResult]],
+        context: ExecutionContext,
+    ):
+        """Write all planned rows with one multi-row statement per table."""
+        if plan.new_assets:
+            self.db.execute(insert(Asset), plan.new_assets)
+        if plan.new_cables:
+            self.db.execute(insert(Cable), plan.new_cables)
+        if plan.new_edges:
+            self.db.execute(insert(MetamodelEdge), plan.new_edges)
+        if plan.updated_assets:
+            self.db.execute(
+                update(Asset),
+                [
+                    {"id": asset.id, "properties": properties}
+                    for asset, _, properties in plan.updated_assets
+                ],
+            )
+
+        # Versions are written in the same transaction as the changes
+        if plan.created_assets:
+            self._versioning.create_versions_bulk(
+                plan.created_assets,
+                change_source=ChangeSource.RULE,
+                change_reason="Initial creation",
+                batch_id=context.batch_id,
+                commit=False,
+            )
+        if plan.updated_assets:
+            self._versioning.create_versions_bulk(
+                [asset for asset, _, _ in plan.updated_assets],
+                change_source=ChangeSource.RULE,
+                change_reason=plan.change_reason,
+                batch_id=context.batch_id,
+                snapshots={
+                    asset.id: {**before, "properties": properties}
+                    for asset, before, properties in plan.updated_assets
+                },
+                previous_snapshots={asset.id: before for asset, before, _ in plan.updated_assets},
+                commit=False,
+            )
+        if actions:
+            self.db.execute(
+                insert(RuleExecution),
+                [
+                    {
+                        "rule_id": rule.id,
+                        "project_id": context.project_id,
+                        "asset_id": asset.id,
+                        "action_type": result.action_type,
+                        "action_taken": result.message,
+                        "condition_matched": True,
+                        "created_entity_id": result.entity_id,
+                        "created_entity_type": result.entity_type,
+                        "error_message": result.error,
+                        "execution_time_ms": result.duration_ms,
+                    }
+                    for asset, result in actions
+                ],
+            )
+
+    def _log_bulk_results(
+        self,
+        rule: RuleDefinition,
+        plan: BulkWritePlan,
+        actions: list[tuple[Asset, ActionResult]],
+        context: ExecutionContext,
+    ):
+        """Log one summary event per action kind instead of one event per asset."""
+        by_kind: dict[str, list[ActionResult]] = {}
+        for _, result in actions:
+            by_kind.setdefault(result.action_type, []).append(result)
+
+        action_types = {
+            "CREATE": WorkflowActionType.CREATE,
+            "UPDATE": WorkflowActionType.UPDATE,
+            "LINK": WorkflowActionType.LINK,
+        }
+        for kind, results in by_kind.items():
+            self._workflow_logger.log_event(
+                source=LogSource.RULE,
+                action_type=action_types.get(kind, WorkflowActionType.EXECUTE),
+                message=f"Rule {rule.name}: {len(results)} {kind.lower()} action(s)",
+                correlation_id=context.correlation_id,
+                details={
+                    "rule_id": rule.id,
+                    "count": len(results),
+                    "entities": [r.entity_tag or r.entity_id for r in results[:10]],
+                },
+            )
+
+        # Cables over the configured length limit (see _action_create_cable)
+        length_limit = rule.action.get("create_cable", {}).get("max_length", 100)
+        too_long = [c["tag"] for c in plan.new_cables if c["length_meters"] > length_limit]
+        if actions and too_long:
+            self._workflow_logger.log_warning(
+                f"{len(too_long)} cable(s) exceed {length_limit}m limit",
+                correlation_id=context.correlation_id,
+                source=LogSource.RULE,
+                entity_type="CABLE",
+                details={"rule_id": rule.id, "cables": too_long[:10]},
+            )
+
     # ==========================================================================
     # CONDITION EVALUATION
     # ==========================================================================
 
+    @timed_phase("evaluate")
     def _evaluate_condition(self, condition: dict, asset: Asset) -> bool:
         """Evaluate if a condition matches an asset."""
         # Check asset_type
@@ -370,6 +1264,7 @@ class RuleExecutionService:
     # ACTION EXECUTION
     # ==========================================================================
 
+    @timed_phase("act")
     def _execute_action(
         self,
         rule: RuleDefinition,
@@ -451,26 +1346,9 @@ class RuleExecutionService:
         )
 
         # Check idempotency
-        existing = (
-            self.db.query(Asset)
-            .filter(
-                and_(
-                    Asset.tag == child_tag,
-                    Asset.project_id == context.project_id,
-                    Asset.deleted_at.is_(None),
-                )
-            )
-            .first()
-        )
-
-        if existing:
-            return ActionResult(
-                success=True,
-                action_type="SKIP",
-                message=f"Child {child_tag} already exists",
-                entity_id=existing.id,
-                entity_tag=existing.tag,
-            )
+        index = self._existence_index(context)
+        if child_tag in index.assets or child_tag in index.deleted_assets:
+            return self._existing_child_result(index, child_tag)
 
         # Build child properties
         child_properties = action.get("properties", {}).copy()
@@ -519,6 +1397,9 @@ class RuleExecutionService:
         self.db.add(edge)
         self.db.commit()
 
+        index.assets[child.tag] = child.id
+        index.edges.add((child.id, asset.id, relation))
+
         # Log the creation
         self._workflow_logger.log_create(
             entity_type="ASSET",
@@ -570,24 +1451,14 @@ class RuleExecutionService:
         cable_tag = cable_tag_pattern.replace("{tag}", asset.tag or "UNKNOWN")
 
         # Check idempotency
-        existing = (
-            self.db.query(Cable)
-            .filter(
-                and_(
-                    Cable.tag == cable_tag,
-                    Cable.project_id == context.project_id,
-                )
-            )
-            .first()
-        )
-
-        if existing:
+        index = self._existence_index(context)
+        if cable_tag in index.cables:
             return ActionResult(
                 success=True,
                 action_type="SKIP",
                 message=f"Cable {cable_tag} already exists",
-                entity_id=str(existing.id),
-                entity_tag=existing.tag,
+                entity_id=index.cables[cable_tag],
+                entity_tag=cable_tag,
             )
 
         # Auto-size if configured
@@ -629,6 +1500,8 @@ class RuleExecutionService:
         self.db.add(cable)
         self.db.commit()
 
+        index.cables[cable.tag] = str(cable.id)
+
         # Log creation
         self._workflow_logger.log_create(
             entity_type="CABLE",
@@ -880,19 +1753,10 @@ class RuleExecutionService:
         target_tag = target_tag_pattern.replace("{tag}", asset.tag or "")
 
         # Find target asset
-        target = (
-            self.db.query(Asset)
-            .filter(
-                and_(
-                    Asset.tag == target_tag,
-                    Asset.project_id == context.project_id,
-                    Asset.deleted_at.is_(None),
-                )
-            )
-            .first()
-        )
+        index = self._existence_index(context)
+        target_asset_id = index.assets.get(target_tag)
 
-        if not target:
+        if not target_asset_id:
             return ActionResult(
                 success=True,
                 action_type="SKIP",
@@ -902,25 +1766,13 @@ class RuleExecutionService:
         # Determine direction
         if direction == "outgoing":
             source_id = asset.id
-            target_id = target.id
+            target_id = target_asset_id
         else:
-            source_id = target.id
+            source_id = target_asset_id
             target_id = asset.id
 
         # Check if edge exists
-        existing = (
-            self.db.query(MetamodelEdge)
-            .filter(
-                and_(
-                    MetamodelEdge.source_node_id == source_id,
-                    MetamodelEdge.target_node_id == target_id,
-                    MetamodelEdge.relation_type == relation_type,
-                )
-            )
-            .first()
-        )
-
-        if existing:
+        if (source_id, target_id, relation_type) in index.edges:
             return ActionResult(
                 success=True,
                 action_type="SKIP",
@@ -938,6 +1790,8 @@ class RuleExecutionService:
         self.db.add(edge)
         self.db.commit()
 
+        index.edges.add((source_id, target_id, relation_type))
+
         # Log
         self._workflow_logger.log_event(
             source=LogSource.RULE,
@@ -1089,17 +1943,18 @@ class RuleExecutionService:
     # HELPERS
     # ==========================================================================
 
+    @timed_phase("load")
     def _load_rules(self, rule_ids: list[str] | None = None) -> list[RuleDefinition]:
         """Load rules in priority order."""
-        query = self.db.query(RuleDefinition).filter(RuleDefinition.is_active is True)
+        query = self.db.query(RuleDefinition).filter(RuleDefinition.is_active.is_(True))
 
         if rule_ids:
             query = query.filter(RuleDefinition.id.in_(rule_ids))
 
         return query.order_by(desc(RuleDefinition.priority)).all()
 
-    def _load_assets(self, asset_ids: list[str] | None = None) -> list[Asset]:
-        """Load assets for processing."""
+    def _asset_query(self, asset_ids: list[str] | None = None):
+        """Query for the live project assets selected for processing."""
         query = self.db.query(Asset).filter(
             and_(
                 Asset.project_id == self.project_id,
@@ -1110,7 +1965,92 @@ class RuleExecutionService:
         if asset_ids:
             query = query.filter(Asset.id.in_(asset_ids))
 
-        return query.all()
+        return query
+
+    @timed_phase("load")
+    def _load_assets(self, asset_ids: list[str] | None = None) -> list[Asset]:
+        """Load assets for processing."""
+        return self._asset_query(asset_ids).all()
+
+    @timed_phase("evaluate")
+    def _match_assets(
+        self, rule: RuleDefinition, asset_ids: list[str] | None = None
+    ) -> list[Asset] | None:
+        """
+        Load only the assets matching the rule condition, filtered in SQL.
+
+        Returns None when the condition cannot be compiled, in which case the
+        caller evaluates it in Python against the full asset list.
+        """
+        if not ConditionCompiler.is_supported(self.db):
+            return None
+
+        predicate = self._condition_compiler.compile(rule.condition)
+        if predicate is None:
+            return None
+
+        return self._asset_query(asset_ids).filter(predicate).all()
+
+    def _existence_index(self, context: ExecutionContext) -> ExistenceIndex:
+        """Return the run's existence index, loading it on first use."""
+        if context.index is None:
+            context.index = self._load_existence_index()
+        return context.index
+
+    @staticmethod
+    def _existing_child_result(index: ExistenceIndex, child_tag: str) -> ActionResult:
+        """SKIP for a child tag already taken by a live or soft-deleted asset."""
+        if child_tag in index.assets:
+            return ActionResult(
+                success=True,
+                action_type="SKIP",
+                message=f"Child {child_tag} already exists",
+                entity_id=index.assets[child_tag],
+                entity_tag=child_tag,
+            )
+        # The unique (project_id, tag) constraint covers deleted rows (e.g. a
+        # rolled-back batch): recreating the child would fail the insert
+        return ActionResult(
+            success=True,
+            action_type="SKIP",
+            message=f"Child {child_tag} was deleted, not recreated",
+            entity_id=index.deleted_assets[child_tag],
+            entity_tag=child_tag,
+        )
+
+    @timed_phase("load")
+    def _load_existence_index(self) -> ExistenceIndex:
+        """Load project asset tags, cable tags and edges (three queries)."""
+        assets = {}
+        deleted_assets = {}
+        for tag, asset_id, deleted_at in self.db.query(
+            Asset.tag, Asset.id, Asset.deleted_at
+        ).filter(Asset.project_id == self.project_id):
+            if deleted_at is None:
+                assets[tag] = asset_id
+            else:
+                deleted_assets[tag] = asset_id
+
+        cables = {
+            tag: str(cable_id)
+            for tag, cable_id in self.db.query(Cable.tag, Cable.id).filter(
+                Cable.project_id == self.project_id
+            )
+        }
+
+        project_asset_ids = select(Asset.id).where(Asset.project_id == self.project_id)
+        edges = {
+            tuple(row)
+            for row in self.db.query(
+                MetamodelEdge.source_node_id,
+                MetamodelEdge.target_node_id,
+                MetamodelEdge.relation_type,
+            ).filter(MetamodelEdge.source_node_id.in_(project_asset_ids))
+        }
+
+        return ExistenceIndex(
+            assets=assets, cables=cables, edges=edges, deleted_assets=deleted_assets
+        )
 
     def _log_rule_execution(
         self,
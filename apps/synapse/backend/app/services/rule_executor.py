@@ -11,9 +11,11 @@ from typing import Any
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 
+from app.core.metrics import PhaseTimer, timed_phase
 from app.models.metamodel import MetamodelEdge
 from app.models.models import Asset
 from app.models.rules import RuleDefinition, RuleExecution
+from app.services.condition_compiler import ConditionCompiler
 
 
 class RuleExecutor:
@@ -21,9 +23,12 @@ class RuleExecutor:
     Executes individual rules on assets.
     """
 
-    def __init__(self, db: Session, project_id: str):
+    def __init__(self, db: Session, project_id: str, phases: PhaseTimer | None = None):
         self.db = db
         self.project_id = project_id
+        # Condition evaluation and audit logging times (see RuleEngine.apply_rules)
+        self.phases = phases or PhaseTimer()
+        self._condition_compiler = ConditionCompiler(include_columns=False)
 
     @staticmethod
     def _get_asset_tag(asset) -> str:
@@ -116,6 +121,33 @@ class RuleExecutor:
                 self.db.rollback()
             return execution
 
+    @timed_phase("evaluate")
+    def find_matching_assets(
+        self, rule: RuleDefinition, asset_ids: set[str] | None = None
+    ) -> list[Asset] | None:
+        """
+        Fetch the project assets matching the rule condition, filtered in SQL.
+
+        Args:
+            rule: Rule whose condition is matched
+            asset_ids: Restrict matching to these assets (None = whole project)
+
+        Returns None when the condition cannot be compiled; callers then run
+        execute_rule on every asset and let _evaluate_condition decide.
+        """
+        if not ConditionCompiler.is_supported(self.db):
+            return None
+
+        predicate = self._condition_compiler.compile(rule.condition)
+        if predicate is None:
+            return None
+
+        query = self.db.query(Asset).filter(Asset.project_id == self.project_id, predicate)
+        if asset_ids is not None:
+            query = query.filter(Asset.id.in_(asset_ids))
+        return query.all()
+
+    @timed_phase("evaluate")
     def _evaluate_condition(self, condition: dict[str, Any], asset: Asset) -> bool:
         """
         Evaluate if condition matches asset.
@@ -523,6 +555,7 @@ class RuleExecutor:
             execution_time_ms=int((time.time() - start_time) * 1000),
         )
 
+    @timed_phase("log")
     def _log_execution(
         self,
         rule: RuleDefinition,
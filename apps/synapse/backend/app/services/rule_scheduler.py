@@ -0,0 +1,174 @@
+"""
+Rule Scheduler
+
+Builds a dependency graph between rules from what each rule reads and writes,
+then groups them into waves of mutually independent rules that can run
+concurrently. Rules that conflict keep their priority order.
+
+Footprints are expressed as resources (kind, asset_type, key) where "*" is a
+wildcard:
+- ("asset", "PUMP", "power_kw")  a property/column of PUMP assets
+- ("asset", "PUMP", ROWS)        which PUMP assets exist (condition matching)
+- ("asset", "PUMP", RECORD)      the PUMP rows themselves (properties JSON is
+                                 rewritten as a whole, versions are appended)
+- ("asset", "*", "*")            a new asset row (every key, any reader)
+- ("tags", "*", "*")             the project-wide asset tag namespace
+- ("cable", "*", "*"), ("edge", "*", "*")
+- ("*", "*", "*")                 everything (CREATE_PACKAGE)
+
+Two rules conflict when one writes a resource the other reads or writes.
+
+Example:
+    waves = build_rule_waves(rules)  # rules in priority order
+    # rules within waves[0] may run concurrently, then waves[1], ...
+"""
+
+from dataclasses import dataclass, field
+
+from app.models.rules import RuleActionType, RuleDefinition
+
+ANY = "*"
+ROWS = "@rows"
+RECORD = "@record"
+
+Resource = tuple[str, str, str]
+
+# Asset columns used by actions when building tags and children
+_TAG_KEYS = ("tag", "area", "system", "location_id")
+
+
+@dataclass
+class RuleFootprint:
+    """Resources a rule reads and writes."""
+
+    reads: set[Resource] = field(default_factory=set)
+    writes: set[Resource] = field(default_factory=set)
+
+
+# ============================================================================
+# ANALYSIS
+# ============================================================================
+
+
+def analyze_rule(rule: RuleDefinition) -> RuleFootprint:
+    """Derive the read/write footprint of a rule from its condition and action."""
+    condition = rule.condition if isinstance(rule.condition, dict) else {}
+    action = rule.action if isinstance(rule.action, dict) else {}
+
+    asset_type = condition.get("asset_type") or condition.get("node_type") or ANY
+    footprint = RuleFootprint()
+
+    # Condition: which assets match, through which keys
+    footprint.reads.add(("asset", asset_type, ROWS))
+    if condition.get("asset_type") and condition.get("node_type"):
+        footprint.reads.add(("asset", condition["node_type"], ROWS))
+    for filter_item in condition.get("property_filters") or []:
+        key = filter_item.get("key") if isinstance(filter_item, dict) else None
+        footprint.reads.add(("asset", asset_type, key or ANY))
+
+    action_type = rule.action_type
+
+    if action_type == RuleActionType.CREATE_CHILD:
+        config = action.get("create_child", {})
+        for key in _TAG_KEYS:
+            footprint.reads.add(("asset", asset_type, key))
+        for key in config.get("inherit_properties") or []:
+            footprint.reads.add(("asset", asset_type, key))
+        footprint.reads.add(("tags", ANY, ANY))
+        footprint.writes.update(
+            {
+                ("asset", config.get("type") or ANY, ANY),
+                ("tags", ANY, ANY),
+                ("edge", ANY, ANY),
+            }
+        )
+
+    elif action_type == RuleActionType.CREATE_CABLE:
+        footprint.reads.update(
+            {
+                ("asset", asset_type, "tag"),
+                ("asset", asset_type, "hp"),
+                ("asset", asset_type, "power"),
+                ("cable", ANY, ANY),
+            }
+        )
+        footprint.writes.add(("cable", ANY, ANY))
+
+    elif action_type == RuleActionType.SET_PROPERTY:
+        config = action.get("set_property", {})
+        footprint.reads.add(("asset", asset_type, RECORD))
+        footprint.writes.add(("asset", asset_type, RECORD))
+        for key in config:
+            footprint.writes.add(("asset", asset_type, key))
+
+    elif action_type == RuleActionType.ALLOCATE_IO:
+        footprint.reads.update(
+            {("asset", asset_type, RECORD), ("asset", asset_type, "io_allocation")}
+        )
+        footprint.writes.update(
+            {("asset", asset_type, RECORD), ("asset", asset_type, "io_allocation")}
+        )
+
+    elif action_type == RuleActionType.CREATE_RELATIONSHIP:
+        footprint.reads.update({("asset", asset_type, "tag"), ("tags", ANY, ANY)})
+        footprint.reads.add(("edge", ANY, ANY))
+        footprint.writes.add(("edge", ANY, ANY))
+
+    elif action_type == RuleActionType.VALIDATE:
+        footprint.reads.add(("asset", asset_type, ANY))
+
+    else:
+        # CREATE_PACKAGE queries and re-links assets across the project;
+        # unknown actions are treated the same way
+        footprint.reads.add((ANY, ANY, ANY))
+        footprint.writes.add((ANY, ANY, ANY))
+
+    return footprint
+
+
+def _overlaps(a: Resource, b: Resource) -> bool:
+    return all(x == y or x == ANY or y == ANY for x, y in zip(a, b, strict=True))
+
+
+def conflicts(first: RuleFootprint, second: RuleFootprint) -> bool:
+    """True if the two rules cannot safely run concurrently."""
+    for written in first.writes:
+        if any(_overlaps(written, r) for r in second.reads | second.writes):
+            return True
+    for written in second.writes:
+        if any(_overlaps(written, r) for r in first.reads):
+            return True
+    return False
+
+
+# ============================================================================
+# SCHEDULING
+# ============================================================================
+
+
+def build_rule_waves(rules: list[RuleDefinition]) -> list[list[RuleDefinition]]:
+    """
+    Group rules into waves of mutually independent rules.
+
+    Args:
+        rules: Rules in execution (priority) order
+
+    Returns:
+        Waves in execution order. A rule is placed in the wave after the
+        latest earlier rule it conflicts with, so conflicting rules keep their
+        relative order; rules inside a wave keep priority order.
+    """
+    footprints = [analyze_rule(rule) for rule in rules]
+    levels: list[int] = []
+
+    for i, footprint in enumerate(footprints):
+        level = 0
+        for j in range(i):
+            if levels[j] >= level and conflicts(footprints[j], footprint):
+                level = levels[j] + 1
+        levels.append(level)
+
+    waves: list[list[RuleDefinition]] = [[] for _ in range(max(levels, default=-1) + 1)]
+    for rule, level in zip(rules, levels, strict=True):
+        waves[level].append(rule)
+    return waves
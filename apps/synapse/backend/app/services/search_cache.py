@@ -0,0 +1,316 @@
+"""
+Search Result Cache
+
+In-process LRU/TTL cache for the command-palette search (GET /search/),
+which is called on every keystroke.
+
+- Entries are keyed by (project, normalized query, type filter, limit).
+- Only entity results (assets, rules, cables, locations) are cached; the
+  fuzzy-matched navigation shortcuts and actions are recomputed per query.
+- Prefix reuse: typing "310-P" after "310-" is answered by filtering the
+  cached "310-" results, as long as that entry was complete (no result
+  type hit the limit, so nothing was cut off).
+- Writes to assets, rules, cables and locations invalidate the affected
+  projects when their session commits (ORM flushes and ORM-enabled bulk
+  statements). The search sync worker also invalidates after each push, so
+  cached MeiliSearch results never outlive the index update they predate.
+- The TTL bounds staleness for writes made by other processes.
+
+Example:
+    cache = get_search_cache()
+    cached = cache.get(project_id, q, types, limit)
+    if cached is None:
+        ...
+        cache.put(project_id, q, types, limit, entity_results, categories, engine, complete)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+from app.models.cables import Cable
+from app.models.models import Asset, LBSNode
+from app.models.rules import RuleDefinition, RuleSource
+
+# Shortest cached prefix reused for a longer query
+MIN_PREFIX_LENGTH = 2
+
+CacheKey = tuple[str | None, str, tuple[str, ...], int]
+
+
+@dataclass
+class CachedSearch:
+    """Cached entity results of a search (before the limit is applied)"""
+
+    results: list[Any]
+    categories: dict[str, int]
+    search_engine: str
+    complete: bool  # No result type was truncated; safe to filter for longer queries
+    expires_at: float = 0.0
+
+
+@dataclass
+class _Stats:
+    hits: int = 0
+    prefix_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so 'P-101 ' and 'p-101' share an entry"""
+    return " ".join(query.lower().split())
+
+
+def result_text(result: Any) -> str:
+    """Text a cached result must contain to survive prefix filtering"""
+    return f"{result.title} {result.subtitle or ''}".lower()
+
+
+class SearchCache:
+    """Thread-safe LRU/TTL cache of search results with prefix reuse"""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries or settings.SEARCH_CACHE_SIZE
+        self.ttl_seconds = settings.SEARCH_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, CachedSearch] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+
+    @staticmethod
+    def make_key(
+        project_id: str | None, query: str, types: Iterable[str] | None, limit: int
+    ) -> CacheKey:
+        return (project_id, normalize_query(query), tuple(sorted(types or ())), limit)
+
+    def get(
+        self, project_id: str | None, query: str, types: Iterable[str] | None, limit: int
+    ) -> CachedSearch | None:
+        """
+        Cached results for a query, exact or derived from a cached prefix.
+
+        Args:
+            project_id: Project filter of the search (None = all projects)
+            query: Raw query
+            types: Type filter
+            limit: Requested limit
+
+        Returns:
+            CachedSearch, or None on a miss
+        """
+        key = self.make_key(project_id, query, types, limit)
+        now = self._clock()
+
+        with self._lock:
+            entry = self._lookup(key, now)
+            if entry is not None:
+                self._stats.hits += 1
+                return entry
+
+            normalized = key[1]
+            for length in range(len(normalized) - 1, MIN_PREFIX_LENGTH - 1, -1):
+                prefix_entry = self._lookup((key[0], normalized[:length], *key[2:]), now)
+                if prefix_entry is None or not prefix_entry.complete:
+                    continue
+                entry = self._narrow(prefix_entry, normalized)
+                self._store(key, entry)
+                self._stats.prefix_hits += 1
+                return entry
+
+            self._stats.misses += 1
+            return None
+
+    def put(
+        self,
+        project_id: str | None,
+        query: str,
+        types: Iterable[str] | None,
+        limit: int,
+        results: list[Any],
+        categories: dict[str, int],
+        search_engine: str,
+        complete: bool,
+    ) -> None:
+        """Cache a freshly computed search"""
+        entry = CachedSearch(
+            results=list(results),
+            categories=dict(categories),
+            search_engine=search_engine,
+            complete=complete,
+            expires_at=self._clock() + self.ttl_seconds,
+        )
+        with self._lock:
+            self._store(self.make_key(project_id, query, types, limit), entry)
+
+    def invalidate(self, project_ids: Iterable[str] | None = None) -> int:
+        """
+        Drop cached searches affected by writes.
+
+        Args:
+            project_ids: Projects that changed; None drops everything. Searches
+                without a project filter are dropped whenever anything changes.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            if project_ids is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                projects = set(project_ids)
+                stale = [key for key in self._entries if key[0] is None or key[0] in projects]
+                for key in stale:
+                    del self._entries[key]
+                dropped = len(stale)
+            self._stats.invalidations += 1
+            return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = _Stats()
+
+    def stats(self) -> dict:
+        """Hit-rate metrics (prefix hits count as hits)"""
+        with self._lock:
+            stats = self._stats
+            lookups = stats.hits + stats.prefix_hits + stats.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": stats.hits,
+                "prefix_hits": stats.prefix_hits,
+                "misses": stats.misses,
+                "evictions": stats.evictions,
+                "invalidations": stats.invalidations,
+                "hit_rate": round((stats.hits + stats.prefix_hits) / lookups, 4)
+                if lookups
+                else 0.0,
+            }
+
+    # -------------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # -------------------------------------------------------------------------
+
+    def _lookup(self, key: CacheKey, now: float) -> CachedSearch | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: CacheKey, entry: CachedSearch) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    @staticmethod
+    def _narrow(entry: CachedSearch, query: str) -> CachedSearch:
+        """Results of a prefix entry that still contain the longer query"""
+        results = [result for result in entry.results if query in result_text(result)]
+        categories = dict.fromkeys(entry.categories, 0)
+        for result in results:
+            categories[result.type] = categories.get(result.type, 0) + 1
+        # Inherits the prefix's expiry so derived entries never outlive their source
+        return CachedSearch(
+            results=results,
+            categories=categories,
+            search_engine=entry.search_engine,
+            complete=True,
+            expires_at=entry.expires_at,
+        )
+
+
+# Singleton instance
+_search_cache: SearchCache | None = None
+
+
+def get_search_cache() -> SearchCache:
+    """Get singleton search cache"""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
+
+
+# =============================================================================
+# WRITE INVALIDATION (session events)
+# =============================================================================
+
+_SEARCHABLE = (Asset, Cable, RuleDefinition, LBSNode)
+_PENDING_KEY = "search_cache_projects"
+_ALL_PROJECTS = "*"
+
+
+def _project_of(obj) -> str:
+    if isinstance(obj, RuleDefinition):
+        # Firm/country/client rules show up in every project's search
+        return (
+            obj.source_id if obj.source == RuleSource.PROJECT and obj.source_id else _ALL_PROJECTS
+        )
+    return obj.project_id or _ALL_PROJECTS
+
+
+def _pending(session: Session) -> set[str]:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session: Session, flush_context) -> None:
+    changed = [
+        obj
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, _SEARCHABLE)
+    ]
+    if changed:
+        _pending(session).update(_project_of(obj) for obj in changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk(state: ORMExecuteState) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    mapper = state.bind_mapper
+    if mapper is None or not issubclass(mapper.class_, _SEARCHABLE):
+        return
+
+    # Bulk rows that name their project invalidate just those projects
+    params = state.parameters
+    rows = params if isinstance(params, list) else [params] if params else []
+    projects = {row.get("project_id") for row in rows if isinstance(row, dict)}
+    if mapper.class_ is RuleDefinition or not projects or None in projects:
+        projects = {_ALL_PROJECTS}
+    _pending(state.session).update(projects)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    projects = session.info.pop(_PENDING_KEY, None)
+    if projects:
+        get_search_cache().invalidate(None if _ALL_PROJECTS in projects else projects)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,455 @@
+"""
+Search Sync Worker
+
+Keeps the MeiliSearch indexes in step with PostgreSQL writes without putting
+MeiliSearch round-trips on the request path.
+
+Writes to assets, cables, rule_definitions and lbs_nodes are captured into the
+search_outbox table by database triggers (see app/models/search.py). A
+background thread drains the outbox in debounced batches:
+- rows younger than SEARCH_SYNC_DEBOUNCE_MS are left to settle, so a burst of
+  writes to one entity (import + rules + versioning) is indexed once
+- claimed rows are coalesced per entity and reloaded with one IN query per type
+- live rows are pushed with one add_documents call per index, missing or
+  soft-deleted rows with one delete_documents call
+- the claim uses FOR UPDATE SKIP LOCKED, so several API workers can run it
+
+Outbox rows are only deleted once MeiliSearch accepted the batch; on failure
+the transaction rolls back and the batch is retried with backoff. The triggers
+write the outbox whatever happens to MeiliSearch, so rows older than
+SEARCH_OUTBOX_RETENTION_HOURS are pruned (the only work done when
+SEARCH_SYNC_ENABLED is off); POST /search/reindex catches the index up.
+
+Example:
+    worker = get_search_sync_worker()
+    worker.start()
+    ...
+    worker.status(db)  # {"pending": 12, "lag_seconds": 0.8, ...}
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.cables import Cable
+from app.models.models import Asset, LBSNode
+from app.models.rules import RuleDefinition, RuleSource
+from app.models.search import SearchOutbox
+from app.services.meilisearch_service import (
+    INDEX_ASSETS,
+    INDEX_CABLES,
+    INDEX_LOCATIONS,
+    INDEX_RULES,
+    MeiliSearchService,
+    get_meilisearch_service,
+)
+from app.services.search_cache import get_search_cache
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between retries while MeiliSearch or the database is down
+MAX_BACKOFF_SECONDS = 30.0
+
+# Seconds between outbox pruning passes
+PRUNE_INTERVAL_SECONDS = 300.0
+
+
+@dataclass
+class SyncBatch:
+    """Outcome of one outbox drain"""
+
+    claimed: int = 0
+    indexed: int = 0
+    deleted: int = 0
+    lag_seconds: float | None = None  # Age of the oldest change in the batch
+
+
+# =============================================================================
+# DOCUMENT BUILDERS
+# =============================================================================
+
+
+def _enum_value(value) -> str:
+    return value.value if hasattr(value, "value") else (value or "")
+
+
+def _timestamp(value) -> str:
+    """created_at as the reindex path writes it (sortable in every index)"""
+    return str(value) if value else ""
+
+
+def asset_document(asset: Asset) -> dict:
+    """MeiliSearch document for an asset"""
+    return {
+        "id": asset.id,
+        "type": "asset",
+        "tag": asset.tag or "",
+        "description": asset.description or "",
+        "system": asset.system or "",
+        "area": asset.area or "",
+        "io_type": _enum_value(asset.io_type),
+        "discipline": asset.discipline or "",
+        "project_id": asset.project_id or "",
+        "asset_type": asset.type or "",
+        # Assets carry no creation column; reindex writes "" for them too
+        "created_at": _timestamp(getattr(asset, "created_at", None)),
+        "_entity_type": "asset",
+    }
+
+
+def cable_document(cable: Cable, from_tag: str | None, to_tag: str | None) -> dict:
+    """MeiliSearch document for a cable (endpoints shown by asset tag)"""
+    return {
+        "id": str(cable.id),
+        "type": "cable",
+        "tag": cable.tag or "",
+        "description": cable.description or "",
+        "from_location": from_tag or "",
+        "to_location": to_tag or "",
+        "cable_type": cable.cable_type or "",
+        "length": cable.length_meters,
+        "project_id": cable.project_id or "",
+        "created_at": _timestamp(cable.created_at),
+        "_entity_type": "cable",
+    }
+
+
+def rule_document(rule: RuleDefinition) -> dict:
+    """MeiliSearch document for a rule (only PROJECT rules carry a project_id)"""
+    return {
+        "id": rule.id,
+        "type": "rule",
+        "name": rule.name or "",
+        "description": rule.description or "",
+        "trigger_type": _enum_value(rule.action_type),
+        "enabled": bool(rule.is_active),
+        "priority": rule.priority or 0,
+        "project_id": (rule.source_id or "") if rule.source == RuleSource.PROJECT else "",
+        "created_at": _timestamp(rule.created_at),
+        "_entity_type": "rule",
+    }
+
+
+def location_document(location: LBSNode) -> dict:
+    """MeiliSearch document for an LBS node"""
+    return {
+        "id": location.id,
+        "type": "location",
+        "name": location.name or "",
+        "code": "",
+        "description": "",
+        "parent_id": location.parent_id,
+        "project_id": location.project_id or "",
+        "location_type": _enum_value(location.type),
+        "_entity_type": "location",
+    }
+
+
+# =============================================================================
+# LOADERS (one IN query per entity type, live rows only)
+# =============================================================================
+
+
+def _load_assets(db: Session, ids: set[str]) -> dict[str, dict]:
+    assets = db.scalars(select(Asset).where(Asset.id.in_(ids), Asset.deleted_at.is_(None)))
+    return {asset.id: asset_document(asset) for asset in assets}
+
+
+def _load_cables(db: Session, ids: set[str]) -> dict[str, dict]:
+    cable_ids = []
+    for entity_id in ids:
+        try:
+            cable_ids.append(uuid.UUID(entity_id))
+        except ValueError:
+            continue  # Cannot exist, so it is deleted from the index
+    if not cable_ids:
+        return {}
+
+    from_asset = aliased(Asset)
+    to_asset = aliased(Asset)
+    rows = db.execute(
+        select(Cable, from_asset.tag, to_asset.tag)
+        .outerjoin(from_asset, Cable.from_asset_id == from_asset.id)
+        .outerjoin(to_asset, Cable.to_asset_id == to_asset.id)
+        .where(Cable.id.in_(cable_ids))
+    )
+    return {
+        str(cable.id): cable_document(cable, from_tag, to_tag) for cable, from_tag, to_tag in rows
+    }
+
+
+def _load_rules(db: Session, ids: set[str]) -> dict[str, dict]:
+    rules = db.scalars(select(RuleDefinition).where(RuleDefinition.id.in_(ids)))
+    return {rule.id: rule_document(rule) for rule in rules}
+
+
+def _load_locations(db: Session, ids: set[str]) -> dict[str, dict]:
+    locations = db.scalars(select(LBSNode).where(LBSNode.id.in_(ids), LBSNode.deleted_at.is_(None)))
+    return {location.id: location_document(location) for location in locations}
+
+
+# Outbox entity type -> (index, loader)
+ENTITY_INDEXES: dict[str, tuple[str, Callable[[Session, set[str]], dict[str, dict]]]] = {
+    "asset": (INDEX_ASSETS, _load_assets),
+    "cable": (INDEX_CABLES, _load_cables),
+    "rule": (INDEX_RULES, _load_rules),
+    "location": (INDEX_LOCATIONS, _load_locations),
+}
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+
+class SearchSyncWorker:
+    """Background thread draining the search outbox into MeiliSearch"""
+
+    def __init__(
+        self,
+        meili: MeiliSearchService | None = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int | None = None,
+        debounce_ms: int | None = None,
+        sync_enabled: bool | None = None,
+        retention_hours: float | None = None,
+    ):
+        self.meili = meili or get_meilisearch_service()
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.SEARCH_SYNC_BATCH_SIZE
+        self.debounce_ms = settings.SEARCH_SYNC_DEBOUNCE_MS if debounce_ms is None else debounce_ms
+        self.sync_enabled = settings.SEARCH_SYNC_ENABLED if sync_enabled is None else sync_enabled
+        self.retention_hours = (
+            settings.SEARCH_OUTBOX_RETENTION_HOURS if retention_hours is None else retention_hours
+        )
+        self._last_prune: float | None = None
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "batches": 0,
+            "indexed": 0,
+            "deleted": 0,
+            "pruned": 0,
+            "errors": 0,
+            "last_sync_at": None,
+            "last_lag_seconds": None,
+            "last_error": None,
+        }
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the sync thread (no-op if already running)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="search-sync", daemon=True)
+        self._thread.start()
+        logger.info(f"Search sync worker started (sync {'on' if self.sync_enabled else 'off'})")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the sync thread, letting an in-flight batch finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        interval = max(self.debounce_ms / 1000, 0.05)
+        wait = interval
+        while not self._stop.is_set():
+            self._prune_periodically()
+            if not self.sync_enabled:
+                self._stop.wait(PRUNE_INTERVAL_SECONDS)
+                continue
+            try:
+                with self.session_factory() as db:
+                    batch = self.sync_once(db)
+                wait = interval
+                if batch.claimed >= self.batch_size:
+                    continue  # Backlog: drain without waiting
+            except Exception as e:
+                with self._lock:
+                    self._stats["errors"] += 1
+                    self._stats["last_error"] = str(e)
+                logger.warning(f"Search sync failed, retrying in {wait:.1f}s: {e}")
+                wait = min(wait * 2, MAX_BACKOFF_SECONDS)
+            self._stop.wait(wait)
+
+    # -------------------------------------------------------------------------
+    # Sync
+    # -------------------------------------------------------------------------
+
+    def sync_once(self, db: Session) -> SyncBatch:
+        """
+        Claim one batch of settled outbox rows and push it to MeiliSearch.
+
+        Args:
+            db: Session used for the claim, the reloads and the outbox delete
+
+        Returns:
+            SyncBatch with claimed row count and documents indexed/deleted
+        """
+        query = (
+            select(
+                SearchOutbox.id,
+                SearchOutbox.entity_type,
+                SearchOutbox.entity_id,
+                SearchOutbox.created_at,
+            )
+            .order_by(SearchOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        if self.debounce_ms:
+            settled = func.now() - timedelta(milliseconds=self.debounce_ms)
+            query = query.where(SearchOutbox.created_at <= settled)
+
+        try:
+            rows = db.execute(query).all()
+            if not rows:
+                db.commit()
+                return SyncBatch()
+
+            # Coalesce: one document per entity however often it changed
+            changed: dict[str, set[str]] = defaultdict(set)
+            for row in rows:
+                changed[row.entity_type].add(row.entity_id)
+
+            batch = SyncBatch(
+                claimed=len(rows), lag_seconds=_age_seconds(min(r.created_at for r in rows))
+            )
+            projects: set[str] = set()
+            for entity_type, entity_ids in changed.items():
+                if entity_type not in ENTITY_INDEXES:
+                    logger.warning(f"Dropping outbox rows for unknown entity type {entity_type}")
+                    continue
+                index_name, load = ENTITY_INDEXES[entity_type]
+                docs = load(db, entity_ids)
+                removed = sorted(entity_ids - docs.keys())
+                if docs:
+                    self.meili.add_documents(index_name, list(docs.values()))
+                if removed:
+                    self.meili.delete_documents(index_name, removed)
+                batch.indexed += len(docs)
+                batch.deleted += len(removed)
+                projects.update(doc["project_id"] for doc in docs.values())
+                if removed:
+                    projects.add("")  # Project of a deleted row is unknown
+
+            db.execute(delete(SearchOutbox).where(SearchOutbox.id.in_([r.id for r in rows])))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        # Cached searches may predate this push; unscoped rules/deletes reset all
+        get_search_cache().invalidate(None if "" in projects else projects)
+
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["indexed"] += batch.indexed
+            self._stats["deleted"] += batch.deleted
+            self._stats["last_sync_at"] = datetime.now(timezone.utc).isoformat()
+            self._stats["last_lag_seconds"] = batch.lag_seconds
+        return batch
+
+    def prune(self, db: Session) -> int:
+        """
+        Delete outbox rows older than the retention window.
+
+        Such rows are only left when sync is disabled or MeiliSearch has been
+        unreachable for that long; without pruning the triggers grow the
+        outbox on every write.
+
+        Returns:
+            Number of rows deleted
+        """
+        cutoff = func.now() - timedelta(hours=self.retention_hours)
+        try:
+            pruned = db.execute(
+                delete(SearchOutbox).where(SearchOutbox.created_at < cutoff)
+            ).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        if pruned:
+            logger.warning(
+                f"Pruned {pruned} search outbox rows older than {self.retention_hours}h; "
+                "run POST /search/reindex once MeiliSearch is in sync again"
+            )
+            with self._lock:
+                self._stats["pruned"] += pruned
+        return pruned
+
+    def _prune_periodically(self) -> None:
+        if self.retention_hours <= 0:
+            return
+        now = time.monotonic()
+        if self._last_prune is not None and now - self._last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_prune = now
+        try:
+            with self.session_factory() as db:
+                self.prune(db)
+        except Exception as e:
+            logger.warning(f"Search outbox pruning failed: {e}")
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def status(self, db: Session | None = None) -> dict:
+        """
+        Worker counters plus, given a session, the current outbox backlog.
+
+        lag_seconds is the age of the oldest unsynced change: how stale search
+        results can be right now.
+        """
+        with self._lock:
+            status = {"running": self.running, "sync_enabled": self.sync_enabled, **self._stats}
+        if db is not None:
+            pending, oldest = db.execute(
+                select(func.count(SearchOutbox.id), func.min(SearchOutbox.created_at))
+            ).one()
+            status["pending"] = pending
+            status["lag_seconds"] = _age_seconds(oldest) if oldest else 0.0
+        return status
+
+
+def _age_seconds(created_at: datetime) -> float:
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return max((datetime.now(timezone.utc) - created_at).total_seconds(), 0.0)
+
+
+# Singleton instance
+_search_sync_worker: SearchSyncWorker | None = None
+
+
+def get_search_sync_worker() -> SearchSyncWorker:
+    """Get singleton search sync worker"""
+    global _search_sync_worker
+    if _search_sync_worker is None:
+        _search_sync_worker = SearchSyncWorker()
+    return _search_sync_worker
@@ -11,35 +11,69 @@ Templates supported:
 - CA-P040: Cable Schedule (Power & signal cables)
 - Package custom templates
 
+Excel files are written with write-only worksheets: rows stream from the
+database (yield_per) straight into openpyxl's on-disk sheet buffer and the
+finished file lands in a temporary file, so memory stays flat for packages
+with tens of thousands of rows. Column widths are computed from the first
+WIDTH_SAMPLE_ROWS rows, since write-only sheets emit widths before any data.
+
+content_hash() fingerprints everything an export renders (rows, names and
+TEMPLATE_VERSIONS), so generated files can be cached and reused while the
+package is unchanged (see export_jobs).
+
 Design based on: .dev/design/2025-11-28-whiteboard-session.md
 """
 
-import io
+import hashlib
+import json
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
+from typing import IO
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session, aliased
 
+from app.core.config import settings
 from app.models.cables import Cable
 from app.models.models import Asset
 from app.models.packages import Package
 
+# Rows used to size columns (write-only sheets emit widths before the first row)
+WIDTH_SAMPLE_ROWS = 500
+
+# Rows above the data: title block (1-4), spacer (5), column headers (6)
+HEADER_ROW = 6
+
+# Bump when a template's layout changes so cached exports are regenerated
+TEMPLATE_VERSIONS = {"IN-P040": 1, "CA-P040": 1}
+
+XLSX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# progress(rows_written, total_rows)
+ProgressCallback = Callable[[int, int], None]
+
 
 @dataclass
 class TemplateContext:
     """Context data for template rendering."""
 
     package: Package
-    assets: list[Asset]
-    cables: list[Cable] | None = None
+    assets: Iterable | None = None  # Streamed asset rows (IN-P040)
+    cables: Iterable | None = None  # Streamed cable rows (CA-P040)
+    asset_count: int = 0
+    row_count: int = 0  # Data rows of the exported sheet
     project_info: dict | None = None
     metadata: dict | None = None
+    progress: ProgressCallback | None = None
 
 
 @dataclass
@@ -49,7 +83,9 @@ class ExportResult:
     success: bool
     file_name: str
     file_data: bytes | None = None
-    mime_type: str = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    file: IO[bytes] | None = None  # Temporary file (stream mode), deleted on close
+    file_size: int | None = None
+    mime_type: str = XLSX_MIME_TYPE
     error: str | None = None
 
 
@@ -103,6 +139,8 @@ class TemplateService:
         package_id: str,
         template_type: str,
         format: str = "xlsx",
+        stream: bool = False,
+        progress: ProgressCallback | None = None,
     ) -> ExportResult:
         """
         Export a package using specified template.
@@ -111,23 +149,24 @@ class TemplateService:
             package_id: Package to export
             template_type: Template type (IN-P040, CA-P040, etc.)
             format: Output format (xlsx, pdf)
+            stream: Return the file as an open temporary file (ExportResult.file)
+                instead of reading it into ExportResult.file_data
+            progress: Called with (rows_written, total_rows) every EXPORT_BATCH_SIZE rows
 
         Returns:
             ExportResult with file data
         """
-        # Load package with assets
+        # Load package
         package = self.db.query(Package).filter(Package.id == package_id).first()
         if not package:
             return ExportResult(
                 success=False, file_name="", error=f"Package {package_id} not found"
             )
 
-        # Load assets
-        assets = (
-            self.db.query(Asset).filter(Asset.package_id == package_id).order_by(Asset.tag).all()
+        asset_count = self.db.scalar(
+            select(func.count(Asset.id)).where(Asset.package_id == package_id)
         )
-
-        if not assets:
+        if not asset_count:
             return ExportResult(
                 success=False,
                 file_name="",
@@ -137,33 +176,24 @@ class TemplateService:
         # Build context
         context = TemplateContext(
             package=package,
-            assets=assets,
+            asset_count=asset_count,
             project_info=self._get_project_info(package.project_id),
             metadata=self._get_metadata(),
+            progress=progress,
         )
 
         # Route to appropriate template generator
         if template_type == "IN-P040":
-            return self._export_instrument_index(context, format)
+            context.row_count = asset_count
+            context.assets = self._iter_assets(package_id)
+            result = self._export_instrument_index(context, format)
         elif template_type == "CA-P040":
-            # Load cables for this package
-            asset_ids = [a.id for a in assets]
-            try:
-                cables = (
-                    self.db.query(Cable)
-                    .filter(
-                        and_(
-                            Cable.from_asset_id.in_(asset_ids),
-                            Cable.to_asset_id.in_(asset_ids),
-                        )
-                    )
-                    .all()
-                )
-                context.cables = cables
-            except Exception:
-                # Cable table may not exist or have different schema
-                context.cables = []
-            return self._export_cable_schedule(context, format)
+            cables = self._cable_rows(package_id)
+            context.row_count = self.db.scalar(
+                select(func.count()).select_from(cables.order_by(None).subquery())
+            )
+            context.cables = self._iter_rows(cables)
+            result = self._export_cable_schedule(context, format)
         else:
             return ExportResult(
                 success=False,
@@ -171,6 +201,57 @@ class TemplateService:
                 error=f"Unknown template type: {template_type}",
             )
 
+        if result.success and not stream:
+            with result.file:
+                result.file_data = result.file.read()
+            result.file = None
+        return result
+
+    def content_hash(self, package_id: str, template_type: str, format: str = "xlsx") -> str | None:
+        """
+        Fingerprint of everything an export of the package would render.
+
+        Streams the same rows as the export (no workbook is built), so it is
+        cheap next to generation. The "Generated" timestamp is not included.
+
+        Args:
+            package_id: Package to fingerprint
+            template_type: Template type (IN-P040, CA-P040)
+            format: Output format
+
+        Returns:
+            SHA-256 hex digest, or None if the package or template doesn't exist
+        """
+        package = self.db.get(Package, package_id)
+        if not package or template_type not in TEMPLATE_VERSIONS:
+            return None
+
+        digest = hashlib.sha256()
+
+        def feed(value) -> None:
+            digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+            digest.update(b"\n")
+
+        asset_count = self.db.scalar(
+            select(func.count(Asset.id)).where(Asset.package_id == package_id)
+        )
+        project_name = self._get_project_info(package.project_id)["name"]
+        feed([template_type, TEMPLATE_VERSIONS[template_type], format])
+        feed([package.name, project_name, asset_count])
+
+        if template_type == "IN-P040":
+            rows = self._iter_assets(package_id)
+        else:
+            rows = self._iter_rows(self._cable_rows(package_id))
+        for row in rows:
+            feed(list(row))
+        return digest.hexdigest()
+
+    @staticmethod
+    def export_file_name(package_name: str, template_type: str) -> str:
+        """Download file name for an export generated today."""
+        return f"{package_name}_{template_type}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+
     # ==========================================================================
     # IN-P040: INSTRUMENT INDEX
     # ==========================================================================
@@ -191,14 +272,6 @@ class TemplateService:
         - Remarks
         """
         try:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Instrument Index"
-
-            # Header
-            self._write_header(ws, context)
-
-            # Column headers
             headers = [
                 "Item",
                 "Tag Number",
@@ -211,42 +284,28 @@ class TemplateService:
                 "Panel",
                 "Remarks",
             ]
-            self._write_column_headers(ws, 6, headers)
-
-            # Data rows
-            row = 7
-            for idx, asset in enumerate(context.assets, start=1):
-                props = asset.properties or {}
-                ws.cell(row, 1, idx)
-                ws.cell(row, 2, asset.tag)
-                ws.cell(row, 3, asset.description or props.get("description", ""))
-                ws.cell(row, 4, asset.type)
-                ws.cell(row, 5, props.get("location", ""))
-                ws.cell(row, 6, props.get("power_supply", ""))
-                ws.cell(row, 7, props.get("signal_type", ""))
-                ws.cell(row, 8, props.get("io_points", ""))
-                ws.cell(row, 9, props.get("panel", ""))
-                ws.cell(row, 10, props.get("remarks", ""))
-                row += 1
-
-            # Auto-size columns
-            self._auto_size_columns(ws)
-
-            # Footer
-            self._write_footer(ws, row + 1, context)
-
-            # Save to bytes
-            output = io.BytesIO()
-            wb.save(output)
-            output.seek(0)
-
-            file_name = f"{context.package.name}_IN-P040_{datetime.now().strftime('%Y%m%d')}.xlsx"
+            rows = (
+                [
+                    tag,
+                    description or props.get("description", ""),
+                    asset_type,
+                    props.get("location", ""),
+                    props.get("power_supply", ""),
+                    props.get("signal_type", ""),
+                    props.get("io_points", ""),
+                    props.get("panel", ""),
+                    props.get("remarks", ""),
+                ]
+                for tag, description, asset_type, props in context.assets
+            )
+            output, size = self._write_workbook("Instrument Index", context, headers, rows)
 
             return ExportResult(
                 success=True,
-                file_name=file_name,
-                file_data=output.getvalue(),
-                mime_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                file_name=self.export_file_name(context.package.name, "IN-P040"),
+                file=output,
+                file_size=size,
+                mime_type=XLSX_MIME_TYPE,
             )
 
         except Exception as e:
@@ -274,14 +333,6 @@ class TemplateService:
         - Remarks
         """
         try:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Cable Schedule"
-
-            # Header
-            self._write_header(ws, context)
-
-            # Column headers
             headers = [
                 "Item",
                 "Cable Number",
@@ -296,53 +347,21 @@ class TemplateService:
                 "Term. To",
                 "Remarks",
             ]
-            self._write_column_headers(ws, 6, headers)
-
-            # Data rows
-            if not context.cables:
-                # No cables, show message
-                ws.cell(7, 2, "No cables found for this package")
-                row = 8
-            else:
-                row = 7
-                for idx, cable in enumerate(context.cables, start=1):
-                    from_asset = (
-                        self.db.query(Asset).filter(Asset.id == cable.from_asset_id).first()
-                    )
-                    to_asset = self.db.query(Asset).filter(Asset.id == cable.to_asset_id).first()
-
-                    ws.cell(row, 1, idx)
-                    ws.cell(row, 2, cable.tag)
-                    ws.cell(row, 3, from_asset.tag if from_asset else "")
-                    ws.cell(row, 4, to_asset.tag if to_asset else "")
-                    ws.cell(row, 5, cable.cable_type or "")
-                    ws.cell(row, 6, cable.conductor_size or "")
-                    ws.cell(row, 7, cable.length_meters or "")
-                    ws.cell(row, 8, cable.route_description or "")
-                    ws.cell(row, 9, cable.installation_method or "")
-                    ws.cell(row, 10, cable.from_terminal or "")
-                    ws.cell(row, 11, cable.to_terminal or "")
-                    ws.cell(row, 12, cable.description or "")
-                    row += 1
-
-            # Auto-size columns
-            self._auto_size_columns(ws)
-
-            # Footer
-            self._write_footer(ws, row + 1, context)
-
-            # Save to bytes
-            output = io.BytesIO()
-            wb.save(output)
-            output.seek(0)
-
-            file_name = f"{context.package.name}_CA-P040_{datetime.now().strftime('%Y%m%d')}.xlsx"
+            rows = ([value or "" for value in row] for row in context.cables)
+            output, size = self._write_workbook(
+                "Cable Schedule",
+                context,
+                headers,
+                rows,
+                empty_message="No cables found for this package",
+            )
 
             return ExportResult(
                 success=True,
-                file_name=file_name,
-                file_data=output.getvalue(),
-                mime_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                file_name=self.export_file_name(context.package.name, "CA-P040"),
+                file=output,
+                file_size=size,
+                mime_type=XLSX_MIME_TYPE,
             )
 
         except Exception as e:
@@ -352,40 +371,94 @@ class TemplateService:
     # FORMATTING HELPERS
     # ==========================================================================
 
-    def _write_header(self, ws, context: TemplateContext, start_row: int = 1):
-        """Write document header (project info, package, etc.)."""
-        # Title
-        ws.merge_cells(f"A{start_row}:J{start_row}")
-        title_cell = ws.cell(start_row, 1, "SYNAPSE - MBSE Platform")
-        title_cell.font = Font(size=16, bold=True)
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Project info
-        ws.merge_cells(f"A{start_row + 1}:J{start_row + 1}")
-        project_cell = ws.cell(
-            start_row + 1,
-            1,
-            f"Project: {context.project_info.get('name', 'Unknown') if context.project_info else 'Unknown'}",
-        )
-        project_cell.font = Font(size=12)
-        project_cell.alignment = Alignment(horizontal="center")
-
-        # Package info
-        ws.merge_cells(f"A{start_row + 2}:J{start_row + 2}")
-        package_cell = ws.cell(start_row + 2, 1, f"Package: {context.package.name}")
-        package_cell.font = Font(size=11, bold=True)
-        package_cell.alignment = Alignment(horizontal="center")
-
-        # Date
-        ws.merge_cells(f"A{start_row + 3}:J{start_row + 3}")
-        date_cell = ws.cell(
-            start_row + 3, 1, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        )
-        date_cell.font = Font(size=9)
-        date_cell.alignment = Alignment(horizontal="center")
+    def _write_workbook(
+        self,
+        title: str,
+        context: TemplateContext,
+        headers: list[str],
+        rows: Iterable[list],
+        empty_message: str | None = None,
+    ) -> tuple[IO[bytes], int]:
+        """
+        Stream a header block, numbered data rows and footer into a write-only workbook.
+
+        Args:
+            title: Worksheet title
+            context: Template context (header/footer data)
+            headers: Column headers, starting with "Item"
+            rows: Data rows without the item number
+            empty_message: Row text written when there are no data rows
 
-    def _write_column_headers(self, ws, row: int, headers: list[str], freeze: bool = True):
-        """Write and format column headers."""
+        Returns:
+            (temporary file positioned at 0, file size in bytes)
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title)
+
+        numbered = ([idx, *row] for idx, row in enumerate(rows, start=1))
+        sample = list(islice(numbered, WIDTH_SAMPLE_ROWS))
+
+        # Write-only sheets need widths and panes before the first row
+        for col_idx, width in enumerate(self._column_widths(headers, sample), start=1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = width
+        ws.freeze_panes = f"A{HEADER_ROW + 1}"
+
+        self._write_header(ws, context)
+        self._write_column_headers(ws, headers)
+
+        row_count = 0
+        for row in chain(sample, numbered):
+            ws.append(row)
+            row_count += 1
+            if context.progress and row_count % settings.EXPORT_BATCH_SIZE == 0:
+                context.progress(row_count, context.row_count)
+        if not row_count and empty_message:
+            ws.append([None, empty_message])
+            row_count = 1
+
+        ws.append([])
+        self._write_footer(ws, HEADER_ROW + row_count + 2, context)
+
+        output = tempfile.TemporaryFile()
+        wb.save(output)
+        size = output.tell()
+        output.seek(0)
+        if context.progress:
+            context.progress(context.row_count, context.row_count)
+        return output, size
+
+    def _styled_cell(self, ws, value, font: Font, alignment: Alignment) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = font
+        cell.alignment = alignment
+        return cell
+
+    def _write_header(self, ws, context: TemplateContext):
+        """Write document header (project info, package, etc.) on rows 1-4."""
+        project_name = (
+            context.project_info.get("name", "Unknown") if context.project_info else "Unknown"
+        )
+        lines = [
+            # Title
+            ("SYNAPSE - MBSE Platform", Font(size=16, bold=True)),
+            # Project info
+            (f"Project: {project_name}", Font(size=12)),
+            # Package info
+            (f"Package: {context.package.name}", Font(size=11, bold=True)),
+            # Date
+            (f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", Font(size=9)),
+        ]
+        for row, (text, font) in enumerate(lines, start=1):
+            vertical = "center" if row == 1 else None
+            alignment = Alignment(horizontal="center", vertical=vertical)
+            ws.append([self._styled_cell(ws, text, font, alignment)])
+            ws.merged_cells.add(f"A{row}:J{row}")
+
+        # Spacer
+        ws.append([])
+
+    def _write_column_headers(self, ws, headers: list[str]):
+        """Write and format column headers (row 6)."""
         # Header style
         header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
         header_font = Font(color="FFFFFF", bold=True, size=11)
@@ -397,48 +470,86 @@ class TemplateService:
             bottom=Side(style="thin"),
         )
 
-        for col_idx, header in enumerate(headers, start=1):
-            cell = ws.cell(row, col_idx, header)
+        cells = []
+        for header in headers:
+            cell = self._styled_cell(ws, header, header_font, header_alignment)
             cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
             cell.border = border
-
-        # Freeze panes at header row
-        if freeze:
-            ws.freeze_panes = ws.cell(row + 1, 1)
+            cells.append(cell)
+        ws.append(cells)
 
     def _write_footer(self, ws, row: int, context: TemplateContext):
         """Write document footer."""
-        ws.merge_cells(f"A{row}:J{row}")
-        footer_cell = ws.cell(
-            row,
-            1,
-            f"Total Items: {len(context.assets)} | Generated by SYNAPSE MBSE Platform",
+        footer_cell = self._styled_cell(
+            ws,
+            f"Total Items: {context.asset_count} | Generated by SYNAPSE MBSE Platform",
+            Font(size=9, italic=True),
+            Alignment(horizontal="center"),
         )
-        footer_cell.font = Font(size=9, italic=True)
-        footer_cell.alignment = Alignment(horizontal="center")
-
-    def _auto_size_columns(self, ws, min_width: int = 10, max_width: int = 50):
-        """Auto-size columns based on content."""
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
+        ws.append([footer_cell])
+        ws.merged_cells.add(f"A{row}:J{row}")
 
-            for cell in column:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-
-            adjusted_width = min(max(max_length + 2, min_width), max_width)
-            ws.column_dimensions[column_letter].width = adjusted_width
+    @staticmethod
+    def _column_widths(
+        headers: list[str], sample: list[list], min_width: int = 10, max_width: int = 50
+    ) -> list[int]:
+        """Column widths sized to the headers and a sample of data rows."""
+        widths = []
+        for col_idx, header in enumerate(headers):
+            max_length = len(header)
+            for row in sample:
+                if col_idx < len(row) and row[col_idx] not in (None, ""):
+                    max_length = max(max_length, len(str(row[col_idx])))
+            widths.append(min(max(max_length + 2, min_width), max_width))
+        return widths
 
     # ==========================================================================
     # DATA HELPERS
     # ==========================================================================
 
+    def _iter_assets(self, package_id: str) -> Iterator:
+        """Stream (tag, description, type, properties) rows for a package, by tag."""
+        stmt = (
+            select(Asset.tag, Asset.description, Asset.type, Asset.properties)
+            .where(Asset.package_id == package_id)
+            .order_by(Asset.tag)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        for tag, description, asset_type, properties in self.db.execute(stmt):
+            yield tag, description, asset_type, properties or {}
+
+    def _cable_rows(self, package_id: str) -> Select:
+        """
+        Cable schedule rows for cables with both ends in the package.
+
+        Endpoint tags come from the same query (no per-cable asset lookups).
+        """
+        from_asset = aliased(Asset)
+        to_asset = aliased(Asset)
+        return (
+            select(
+                Cable.tag,
+                from_asset.tag,
+                to_asset.tag,
+                Cable.cable_type,
+                Cable.conductor_size,
+                Cable.length_meters,
+                Cable.route_description,
+                Cable.installation_method,
+                Cable.from_terminal,
+                Cable.to_terminal,
+                Cable.description,
+            )
+            .join(from_asset, Cable.from_asset_id == from_asset.id)
+            .join(to_asset, Cable.to_asset_id == to_asset.id)
+            .where(from_asset.package_id == package_id, to_asset.package_id == package_id)
+            .order_by(Cable.tag)
+        )
+
+    def _iter_rows(self, stmt: Select) -> Iterator:
+        """Stream the rows of a query in EXPORT_BATCH_SIZE batches."""
+        yield from self.db.execute(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+
     def _get_project_info(self, project_id: str) -> dict:
         """Get project information for header."""
         from app.models.auth import Project
@@ -8,7 +8,7 @@ Provides summary statistics and detailed reports on data quality issues.
 from typing import Any
 
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.models.models import Asset
 from app.models.rules import RuleExecution
@@ -51,8 +51,11 @@ class ValidationService:
         """
         Get detailed list of validation issues.
         """
+        # Asset tag and rule name joined in, instead of two lookups per issue
         issues = (
-            db.query(RuleExecution)
+            db.query(RuleExecution, Asset.tag)
+            .outerjoin(Asset, Asset.id == RuleExecution.asset_id)
+            .options(joinedload(RuleExecution.rule))
             .filter(
                 RuleExecution.project_id == project_id,
                 RuleExecution.action_type.in_(["VALIDATION_FAIL", "VALIDATION_WARN"]),
@@ -62,18 +65,9 @@ class ValidationService:
         )
 
         results = []
-        for issue in issues:
-            # Fetch related asset tag if possible (optimization: join in query)
-            asset_tag = "Unknown"
-            if issue.asset_id:
-                asset = db.query(Asset).filter(Asset.id == issue.asset_id).first()
-                if asset:
-                    asset_tag = asset.tag
-
-            # Fetch rule name
-            rule_name = "Unknown Rule"
-            if issue.rule:
-                rule_name = issue.rule.name
+        for issue, tag in issues:
+            asset_tag = tag or "Unknown"
+            rule_name = issue.rule.name if issue.rule else "Unknown Rule"
 
             results.append(
                 {
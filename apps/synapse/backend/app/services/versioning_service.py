@@ -11,11 +11,12 @@ Design based on: .dev/design/2025-11-28-whiteboard-session.md
 """
 
 import json
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
 from app.models.models import Asset
@@ -27,9 +28,13 @@ from app.models.workflow import (
     LogSource,
     PropertyChange,
     WorkflowActionType,
+    generate_uuid,
 )
 from app.services.workflow_logger import WorkflowLogger, generate_correlation_id
 
+# Assets restored per bulk UPDATE during batch rollback
+ROLLBACK_CHUNK_SIZE = 1000
+
 
 @dataclass
 class RollbackResult:
@@ -179,6 +184,115 @@ class VersioningService:
 
         return version
 
+    def create_versions_bulk(
+        self,
+        assets: list[Asset],
+        change_source: ChangeSource,
+        change_reason: str | None = None,
+        batch_id: str | None = None,
+        snapshots: dict[str, dict] | None = None,
+        previous_snapshots: dict[str, dict] | None = None,
+        commit: bool = True,
+    ) -> list[AssetVersion]:
+        """
+        Create the next version of many assets at once.
+
+        Next version numbers come from one grouped query; property changes are
+        diffed in memory and all rows are written with one multi-row INSERT
+        per table. Assets without a previous version get v1 (no property
+        changes), like create_initial_version.
+
+        Args:
+            assets: Assets to version (duplicates are versioned once)
+            change_source: Source of the change (USER, RULE, IMPORT, etc.)
+            change_reason: Human-readable reason for the change
+            batch_id: Related batch operation ID
+            snapshots: asset_id -> new snapshot, for assets whose in-memory
+                state is not the state being versioned (default: current state)
+            previous_snapshots: asset_id -> snapshot of the previous version,
+                when the caller already has it (otherwise fetched in one query)
+            commit: Commit after writing (False to stay in the caller's transaction)
+
+        Returns:
+            Created AssetVersions, in asset order
+        """
+        assets = list({asset.id: asset for asset in assets}.values())
+        if not assets:
+            return []
+
+        snapshots = snapshots or {}
+        previous_snapshots = dict(previous_snapshots or {})
+        asset_ids = [asset.id for asset in assets]
+
+        latest = dict(
+            self.db.query(AssetVersion.asset_id, func.max(AssetVersion.version_number))
+            .filter(AssetVersion.asset_id.in_(asset_ids))
+            .group_by(AssetVersion.asset_id)
+        )
+
+        missing = [
+            (asset_id, number)
+            for asset_id, number in latest.items()
+            if asset_id not in previous_snapshots
+        ]
+        if missing:
+            previous_snapshots.update(
+                self.db.query(AssetVersion.asset_id, AssetVersion.snapshot).filter(
+                    tuple_(AssetVersion.asset_id, AssetVersion.version_number).in_(missing)
+                )
+            )
+
+        versions = []
+        changes = []
+        for asset in assets:
+            current_version = latest.get(asset.id, 0)
+            snapshot = snapshots.get(asset.id) or self._create_snapshot(asset)
+            version_id = generate_uuid()
+
+            versions.append(
+                {
+                    "id": version_id,
+                    "asset_id": asset.id,
+                    "version_number": current_version + 1,
+                    "snapshot": snapshot,
+                    "created_by": self.user_id,
+                    "change_reason": change_reason,
+                    "change_source": change_source,
+                    "batch_id": batch_id,
+                }
+            )
+
+            if current_version > 0:
+                previous = previous_snapshots.get(asset.id) or {}
+                for key in set(previous) | set(snapshot):
+                    old_value = previous.get(key)
+                    new_value = snapshot.get(key)
+                    if self._values_equal(old_value, new_value):
+                        continue
+                    changes.append(
+                        {
+                            "asset_id": asset.id,
+                            "version_id": version_id,
+                            "property_name": key,
+                            "old_value": old_value,
+                            "new_value": new_value,
+                            "changed_by": self.user_id,
+                        }
+                    )
+
+        created = list(
+            self.db.scalars(
+                insert(AssetVersion).returning(AssetVersion, sort_by_parameter_order=True), versions
+            )
+        )
+        if changes:
+            self.db.execute(insert(PropertyChange), changes)
+
+        if commit:
+            self.db.commit()
+
+        return created
+
     # ==========================================================================
     # VERSION QUERIES
     # ==========================================================================
@@ -575,14 +689,22 @@ class VersioningService:
         batch_id: str,
         reason: str,
         include_triggered_rules: bool = True,
+        chunk_size: int = ROLLBACK_CHUNK_SIZE,
+        progress: Callable[[int, int], None] | None = None,
     ) -> BatchRollbackResult:
         """
         Rollback an entire batch operation.
 
+        Pre-batch snapshots of every affected asset are resolved with one
+        query; snapshots and soft-deletes are applied with bulk UPDATEs in
+        chunks, inside a single transaction (all or nothing).
+
         Args:
             batch_id: Batch to rollback
             reason: Reason for rollback
             include_triggered_rules: Also rollback assets created by triggered rules
+            chunk_size: Assets updated per bulk statement
+            progress: Called with (processed, total) after each chunk
 
         Returns:
             BatchRollbackResult
@@ -597,64 +719,71 @@ class VersioningService:
                     error="Batch operation not found",
                 )
 
-            # Get all versions created by this batch
-            affected_versions = (
-                self.db.query(AssetVersion).filter(AssetVersion.batch_id == batch_id).all()
-            )
+            targets = self._get_pre_batch_versions(batch_id)
+            total = len(targets)
 
-            # Group by asset and find pre-batch version
-            assets_to_rollback = {}
-            for version in affected_versions:
-                if version.asset_id not in assets_to_rollback:
-                    # Find version before batch
-                    pre_batch_version = (
-                        self.db.query(AssetVersion)
-                        .filter(
-                            and_(
-                                AssetVersion.asset_id == version.asset_id,
-                                AssetVersion.version_number < version.version_number,
-                                AssetVersion.batch_id != batch_id,
+            results = []
+            processed = 0
+            now = datetime.utcnow()
+            for start in range(0, total, chunk_size):
+                chunk = targets[start : start + chunk_size]
+
+                restored = {}
+                updates = []
+                deleted = []
+                for asset_id, found, version_number, snapshot in chunk:
+                    if not found:
+                        results.append(
+                            RollbackResult(
+                                success=False, asset_id=asset_id, error="Asset not found"
                             )
                         )
-                        .order_by(desc(AssetVersion.version_number))
-                        .first()
-                    )
-
-                    if pre_batch_version:
-                        assets_to_rollback[version.asset_id] = pre_batch_version.version_number
+                    elif version_number is None:
+                        # Asset was created by this batch - soft delete it
+                        deleted.append(asset_id)
                     else:
-                        # Asset was created by this batch - mark for deletion
-                        assets_to_rollback[version.asset_id] = None
-
-            # Perform rollbacks
-            results = []
-            for asset_id, target_version in assets_to_rollback.items():
-                if target_version is not None:
-                    result = self.rollback_asset_to_version(
-                        asset_id=asset_id,
-                        target_version=target_version,
-                        reason=f"Batch rollback: {reason}",
+                        restored[asset_id] = version_number
+                        updates.append({"id": asset_id, **self._snapshot_columns(snapshot)})
+
+                if updates:
+                    self.db.execute(update(Asset), updates)
+                if deleted:
+                    self.db.execute(
+                        update(Asset).where(Asset.id.in_(deleted)).values(deleted_at=now)
                     )
-                else:
-                    # Soft delete the asset (it was created by this batch)
-                    asset = self.db.query(Asset).filter(Asset.id == asset_id).first()
-                    if asset:
-                        asset.deleted_at = datetime.utcnow()
-                        result = RollbackResult(
+                    results.extend(RollbackResult(success=True, asset_id=a) for a in deleted)
+
+                if restored:
+                    # Bulk UPDATEs bypass the identity map: reload restored state
+                    assets = (
+                        self.db.query(Asset)
+                        .filter(Asset.id.in_(list(restored)))
+                        .populate_existing()
+                        .all()
+                    )
+                    versions = self.create_versions_bulk(
+                        assets,
+                        change_source=ChangeSource.ROLLBACK,
+                        change_reason=f"Batch rollback: {reason}",
+                        commit=False,
+                    )
+                    results.extend(
+                        RollbackResult(
                             success=True,
-                            asset_id=asset_id,
+                            asset_id=version.asset_id,
+                            restored_version=restored[version.asset_id],
+                            new_version=version.version_number,
                         )
-                    else:
-                        result = RollbackResult(
-                            success=False,
-                            asset_id=asset_id,
-                            error="Asset not found",
-                        )
-                results.append(result)
+                        for version in versions
+                    )
+
+                processed += len(chunk)
+                if progress:
+                    progress(processed, total)
 
             # Mark batch as rolled back
             batch.is_rolled_back = True
-            batch.rolled_back_at = datetime.utcnow()
+            batch.rolled_back_at = now
             batch.rolled_back_by = self.user_id
             batch.rollback_reason = reason
 
@@ -692,6 +821,65 @@ class VersioningService:
                 error=str(e),
             )
 
+    def _get_pre_batch_versions(self, batch_id: str) -> list[tuple]:
+        """
+        Resolve the version each asset touched by a batch should return to.
+
+        The target is the latest version below the asset's first version in
+        the batch, picked with ROW_NUMBER() in a single query.
+
+        Returns:
+            (asset_id, asset_exists, version_number, snapshot) per asset;
+            version_number and snapshot are None when the batch created the asset
+        """
+        first_in_batch = (
+            select(
+                AssetVersion.asset_id,
+                func.min(AssetVersion.version_number).label("first_version"),
+            )
+            .where(AssetVersion.batch_id == batch_id)
+            .group_by(AssetVersion.asset_id)
+            .subquery()
+        )
+
+        ranked = (
+            select(
+                AssetVersion.asset_id,
+                AssetVersion.version_number,
+                AssetVersion.snapshot,
+                func.row_number()
+                .over(
+                    partition_by=AssetVersion.asset_id,
+                    order_by=AssetVersion.version_number.desc(),
+                )
+                .label("rank"),
+            )
+            .join(
+                first_in_batch,
+                and_(
+                    AssetVersion.asset_id == first_in_batch.c.asset_id,
+                    AssetVersion.version_number < first_in_batch.c.first_version,
+                ),
+            )
+            .subquery()
+        )
+
+        rows = self.db.execute(
+            select(
+                first_in_batch.c.asset_id,
+                Asset.id.isnot(None),
+                ranked.c.version_number,
+                ranked.c.snapshot,
+            )
+            .outerjoin(Asset, Asset.id == first_in_batch.c.asset_id)
+            .outerjoin(
+                ranked,
+                and_(ranked.c.asset_id == first_in_batch.c.asset_id, ranked.c.rank == 1),
+            )
+            .order_by(first_in_batch.c.asset_id)
+        )
+        return [tuple(row) for row in rows]
+
     # ==========================================================================
     # HELPERS
     # ==========================================================================
@@ -728,44 +916,55 @@ class VersioningService:
 
     def _apply_snapshot(self, asset: Asset, snapshot: dict):
         """Apply a snapshot to an asset."""
+        for column, value in self._snapshot_columns(snapshot).items():
+            setattr(asset, column, value)
+
+    def _snapshot_columns(self, snapshot: dict) -> dict:
+        """Asset column values stored in a snapshot (for setattr or bulk UPDATE)."""
         from app.models.models import AssetDataStatus, IOType
 
-        # Apply simple fields
-        asset.tag = snapshot.get("tag", asset.tag)
-        asset.description = snapshot.get("description")
-        asset.type = snapshot.get("type", asset.type)
-        asset.area = snapshot.get("area")
-        asset.system = snapshot.get("system")
-        asset.mechanical = snapshot.get("mechanical")
-        asset.electrical = snapshot.get("electrical")
-        asset.process = snapshot.get("process")
-        asset.purchasing = snapshot.get("purchasing")
-        asset.manufacturer_part_id = snapshot.get("manufacturer_part_id")
-        asset.confidence_score = snapshot.get("confidence_score", 1.0)
-        asset.data_source_id = snapshot.get("data_source_id")
-        asset.discipline = snapshot.get("discipline")
-        asset.semantic_type = snapshot.get("semantic_type")
-        asset.lod = snapshot.get("lod")
-        asset.isa95_level = snapshot.get("isa95_level")
-        asset.properties = snapshot.get("properties")
-        asset.location_id = snapshot.get("location_id")
-        asset.package_id = snapshot.get("package_id")
+        columns = {
+            "description": snapshot.get("description"),
+            "area": snapshot.get("area"),
+            "system": snapshot.get("system"),
+            "mechanical": snapshot.get("mechanical"),
+            "electrical": snapshot.get("electrical"),
+            "process": snapshot.get("process"),
+            "purchasing": snapshot.get("purchasing"),
+            "manufacturer_part_id": snapshot.get("manufacturer_part_id"),
+            "confidence_score": snapshot.get("confidence_score", 1.0),
+            "data_source_id": snapshot.get("data_source_id"),
+            "discipline": snapshot.get("discipline"),
+            "semantic_type": snapshot.get("semantic_type"),
+            "lod": snapshot.get("lod"),
+            "isa95_level": snapshot.get("isa95_level"),
+            "properties": snapshot.get("properties"),
+            "location_id": snapshot.get("location_id"),
+            "package_id": snapshot.get("package_id"),
+        }
+
+        # Required fields keep their current value when missing
+        for column in ("tag", "type"):
+            if column in snapshot:
+                columns[column] = snapshot[column]
 
         # Apply enum fields
         io_type_value = snapshot.get("io_type")
         if io_type_value:
             try:
-                asset.io_type = IOType(io_type_value)
+                columns["io_type"] = IOType(io_type_value)
             except ValueError:
                 pass
 
         data_status_value = snapshot.get("data_status")
         if data_status_value:
             try:
-                asset.data_status = AssetDataStatus(data_status_value)
+                columns["data_status"] = AssetDataStatus(data_status_value)
             except ValueError:
                 pass
 
+        return columns
+
     def _values_equal(self, a: Any, b: Any) -> bool:
         """Compare two values for equality, handling JSON serialization."""
         if a is None and b is None:
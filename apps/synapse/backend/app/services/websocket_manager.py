@@ -1,57 +1,196 @@
 """
 WebSocket Manager for real-time log streaming to DevConsole.
 Manages client connections and broadcasts log entries.
+
+Fan-out never waits on a client: broadcast() serializes the entry once and
+appends it to each subscriber's bounded queue, and a writer task per client
+sends it. A slow or stalled viewer only delays itself:
+- when a queue is full the oldest entries are dropped (and counted)
+- entries that piled up while a send was in flight go out as one batch frame:
+  {"type": "batch", "dropped": n, "entries": [...]}; a lone entry is sent as is
+- each subscriber may filter by level and topic server-side (query string on
+  connect, or a {"type": "subscribe", ...} message)
 """
 
 import asyncio
 import json
+from collections import deque
+from collections.abc import Callable, Iterable
 from datetime import datetime
 from typing import Any
 
 from fastapi import WebSocket
 
+from app.core.config import settings
+from app.services.log_store import LogStore
+
+
+class Subscriber:
+    """One DevConsole connection: filters, pending frames and its writer task."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        levels: Iterable[str] | None = None,
+        topics: Iterable[str] | None = None,
+        max_pending: int | None = None,
+    ):
+        self.websocket = websocket
+        self.pending: deque[str] = deque(maxlen=max_pending or settings.WS_CLIENT_QUEUE_SIZE)
+        self.dropped = 0
+        self.ready = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.subscribe(levels, topics)
+
+    def subscribe(self, levels: Iterable[str] | None, topics: Iterable[str] | None):
+        """Set filters (None or empty = everything)."""
+        self.levels = {level.upper() for level in levels} if levels else None
+        self.topics = set(topics) if topics else None
+
+    def wants(self, message: dict[str, Any]) -> bool:
+        if self.levels is not None and str(message.get("level", "")).upper() not in self.levels:
+            return False
+        return self.topics is None or message.get("topic") in self.topics
+
+    def push(self, message_json: str):
+        """Queue a serialized entry, dropping the oldest one when full."""
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(message_json)
+        self.ready.set()
+
+    def next_frame(self, max_batch: int) -> str:
+        """Pop up to max_batch entries as one frame."""
+        count = min(len(self.pending), max_batch)
+        entries = [self.pending.popleft() for _ in range(count)]
+        if count == 1 and not self.dropped:
+            return entries[0]
+        dropped, self.dropped = self.dropped, 0
+        return f'{{"type": "batch", "dropped": {dropped}, "entries": [{",".join(entries)}]}}'
+
 
 class ConnectionManager:
     """Manages WebSocket connections for log streaming."""
 
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
+    def __init__(self, max_pending: int | None = None, max_batch: int | None = None):
+        self.subscribers: dict[WebSocket, Subscriber] = {}
+        self.max_pending = max_pending or settings.WS_CLIENT_QUEUE_SIZE
+        self.max_batch = max_batch or settings.WS_MAX_BATCH
+        self.dropped_total = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        levels: Iterable[str] | None = None,
+        topics: Iterable[str] | None = None,
+        history: Callable[[], Iterable[dict[str, Any]]] | None = None,
+    ):
+        """
+        Accept a new WebSocket connection and start its writer.
 
-    async def connect(self, websocket: WebSocket):
-        """Accept a new WebSocket connection."""
+        Args:
+            websocket: Client socket
+            levels: Only send these levels (default: all)
+            topics: Only send these topics (default: all)
+            history: Returns entries to replay first, one frame each, filtered like
+                live entries; called once the client is registered, so nothing
+                falls in between
+        """
         await websocket.accept()
-        self.active_connections.append(websocket)
-        print(f"[WS] Client connected. Total: {len(self.active_connections)}", flush=True)
+        self._loop = asyncio.get_running_loop()
+
+        # Registered before the replay so live entries queue up behind it
+        subscriber = Subscriber(websocket, levels, topics, self.max_pending)
+        self.subscribers[websocket] = subscriber
+        print(f"[WS] Client connected. Total: {len(self.subscribers)}", flush=True)
+        try:
+            for entry in history() if history else ():
+                if subscriber.wants(entry):
+                    await websocket.send_text(json.dumps(entry, default=str))
+        except Exception:
+            self.disconnect(websocket)
+            return
+        subscriber.task = asyncio.create_task(self._write(subscriber))
 
     def disconnect(self, websocket: WebSocket):
-        """Remove a WebSocket connection."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        print(f"[WS] Client disconnected. Total: {len(self.active_connections)}", flush=True)
+        """Remove a WebSocket connection and stop its writer."""
+        subscriber = self.subscribers.pop(websocket, None)
+        if subscriber and subscriber.task:
+            try:
+                current = asyncio.current_task()
+            except RuntimeError:
+                current = None
+            if subscriber.task is not current:
+                subscriber.task.cancel()
+        print(f"[WS] Client disconnected. Total: {len(self.subscribers)}", flush=True)
+
+    def subscribe(
+        self, websocket: WebSocket, levels: Iterable[str] | None, topics: Iterable[str] | None
+    ):
+        """Change the level/topic filters of a connected client."""
+        subscriber = self.subscribers.get(websocket)
+        if subscriber:
+            subscriber.subscribe(levels, topics)
+
+    def publish(self, message: dict[str, Any]):
+        """
+        Queue a message for every interested client without waiting on any send.
+
+        Safe to call from threads outside the event loop (sync endpoints).
+        """
+        if not self.subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is not None and running is self._loop:
+            self._enqueue(message)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._enqueue, message)
 
     async def broadcast(self, message: dict[str, Any]):
         """Broadcast a message to all connected clients."""
-        if not self.active_connections:
-            return
+        self.publish(message)
+        # Let idle writers pick the entry up now; never waits for the sends
+        await asyncio.sleep(0)
 
-        message_json = json.dumps(message, default=str)
-        disconnected = []
+    def _enqueue(self, message: dict[str, Any]):
+        message_json = None
+        for subscriber in list(self.subscribers.values()):
+            if not subscriber.wants(message):
+                continue
+            if message_json is None:
+                message_json = json.dumps(message, default=str)
+            dropped = subscriber.dropped
+            subscriber.push(message_json)
+            self.dropped_total += subscriber.dropped - dropped
 
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_json)
-            except Exception as e:
-                print(f"[WS] Send error: {e}", flush=True)
-                disconnected.append(connection)
+    async def _write(self, subscriber: Subscriber):
+        """Writer task: drain the client's queue, batching what piled up."""
+        try:
+            while True:
+                await subscriber.ready.wait()
+                subscriber.ready.clear()
+                while subscriber.pending:
+                    await subscriber.websocket.send_text(subscriber.next_frame(self.max_batch))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[WS] Send error: {e}", flush=True)
+            self.disconnect(subscriber.websocket)
 
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+    @property
+    def active_connections(self) -> list[WebSocket]:
+        """Connected client sockets."""
+        return list(self.subscribers)
 
     @property
     def connection_count(self) -> int:
         """Number of active connections."""
-        return len(self.active_connections)
+        return len(self.subscribers)
 
 
 # Global manager instance
@@ -61,8 +200,7 @@ log_manager = ConnectionManager()
 class WebSocketLogger:
     """Logger that sends structured logs to both console and WebSocket clients."""
 
-    _logs: list[dict] = []
-    _max_logs = 1000
+    _store = LogStore(capacity=1000)
 
     @classmethod
     async def log(
@@ -118,9 +256,7 @@ class WebSocketLogger:
         }
 
         # Store locally
-        cls._logs.append(entry)
-        if len(cls._logs) > cls._max_logs:
-            cls._logs.pop(0)
+        cls._store.append(entry)
 
         # Print to console (for Docker logs / Promtail)
         log_json = json.dumps(
@@ -171,9 +307,7 @@ class WebSocketLogger:
         }
 
         # Store locally
-        cls._logs.append(entry)
-        if len(cls._logs) > cls._max_logs:
-            cls._logs.pop(0)
+        cls._store.append(entry)
 
         # Print to console (JSON for Promtail)
         log_json = json.dumps(
@@ -189,22 +323,28 @@ class WebSocketLogger:
         )
         print(log_json, flush=True)
 
-        # Queue broadcast for async execution
-        try:
-            # loop = asyncio.get_running_loop()
-            asyncio.create_task(log_manager.broadcast(entry))
-        except RuntimeError:
-            pass  # No event loop, skip WebSocket broadcast
+        # Queue for WebSocket clients (from any thread; never blocks)
+        log_manager.publish(entry)
 
     @classmethod
-    def get_logs(cls, limit: int = 100) -> list[dict]:
-        """Get recent logs."""
-        return cls._logs[-limit:]
+    def get_logs(cls, limit: int = 100, since: str | None = None, **filters) -> list[dict]:
+        """
+        Get recent logs, oldest first.
+
+        Args:
+            limit: Max entries
+            since: Only entries after this log id (resume / page forward)
+            **filters: level, source, action_type, entity_id
+
+        Returns:
+            List of log entries
+        """
+        return cls._store.query(limit=limit, since=since, **filters)
 
     @classmethod
     def clear(cls):
         """Clear all logs."""
-        cls._logs = []
+        cls._store.clear()
 
 
 # Export alias for compatibility
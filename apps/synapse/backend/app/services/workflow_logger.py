@@ -32,6 +32,16 @@ Usage:
     # Complete the workflow
     logger.complete_workflow(correlation_id, duration_ms=1234)
 
+Buffered mode (WorkflowLogger(..., buffered=True)) queues events in memory and
+writes them with one multi-row INSERT every flush_size events or
+flush_interval_ms, and always on complete_workflow/fail_workflow. Events are
+still broadcast to WebSocket as soon as they are logged. The interval is only
+checked when the next event is logged, so callers that stop logging without
+completing a workflow must call flush() or use the logger as a context manager:
+
+    with WorkflowLogger(db, project_id, user_id, buffered=True) as logger:
+        ...  # queued events are written on exit
+
 Design based on: .dev/design/2025-11-28-whiteboard-session.md
 """
 
@@ -39,9 +49,11 @@ import time
 import uuid
 from datetime import datetime
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models.workflow import (
+    AssetVersion,
     BatchOperation,
     BatchOperationType,
     LogLevel,
@@ -49,9 +61,14 @@ from app.models.workflow import (
     WorkflowActionType,
     WorkflowEvent,
     WorkflowStatus,
+    generate_uuid,
 )
 from app.services.websocket_manager import websocket_logger
 
+# Buffered mode defaults
+DEFAULT_FLUSH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL_MS = 500
+
 
 def generate_correlation_id() -> str:
     """Generate a unique correlation ID for grouping related events."""
@@ -73,6 +90,9 @@ class WorkflowLogger:
         project_id: str,
         user_id: str | None = None,
         session_id: str | None = None,
+        buffered: bool = False,
+        flush_size: int = DEFAULT_FLUSH_SIZE,
+        flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
     ):
         """
         Initialize the workflow logger.
@@ -82,6 +102,10 @@ class WorkflowLogger:
             project_id: Current project context
             user_id: User performing the action (optional)
             session_id: Browser session ID for grouping (optional)
+            buffered: Queue events and insert them in batches (see flush)
+            flush_size: Buffered mode - flush after this many events
+            flush_interval_ms: Buffered mode - flush when the oldest queued
+                event is older than this (checked whenever an event is logged)
         """
         self.db = db
         self.project_id = project_id
@@ -89,6 +113,12 @@ class WorkflowLogger:
         self.session_id = session_id or str(uuid.uuid4())
         self._active_workflows: dict[str, dict] = {}
 
+        self.buffered = buffered
+        self.flush_size = flush_size
+        self.flush_interval_ms = flush_interval_ms
+        self._pending: list[dict] = []
+        self._pending_since: float | None = None
+
     def start_workflow(
         self,
         source: LogSource,
@@ -268,6 +298,7 @@ class WorkflowLogger:
             duration_ms=duration_ms,
             details=stats,
         )
+        self.flush()
 
         # Update root event status
         root_event = (
@@ -322,6 +353,7 @@ class WorkflowLogger:
             duration_ms=duration_ms,
             error=error,
         )
+        self.flush()
 
         # Update root event status
         root_event = (
@@ -360,36 +392,84 @@ class WorkflowLogger:
         discipline: str | None = None,
         package_code: str | None = None,
     ) -> WorkflowEvent:
-        """Create and persist a workflow event."""
-        event = WorkflowEvent(
-            level=level,
-            source=source,
-            action_type=action_type,
-            project_id=self.project_id,
-            user_id=self.user_id,
-            session_id=self.session_id,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            entity_tag=entity_tag,
-            message=message,
-            details=details or {},
-            parent_event_id=parent_event_id,
-            correlation_id=correlation_id,
-            status=status,
-            duration_ms=duration_ms,
-            error=error,
-            fbs_code=fbs_code,
-            lbs_code=lbs_code,
-            discipline=discipline,
-            package_code=package_code,
-        )
+        """Create and persist a workflow event (queued in buffered mode)."""
+        values = {
+            "level": level,
+            "source": source,
+            "action_type": action_type,
+            "project_id": self.project_id,
+            "user_id": self.user_id,
+            "session_id": self.session_id,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "entity_tag": entity_tag,
+            "message": message,
+            "details": details or {},
+            "parent_event_id": parent_event_id,
+            "correlation_id": correlation_id,
+            "status": status,
+            "duration_ms": duration_ms,
+            "error": error,
+            "fbs_code": fbs_code,
+            "lbs_code": lbs_code,
+            "discipline": discipline,
+            "package_code": package_code,
+        }
 
-        self.db.add(event)
-        self.db.commit()
-        self.db.refresh(event)
+        if not self.buffered:
+            event = WorkflowEvent(**values)
+            self.db.add(event)
+            self.db.commit()
+            self.db.refresh(event)
+            return event
+
+        # Assign id/timestamp now so the event can be broadcast and referenced
+        # as a parent before it is written
+        values["id"] = generate_uuid()
+        values["timestamp"] = datetime.utcnow()
+        event = WorkflowEvent(**values)
+        self._pending.append(values)
+        if self._pending_since is None:
+            self._pending_since = time.time()
+
+        if (
+            len(self._pending) >= self.flush_size
+            or (time.time() - self._pending_since) * 1000 >= self.flush_interval_ms
+        ):
+            self.flush()
 
         return event
 
+    def flush(self) -> int:
+        """
+        Write queued events with one multi-row INSERT and commit.
+
+        No-op when not buffered or nothing is queued. Events stay queued
+        until the commit succeeds, so a failed write can be retried.
+
+        Returns:
+            Number of events written
+        """
+        if not self._pending:
+            return 0
+
+        rows = self._pending
+        self.db.execute(insert(WorkflowEvent), rows)
+        self.db.commit()
+
+        self._pending = []
+        self._pending_since = None
+        return len(rows)
+
+    def __enter__(self) -> "WorkflowLogger":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # After an error the session may need a rollback first; leave the
+        # queue for the caller (fail_workflow flushes it)
+        if exc_type is None:
+            self.flush()
+
     def _broadcast_event(self, event: WorkflowEvent, is_start: bool = False):
         """Broadcast event to WebSocket clients."""
         try:
@@ -630,6 +710,27 @@ class BatchOperationManager:
 
         return batch
 
+    def get_batch_asset_ids(self, batch_id: str) -> list[str]:
+        """
+        Get the assets created or updated by a batch operation.
+
+        Every change made inside a batch is versioned with its batch_id, so
+        the versions identify the touched assets.
+
+        Args:
+            batch_id: Batch to inspect
+
+        Returns:
+            Distinct asset IDs
+        """
+        rows = (
+            self.db.query(AssetVersion.asset_id)
+            .filter(AssetVersion.batch_id == batch_id)
+            .distinct()
+            .all()
+        )
+        return [asset_id for (asset_id,) in rows]
+
     def rollback_batch(
         self,
         batch_id: str,
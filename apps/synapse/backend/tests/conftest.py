@@ -4,13 +4,19 @@ Uses PostgreSQL database for all tests (no SQLite).
 """
 import os
 
+# Tests drive the search sync worker directly; don't start its thread with the app
+os.environ.setdefault("SEARCH_SYNC_ENABLED", "false")
+os.environ.setdefault("SEARCH_OUTBOX_RETENTION_HOURS", "0")
+# Endpoints over their query_budget() fail the test
+os.environ.setdefault("QUERY_BUDGET_ENFORCE", "true")
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_session_factory
 from app.main import app
 
 # PostgreSQL test database URL
@@ -75,6 +81,8 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    # Side sessions (progress events, ...) join the test transaction
+    app.dependency_overrides[get_session_factory] = lambda: sessionmaker(bind=db_session.get_bind())
 
     with TestClient(app) as test_client:
         yield test_client
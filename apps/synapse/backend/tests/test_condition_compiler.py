@@ -0,0 +1,164 @@
+"""
+Tests for ConditionCompiler
+
+Checks that compiled SQL predicates select exactly the assets accepted by the
+Python condition evaluator, and that non-compilable conditions fall back.
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.auth import Client, Project
+from app.models.models import Asset
+from app.services.condition_compiler import ConditionCompiler
+from app.services.rule_execution_service import RuleExecutionService
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture
+def test_project(db_session: Session):
+    """Create test project"""
+    client = Client(id=f"test-client-{uuid4().hex[:8]}", name="Test Client")
+    db_session.add(client)
+    project = Project(
+        id=f"test-project-{uuid4().hex[:8]}",
+        name="Test Project",
+        client_id=client.id,
+    )
+    db_session.add(project)
+    db_session.commit()
+    return project
+
+
+@pytest.fixture
+def assets(db_session: Session, test_project):
+    """Create assets with mixed property types"""
+    rows = [
+        ("310-PP-001", "PUMP", "310", {"power_kw": 75, "pump_type": "CENTRIFUGAL"}),
+        ("310-PP-002", "PUMP", "310", {"power_kw": 25, "pump_type": "POSITIVE_DISPLACEMENT"}),
+        ("320-PP-001", "PUMP", "320", {"power_kw": "n/a", "tags": ["spare", "critical"]}),
+        ("400-PP-001", "PUMP", None, {"pump_type": None}),
+        ("310-TK-001", "TANK", "310", None),
+    ]
+    created = []
+    for tag, asset_type, area, properties in rows:
+        asset = Asset(
+            id=f"asset-{uuid4().hex[:8]}",
+            tag=tag,
+            type=asset_type,
+            area=area,
+            project_id=test_project.id,
+            properties=properties,
+        )
+        db_session.add(asset)
+        created.append(asset)
+    db_session.commit()
+    return created
+
+
+def _sql_matches(db_session: Session, project_id: str, condition: dict) -> set[str]:
+    predicate = ConditionCompiler().compile(condition)
+    assert predicate is not None
+    rows = db_session.query(Asset.tag).filter(Asset.project_id == project_id, predicate).all()
+    return {tag for (tag,) in rows}
+
+
+def _python_matches(service: RuleExecutionService, assets: list, condition: dict) -> set[str]:
+    return {a.tag for a in assets if service._evaluate_condition(condition, a)}
+
+
+# ============================================================================
+# Compilation Tests
+# ============================================================================
+
+
+class TestCompilation:
+    """Tests for which conditions compile"""
+
+    def test_empty_condition_compiles(self):
+        assert ConditionCompiler().compile({}) is not None
+
+    def test_nested_value_falls_back(self):
+        condition = {"property_filters": [{"key": "specs", "op": "==", "value": {"a": 1}}]}
+        assert ConditionCompiler().compile(condition) is None
+
+    def test_string_ordering_falls_back(self):
+        condition = {"property_filters": [{"key": "voltage", "op": ">", "value": "480V"}]}
+        assert ConditionCompiler().compile(condition) is None
+
+    def test_relationship_attribute_falls_back(self):
+        condition = {"property_filters": [{"key": "location", "op": "exists", "value": None}]}
+        assert ConditionCompiler().compile(condition) is None
+
+    def test_relationship_key_uses_properties_without_columns(self):
+        condition = {"property_filters": [{"key": "location", "op": "exists", "value": None}]}
+        assert ConditionCompiler(include_columns=False).compile(condition) is not None
+
+    def test_malformed_filter_falls_back(self):
+        condition = {"property_filters": [{"key": "power_kw"}]}
+        assert ConditionCompiler().compile(condition) is None
+
+
+# ============================================================================
+# Parity Tests (SQL vs Python)
+# ============================================================================
+
+
+class TestParity:
+    """Compiled predicates must match the Python evaluator"""
+
+    @pytest.mark.parametrize(
+        "condition",
+        [
+            {"asset_type": "PUMP"},
+            {"node_type": "TANK"},
+            {"property_filters": [{"key": "pump_type", "op": "==", "value": "CENTRIFUGAL"}]},
+            {"property_filters": [{"key": "pump_type", "op": "!=", "value": "CENTRIFUGAL"}]},
+            {"property_filters": [{"key": "power_kw", "op": ">", "value": 50}]},
+            {"property_filters": [{"key": "power_kw", "op": "<=", "value": 25}]},
+            {"property_filters": [{"key": "area", "op": "in", "value": ["310", "320"]}]},
+            {"property_filters": [{"key": "area", "op": "!=", "value": "310"}]},
+            {"property_filters": [{"key": "tags", "op": "contains", "value": "spare"}]},
+            {"property_filters": [{"key": "pump_type", "op": "contains", "value": "_"}]},
+            {"property_filters": [{"key": "pump_type", "op": "exists", "value": None}]},
+            {"property_filters": [{"key": "pump_type", "op": "not_exists", "value": None}]},
+            {"property_filters": [{"key": "pump_type", "op": "unknown", "value": None}]},
+            {
+                "asset_type": "PUMP",
+                "property_filters": [
+                    {"key": "area", "op": "==", "value": "310"},
+                    {"key": "power_kw", "op": ">=", "value": 25},
+                ],
+            },
+        ],
+    )
+    def test_sql_matches_python(self, db_session: Session, test_project, assets, condition):
+        service = RuleExecutionService(db=db_session, project_id=test_project.id)
+
+        assert _sql_matches(db_session, test_project.id, condition) == _python_matches(
+            service, assets, condition
+        )
+
+    def test_match_assets_uses_predicate(self, db_session: Session, test_project, assets):
+        from app.models.rules import RuleActionType, RuleDefinition, RuleSource
+
+        rule = RuleDefinition(
+            name="High power pumps",
+            source=RuleSource.FIRM,
+            action_type=RuleActionType.SET_PROPERTY,
+            condition={
+                "asset_type": "PUMP",
+                "property_filters": [{"key": "power_kw", "op": ">", "value": 50}],
+            },
+            action={"set_property": {"high_power": True}},
+        )
+        service = RuleExecutionService(db=db_session, project_id=test_project.id)
+
+        matched = service._match_assets(rule)
+
+        assert [a.tag for a in matched] == ["310-PP-001"]
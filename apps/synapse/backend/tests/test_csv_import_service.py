@@ -0,0 +1,189 @@
+"""
+Tests for CSVImportService
+
+Covers chunked streaming import: create/update resolution, rows repeated
+across and within chunks, per-row errors, versioning, metamodel sync and
+progress reporting.
+"""
+
+import io
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.auth import Client, Project
+from app.models.metamodel import MetamodelNode
+from app.models.models import Asset
+from app.models.workflow import AssetVersion
+from app.services.csv_import_service import CSVImportService
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture
+def test_project(db_session: Session):
+    """Create test project"""
+    client = Client(id=f"test-client-{uuid4().hex[:8]}", name="Test Client")
+    db_session.add(client)
+    project = Project(
+        id=f"test-project-{uuid4().hex[:8]}",
+        name="Test Project",
+        client_id=client.id,
+    )
+    db_session.add(project)
+    db_session.commit()
+    return project
+
+
+@pytest.fixture
+def existing_pump(db_session: Session, test_project):
+    """Create an asset the import will update"""
+    asset = Asset(
+        id=f"asset-{uuid4().hex[:8]}",
+        tag="P-100",
+        type="PUMP",
+        description="Old description",
+        area="100",
+        project_id=test_project.id,
+    )
+    db_session.add(asset)
+    db_session.commit()
+    return asset
+
+
+def _import(db_session: Session, project_id: str, content: str, **kwargs):
+    service = CSVImportService(db_session, project_id, chunk_size=kwargs.pop("chunk_size", 2))
+    return service.import_csv(io.BytesIO(content.encode("utf-8-sig")), "test.csv", **kwargs)
+
+
+def _asset(db_session: Session, project_id: str, tag: str) -> Asset | None:
+    return db_session.query(Asset).filter(Asset.project_id == project_id, Asset.tag == tag).first()
+
+
+# ============================================================================
+# Import Tests
+# ============================================================================
+
+
+class TestImport:
+    """Tests for create/update resolution"""
+
+    def test_creates_and_updates_across_chunks(
+        self, db_session: Session, test_project, existing_pump
+    ):
+        content = (
+            "tag,type,description,electrical.voltage\n"
+            "P-100,,New description,480V\n"
+            "P-101,PUMP,Feed pump,\n"
+            "M-101,MOTOR,Feed motor,600V\n"
+        )
+
+        result = _import(db_session, test_project.id, content)
+
+        assert (result.total_rows, result.created, result.updated, result.failed) == (3, 2, 1, 0)
+
+        db_session.refresh(existing_pump)
+        assert existing_pump.description == "New description"
+        assert existing_pump.type == "PUMP"
+        assert existing_pump.area == "100"  # Column absent from the CSV keeps its value
+        assert existing_pump.electrical == {"voltage": "480V"}
+        assert _asset(db_session, test_project.id, "M-101").electrical == {"voltage": "600V"}
+
+    def test_repeated_tag_updates_the_first_row(self, db_session: Session, test_project):
+        content = "tag,type,description\nP-200,PUMP,First\nP-200,,Second\nP-200,,Third\n"
+
+        result = _import(db_session, test_project.id, content)
+
+        assert (result.created, result.updated, result.failed) == (1, 2, 0)
+        assert _asset(db_session, test_project.id, "P-200").description == "Third"
+
+    def test_rename_by_id(self, db_session: Session, test_project, existing_pump):
+        content = f"id,tag,description\n{existing_pump.id},P-100A,Renamed\n"
+
+        result = _import(db_session, test_project.id, content)
+
+        assert result.updated == 1
+        db_session.refresh(existing_pump)
+        assert existing_pump.tag == "P-100A"
+
+    def test_column_mapping(self, db_session: Session, test_project):
+        content = "Equipment Tag,Class,Service\nP-300,PUMP,Mapped\n"
+
+        service = CSVImportService(
+            db_session,
+            test_project.id,
+            column_map={"tag": "Equipment Tag", "type": "class", "description": "Service"},
+        )
+        result = service.import_csv(io.BytesIO(content.encode()), "mapped.csv")
+
+        assert result.created == 1
+        assert _asset(db_session, test_project.id, "P-300").description == "Mapped"
+
+
+# ============================================================================
+# Error Tests
+# ============================================================================
+
+
+class TestRowErrors:
+    """Invalid rows fail individually"""
+
+    def test_invalid_rows_are_reported(self, db_session: Session, test_project):
+        content = "tag,type,io_type\n,PUMP,\nP-400,,\nP-401,PUMP,XX\nP-402,PUMP,AI\n"
+
+        result = _import(db_session, test_project.id, content)
+
+        assert (result.created, result.failed) == (1, 3)
+        assert [e["row"] for e in result.errors] == [0, 1, 2]
+        assert "tag" in result.errors[0]["error"].lower()
+        assert "type" in result.errors[1]["error"].lower()
+
+    def test_failing_row_does_not_fail_its_chunk(self, db_session: Session, test_project):
+        content = "tag,type,location_id\nP-500,PUMP,\nP-501,PUMP,missing-location\n"
+
+        result = _import(db_session, test_project.id, content)
+
+        assert (result.created, result.failed) == (1, 1)
+        assert result.errors[0]["tag"] == "P-501"
+        assert _asset(db_session, test_project.id, "P-500") is not None
+
+
+# ============================================================================
+# Side Effects
+# ============================================================================
+
+
+class TestSideEffects:
+    """Versions, metamodel nodes and progress"""
+
+    def test_versions_and_nodes(self, db_session: Session, test_project, existing_pump):
+        content = "tag,type,description\nP-100,,Changed\nP-600,PUMP,New\n"
+
+        _import(db_session, test_project.id, content)
+
+        versions = db_session.query(AssetVersion.asset_id, AssetVersion.change_reason).all()
+        new_asset = _asset(db_session, test_project.id, "P-600")
+        assert set(versions) == {
+            (existing_pump.id, "CSV Import: test.csv"),
+            (new_asset.id, "Initial creation"),
+        }
+
+        nodes = db_session.query(MetamodelNode).filter(MetamodelNode.project_id == test_project.id)
+        assert {node.name for node in nodes} == {"P-100", "P-600"}
+
+    def test_progress_per_chunk(self, db_session: Session, test_project):
+        content = "tag,type\n" + "".join(f"P-7{i:02d},PUMP\n" for i in range(5))
+        progress = []
+
+        _import(
+            db_session,
+            test_project.id,
+            content,
+            progress=lambda rows, fraction: progress.append((rows, fraction)),
+        )
+
+        assert [rows for rows, _ in progress] == [2, 4, 5]
+        assert progress[-1][1] == 1.0
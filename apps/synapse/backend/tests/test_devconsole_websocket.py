@@ -21,11 +21,33 @@ from fastapi.responses import JSONResponse
 # ============================================================================
 
 
+def _http_scope(path: str, method: str = "GET") -> dict:
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [],
+        "query_string": b"",
+    }
+
+
+async def _call(middleware, scope: dict):
+    """Run one request through the ASGI middleware"""
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    await middleware(scope, receive, send)
+
+
 @pytest.mark.asyncio
 async def test_middleware_logs_all_requests():
     """VERIFY: Middleware logs every HTTP request"""
 
-    from app.middleware.logging_middleware import LoggingMiddleware
+    from app.middleware.logging_middleware import LoggingMiddleware, RequestLogWorker
 
     # Mock WebSocketLogger.log
     received_logs = []
@@ -35,32 +57,13 @@ async def test_middleware_logs_all_requests():
     ) as mock_log:
         mock_log.side_effect = lambda **kwargs: received_logs.append(kwargs)
 
-        # Mock request
-        scope = {
-            "type": "http",
-            "method": "GET",
-            "path": "/api/v1/assets",
-            "headers": [],
-            "query_string": b"",
-        }
-
-        async def mock_receive():
-            return {"type": "http.request", "body": b""}
-
-        async def mock_send(message):
-            pass
-
-        request = Request(scope, mock_receive, mock_send)
-
-        # Mock call_next
-        async def mock_call_next(req):
-            return JSONResponse({"status": "ok"})
+        worker = RequestLogWorker(sample_rate=1.0)
+        middleware = LoggingMiddleware(JSONResponse({"status": "ok"}), worker=worker)
+        await _call(middleware, _http_scope("/api/v1/assets"))
 
-        middleware = LoggingMiddleware(Mock())
-        await middleware.dispatch(request, mock_call_next)
-
-        # Verify log was called (at least twice: REQUEST and RESPONSE)
-        assert len(received_logs) >= 2
+        # Nothing is logged on the request path; the drain emits the entries
+        assert received_logs == []
+        assert await worker.drain() == 2
 
         # Check first log (REQUEST)
         assert received_logs[0]["action_type"] == "REQUEST"
@@ -75,7 +78,7 @@ async def test_middleware_logs_all_requests():
 @pytest.mark.asyncio
 async def test_middleware_calculates_response_time():
     """VERIFY: Response time is calculated correctly"""
-    from app.middleware.logging_middleware import LoggingMiddleware
+    from app.middleware.logging_middleware import LoggingMiddleware, RequestLogWorker
 
     received_logs = []
 
@@ -85,21 +88,14 @@ async def test_middleware_calculates_response_time():
         mock_log.side_effect = lambda **kwargs: received_logs.append(kwargs)
 
         # Mock slow request
-        async def mock_call_next(request):
+        async def slow_app(scope, receive, send):
             await asyncio.sleep(0.1)
-            return JSONResponse({"status": "ok"})
-
-        scope = {
-            "type": "http",
-            "method": "GET",
-            "path": "/api/v1/slow",
-            "headers": [],
-            "query_string": b"",
-        }
+            await JSONResponse({"status": "ok"})(scope, receive, send)
 
-        request = Request(scope, AsyncMock(), AsyncMock())
-        middleware = LoggingMiddleware(Mock())
-        await middleware.dispatch(request, mock_call_next)
+        worker = RequestLogWorker(sample_rate=0.0)
+        middleware = LoggingMiddleware(slow_app, worker=worker)
+        await _call(middleware, _http_scope("/api/v1/slow"))
+        await worker.drain()
 
         # Check response log
         response_logs = [l for l in received_logs if l.get("action_type") == "RESPONSE"]
@@ -110,7 +106,7 @@ async def test_middleware_calculates_response_time():
 @pytest.mark.asyncio
 async def test_middleware_extracts_topic_from_url():
     """VERIFY: Topic is auto-detected from URL path"""
-    from app.middleware.logging_middleware import LoggingMiddleware
+    from app.middleware.logging_middleware import LoggingMiddleware, RequestLogWorker
 
     test_cases = [
         ("/api/v1/assets", "ASSETS"),
@@ -128,22 +124,67 @@ async def test_middleware_extracts_topic_from_url():
         ) as mock_log:
             mock_log.side_effect = lambda **kwargs: received_logs.append(kwargs)
 
-            async def mock_call_next(req):
-                return JSONResponse({"status": "ok"})
+            worker = RequestLogWorker(sample_rate=1.0)
+            middleware = LoggingMiddleware(JSONResponse({"status": "ok"}), worker=worker)
+            await _call(middleware, _http_scope(path))
+            await worker.drain()
+
+            assert received_logs[0]["topic"] == expected_topic
 
-            scope = {
-                "type": "http",
-                "method": "GET",
-                "path": path,
-                "headers": [],
-                "query_string": b"",
-            }
 
-            request = Request(scope, AsyncMock(), AsyncMock())
-            middleware = LoggingMiddleware(Mock())
-            await middleware.dispatch(request, mock_call_next)
+@pytest.mark.asyncio
+async def test_middleware_records_errors_and_skipped_paths():
+    """VERIFY: Exceptions are logged and re-raised; noisy paths are not logged"""
+    from app.middleware.logging_middleware import LoggingMiddleware, RequestLogWorker
 
-            assert received_logs[0]["topic"] == expected_topic
+    received_logs = []
+
+    with patch(
+        "app.services.websocket_manager.websocket_logger.log", new_callable=AsyncMock
+    ) as mock_log:
+        mock_log.side_effect = lambda **kwargs: received_logs.append(kwargs)
+
+        async def failing_app(scope, receive, send):
+            raise RuntimeError("boom")
+
+        worker = RequestLogWorker(sample_rate=0.0)
+        middleware = LoggingMiddleware(failing_app, worker=worker)
+        with pytest.raises(RuntimeError):
+            await _call(middleware, _http_scope("/api/v1/assets", method="POST"))
+
+        ok = LoggingMiddleware(JSONResponse({"status": "ok"}), worker=worker)
+        await _call(ok, _http_scope("/health"))
+        await _call(ok, _http_scope("/api/v1/assets", method="OPTIONS"))
+        await worker.drain()
+
+        assert [log["action_type"] for log in received_logs] == ["ERROR"]
+        assert received_logs[0]["context"]["error"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_middleware_aggregates_latency_per_route():
+    """VERIFY: Latency histograms are keyed by route template, not raw path"""
+    from app.middleware.logging_middleware import LoggingMiddleware, RequestLogWorker
+
+    route = Mock(path="/api/v1/assets/{asset_id}")
+
+    async def routed_app(scope, receive, send):
+        scope["route"] = route  # Set by the FastAPI router
+        status = 404 if scope["path"].endswith("missing") else 200
+        await JSONResponse({}, status_code=status)(scope, receive, send)
+
+    with patch("app.services.websocket_manager.websocket_logger.log", new_callable=AsyncMock):
+        worker = RequestLogWorker(sample_rate=0.0)
+        middleware = LoggingMiddleware(routed_app, worker=worker)
+        for asset_id in ("a1", "a2", "missing"):
+            await _call(middleware, _http_scope(f"/api/v1/assets/{asset_id}"))
+        await worker.drain()
+
+    stats = worker.latency_stats()
+    assert list(stats) == ["GET /api/v1/assets/{asset_id}"]
+    assert stats["GET /api/v1/assets/{asset_id}"]["count"] == 3
+    assert stats["GET /api/v1/assets/{asset_id}"]["errors"] == 0
+    assert sum(stats["GET /api/v1/assets/{asset_id}"]["buckets"].values()) == 3
 
 
 # ============================================================================
@@ -264,7 +305,7 @@ async def test_websocket_handles_send_failures():
 @pytest.mark.asyncio
 async def test_user_extracted_from_jwt():
     """VERIFY: User ID/name extracted from request state"""
-    from app.middleware.logging_middleware import LoggingMiddleware
+    from app.middleware.logging_middleware import LoggingMiddleware, RequestLogWorker
 
     received_logs = []
     with patch(
@@ -272,27 +313,18 @@ async def test_user_extracted_from_jwt():
     ) as mock_log:
         mock_log.side_effect = lambda **kwargs: received_logs.append(kwargs)
 
-        async def mock_call_next(req):
-            return JSONResponse({"status": "ok"})
-
-        scope = {
-            "type": "http",
-            "method": "GET",
-            "path": "/api/v1/assets",
-            "headers": [],
-            "query_string": b"",
-        }
-
-        request = Request(scope, AsyncMock(), AsyncMock())
+        scope = _http_scope("/api/v1/assets")
 
         # Mock user in request state
         mock_user = Mock()
         mock_user.id = "user-123"
         mock_user.email = "user@example.com"
-        request.state.user = mock_user
+        Request(scope).state.user = mock_user
 
-        middleware = LoggingMiddleware(Mock())
-        await middleware.dispatch(request, mock_call_next)
+        worker = RequestLogWorker(sample_rate=0.0)
+        middleware = LoggingMiddleware(JSONResponse({"status": "ok"}), worker=worker)
+        await _call(middleware, scope)
+        await worker.drain()
 
         # Verify user info in log
         assert received_logs[0]["user_id"] == "user-123"
@@ -320,3 +352,113 @@ async def test_logs_stream_in_real_time():
 
     # All 3 should have been sent immediately
     assert mock_ws.send_text.call_count == 3
+
+
+# ============================================================================
+# Backpressure & Filtering Tests
+# ============================================================================
+
+
+class StalledSocket:
+    """Client whose sends block until released"""
+
+    def __init__(self):
+        self.frames = []
+        self.release = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.release.wait()
+        self.frames.append(json.loads(text))
+
+
+@pytest.mark.asyncio
+async def test_stalled_client_does_not_delay_others():
+    """VERIFY: Broadcast returns and other clients receive while one client is stalled"""
+    from app.services.websocket_manager import ConnectionManager
+
+    manager = ConnectionManager()
+    stalled = StalledSocket()
+    fast = AsyncMock()
+    await manager.connect(stalled)
+    await manager.connect(fast)
+
+    await asyncio.wait_for(manager.broadcast({"message": "Log 0"}), timeout=1)
+
+    fast.send_text.assert_called_once()
+    assert stalled.frames == []
+
+
+@pytest.mark.asyncio
+async def test_backlog_is_bounded_and_batched():
+    """VERIFY: A backed-up client drops its oldest entries and gets the rest in one frame"""
+    from app.services.websocket_manager import ConnectionManager
+
+    manager = ConnectionManager(max_pending=3)
+    stalled = StalledSocket()
+    await manager.connect(stalled)
+
+    for i in range(5):
+        await manager.broadcast({"message": f"Log {i}"})
+    stalled.release.set()
+    await asyncio.sleep(0.01)
+
+    assert stalled.frames[0] == {"message": "Log 0"}
+    assert stalled.frames[1]["type"] == "batch"
+    assert stalled.frames[1]["dropped"] == 1
+    assert [e["message"] for e in stalled.frames[1]["entries"]] == ["Log 2", "Log 3", "Log 4"]
+    assert manager.dropped_total == 1
+
+
+@pytest.mark.asyncio
+async def test_level_and_topic_filters():
+    """VERIFY: Subscribers only receive the levels/topics they asked for"""
+    from app.services.websocket_manager import ConnectionManager
+
+    manager = ConnectionManager()
+    errors_only = AsyncMock()
+    await manager.connect(errors_only, levels=["error"])
+
+    await manager.broadcast({"level": "INFO", "message": "ok"})
+    await manager.broadcast({"level": "ERROR", "message": "boom"})
+    assert errors_only.send_text.call_count == 1
+
+    manager.subscribe(errors_only, levels=None, topics=["rules"])
+    await manager.broadcast({"level": "INFO", "topic": "rules", "message": "ran"})
+    await manager.broadcast({"level": "INFO", "topic": "import", "message": "skipped"})
+    assert errors_only.send_text.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_history_replay_is_filtered():
+    """VERIFY: Replayed history honours the subscriber's levels/topics"""
+    from app.services.websocket_manager import ConnectionManager
+
+    manager = ConnectionManager()
+    mock_ws = AsyncMock()
+    history = [
+        {"level": "INFO", "topic": "rules", "message": "ran"},
+        {"level": "ERROR", "topic": "rules", "message": "failed"},
+        {"level": "ERROR", "topic": "import", "message": "bad row"},
+    ]
+    await manager.connect(mock_ws, levels=["error"], topics=["rules"], history=lambda: history)
+
+    sent = [json.loads(call.args[0]) for call in mock_ws.send_text.call_args_list]
+    assert [entry["message"] for entry in sent] == ["failed"]
+
+
+@pytest.mark.asyncio
+async def test_publish_from_worker_thread():
+    """VERIFY: Sync code running in a thread pool can publish to clients"""
+    from app.services.websocket_manager import ConnectionManager
+
+    manager = ConnectionManager()
+    mock_ws = AsyncMock()
+    await manager.connect(mock_ws)
+
+    await asyncio.to_thread(manager.publish, {"message": "from thread"})
+    await asyncio.sleep(0.01)
+
+    mock_ws.send_text.assert_called_once()
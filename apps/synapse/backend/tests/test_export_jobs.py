@@ -0,0 +1,223 @@
+"""
+Tests for ExportJobQueue
+
+Covers content hashing, the artifact cache, background jobs (progress,
+failure, in-flight deduplication) and the export job API.
+"""
+
+from uuid import uuid4
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy.orm import Session
+
+from app.models.auth import Client, Project
+from app.models.models import Asset
+from app.models.packages import ExportJobStatus, Package
+from app.services import export_jobs
+from app.services.export_jobs import ArtifactStore, ExportError, ExportJobQueue
+from app.services.template_service import TemplateService
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+class InlineExecutor:
+    """Runs submitted jobs immediately (or holds them when paused)"""
+
+    def __init__(self, paused: bool = False):
+        self.paused = paused
+        self.held = []
+
+    def submit(self, fn, *args):
+        if self.paused:
+            self.held.append((fn, args))
+        else:
+            fn(*args)
+
+
+@pytest.fixture
+def test_package(db_session: Session):
+    """Create a package with three instruments"""
+    client = Client(id=f"test-client-{uuid4().hex[:8]}", name="Test Client")
+    project = Project(id=f"test-project-{uuid4().hex[:8]}", name="Test", client_id=client.id)
+    package = Package(name=f"PKG-{uuid4().hex[:6]}", package_type="IN-P040", project_id=project.id)
+    db_session.add_all([client, project, package])
+    db_session.flush()
+    db_session.add_all(
+        Asset(
+            id=f"asset-{uuid4().hex[:8]}",
+            tag=f"FIT-210-00{i}",
+            type="INSTRUMENT",
+            description="Flow Transmitter",
+            project_id=project.id,
+            package_id=package.id,
+        )
+        for i in range(1, 4)
+    )
+    db_session.commit()
+    return package
+
+
+def _queue(db_session: Session, tmp_path, executor=None) -> ExportJobQueue:
+    return ExportJobQueue(
+        session_factory=lambda: Session(bind=db_session.connection()),
+        store=ArtifactStore(root=str(tmp_path)),
+        executor=executor or InlineExecutor(),
+    )
+
+
+# ============================================================================
+# Cache Tests
+# ============================================================================
+
+
+class TestArtifactCache:
+    """Content hash and artifact reuse"""
+
+    def test_content_hash_tracks_exported_data(self, db_session: Session, test_package):
+        service = TemplateService(db_session)
+        before = service.content_hash(test_package.id, "IN-P040")
+
+        assert service.content_hash(test_package.id, "IN-P040") == before
+        assert service.content_hash(test_package.id, "CA-P040") != before
+
+        asset = db_session.query(Asset).filter(Asset.package_id == test_package.id).first()
+        asset.description = "Flow Transmitter - Feed Water"
+        db_session.commit()
+
+        assert service.content_hash(test_package.id, "IN-P040") != before
+        assert service.content_hash("missing", "IN-P040") is None
+
+    def test_unchanged_package_is_served_from_cache(
+        self, db_session: Session, test_package, tmp_path, monkeypatch
+    ):
+        queue = _queue(db_session, tmp_path)
+        first = queue.export(db_session, test_package.id, "IN-P040")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("cached export was regenerated")
+
+        monkeypatch.setattr(TemplateService, "export_package", fail)
+        second = queue.export(db_session, test_package.id, "IN-P040")
+
+        assert (first.cached, second.cached) == (False, True)
+        assert second.path == first.path
+        assert load_workbook(second.path).active["B7"].value == "FIT-210-001"
+
+    def test_prune_removes_stale_artifacts(self, tmp_path):
+        store = ArtifactStore(root=str(tmp_path), retention_days=0)
+        stale = tmp_path / "abc.xlsx"
+        stale.write_bytes(b"x")
+
+        assert store.prune() == 1
+        assert store.get("abc") is None
+
+
+# ============================================================================
+# Job Tests
+# ============================================================================
+
+
+class TestExportJobs:
+    """Background jobs, progress and failures"""
+
+    def test_job_completes_then_resubmit_is_cached(
+        self, db_session: Session, test_package, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(export_jobs.settings, "EXPORT_BATCH_SIZE", 1)
+        progress = []
+        queue = _queue(db_session, tmp_path)
+        report = queue._report_progress
+        monkeypatch.setattr(
+            queue, "_report_progress", lambda *args: progress.append(args[1:]) or report(*args)
+        )
+
+        job = queue.submit(db_session, test_package.id, "IN-P040")
+        db_session.refresh(job)
+
+        assert job.status == ExportJobStatus.COMPLETED
+        assert (job.progress, job.cached) == (100, False)
+        assert job.file_name.startswith(f"{test_package.name}_IN-P040_")
+        assert progress[:3] == [(1, 3), (2, 3), (3, 3)]
+
+        again = queue.submit(db_session, test_package.id, "IN-P040")
+        assert (again.status, again.cached) == (ExportJobStatus.COMPLETED, True)
+        assert again.content_hash == job.content_hash
+
+    def test_failed_export_is_recorded(self, db_session: Session, test_package, tmp_path):
+        empty = Package(name="Empty", project_id=test_package.project_id)
+        db_session.add(empty)
+        db_session.commit()
+
+        job = _queue(db_session, tmp_path).submit(db_session, empty.id, "IN-P040")
+        db_session.refresh(job)
+
+        assert job.status == ExportJobStatus.FAILED
+        assert "has no assets" in job.error
+
+    def test_in_flight_job_is_shared(self, db_session: Session, test_package, tmp_path):
+        executor = InlineExecutor(paused=True)
+        queue = _queue(db_session, tmp_path, executor)
+
+        first = queue.submit(db_session, test_package.id, "IN-P040")
+        second = queue.submit(db_session, test_package.id, "IN-P040")
+
+        assert second.id == first.id
+        assert first.status == ExportJobStatus.QUEUED
+        assert len(executor.held) == 1
+
+    def test_edited_package_gets_new_job(self, db_session: Session, test_package, tmp_path):
+        executor = InlineExecutor(paused=True)
+        queue = _queue(db_session, tmp_path, executor)
+
+        first = queue.submit(db_session, test_package.id, "IN-P040")
+        asset = db_session.query(Asset).filter(Asset.package_id == test_package.id).first()
+        asset.description = "Flow Transmitter - Feed Water"
+        db_session.commit()
+        second = queue.submit(db_session, test_package.id, "IN-P040")
+
+        assert second.id != first.id
+        assert second.content_hash != first.content_hash
+        assert len(executor.held) == 2
+
+    def test_unknown_package_raises(self, db_session: Session, tmp_path):
+        with pytest.raises(ExportError):
+            _queue(db_session, tmp_path).submit(db_session, "missing", "IN-P040")
+
+
+# ============================================================================
+# API Tests
+# ============================================================================
+
+
+class TestExportJobApi:
+    """Queue, poll and download through the API"""
+
+    def test_queue_poll_and_download(
+        self, client, db_session: Session, test_package, tmp_path, monkeypatch
+    ):
+        from app.api.deps import get_current_active_user
+        from app.main import app
+
+        app.dependency_overrides[get_current_active_user] = lambda: {"username": "testuser"}
+        monkeypatch.setattr(export_jobs, "_export_queue", _queue(db_session, tmp_path))
+        headers = {"X-Project-ID": test_package.project_id}
+        base = f"/api/v1/packages/{test_package.id}/export"
+
+        response = client.post(f"{base}/jobs", headers=headers, json={"template_type": "IN-P040"})
+        assert response.status_code == 202
+        job = response.json()
+
+        status = client.get(f"{base}/jobs/{job['id']}", headers=headers).json()
+        assert status["status"] == "COMPLETED"
+        assert status["download_url"] == f"{base}/jobs/{job['id']}/download"
+
+        download = client.get(status["download_url"], headers=headers)
+        assert download.status_code == 200
+        assert status["file_name"] in download.headers["content-disposition"]
+
+        cached = client.get(base, headers=headers, params={"template_type": "IN-P040"})
+        assert cached.headers["x-export-cache"] == "hit"
+        assert cached.content == download.content
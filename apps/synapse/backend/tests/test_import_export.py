@@ -453,6 +453,25 @@ def test_export_csv_success(client, db_session, test_import_project):
     assert "electrical.voltage" in headers
 
 
+def test_export_csv_streams_in_buffered_chunks(db_session, test_import_project):
+    """Test export rows are coalesced into buffer-sized chunks"""
+    from app.api.endpoints.import_export import iter_assets_csv
+
+    db_session.add_all(
+        Asset(tag=f"BULK-{i:03d}", type="PUMP", project_id="test-project-import")
+        for i in range(200)
+    )
+    db_session.commit()
+
+    chunks = list(iter_assets_csv(db_session, "test-project-import", buffer_size=2048))
+
+    # Header chunk first, then a few large chunks instead of one per row
+    assert chunks[0].startswith("id,tag,")
+    assert 2 < len(chunks) < 20
+    assert all(len(chunk) >= 2048 for chunk in chunks[1:-1])
+    assert "".join(chunks).count("BULK-") == 200
+
+
 def test_export_csv_multi_tenancy(client, db_session, test_import_project, other_test_project):
     """Test CSV export respects project isolation"""
     # Create assets in different projects
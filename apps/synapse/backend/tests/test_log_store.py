@@ -0,0 +1,78 @@
+"""
+Tests for LogStore
+
+Covers ring-buffer eviction, indexed filters and "since" cursor reads.
+"""
+
+from app.services.log_store import LogStore
+
+
+def _entry(n: int, level: str = "INFO", **fields) -> dict:
+    return {"id": f"log-{n}", "level": level, "message": f"Log {n}", "source": "BACKEND", **fields}
+
+
+def _ids(entries: list[dict]) -> list[str]:
+    return [entry["id"] for entry in entries]
+
+
+class TestRingBuffer:
+    """Capacity and eviction"""
+
+    def test_oldest_entries_are_evicted(self):
+        store = LogStore(capacity=3)
+        for n in range(5):
+            store.append(_entry(n, level="ERROR" if n == 0 else "INFO"))
+
+        assert len(store) == 3
+        assert _ids(store.query()) == ["log-2", "log-3", "log-4"]
+        # Evicted entries leave no trace in the indexes
+        assert store.query(level="ERROR") == []
+
+    def test_limit_returns_most_recent(self):
+        store = LogStore()
+        for n in range(5):
+            store.append(_entry(n))
+
+        assert _ids(store.query(limit=2)) == ["log-3", "log-4"]
+        assert store.query(limit=0) == []
+
+
+class TestQueries:
+    """Indexed filters and since-id cursors"""
+
+    def test_filters_combine(self):
+        store = LogStore()
+        store.append(_entry(1, "ERROR", actionType="IMPORT", entityId="a-1"))
+        store.append(_entry(2, "INFO", actionType="IMPORT", entityId="a-1"))
+        store.append(_entry(3, "ERROR", actionType="RULE_EXECUTION", entityId="a-2"))
+
+        assert _ids(store.query(level="error")) == ["log-1", "log-3"]
+        assert _ids(store.query(action_type="IMPORT", entity_id="a-1")) == ["log-1", "log-2"]
+        assert _ids(store.query(level="ERROR", entity_id="a-1")) == ["log-1"]
+        assert store.query(source="FRONTEND") == []
+
+    def test_since_pages_forward_without_duplicates(self):
+        store = LogStore()
+        for n in range(6):
+            store.append(_entry(n))
+
+        page = store.query(since="log-1", limit=2)
+        assert _ids(page) == ["log-2", "log-3"]
+        assert _ids(store.query(since=page[-1]["id"], limit=10)) == ["log-4", "log-5"]
+        assert store.query(since="log-5") == []
+
+    def test_unknown_since_returns_everything_stored(self):
+        store = LogStore(capacity=2)
+        for n in range(4):
+            store.append(_entry(n))
+
+        # log-0 was evicted: the client missed more than the buffer holds
+        assert _ids(store.query(since="log-0")) == ["log-2", "log-3"]
+
+    def test_clear_keeps_cursors_unique(self):
+        store = LogStore()
+        store.append(_entry(1))
+        store.clear()
+        store.append(_entry(2))
+
+        assert _ids(store.query(since="log-1")) == ["log-2"]
@@ -29,6 +29,23 @@ class TestLogsEndpoint:
             # Verify default limit was used
             mock_logger.get_logs.assert_called_with(limit=100)
 
+    def test_get_logs_filtered_since(self, client):
+        """Test GET /api/v1/logs/ filters by level and resumes after an id."""
+        from app.services.websocket_manager import WebSocketLogger
+
+        WebSocketLogger.clear()
+        for level in ("info", "error", "info", "error"):
+            WebSocketLogger.log_sync(level, f"{level} log")
+        first_error = WebSocketLogger.get_logs(level="ERROR")[0]
+
+        response = client.get(f"/api/v1/logs/?level=ERROR&since={first_error['id']}")
+
+        assert response.status_code == 200
+        logs = response.json()
+        assert len(logs) == 1
+        assert logs[0]["level"] == "ERROR"
+        assert logs[0]["id"] != first_error["id"]
+
     def test_clear_logs(self, client):
         """Test DELETE /api/v1/logs/ clears all logs."""
         response = client.delete("/api/v1/logs/")
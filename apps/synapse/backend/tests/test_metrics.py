@@ -0,0 +1,155 @@
+"""
+Tests for Prometheus metrics
+
+Covers the text exposition format, per-request DB query tracking, rule
+engine phase timing and the /metrics endpoint.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, text
+
+import app.core.database  # noqa: F401  (registers the cursor event listeners)
+from app.core import metrics
+from app.core.metrics import Counter, Histogram, PhaseTimer, Registry, track_queries
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestExposition:
+    """Text format rendering"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        histogram = registry.register(
+            Histogram("test_seconds", "Test latency", labels=("route",), buckets=(0.1, 1.0))
+        )
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, route="/a")
+
+        lines = registry.render().splitlines()
+
+        assert "# TYPE test_seconds histogram" in lines
+        assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{route="/a",le="1"} 3' in lines
+        assert 'test_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'test_seconds_count{route="/a"} 4' in lines
+
+    def test_counter_escapes_label_values(self):
+        registry = Registry()
+        counter = registry.register(Counter("test_errors", "Errors", labels=("route",)))
+        counter.inc(route='/a"b')
+        counter.inc(2, route='/a"b')
+
+        assert 'test_errors_total{route="/a\\"b"} 3' in registry.render().splitlines()
+
+    def test_large_values_keep_full_precision(self):
+        registry = Registry()
+        counter = registry.register(Counter("test_requests", "Requests"))
+        histogram = registry.register(Histogram("test_seconds", "Latency", buckets=(1.0,)))
+        counter.inc(1234567)
+        histogram.observe(1234567.125)
+
+        lines = registry.render().splitlines()
+
+        assert "test_requests_total 1234567" in lines
+        assert "test_seconds_sum 1234567.125" in lines
+
+
+class TestQueryTracking:
+    """Per-request DB query count and time"""
+
+    def test_statements_are_counted_in_context(self):
+        engine = create_engine("sqlite://")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))  # Outside any tracked context
+            with track_queries() as queries:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+        assert queries.count == 2
+        assert queries.seconds > 0
+
+    @pytest.mark.asyncio
+    async def test_request_logs_carry_db_stats(self):
+        from app.middleware.logging_middleware import LoggingMiddleware, RequestLogWorker
+
+        async def app(scope, receive, send):
+            metrics.record_query("SELECT 1", 0.002)
+            metrics.record_query("SELECT 2", 0.003)
+            await JSONResponse({})(scope, receive, send)
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            pass
+
+        received_logs = []
+        with patch(
+            "app.services.websocket_manager.websocket_logger.log", new_callable=AsyncMock
+        ) as mock_log:
+            mock_log.side_effect = lambda **kwargs: received_logs.append(kwargs)
+            worker = RequestLogWorker(sample_rate=0.0)
+            scope = {"type": "http", "method": "GET", "path": "/api/v1/assets", "headers": []}
+            await LoggingMiddleware(app, worker=worker)(scope, receive, send)
+            await worker.drain()
+
+        assert received_logs[0]["context"]["db_queries"] == 2
+        assert received_logs[0]["context"]["db_time_ms"] == pytest.approx(5.0)
+        stats = worker.latency_stats()["GET <unmatched>"]
+        assert stats["avg_db_queries"] == 2
+
+
+class TestPhaseTimer:
+    """Exclusive phase timings"""
+
+    def test_nested_phase_time_is_exclusive(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(metrics.time, "perf_counter", clock)
+        phases = PhaseTimer()
+
+        with phases.phase("act"):
+            clock.now += 1.0
+            with phases.phase("log"):
+                clock.now += 2.0
+            with phases.phase(None):  # Not counted
+                clock.now += 4.0
+            clock.now += 0.5
+
+        assert dict(phases.totals) == {"act": 1.5, "log": 2.0}
+        assert phases.milliseconds() == {"act": 1500, "log": 2000}
+
+    def test_observe_records_one_sample_per_phase(self):
+        histogram = Histogram("test_phase_seconds", "Phases", labels=("phase",))
+        phases = PhaseTimer()
+        with phases.phase("load"):
+            pass
+        phases.observe(histogram)
+
+        assert list(histogram.series()) == [("load",)]
+
+
+class TestMetricsEndpoint:
+    """GET /metrics"""
+
+    def test_metrics_are_exposed(self):
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE synapse_db_query_duration_seconds histogram" in response.text
+        assert "# TYPE synapse_rule_phase_seconds histogram" in response.text
+        assert "# TYPE synapse_http_request_duration_seconds histogram" in response.text
@@ -322,6 +322,30 @@ class TestTemplateExport:
         assert headers_found, "Headers not found in cable schedule"
         print("✅ test_export_cable_schedule passed")
 
+    def test_export_streamed_layout(self, db_session, test_package, test_instruments):
+        """Test streamed export keeps the sheet layout (widths, frozen header, footer)"""
+        service = TemplateService(db_session)
+
+        result = service.export_package(
+            package_id=test_package.id, template_type="IN-P040", format="xlsx", stream=True
+        )
+
+        assert result.success is True
+        assert result.file_data is None
+        with result.file:
+            content = result.file.read()
+        assert len(content) == result.file_size
+        assert result.file.closed
+
+        ws = load_workbook(io.BytesIO(content)).active
+        assert ws.freeze_panes == "A7"
+        assert ws["B6"].value == "Tag Number"
+        assert [ws.cell(row, 1).value for row in (7, 8, 9)] == [1, 2, 3]
+        assert ws.column_dimensions["C"].width > ws.column_dimensions["A"].width >= 10
+        assert "A1:J1" in {str(merged) for merged in ws.merged_cells.ranges}
+        assert ws["A11"].value.startswith("Total Items: 3")
+        print("✅ test_export_streamed_layout passed")
+
     def test_export_via_api(self, client, test_package):
         """Test package export via API endpoint"""
         from app.api.deps import get_current_active_user
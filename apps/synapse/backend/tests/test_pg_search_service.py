@@ -0,0 +1,163 @@
+"""
+Tests for PostgresSearchService
+
+Covers the pg_trgm / tsvector fallback search: substring, prefix and typo
+matches, ranking, filters and the SearchResult-shaped hits.
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.auth import Client, Project
+from app.models.models import Asset, LBSNode, LocationType
+from app.models.rules import RuleActionType, RuleDefinition, RuleSource
+from app.services.pg_search_service import PostgresSearchService
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def _project(db_session: Session) -> Project:
+    client = Client(id=f"test-client-{uuid4().hex[:8]}", name="Test Client")
+    db_session.add(client)
+    project = Project(
+        id=f"test-project-{uuid4().hex[:8]}",
+        name="Test Project",
+        client_id=client.id,
+    )
+    db_session.add(project)
+    return project
+
+
+@pytest.fixture
+def test_project(db_session: Session):
+    """Create test project with a few searchable assets"""
+    project = _project(db_session)
+    db_session.add_all(
+        [
+            Asset(
+                id=f"asset-{uuid4().hex[:8]}",
+                tag="P-1001",
+                type="PUMP",
+                description="Centrifugal feed pump",
+                system="Leaching",
+                project_id=project.id,
+            ),
+            Asset(
+                id=f"asset-{uuid4().hex[:8]}",
+                tag="M-1001",
+                type="MOTOR",
+                description="Feed pump motor",
+                project_id=project.id,
+            ),
+            Asset(
+                id=f"asset-{uuid4().hex[:8]}",
+                tag="P-1002",
+                type="PUMP",
+                description="Retired pump",
+                project_id=project.id,
+                deleted_at=datetime.utcnow(),
+            ),
+        ]
+    )
+    db_session.commit()
+    return project
+
+
+def _search(db_session: Session, query: str, **kwargs):
+    return PostgresSearchService(db_session).search(query, **kwargs)
+
+
+# ============================================================================
+# Matching Tests
+# ============================================================================
+
+
+class TestMatching:
+    """Substring, prefix and typo-tolerant matches"""
+
+    def test_substring_match_on_tag(self, db_session: Session, test_project):
+        hits, categories = _search(db_session, "1001", types=["asset"], project_id=test_project.id)
+
+        assert {hit["title"] for hit in hits} == {"P-1001", "M-1001"}
+        assert categories == {"asset": 2}
+
+    def test_word_prefix_match_across_fields(self, db_session: Session, test_project):
+        hits, _ = _search(db_session, "centri leach", types=["asset"], project_id=test_project.id)
+
+        assert [hit["title"] for hit in hits] == ["P-1001"]
+
+    def test_typo_tolerance(self, db_session: Session, test_project):
+        hits, _ = _search(db_session, "centrifugl", types=["asset"], project_id=test_project.id)
+
+        assert [hit["title"] for hit in hits] == ["P-1001"]
+
+    def test_exact_tag_ranks_first(self, db_session: Session, test_project):
+        hits, _ = _search(db_session, "P-1001", types=["asset"], project_id=test_project.id)
+
+        assert hits[0]["title"] == "P-1001"
+        assert hits[0]["score"] == 100
+        assert hits == sorted(hits, key=lambda hit: hit["score"], reverse=True)
+
+    def test_query_syntax_is_not_interpreted(self, db_session: Session, test_project):
+        hits, _ = _search(db_session, "pump & | ! %_", types=["asset"], project_id=test_project.id)
+
+        assert all(hit["type"] == "asset" for hit in hits)
+
+
+# ============================================================================
+# Filter Tests
+# ============================================================================
+
+
+class TestFilters:
+    """Project, soft-delete and type filters"""
+
+    def test_soft_deleted_assets_excluded(self, db_session: Session, test_project):
+        hits, _ = _search(db_session, "Retired", project_id=test_project.id)
+
+        assert hits == []
+
+    def test_project_filter(self, db_session: Session, test_project):
+        other = _project(db_session)
+        db_session.add(
+            Asset(id=f"asset-{uuid4().hex[:8]}", tag="P-1001", type="PUMP", project_id=other.id)
+        )
+        db_session.commit()
+
+        hits, _ = _search(db_session, "P-1001", types=["asset"], project_id=other.id)
+
+        assert len(hits) == 1
+
+    def test_hits_have_search_result_shape(self, db_session: Session, test_project):
+        db_session.add_all(
+            [
+                LBSNode(
+                    id=f"lbs-{uuid4().hex[:8]}",
+                    name="Pump House",
+                    type=LocationType.AREA,
+                    project_id=test_project.id,
+                ),
+                RuleDefinition(
+                    name="Pump motor rule",
+                    source=RuleSource.PROJECT,
+                    source_id=test_project.id,
+                    action_type=RuleActionType.CREATE_CHILD,
+                    condition={"asset_type": "PUMP"},
+                    action={},
+                ),
+            ]
+        )
+        db_session.commit()
+
+        hits, categories = _search(db_session, "pump", project_id=test_project.id)
+
+        assert categories == {"asset": 2, "rule": 1, "cable": 0, "location": 1}
+        location = next(hit for hit in hits if hit["type"] == "location")
+        assert location["path"] == f"/locations/{location['id']}"
+        assert location["icon"] == "MapPin"
+        assert location["metadata"] == {"type": "AREA"}
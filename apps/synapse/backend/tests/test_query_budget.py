@@ -0,0 +1,217 @@
+"""
+Tests for query budgets and N+1 detection
+
+Covers statement fingerprints, repeated-statement detection with stack
+attribution, budget enforcement and the budgeted bulk asset update.
+"""
+
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import app.core.database  # noqa: F401  (registers the cursor event listeners)
+from app.core import metrics
+from app.core.config import settings
+from app.core.metrics import track_queries
+from app.core.query_budget import (
+    InspectedQueryStats,
+    QueryBudgetExceeded,
+    fingerprint,
+    query_budget,
+)
+from app.models.auth import Client, Project, User
+from app.models.models import Asset
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER, tag TEXT)"))
+        yield conn
+
+
+def _lookup(conn, n: int):
+    """Query issued in a loop (the N+1 shape)"""
+    for i in range(n):
+        conn.execute(text("SELECT tag FROM t WHERE id = :id"), {"id": i})
+
+
+# ============================================================================
+# Fingerprint Tests
+# ============================================================================
+
+
+class TestFingerprint:
+    """Statement shapes"""
+
+    def test_literals_and_parameters_are_collapsed(self):
+        assert fingerprint("SELECT * FROM asset WHERE id = %(id_1)s LIMIT 1") == fingerprint(
+            "SELECT  *\nFROM asset WHERE id = %(id_1)s LIMIT 5"
+        )
+        assert fingerprint("SELECT * FROM asset WHERE tag = 'P-101'") == (
+            "SELECT * FROM asset WHERE tag = ?"
+        )
+
+    def test_in_lists_of_any_length_share_a_shape(self):
+        one = "SELECT * FROM asset WHERE id IN (%(id_1_1)s)"
+        three = "SELECT * FROM asset WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)"
+        assert fingerprint(one) == fingerprint(three) == "SELECT * FROM asset WHERE id IN (...)"
+
+    def test_identifiers_with_digits_are_kept(self):
+        assert fingerprint("SELECT asset_1.tag FROM asset AS asset_1") == (
+            "SELECT asset_1.tag FROM asset AS asset_1"
+        )
+
+
+# ============================================================================
+# N+1 Detection Tests
+# ============================================================================
+
+
+class TestDetection:
+    """Repeated statements within a tracked block"""
+
+    def test_repeated_shape_is_reported_with_location(self, conn):
+        with track_queries(InspectedQueryStats(threshold=3)) as stats:
+            _lookup(conn, 5)
+            conn.execute(text("SELECT COUNT(*) FROM t"))
+
+        assert stats.count == 6
+        assert len(stats.repeated) == 1
+        repeated = next(iter(stats.repeated.values()))
+        assert repeated.count == 5
+        assert repeated.fingerprint == "SELECT tag FROM t WHERE id = ?"
+
+    def test_below_threshold_is_not_reported(self, conn):
+        with track_queries(InspectedQueryStats(threshold=3)) as stats:
+            _lookup(conn, 2)
+
+        assert stats.repeated == {}
+
+    @pytest.mark.asyncio
+    async def test_request_reports_repeated_statements(self, monkeypatch):
+        from app.middleware.logging_middleware import LoggingMiddleware, RequestLogWorker
+
+        monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 3)
+
+        async def app(scope, receive, send):
+            for i in range(4):
+                metrics.record_query(f"SELECT * FROM assets WHERE id = {i}", 0.001)
+            await JSONResponse({})(scope, receive, send)
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            pass
+
+        received_logs = []
+        with patch(
+            "app.services.websocket_manager.websocket_logger.log", new_callable=AsyncMock
+        ) as mock_log:
+            mock_log.side_effect = lambda **kwargs: received_logs.append(kwargs)
+            worker = RequestLogWorker(sample_rate=0.0)
+            scope = {"type": "http", "method": "GET", "path": "/api/v1/assets", "headers": []}
+            await LoggingMiddleware(app, worker=worker)(scope, receive, send)
+            await worker.drain()
+
+        warnings = [log for log in received_logs if log["action_type"] == "N_PLUS_ONE"]
+        assert len(warnings) == 1
+        assert warnings[0]["context"]["count"] == 4
+        assert warnings[0]["context"]["statement"] == "SELECT * FROM assets WHERE id = ?"
+
+    def test_location_points_at_app_code(self, db_session: Session):
+        from app.services.validation_service import ValidationService
+
+        with track_queries(InspectedQueryStats(threshold=1)) as stats:
+            ValidationService.get_validation_details(db_session, "missing-project")
+
+        locations = [r.location for r in stats.repeated.values()]
+        assert any("services/validation_service.py" in loc[0] for loc in locations if loc)
+
+
+# ============================================================================
+# Budget Tests
+# ============================================================================
+
+
+class TestBudget:
+    """query_budget() as context manager and decorator"""
+
+    def test_exceeded_budget_raises_with_repeated_statement(self, conn):
+        with pytest.raises(QueryBudgetExceeded) as exc:
+            with query_budget(3, enforce=True, name="lookup"):
+                _lookup(conn, 4)
+
+        assert "lookup ran 4 queries (budget 3)" in exc.value.message
+        assert exc.value.details["repeated"][0]["count"] == 4
+
+    def test_exceeded_budget_warns_when_not_enforced(self, conn, caplog):
+        with query_budget(1, enforce=False, name="lookup"):
+            _lookup(conn, 2)
+
+        assert "lookup ran 2 queries (budget 1)" in caplog.text
+
+    def test_nested_budget_counts_toward_outer_tracking(self, conn):
+        with track_queries() as outer:
+            with query_budget(5, enforce=True):
+                _lookup(conn, 2)
+            _lookup(conn, 1)
+
+        assert outer.count == 3
+
+    def test_decorator_names_the_function(self, conn):
+        @query_budget(1, enforce=True)
+        def chatty():
+            _lookup(conn, 2)
+
+        with pytest.raises(QueryBudgetExceeded, match="chatty ran 2 queries"):
+            chatty()
+
+    @pytest.mark.asyncio
+    async def test_async_decorator(self, conn):
+        @query_budget(1, enforce=True)
+        async def chatty():
+            _lookup(conn, 2)
+
+        with pytest.raises(QueryBudgetExceeded):
+            await chatty()
+
+
+# ============================================================================
+# Endpoint Tests
+# ============================================================================
+
+
+def test_bulk_update_assets_stays_within_budget(client, db_session: Session):
+    """PATCH /assets/bulk runs a constant number of queries (@query_budget)"""
+    from app.api.deps import get_current_active_user
+    from app.main import app
+
+    tenant = Client(id=f"test-client-{uuid4().hex[:8]}", name="Test Client")
+    project = Project(id=f"test-project-{uuid4().hex[:8]}", name="Test", client_id=tenant.id)
+    db_session.add_all([tenant, project])
+    db_session.flush()
+    assets = [
+        Asset(id=f"asset-{uuid4().hex[:8]}", tag=f"P-{i:03}", type="PUMP", project_id=project.id)
+        for i in range(25)
+    ]
+    db_session.add_all(assets)
+    db_session.commit()
+
+    user = db_session.get(User, "dev-user")
+    app.dependency_overrides[get_current_active_user] = lambda: user
+
+    response = client.patch(
+        "/api/v1/assets/bulk",
+        headers={"X-Project-ID": project.id},
+        json=[{"id": asset.id, "description": "Updated"} for asset in assets],
+    )
+
+    assert response.status_code == 200
+    assert {item["description"] for item in response.json()} == {"Updated"}
@@ -12,7 +12,7 @@ Tests the new rule execution pipeline with:
 from uuid import uuid4
 
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.models.auth import Client, Project, User
 from app.models.models import Asset
@@ -25,8 +25,10 @@ from app.models.workflow import (
     LogSource,
     WorkflowActionType,
     WorkflowEvent,
+    WorkflowStatus,
 )
-from app.services.rule_execution_service import RuleExecutionService
+from app.services.rule_execution_service import ExecutionContext, RuleExecutionService
+from app.services.rule_scheduler import build_rule_waves
 from app.services.versioning_service import VersioningService
 from app.services.workflow_logger import WorkflowLogger
 
@@ -236,6 +238,120 @@ class TestWorkflowLogger:
 
         assert len(events) == 2
 
+    def test_buffered_events_flushed_in_batches(self, db_session: Session, test_project, test_user):
+        """Test buffered mode inserts events once flush_size is reached"""
+        logger = WorkflowLogger(
+            db=db_session,
+            project_id=test_project.id,
+            user_id=test_user.id,
+            buffered=True,
+            flush_size=3,
+            flush_interval_ms=60_000,
+        )
+
+        correlation_id = logger.start_workflow(
+            source=LogSource.RULE, action_type=WorkflowActionType.EXECUTE, message="Buffered"
+        )
+        logger.log_info(message="First", source=LogSource.RULE, correlation_id=correlation_id)
+
+        def count():
+            return (
+                db_session.query(WorkflowEvent)
+                .filter(WorkflowEvent.correlation_id == correlation_id)
+                .count()
+            )
+
+        assert count() == 0
+
+        logger.log_info(message="Second", source=LogSource.RULE, correlation_id=correlation_id)
+
+        assert count() == 3
+
+    def test_buffered_failed_flush_keeps_events(
+        self, db_session: Session, test_project, test_user, monkeypatch
+    ):
+        """Test events stay queued when the batch insert fails"""
+        logger = WorkflowLogger(
+            db=db_session,
+            project_id=test_project.id,
+            user_id=test_user.id,
+            buffered=True,
+            flush_interval_ms=60_000,
+        )
+        correlation_id = logger.start_workflow(
+            source=LogSource.RULE, action_type=WorkflowActionType.EXECUTE, message="Buffered"
+        )
+
+        def unavailable(*args, **kwargs):
+            raise ConnectionError("database unavailable")
+
+        monkeypatch.setattr(db_session, "execute", unavailable)
+        with pytest.raises(ConnectionError):
+            logger.flush()
+        monkeypatch.undo()
+
+        assert logger.flush() == 1
+        assert (
+            db_session.query(WorkflowEvent)
+            .filter(WorkflowEvent.correlation_id == correlation_id)
+            .count()
+            == 1
+        )
+
+    def test_buffered_context_exit_flushes(self, db_session: Session, test_project, test_user):
+        """Test leaving the logger's context writes queued events"""
+        with WorkflowLogger(
+            db=db_session,
+            project_id=test_project.id,
+            user_id=test_user.id,
+            buffered=True,
+            flush_interval_ms=60_000,
+        ) as logger:
+            correlation_id = logger.start_workflow(
+                source=LogSource.RULE, action_type=WorkflowActionType.EXECUTE, message="Buffered"
+            )
+            logger.log_info(message="Child", source=LogSource.RULE, correlation_id=correlation_id)
+
+        assert (
+            db_session.query(WorkflowEvent)
+            .filter(WorkflowEvent.correlation_id == correlation_id)
+            .count()
+            == 2
+        )
+
+    def test_buffered_complete_workflow_flushes(
+        self, db_session: Session, test_project, test_user, monkeypatch
+    ):
+        """Test complete_workflow writes queued events; broadcast is immediate"""
+        broadcast = []
+        monkeypatch.setattr(
+            WorkflowLogger, "_broadcast_event", lambda self, event, **kw: broadcast.append(event)
+        )
+        logger = WorkflowLogger(
+            db=db_session, project_id=test_project.id, user_id=test_user.id, buffered=True
+        )
+
+        correlation_id = logger.start_workflow(
+            source=LogSource.RULE, action_type=WorkflowActionType.EXECUTE, message="Buffered"
+        )
+        child = logger.log_info(
+            message="Child", source=LogSource.RULE, correlation_id=correlation_id
+        )
+
+        assert len(broadcast) == 2
+
+        logger.complete_workflow(correlation_id)
+
+        events = (
+            db_session.query(WorkflowEvent)
+            .filter(WorkflowEvent.correlation_id == correlation_id)
+            .all()
+        )
+        assert len(events) == 3
+        root = next(e for e in events if e.parent_event_id is None)
+        assert root.status == WorkflowStatus.COMPLETED
+        assert db_session.get(WorkflowEvent, child.id).parent_event_id == root.id
+
 
 # ============================================================================
 # VersioningService Tests
@@ -469,6 +585,46 @@ class TestRuleExecutionService:
         assert hasattr(result, "actions_taken")
         assert hasattr(result, "errors")
 
+    def test_later_rules_see_created_children(
+        self, db_session: Session, test_project, test_pump, create_child_rule, test_user
+    ):
+        """Test compiled and Python-evaluated conditions both see new children"""
+        # is_deleted is a Python property: the condition cannot be compiled
+        python_only = [{"key": "is_deleted", "op": "==", "value": False}]
+
+        def set_rule(name: str, priority: int, condition: dict) -> RuleDefinition:
+            return RuleDefinition(
+                id=f"rule-{uuid4().hex[:8]}",
+                name=name,
+                source=RuleSource.FIRM,
+                priority=priority,
+                action_type=RuleActionType.SET_PROPERTY,
+                condition=condition,
+                action={"set_property": {name: "yes"}},
+                is_active=True,
+            )
+
+        # Runs before the motor exists and loads the Python-path asset list
+        before = set_rule("before", 20, {"asset_type": "MOTOR", "property_filters": python_only})
+        after = set_rule("after", 5, {"asset_type": "MOTOR", "property_filters": python_only})
+        everything = set_rule("everything", 4, {})
+        db_session.add_all([before, after, everything])
+        db_session.commit()
+
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+        result = service.execute_rules(
+            rule_ids=[create_child_rule.id, before.id, after.id, everything.id]
+        )
+
+        by_name = {rule_result.rule_name: rule_result for rule_result in result.rule_results}
+        assert by_name["before"].actions_taken == 0
+        assert by_name["after"].actions_taken == 1
+        assert by_name["everything"].actions_taken == 2
+        assert (by_name["everything"].total_assets, by_name["everything"].skipped) == (2, 0)
+        assert all(rule_result.skipped >= 0 for rule_result in result.rule_results)
+
 
 # ============================================================================
 # Property Filter Tests
@@ -661,3 +817,305 @@ class TestErrorHandling:
         # Should not crash with non-existent asset ID
         result = service.execute_rules(asset_ids=["non-existent-id"])
         assert result is not None
+
+
+# ============================================================================
+# Bulk Execution Tests
+# ============================================================================
+
+
+class TestBulkExecution:
+    """Tests for set-based bulk execution mode"""
+
+    def test_bulk_create_child(
+        self, db_session: Session, test_project, test_pump, create_child_rule, test_user
+    ):
+        """Test bulk CREATE_CHILD creates child, edge and initial version"""
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+
+        result = service.execute_rules(asset_ids=[test_pump.id], bulk=True)
+
+        motor = (
+            db_session.query(Asset)
+            .filter(Asset.tag == "310-PP-001-M", Asset.project_id == test_project.id)
+            .first()
+        )
+        assert motor is not None
+        assert motor.type == "MOTOR"
+        assert result.actions_taken == 1
+
+        versions = db_session.query(AssetVersion).filter(AssetVersion.asset_id == motor.id).all()
+        assert len(versions) == 1
+        assert versions[0].batch_id is not None
+
+    def test_bulk_create_child_idempotency(
+        self, db_session: Session, test_project, test_pump, create_child_rule, test_user
+    ):
+        """Test bulk CREATE_CHILD skips existing children"""
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+
+        service.execute_rules(asset_ids=[test_pump.id], bulk=True)
+        result = service.execute_rules(asset_ids=[test_pump.id], bulk=True)
+
+        motors = (
+            db_session.query(Asset)
+            .filter(Asset.tag == "310-PP-001-M", Asset.project_id == test_project.id)
+            .all()
+        )
+        assert len(motors) == 1
+        assert result.actions_taken == 0
+
+    def test_bulk_rerun_after_batch_rollback(
+        self, db_session: Session, test_project, test_pump, create_child_rule, test_user
+    ):
+        """Test children deleted by a batch rollback are skipped, not re-inserted"""
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+        service.execute_rules(asset_ids=[test_pump.id], bulk=True)
+
+        batch = (
+            db_session.query(BatchOperation)
+            .filter(BatchOperation.project_id == test_project.id)
+            .order_by(BatchOperation.started_at.desc())
+            .first()
+        )
+        rollback = VersioningService(db_session, test_project.id, test_user.id).rollback_batch(
+            batch.id, reason="Undo rule run"
+        )
+        assert rollback.success
+
+        rerun = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+        result = rerun.execute_rules(asset_ids=[test_pump.id], bulk=True)
+
+        assert result.errors == 0
+        assert result.actions_taken == 0
+        assert result.skipped == 1
+        motor = (
+            db_session.query(Asset)
+            .filter(Asset.tag == "310-PP-001-M", Asset.project_id == test_project.id)
+            .one()
+        )
+        assert motor.deleted_at is not None
+
+    def test_bulk_set_property(
+        self, db_session: Session, test_project, test_user, set_property_rule
+    ):
+        """Test bulk SET_PROPERTY updates assets and versions them"""
+        motors = [
+            Asset(
+                id=f"motor-{uuid4().hex[:8]}",
+                tag=f"310-PP-00{i}-M",
+                type="MOTOR",
+                project_id=test_project.id,
+                properties={},
+            )
+            for i in range(3)
+        ]
+        db_session.add_all(motors)
+        db_session.commit()
+
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+
+        result = service.execute_rules(asset_ids=[m.id for m in motors], bulk=True)
+
+        assert result.actions_taken == 3
+        for motor in motors:
+            db_session.refresh(motor)
+            assert motor.properties.get("voltage") == "600V"
+            assert (
+                db_session.query(AssetVersion).filter(AssetVersion.asset_id == motor.id).count()
+                == 1
+            )
+
+    def test_bulk_matches_per_asset_summary(
+        self, db_session: Session, test_project, test_pump, create_child_rule, test_user
+    ):
+        """Test bulk mode reports the same summary as per-asset mode"""
+        tank = Asset(
+            id=f"tank-{uuid4().hex[:8]}",
+            tag="310-TK-001",
+            type="TANK",
+            project_id=test_project.id,
+        )
+        db_session.add(tank)
+        db_session.commit()
+
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+
+        result = service.execute_rules(asset_ids=[test_pump.id, tank.id], bulk=True)
+
+        assert result.total_assets == 2
+        assert result.actions_taken == 1
+        assert result.skipped == 1
+        assert result.errors == 0
+
+    def test_bulk_invalid_action_handled(
+        self, db_session: Session, test_project, test_pump, test_user
+    ):
+        """Test invalid action configuration counts errors in bulk mode"""
+        bad_rule = RuleDefinition(
+            id=f"rule-{uuid4().hex[:8]}",
+            name="Bad Rule",
+            source=RuleSource.FIRM,
+            priority=10,
+            action_type=RuleActionType.CREATE_CHILD,
+            condition={"asset_type": "PUMP"},
+            action={},
+            is_active=True,
+        )
+        db_session.add(bad_rule)
+        db_session.commit()
+
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+
+        result = service.execute_rules(asset_ids=[test_pump.id], bulk=True)
+
+        assert result.errors >= 1
+
+
+class TestExistenceIndex:
+    """Tests for the per-run idempotency index"""
+
+    def test_index_loaded_from_project(
+        self, db_session: Session, test_project, test_pump, create_child_rule, test_user
+    ):
+        """Test index contains existing assets and edges"""
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+        service.execute_rules(asset_ids=[test_pump.id])
+
+        index = service._load_existence_index()
+
+        motor_id = index.assets["310-PP-001-M"]
+        assert index.assets["310-PP-001"] == test_pump.id
+        assert (motor_id, test_pump.id, "powers") in index.edges
+
+    def test_index_updated_on_create(
+        self, db_session: Session, test_project, test_pump, create_child_rule, test_user
+    ):
+        """Test entities created during a run are visible to later checks"""
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+        context = ExecutionContext(
+            project_id=test_project.id,
+            user_id=test_user.id,
+            correlation_id="test-correlation",
+            batch_id=None,
+        )
+
+        first = service._action_create_child(create_child_rule, test_pump, context)
+        second = service._action_create_child(create_child_rule, test_pump, context)
+
+        assert first.action_type == "CREATE"
+        assert second.action_type == "SKIP"
+        assert second.entity_id == first.entity_id
+        assert context.index.assets["310-PP-001-M"] == first.entity_id
+
+
+class TestParallelExecution:
+    """Tests for wave-scheduled rule execution"""
+
+    def test_parallel_single_wave_runs_inline(
+        self, db_session: Session, test_project, test_pump, create_child_rule, test_user
+    ):
+        """Test a wave with one rule runs in the caller's session"""
+        service = RuleExecutionService(
+            db=db_session, project_id=test_project.id, user_id=test_user.id
+        )
+
+        result = service.execute_rules(asset_ids=[test_pump.id], parallel=True)
+
+        assert result.actions_taken == 1
+        motor = (
+            db_session.query(Asset)
+            .filter(Asset.tag == "310-PP-001-M", Asset.project_id == test_project.id)
+            .first()
+        )
+        assert motor is not None
+
+    def test_parallel_wave_runs_independent_rules(
+        self,
+        db_session: Session,
+        test_project,
+        test_pump,
+        create_child_rule,
+        test_user,
+        monkeypatch,
+    ):
+        """Test two independent rules in one wave run in worker threads"""
+        tank = Asset(
+            id=f"tank-{uuid4().hex[:8]}",
+            tag="310-TK-001",
+            type="TANK",
+            project_id=test_project.id,
+            properties={},
+        )
+        tank_rule = RuleDefinition(
+            id=f"rule-{uuid4().hex[:8]}",
+            name="Test: Tank material",
+            source=RuleSource.FIRM,
+            priority=5,
+            action_type=RuleActionType.SET_PROPERTY,
+            condition={"asset_type": "TANK"},
+            action={"set_property": {"material": "SS316"}},
+            is_active=True,
+        )
+        db_session.add_all([tank, tank_rule])
+        db_session.commit()
+        assert build_rule_waves([create_child_rule, tank_rule]) == [[create_child_rule, tank_rule]]
+
+        # Worker sessions join the test transaction
+        service = RuleExecutionService(
+            db=db_session,
+            project_id=test_project.id,
+            user_id=test_user.id,
+            session_factory=sessionmaker(bind=db_session.get_bind()),
+        )
+        shared = []
+        load_index = service._existence_index
+
+        def capture_index(context: ExecutionContext):
+            index = load_index(context)
+            shared.append(index)
+            return index
+
+        monkeypatch.setattr(service, "_existence_index", capture_index)
+
+        result = service.execute_rules(
+            rule_ids=[create_child_rule.id, tank_rule.id],
+            asset_ids=[test_pump.id, tank.id],
+            parallel=True,
+            max_workers=2,
+        )
+
+        assert [r.rule_id for r in result.rule_results] == [create_child_rule.id, tank_rule.id]
+        assert [r.actions_taken for r in result.rule_results] == [1, 1]
+        assert (result.actions_taken, result.errors) == (2, 0)
+        assert result.skipped == 2  # Each rule skips the other rule's asset
+
+        motor = (
+            db_session.query(Asset)
+            .filter(Asset.tag == "310-PP-001-M", Asset.project_id == test_project.id)
+            .one()
+        )
+        db_session.refresh(tank)
+        assert tank.properties["material"] == "SS316"
+
+        # The worker's creation landed in the run's shared index
+        assert shared and shared[0].assets["310-PP-001-M"] == motor.id
+        assert {"load", "evaluate", "act"} <= set(service.phases.totals)
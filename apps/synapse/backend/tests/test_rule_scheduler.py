@@ -0,0 +1,119 @@
+"""
+Tests for rule dependency analysis and wave scheduling
+"""
+
+from app.models.rules import RuleActionType, RuleDefinition, RuleSource
+from app.services.rule_scheduler import analyze_rule, build_rule_waves, conflicts
+
+
+def make_rule(name: str, action_type: RuleActionType, condition: dict, action: dict):
+    return RuleDefinition(
+        id=f"rule-{name}",
+        name=name,
+        source=RuleSource.FIRM,
+        priority=10,
+        action_type=action_type,
+        condition=condition,
+        action=action,
+    )
+
+
+def set_property(name: str, asset_type: str | None, values: dict, filters=None):
+    condition = {"asset_type": asset_type} if asset_type else {}
+    if filters:
+        condition["property_filters"] = filters
+    return make_rule(name, RuleActionType.SET_PROPERTY, condition, {"set_property": values})
+
+
+def create_child(name: str, parent_type: str, child_type: str):
+    return make_rule(
+        name,
+        RuleActionType.CREATE_CHILD,
+        {"asset_type": parent_type},
+        {"create_child": {"type": child_type, "naming": "{parent_tag}-" + child_type[:1]}},
+    )
+
+
+# ============================================================================
+# Conflict Analysis
+# ============================================================================
+
+
+def test_disjoint_types_do_not_conflict():
+    pumps = analyze_rule(set_property("pumps", "PUMP", {"voltage": "600V"}))
+    tanks = analyze_rule(set_property("tanks", "TANK", {"voltage": "480V"}))
+
+    assert not conflicts(pumps, tanks)
+
+
+def test_writes_to_same_rows_conflict():
+    first = analyze_rule(set_property("a", "PUMP", {"voltage": "600V"}))
+    second = analyze_rule(set_property("b", "PUMP", {"seal": "mechanical"}))
+
+    assert conflicts(first, second)
+
+
+def test_write_read_conflict_through_filter():
+    writer = analyze_rule(set_property("writer", None, {"power_kw": 75}))
+    reader = make_rule(
+        "reader",
+        RuleActionType.VALIDATE,
+        {"asset_type": "MOTOR", "property_filters": [{"key": "power_kw", "op": ">", "value": 50}]},
+        {"validate": {"message": "{tag} is large"}},
+    )
+
+    assert conflicts(writer, analyze_rule(reader))
+
+
+def test_created_type_conflicts_with_its_readers():
+    creator = analyze_rule(create_child("motors", "PUMP", "MOTOR"))
+    motor_reader = analyze_rule(set_property("motor props", "MOTOR", {"voltage": "600V"}))
+    tank_reader = analyze_rule(set_property("tank props", "TANK", {"voltage": "600V"}))
+
+    assert conflicts(creator, motor_reader)
+    assert not conflicts(creator, tank_reader)
+
+
+def test_package_rule_conflicts_with_everything():
+    package = analyze_rule(
+        make_rule("pkg", RuleActionType.CREATE_PACKAGE, {"asset_type": "PUMP"}, {})
+    )
+    tanks = analyze_rule(set_property("tanks", "TANK", {"voltage": "480V"}))
+
+    assert conflicts(package, tanks)
+
+
+# ============================================================================
+# Waves
+# ============================================================================
+
+
+def test_independent_rules_share_a_wave():
+    rules = [
+        set_property("pumps", "PUMP", {"voltage": "600V"}),
+        set_property("tanks", "TANK", {"voltage": "480V"}),
+        set_property("valves", "VALVE", {"voltage": "120V"}),
+    ]
+
+    waves = build_rule_waves(rules)
+
+    assert [[r.name for r in wave] for wave in waves] == [["pumps", "tanks", "valves"]]
+
+
+def test_conflicting_rules_keep_priority_order():
+    rules = [
+        create_child("motors", "PUMP", "MOTOR"),
+        set_property("tanks", "TANK", {"voltage": "480V"}),
+        set_property("motor props", "MOTOR", {"voltage": "600V"}),
+    ]
+
+    waves = build_rule_waves(rules)
+
+    assert [[r.name for r in wave] for wave in waves] == [
+        ["motors", "tanks"],
+        ["motor props"],
+    ]
+
+
+def test_empty_rule_list():
+    assert build_rule_waves([]) == []
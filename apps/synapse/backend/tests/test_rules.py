@@ -408,6 +408,53 @@ def test_rule_engine_error_handling(db_session: Session, test_project, test_pump
     assert summary["errors"] >= 1
 
 
+def test_rule_engine_incremental_changed_assets_only(
+    db_session: Session, test_project, firm_rule, test_pump
+):
+    """Test incremental mode only processes the given assets"""
+    other_pump = Asset(
+        tag="310-PP-002",
+        type="PUMP",
+        semantic_type="ASSET",
+        project_id=test_project.id,
+        properties={},
+    )
+    db_session.add(other_pump)
+    db_session.commit()
+
+    summary = RuleEngine.apply_rules(db_session, test_project.id, asset_ids=[test_pump.id])
+
+    assert summary["total_assets"] == 2  # changed pump + motor created from it
+    assert db_session.query(Asset).filter(Asset.tag == "310-PP-001-M").first() is not None
+    assert db_session.query(Asset).filter(Asset.tag == "310-PP-002-M").first() is None
+
+
+def test_rule_engine_incremental_includes_dependents(
+    db_session: Session, test_project, country_rule, test_pump
+):
+    """Test incremental mode follows edges to assets created from a changed asset"""
+    from app.models.metamodel import MetamodelEdge
+
+    motor = Asset(
+        tag="310-PP-001-M",
+        type="MOTOR",
+        semantic_type="ASSET",
+        project_id=test_project.id,
+        properties={},
+    )
+    db_session.add(motor)
+    db_session.flush()
+    db_session.add(
+        MetamodelEdge(source_node_id=motor.id, target_node_id=test_pump.id, relation_type="powers")
+    )
+    db_session.commit()
+
+    RuleEngine.apply_rules(db_session, test_project.id, asset_ids=[test_pump.id])
+
+    db_session.refresh(motor)
+    assert motor.properties["voltage"] == "600V"
+
+
 # ============================================================================
 # API Endpoint Tests
 # ============================================================================
@@ -0,0 +1,186 @@
+"""
+Tests for SearchCache
+
+Covers exact and prefix hits, LRU/TTL expiry, per-project invalidation
+(explicit and on session commit) and hit-rate metrics.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.api.endpoints import search as search_endpoint
+from app.api.endpoints.search import SearchResult
+from app.models.auth import Client, Project
+from app.models.models import Asset
+from app.services.search_cache import SearchCache, get_search_cache
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _result(tag: str, subtitle: str | None = None) -> SearchResult:
+    return SearchResult(id=tag, type="asset", title=tag, subtitle=subtitle, score=50)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return SearchCache(max_entries=3, ttl_seconds=30, clock=clock)
+
+
+def _put(cache: SearchCache, query: str, results, project_id="p1", complete=True, limit=20):
+    cache.put(
+        project_id, query, ["asset"], limit, results, {"asset": len(results)}, "postgres", complete
+    )
+
+
+# ============================================================================
+# Lookup Tests
+# ============================================================================
+
+
+class TestLookup:
+    """Exact, normalized and prefix lookups"""
+
+    def test_exact_hit_is_normalized(self, cache: SearchCache):
+        _put(cache, "310-P", [_result("310-P-01")])
+
+        cached = cache.get("p1", "  310-p ", ["asset"], 20)
+
+        assert [r.title for r in cached.results] == ["310-P-01"]
+        assert cache.get("p2", "310-P", ["asset"], 20) is None
+        assert cache.get("p1", "310-P", ["rule"], 20) is None
+
+    def test_prefix_reuse_filters_results(self, cache: SearchCache):
+        _put(cache, "310-", [_result("310-P-01"), _result("310-M-01", "Feed pump motor")])
+
+        cached = cache.get("p1", "310-p", ["asset"], 20)
+
+        assert [r.title for r in cached.results] == ["310-P-01"]
+        assert cached.categories == {"asset": 1}
+        assert cache.stats()["prefix_hits"] == 1
+
+    def test_truncated_prefix_is_not_reused(self, cache: SearchCache):
+        _put(cache, "310-", [_result("310-M-01")], complete=False)
+
+        assert cache.get("p1", "310-p", ["asset"], 20) is None
+
+    def test_single_character_prefix_is_not_reused(self, cache: SearchCache):
+        _put(cache, "3", [_result("310-P-01")])
+
+        assert cache.get("p1", "31", ["asset"], 20) is None
+
+    def test_navigation_is_recomputed_on_prefix_hit(self, cache: SearchCache, monkeypatch):
+        fallback_calls = []
+
+        async def fake_fallback(q, type_filter, project_id, limit, db):
+            fallback_calls.append(q)
+            return [_result("SE-101")], {"asset": 1}
+
+        class UnavailableMeili:
+            def is_available(self) -> bool:
+                return False
+
+        monkeypatch.setattr(search_endpoint, "get_search_cache", lambda: cache)
+        monkeypatch.setattr(search_endpoint, "get_meilisearch_service", UnavailableMeili)
+        monkeypatch.setattr(search_endpoint, "search_with_fallback", fake_fallback)
+
+        def search(q: str):
+            return asyncio.run(
+                search_endpoint.global_search(q=q, limit=20, types=None, project_id="p1", db=None)
+            )
+
+        search("se")
+        # Fuzzy match only: "setings" is not a substring of "Settings"
+        response = search("setings")
+
+        assert response.cached is True
+        assert fallback_calls == ["se"]
+        assert "Settings" in [r.title for r in response.results]
+        assert response.categories["navigation"] >= 1
+
+
+# ============================================================================
+# Expiry Tests
+# ============================================================================
+
+
+class TestExpiry:
+    """TTL and LRU eviction"""
+
+    def test_entries_expire(self, cache: SearchCache, clock: FakeClock):
+        _put(cache, "pump", [_result("P-1")])
+        clock.now = 31
+
+        assert cache.get("p1", "pump", ["asset"], 20) is None
+
+    def test_least_recently_used_is_evicted(self, cache: SearchCache):
+        for query in ("aa", "bb", "cc"):
+            _put(cache, query, [])
+        cache.get("p1", "aa", ["asset"], 20)
+        _put(cache, "dd", [])
+
+        assert cache.get("p1", "bb", ["asset"], 20) is None
+        assert cache.get("p1", "aa", ["asset"], 20) is not None
+        assert cache.stats()["evictions"] == 1
+
+
+# ============================================================================
+# Invalidation Tests
+# ============================================================================
+
+
+class TestInvalidation:
+    """Per-project invalidation and metrics"""
+
+    def test_invalidate_project(self, cache: SearchCache):
+        _put(cache, "pump", [], project_id="p1")
+        _put(cache, "pump", [], project_id="p2")
+        _put(cache, "pump", [], project_id=None)
+
+        assert cache.invalidate(["p1"]) == 2
+        assert cache.get("p2", "pump", ["asset"], 20) is not None
+
+    def test_hit_rate(self, cache: SearchCache):
+        _put(cache, "pump", [])
+        cache.get("p1", "pump", ["asset"], 20)
+        cache.get("p1", "valve", ["asset"], 20)
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_commit_invalidates_written_project(self, db_session: Session):
+        client = Client(id=f"test-client-{uuid4().hex[:8]}", name="Test Client")
+        project = Project(id=f"test-project-{uuid4().hex[:8]}", name="Test", client_id=client.id)
+        other = Project(id=f"test-project-{uuid4().hex[:8]}", name="Other", client_id=client.id)
+        db_session.add_all([client, project, other])
+        db_session.commit()
+
+        cache = get_search_cache()
+        cache.clear()
+        _put(cache, "pump", [], project_id=project.id)
+        _put(cache, "pump", [], project_id=other.id)
+
+        db_session.add(
+            Asset(id=f"asset-{uuid4().hex[:8]}", tag="P-1", type="PUMP", project_id=project.id)
+        )
+        db_session.commit()
+
+        assert cache.get(project.id, "pump", ["asset"], 20) is None
+        assert cache.get(other.id, "pump", ["asset"], 20) is not None
@@ -0,0 +1,204 @@
+"""
+Tests for SearchSyncWorker
+
+Covers outbox capture by the database triggers, coalescing per entity,
+soft deletes, failure handling, debouncing, pruning and the lag metric.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.auth import Client, Project
+from app.models.cables import Cable
+from app.models.models import Asset, LBSNode, LocationType
+from app.models.rules import RuleDefinition, RuleSource
+from app.models.search import SearchOutbox
+from app.services.meilisearch_service import INDEX_ASSETS, INDEX_LOCATIONS
+from app.services.search_sync import (
+    SearchSyncWorker,
+    asset_document,
+    cable_document,
+    rule_document,
+)
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+class FakeMeili:
+    """Records pushes instead of calling MeiliSearch"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.added = defaultdict(list)
+        self.deleted = defaultdict(list)
+
+    def add_documents(self, index_name: str, docs: list[dict]) -> dict:
+        if self.fail:
+            raise ConnectionError("MeiliSearch unreachable")
+        self.added[index_name].extend(docs)
+        return {}
+
+    def delete_documents(self, index_name: str, doc_ids: list[str]) -> dict:
+        self.deleted[index_name].extend(doc_ids)
+        return {}
+
+
+@pytest.fixture
+def test_project(db_session: Session):
+    """Create test project"""
+    client = Client(id=f"test-client-{uuid4().hex[:8]}", name="Test Client")
+    db_session.add(client)
+    project = Project(
+        id=f"test-project-{uuid4().hex[:8]}",
+        name="Test Project",
+        client_id=client.id,
+    )
+    db_session.add(project)
+    db_session.commit()
+    return project
+
+
+def _asset(db_session: Session, project_id: str, tag: str, **kwargs) -> Asset:
+    asset = Asset(
+        id=f"asset-{uuid4().hex[:8]}", tag=tag, type="PUMP", project_id=project_id, **kwargs
+    )
+    db_session.add(asset)
+    return asset
+
+
+def _outbox(db_session: Session, entity_type: str, *entity_ids: str):
+    db_session.add_all(
+        SearchOutbox(entity_type=entity_type, entity_id=entity_id) for entity_id in entity_ids
+    )
+    db_session.commit()
+
+
+def _pending(db_session: Session) -> set[tuple[str, str]]:
+    return set(db_session.query(SearchOutbox.entity_type, SearchOutbox.entity_id).all())
+
+
+# ============================================================================
+# Capture Tests
+# ============================================================================
+
+
+class TestCapture:
+    """Database triggers write the outbox"""
+
+    def test_orm_and_bulk_writes_are_captured(self, db_session: Session, test_project):
+        asset = _asset(db_session, test_project.id, "P-100")
+        db_session.commit()
+        assert ("asset", asset.id) in _pending(db_session)
+
+        db_session.query(SearchOutbox).delete()
+        db_session.execute(
+            update(Asset).where(Asset.id == asset.id).values(deleted_at=datetime.utcnow())
+        )
+        db_session.commit()
+
+        assert _pending(db_session) == {("asset", asset.id)}
+
+
+# ============================================================================
+# Sync Tests
+# ============================================================================
+
+
+class TestDocuments:
+    """Sync documents match the ones the reindex endpoints write"""
+
+    def test_sortable_created_at_is_present(self):
+        created = datetime(2026, 1, 2, 3, 4, 5)
+        asset = Asset(id="a-1", tag="P-100", type="PUMP", project_id="p-1")
+        cable = Cable(id=uuid4(), tag="C-100", project_id="p-1", created_at=created)
+        rule = RuleDefinition(
+            id="r-1", name="Pumps", source=RuleSource.PROJECT, source_id="p-1", created_at=created
+        )
+
+        assert asset_document(asset)["created_at"] == ""
+        assert cable_document(cable, None, None)["created_at"] == str(created)
+        assert rule_document(rule)["created_at"] == str(created)
+
+
+class TestSync:
+    """Coalesced batches pushed to MeiliSearch"""
+
+    def test_coalesces_and_pushes(self, db_session: Session, test_project):
+        live = _asset(db_session, test_project.id, "P-200", description="Feed pump")
+        removed = _asset(db_session, test_project.id, "P-201", deleted_at=datetime.utcnow())
+        location = LBSNode(
+            id=f"lbs-{uuid4().hex[:8]}",
+            name="Substation 1",
+            type=LocationType.ROOM,
+            project_id=test_project.id,
+        )
+        db_session.add(location)
+        db_session.commit()
+        _outbox(db_session, "asset", live.id, live.id, live.id, removed.id, "asset-gone")
+        _outbox(db_session, "location", location.id)
+
+        meili = FakeMeili()
+        batch = SearchSyncWorker(meili=meili, debounce_ms=0).sync_once(db_session)
+
+        assert [doc["id"] for doc in meili.added[INDEX_ASSETS]] == [live.id]
+        assert meili.added[INDEX_ASSETS][0]["description"] == "Feed pump"
+        assert "created_at" in meili.added[INDEX_ASSETS][0]
+        assert sorted(meili.deleted[INDEX_ASSETS]) == sorted([removed.id, "asset-gone"])
+        assert meili.added[INDEX_LOCATIONS][0]["name"] == "Substation 1"
+        assert (batch.indexed, batch.deleted) == (2, 2)
+        assert _pending(db_session) == set()
+
+    def test_failed_push_keeps_outbox(self, db_session: Session, test_project):
+        asset = _asset(db_session, test_project.id, "P-300")
+        db_session.commit()
+        _outbox(db_session, "asset", asset.id)
+
+        worker = SearchSyncWorker(meili=FakeMeili(fail=True), debounce_ms=0)
+        with pytest.raises(ConnectionError):
+            worker.sync_once(db_session)
+
+        assert ("asset", asset.id) in _pending(db_session)
+
+    def test_recent_changes_wait_for_debounce(self, db_session: Session, test_project):
+        asset = _asset(db_session, test_project.id, "P-400")
+        db_session.commit()
+        _outbox(db_session, "asset", asset.id)
+
+        meili = FakeMeili()
+        batch = SearchSyncWorker(meili=meili, debounce_ms=60_000).sync_once(db_session)
+
+        assert batch.claimed == 0
+        assert ("asset", asset.id) in _pending(db_session)
+
+    def test_prune_drops_rows_past_retention(self, db_session: Session):
+        db_session.query(SearchOutbox).delete()
+        _outbox(db_session, "asset", "asset-old", "asset-new")
+        db_session.execute(
+            update(SearchOutbox)
+            .where(SearchOutbox.entity_id == "asset-old")
+            .values(created_at=datetime.utcnow() - timedelta(hours=48))
+        )
+        db_session.commit()
+
+        worker = SearchSyncWorker(meili=FakeMeili(), sync_enabled=False, retention_hours=24)
+
+        assert worker.prune(db_session) == 1
+        assert _pending(db_session) == {("asset", "asset-new")}
+        assert worker.status()["pruned"] == 1
+
+    def test_status_reports_backlog_and_lag(self, db_session: Session):
+        db_session.query(SearchOutbox).delete()
+        _outbox(db_session, "asset", "asset-a", "asset-b")
+
+        status = SearchSyncWorker(meili=FakeMeili()).status(db_session)
+
+        assert status["pending"] == 2
+        assert status["lag_seconds"] >= 0
+        assert status["running"] is False
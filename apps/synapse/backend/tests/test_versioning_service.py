@@ -17,6 +17,9 @@ from app.models.workflow import (
     BatchOperation,
     BatchOperationType,
     ChangeSource,
+    LogSource,
+    PropertyChange,
+    WorkflowEvent,
 )
 from app.services.versioning_service import (
     VersioningService,
@@ -136,6 +139,62 @@ class TestVersionCreation:
 
         assert version.batch_id == batch.id
 
+    def test_create_versions_bulk(self, versioning_service, test_asset, db_session, test_project):
+        """Test versioning many assets at once."""
+        other = Asset(
+            id="test-asset-versioning-2",
+            tag="TEST-002",
+            type="INSTRUMENT",
+            project_id=test_project.id,
+            properties={"custom_field": "a"},
+        )
+        db_session.add(other)
+        db_session.commit()
+        versioning_service.create_initial_version(test_asset)
+
+        test_asset.description = "Bulk update"
+        test_asset.properties = {"custom_field": "value2"}
+        db_session.commit()
+
+        versions = versioning_service.create_versions_bulk(
+            [test_asset, other, test_asset],
+            change_source=ChangeSource.RULE,
+            change_reason="Bulk",
+        )
+
+        assert [(v.asset_id, v.version_number) for v in versions] == [
+            (test_asset.id, 2),
+            (other.id, 1),
+        ]
+        assert versions[0].snapshot["description"] == "Bulk update"
+        changes = db_session.query(PropertyChange).filter(
+            PropertyChange.version_id.in_([v.id for v in versions])
+        )
+        assert {(c.version_id, c.property_name) for c in changes} == {
+            (versions[0].id, "description"),
+            (versions[0].id, "properties"),
+        }
+
+    def test_create_versions_bulk_with_snapshots(self, versioning_service, test_asset):
+        """Test bulk versioning from caller-provided snapshots."""
+        before = versioning_service._create_snapshot(test_asset)
+        after = {**before, "properties": {"custom_field": "value3"}}
+
+        versions = versioning_service.create_versions_bulk(
+            [test_asset],
+            change_source=ChangeSource.RULE,
+            snapshots={test_asset.id: after},
+            previous_snapshots={test_asset.id: before},
+        )
+
+        # No previous version in the database, so this is v1
+        assert versions[0].version_number == 1
+        assert versions[0].snapshot["properties"] == {"custom_field": "value3"}
+
+    def test_create_versions_bulk_empty(self, versioning_service):
+        """Test bulk versioning with no assets."""
+        assert versioning_service.create_versions_bulk([], ChangeSource.RULE) == []
+
 
 class TestVersionQueries:
     """Tests for version queries."""
@@ -411,6 +470,119 @@ class TestBatchRollback:
         assert result.success is True
         assert result.batch_id == batch.id
 
+    def test_rollback_batch_restores_and_deletes(
+        self, versioning_service, test_asset, db_session, test_project
+    ):
+        """Test batch rollback restores updated assets and soft-deletes created ones."""
+        batch = BatchOperation(
+            id="test-batch-set-rollback",
+            operation_type=BatchOperationType.IMPORT,
+            project_id=test_project.id,
+            correlation_id="test-correlation-set-rollback",
+        )
+        db_session.add(batch)
+        db_session.commit()
+
+        versioning_service.create_initial_version(test_asset)
+        test_asset.description = "Edited before batch"
+        db_session.commit()
+        versioning_service.create_version(test_asset, ChangeSource.USER)
+
+        # Batch updates the asset twice and creates a new one
+        created = Asset(
+            id="test-asset-created-in-batch",
+            tag="TEST-NEW",
+            type="INSTRUMENT",
+            project_id=test_project.id,
+        )
+        db_session.add(created)
+        test_asset.description = "Batch 1"
+        db_session.commit()
+        versioning_service.create_versions_bulk(
+            [test_asset, created], ChangeSource.IMPORT, batch_id=batch.id
+        )
+        test_asset.description = "Batch 2"
+        test_asset.properties = {"custom_field": "batch"}
+        db_session.commit()
+        versioning_service.create_version(test_asset, ChangeSource.IMPORT, batch_id=batch.id)
+
+        progress = []
+        result = versioning_service.rollback_batch(
+            batch_id=batch.id,
+            reason="Undo batch import",
+            chunk_size=1,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+
+        assert result.success is True
+        assert result.assets_restored == 2
+        assert progress == [(1, 2), (2, 2)]
+
+        restored = next(r for r in result.results if r.asset_id == test_asset.id)
+        assert restored.restored_version == 2
+        assert restored.new_version == 5
+
+        db_session.refresh(test_asset)
+        db_session.refresh(created)
+        assert test_asset.description == "Edited before batch"
+        assert test_asset.properties == {"custom_field": "value1"}
+        assert test_asset.deleted_at is None
+        assert created.deleted_at is not None
+
+        db_session.refresh(batch)
+        assert batch.is_rolled_back is True
+
+    def test_rollback_batch_endpoint(
+        self, client, versioning_service, test_asset, db_session, test_project
+    ):
+        """Test the rollback endpoint restores the batch and logs progress events."""
+        from app.api.deps import get_current_active_user
+        from app.main import app
+        from app.models.auth import User
+
+        batch = BatchOperation(
+            id="test-batch-endpoint-rollback",
+            operation_type=BatchOperationType.IMPORT,
+            project_id=test_project.id,
+            correlation_id="test-correlation-endpoint-rollback",
+        )
+        db_session.add(batch)
+        db_session.commit()
+
+        versioning_service.create_initial_version(test_asset)
+        test_asset.description = "Batch Modified"
+        db_session.commit()
+        versioning_service.create_version(test_asset, ChangeSource.IMPORT, batch_id=batch.id)
+
+        dev_user = db_session.query(User).filter(User.id == "dev-user").one()
+        app.dependency_overrides[get_current_active_user] = lambda: dev_user
+
+        response = client.post(
+            f"/api/v1/workflow/batches/{batch.id}/rollback", params={"reason": "Undo import"}
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["success"] is True
+        assert body["rolled_back"] == 1
+        assert body["results"][0]["message"] == "Restored version 1"
+
+        db_session.refresh(test_asset)
+        assert test_asset.description == "Test Asset"
+
+        events = (
+            db_session.query(WorkflowEvent)
+            .filter(
+                WorkflowEvent.project_id == test_project.id,
+                WorkflowEvent.source == LogSource.ROLLBACK,
+            )
+            .all()
+        )
+        assert "Rolled back 1/1 assets" in [e.message for e in events]
+
+        response = client.post(f"/api/v1/workflow/batches/{batch.id}/rollback")
+        assert response.status_code == 400
+
     def test_rollback_batch_not_found(self, versioning_service):
         """Test rollback of non-existent batch."""
         result = versioning_service.rollback_batch(
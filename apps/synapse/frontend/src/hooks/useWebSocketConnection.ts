@@ -5,6 +5,8 @@ export const useWebSocketConnection = () => {
     const wsRef = useRef<WebSocket | null>(null)
     const reconnectTimeoutRef = useRef<NodeJS.Timeout>()
     const reconnectAttempts = useRef(0)
+    // Id of the last backend entry received, to resume without duplicates
+    const lastIdRef = useRef<string | null>(null)
 
     const { addLog, setConnected, setConnectionError } = useDevConsoleStore()
 
@@ -12,7 +14,8 @@ export const useWebSocketConnection = () => {
         try {
             // Get API URL from environment
             const apiUrl = import.meta.env.VITE_API_URL || 'http://localhost:8001'
-            const wsUrl = apiUrl.replace('http', 'ws') + '/ws/logs'
+            const since = lastIdRef.current ? `?since=${encodeURIComponent(lastIdRef.current)}` : ''
+            const wsUrl = apiUrl.replace('http', 'ws') + '/ws/logs' + since
 
             console.log('[WebSocket] Connecting to:', wsUrl)
 
@@ -27,8 +30,14 @@ export const useWebSocketConnection = () => {
 
             ws.onmessage = (event) => {
                 try {
-                    const log = JSON.parse(event.data)
-                    addLog(log)
+                    if (event.data === 'pong') return
+                    const frame = JSON.parse(event.data)
+                    // Entries that piled up for a slow client arrive as one batch frame
+                    const logs = frame.type === 'batch' ? frame.entries : [frame]
+                    logs.forEach(addLog)
+                    if (logs.length && logs[logs.length - 1].id) {
+                        lastIdRef.current = logs[logs.length - 1].id
+                    }
                 } catch (error) {
                     console.error('[WebSocket] Failed to parse message:', error)
                 }
@@ -45,6 +45,13 @@ interface WsLogEntry {
   status?: ActionStatus;
 }
 
+// Entries that piled up for a slow client arrive together
+interface WsBatchFrame {
+  type: 'batch';
+  dropped: number;
+  entries: WsLogEntry[];
+}
+
 export interface LogEntry {
   id: string;
   timestamp: string;
@@ -133,6 +140,8 @@ const levelPriority: Record<LogLevel | 'ALL', number> = {
 
 // Reconnection settings
 let reconnectTimeout: ReturnType<typeof setTimeout> | null = null;
+// Id of the last backend entry received, to resume without duplicates
+let lastLogId: string | null = null;
 const RECONNECT_DELAY = 3000;
 
 // Helper to detect topic from message/context
@@ -251,7 +260,8 @@ export const useLogStore = create<LogStore>((set, get) => ({
     set({ wsState: 'connecting' });
 
     try {
-      const ws = new WebSocket(`${WS_URL}/ws/logs`);
+      const since = lastLogId ? `?since=${encodeURIComponent(lastLogId)}` : '';
+      const ws = new WebSocket(`${WS_URL}/ws/logs${since}`);
 
       ws.onopen = () => {
         set({ wsState: 'connected', wsConnection: ws });
@@ -266,21 +276,25 @@ export const useLogStore = create<LogStore>((set, get) => ({
         try {
           if (event.data === 'pong') return;
 
-          const data: WsLogEntry = JSON.parse(event.data);
-          addLog({
-            id: data.id,
-            timestamp: data.timestamp,
-            level: data.level || 'INFO',
-            source: (data.source as LogSource) || 'BACKEND',
-            message: data.message,
-            context: data.context,
-            actionType: data.actionType,
-            entityId: data.entityId,
-            entityType: data.entityType,
-            discipline: data.discipline,
-            parentId: data.parentId,
-            status: data.status,
-          });
+          const frame: WsLogEntry | WsBatchFrame = JSON.parse(event.data);
+          const entries = 'type' in frame && frame.type === 'batch' ? frame.entries : [frame as WsLogEntry];
+          for (const data of entries) {
+            addLog({
+              id: data.id,
+              timestamp: data.timestamp,
+              level: data.level || 'INFO',
+              source: (data.source as LogSource) || 'BACKEND',
+              message: data.message,
+              context: data.context,
+              actionType: data.actionType,
+              entityId: data.entityId,
+              entityType: data.entityType,
+              discipline: data.discipline,
+              parentId: data.parentId,
+              status: data.status,
+            });
+            if (data.id) lastLogId = data.id;
+          }
         } catch (e) {
           console.error('Failed to parse WebSocket message:', e);
         }